@@ -0,0 +1,454 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+AI 关键词分析 / AI 聚合分析的执行逻辑
+
+视图（api/views.py）和 AI 任务（api/ai_jobs.py）共用。每个函数返回 (响应数据, HTTP 状态码)，
+只有真正执行分析时才写入 AIUsageRecord；结果缓存与任务去重见 api/ai_jobs.py。
+"""
+
+import json
+import logging
+import re
+import time
+from typing import List, Optional, Tuple
+
+import httpx
+from django.db.models import Count
+from rest_framework import status
+
+from api import llm_client
+from api.feed_search import search_feed
+from api.models import AIUsageRecord
+from api.time_buckets import bucket_label, granularity_bucket_expression
+from media_platform.models import MonitorFeed
+
+logger = logging.getLogger(__name__)
+
+PLATFORM_NAMES = {
+    "xhs": "小红书",
+    "dy": "抖音",
+    "ks": "快手",
+    "bili": "B站",
+    "wb": "微博",
+    "tieba": "贴吧",
+    "zhihu": "知乎",
+}
+
+# 关键词分析的平台显示名（含“所有平台”）
+KEYWORD_PLATFORM_NAMES = {
+    'all': '所有平台',
+    'xhs': '小红书',
+    'dy': '抖音',
+    'ks': '快手',
+    'bili': 'B站',
+    'wb': '微博',
+    'tieba': '贴吧',
+    'zhihu': '知乎'
+}
+
+
+def time_range_display(time_range: str) -> str:
+    return f"过去{time_range}天" if str(time_range).isdigit() else "自定义时间"
+
+
+async def run_keyword_analysis(params: dict) -> Tuple[dict, int]:
+    """使用智谱 AI 生成关键词"""
+    keyword = params["keyword"]
+    platform = params["platform"]
+    time_range = params["time_range"]
+
+    api_key = llm_client.get_api_key()
+
+    platform_display = KEYWORD_PLATFORM_NAMES.get(platform, platform)
+    range_display = time_range_display(time_range)
+
+    logger.debug(
+        f"Keyword analysis: keyword={keyword}, platform={platform}, time_range={time_range}, "
+        f"api_key_configured={bool(api_key)}"
+    )
+
+    # 创建AI使用记录（初始状态）
+    usage_record = await AIUsageRecord.objects.acreate(
+        keyword=keyword,
+        platform=platform,
+        time_range=range_display,
+        is_success=False
+    )
+
+    if not api_key:
+        usage_record.error_message = "未配置智谱 AI API Key"
+        await usage_record.asave()
+        return (
+            {"error": "未配置智谱 AI API Key，请在后端 .env 文件中设置 ZHIPU_API_KEY"},
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    # 简化提示词，使用更简洁的格式
+    prompt = f'请列出10-15个关于"{keyword}"在{platform_display}的关键词，每行一个。'
+    messages = [
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+    # 只记录请求规模，提示词和返回内容不写入日志
+    logger.debug(f"Calling {llm_client.get_chat_url()} for keyword analysis ({len(prompt)} prompt chars)")
+
+    # 限流、重试和熔断由 llm_client 处理；调用失败时从监控数据样本中提取关键词兜底
+    try:
+        result = await llm_client.chat_completion(api_key, messages)
+    except llm_client.LLMUnavailableError as e:
+        logger.warning(f"Keyword analysis skipped, LLM unavailable: {e}")
+        usage_record.error_message = str(e)
+        await usage_record.asave()
+        return await _keyword_fallback(params, str(e), status.HTTP_503_SERVICE_UNAVAILABLE)
+    except httpx.TimeoutException as e:
+        logger.warning(f"Keyword analysis LLM request timed out after all attempts: {e}")
+        usage_record.error_message = f"AI 服务响应超时: {str(e)}"
+        await usage_record.asave()
+        return await _keyword_fallback(
+            params,
+            "AI 服务响应超时，可能是网络问题。请检查服务器网络连接，或稍后重试。",
+            status.HTTP_504_GATEWAY_TIMEOUT
+        )
+    except httpx.HTTPError as e:
+        logger.warning(f"Keyword analysis LLM request failed: {e}")
+        error_msg = str(e)
+        if isinstance(e, httpx.HTTPStatusError):
+            # 尝试解析错误信息
+            try:
+                error_json = e.response.json()
+                if 'error' in error_json:
+                    error_msg = error_json['error'].get('message', error_msg)
+            except:
+                pass
+        usage_record.error_message = f"请求失败: {str(e)}"
+        await usage_record.asave()
+        return await _keyword_fallback(
+            params, f"AI 分析请求失败: {error_msg}", status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    except Exception as e:
+        logger.exception("Keyword analysis failed")
+        usage_record.error_message = f"未知错误: {str(e)}"
+        await usage_record.asave()
+        return (
+            {"error": f"AI 分析失败: {str(e)}"},
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    # 检查返回格式
+    if 'choices' not in result or not result['choices']:
+        usage_record.error_message = "AI 返回格式异常，未包含 choices"
+        await usage_record.asave()
+        return (
+            {"error": "AI 返回格式异常，未包含 choices"},
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    # 解析返回的关键词
+    content = llm_client.completion_text(result)
+
+    keywords = []
+    for line in content.split('\n'):
+        line = line.strip()
+        # 使用正则表达式移除序号和其他符号
+        line = re.sub(r'^[\d\-\*\.\、]+\s*', '', line).strip()
+        # 移除可能的引号和特殊符号
+        line = line.strip('"\'""''《》【】()（）-—–')
+        if line and 1 < len(line) < 20:
+            keywords.append(line)
+
+    logger.debug(f"Parsed {len(keywords)} keywords from {len(content)} response chars")
+
+    if not keywords:
+        usage_record.error_message = "AI 未能生成有效关键词"
+        await usage_record.asave()
+        return (
+            {"error": "AI 未能生成有效关键词，请重试"},
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    # 更新使用记录为成功状态
+    usage_record.is_success = True
+    usage_record.result_keywords = keywords[:15]
+    usage_record.error_message = ""
+    await usage_record.asave()
+
+    return {
+        "success": True,
+        "keywords": keywords[:15]
+    }, status.HTTP_200_OK
+
+
+async def _keyword_fallback(params: dict, error: str, status_code: int) -> Tuple[dict, int]:
+    """大模型不可用时从匹配的监控数据中提取高频词；没有样本时返回原错误"""
+    queryset = MonitorFeed.objects.all()
+    if params["platform"] != "all":
+        queryset = queryset.filter(platform=params["platform"])
+    samples = await _collect_samples(search_feed(queryset, params["keyword"]))
+    keywords = _fallback_keywords_from_samples(samples)
+    if not keywords:
+        return {"error": error}, status_code
+    return {
+        "success": True,
+        "keywords": keywords[:15],
+        "meta": {"ai_enabled": False, "ai_error": error}
+    }, status.HTTP_200_OK
+
+
+async def _collect_samples(queryset, limit: int = 40) -> List[str]:
+    """最近 limit 条内容，格式为 "[平台] 作者: 内容"（用于提示词和兜底关键词）"""
+    sample_qs = queryset.order_by("-created_at").values("content", "author", "platform")[:limit]
+    samples = []
+    async for item in sample_qs:
+        content = (item.get("content") or "").strip().replace("\n", " ")
+        content = re.sub(r"\s+", " ", content)
+        if not content:
+            continue
+        samples.append(f"[{PLATFORM_NAMES.get(item.get('platform'), item.get('platform'))}] {item.get('author') or '匿名'}: {content[:120]}")
+    return samples
+
+
+def _sentiment_key(sentiment: Optional[str], is_sensitive: bool) -> str:
+    if is_sensitive or sentiment == "sensitive":
+        return "sensitive"
+    if sentiment in {"positive", "negative", "neutral"}:
+        return sentiment
+    return "neutral"
+
+
+def _fallback_keywords_from_samples(samples: List[str]) -> List[str]:
+    tokens = []
+    for text in samples:
+        tokens.extend(re.findall(r"[\u4e00-\u9fa5]{2,6}", text))
+    freq = {}
+    for token in tokens:
+        freq[token] = freq.get(token, 0) + 1
+    return [k for k, _ in sorted(freq.items(), key=lambda item: item[1], reverse=True)[:12]]
+
+
+def _build_default_summary(total_hits: int, platform: str, time_range_display: str) -> List[str]:
+    platform_name = PLATFORM_NAMES.get(platform, platform) if platform != "all" else "全平台"
+    return [
+        f"当前分析覆盖{platform_name}，时间范围为{time_range_display}。",
+        f"本次共匹配到{total_hits}条相关内容，后续可继续观察情绪变化。",
+        "建议结合高频观点与风险提示进行重点研判。"
+    ]
+
+
+def _build_default_risks(sentiment_stats: dict) -> List[dict]:
+    risks = []
+    total = sentiment_stats.get("total", 0) or 0
+    negative = sentiment_stats.get("negative", 0) or 0
+    sensitive = sentiment_stats.get("sensitive", 0) or 0
+    if total:
+        neg_ratio = negative / total
+        if neg_ratio >= 0.35:
+            risks.append({
+                "level": "medium",
+                "trigger": "负面占比偏高",
+                "reason": f"负面内容占比约{neg_ratio:.0%}，需要关注情绪扩散趋势。"
+            })
+    if sensitive > 0:
+        risks.append({
+            "level": "high",
+            "trigger": "敏感内容命中",
+            "reason": f"监测到{sensitive}条敏感内容，需确认话题来源与扩散路径。"
+        })
+    if not risks:
+        risks.append({
+            "level": "low",
+            "trigger": "风险信号较弱",
+            "reason": "当前未出现明显敏感或负面集中现象，可持续观察。"
+        })
+    return risks
+
+
+def _platform_risk_stats(sentiment_by_platform: dict, platform: str) -> dict:
+    if platform != "all":
+        return sentiment_by_platform.get(platform, {})
+    return {
+        "total": sum(p["total"] for p in sentiment_by_platform.values()),
+        "negative": sum(p["negative"] for p in sentiment_by_platform.values()),
+        "sensitive": sum(p["sensitive"] for p in sentiment_by_platform.values()),
+    }
+
+
+async def run_ai_analysis(params: dict) -> Tuple[dict, int]:
+    """AI 聚合分析：关键词 + 摘要 + 情绪分布 + 风险提示
+
+    granularity 控制 sentiment_distribution.by_day 的时间粒度：hour / day（默认）/ week
+    """
+    keyword = params["keyword"]
+    platform = params["platform"]
+    time_range = params["time_range"]
+    granularity = params["granularity"]
+
+    platform_display = PLATFORM_NAMES.get(platform, platform) if platform != "all" else "所有平台"
+    range_display = time_range_display(time_range)
+
+    api_key = llm_client.get_api_key()
+
+    usage_record = await AIUsageRecord.objects.acreate(
+        keyword=keyword,
+        platform=platform,
+        time_range=range_display,
+        is_success=False
+    )
+
+    queryset = MonitorFeed.objects.all()
+    if platform != "all":
+        queryset = queryset.filter(platform=platform)
+
+    queryset = search_feed(queryset, keyword)
+
+    if str(time_range).isdigit():
+        days = int(time_range)
+        cutoff_ts = int(time.time()) - days * 86400
+        queryset = queryset.filter(created_at__gte=cutoff_ts)
+
+    # 情绪分布（按平台）
+    sentiment_by_platform = {
+        code: {"positive": 0, "negative": 0, "neutral": 0, "sensitive": 0, "total": 0}
+        for code in PLATFORM_NAMES.keys()
+    }
+    platform_rows = queryset.values("platform", "sentiment", "is_sensitive").annotate(cnt=Count("id"))
+    async for row in platform_rows:
+        platform_code = row.get("platform")
+        if platform_code not in sentiment_by_platform:
+            continue
+        sentiment = row.get("sentiment")
+        is_sensitive = bool(row.get("is_sensitive"))
+        key = _sentiment_key(sentiment, is_sensitive)
+        sentiment_by_platform[platform_code][key] += row.get("cnt", 0)
+        sentiment_by_platform[platform_code]["total"] += row.get("cnt", 0)
+
+    # 情绪分布（按时间）：在数据库中按本地时间分桶聚合，秒/毫秒时间戳统一换算
+    time_buckets = {}
+    trend_rows = (
+        queryset.filter(created_at__gt=0)
+        .annotate(bucket=granularity_bucket_expression("created_at", granularity))
+        .values("bucket", "sentiment", "is_sensitive")
+        .annotate(cnt=Count("id"))
+        .order_by()
+    )
+    async for row in trend_rows:
+        bucket = time_buckets.setdefault(
+            int(row["bucket"]), {"positive": 0, "negative": 0, "neutral": 0, "sensitive": 0, "total": 0}
+        )
+        key = _sentiment_key(row.get("sentiment"), bool(row.get("is_sensitive")))
+        bucket[key] += row.get("cnt", 0)
+        bucket["total"] += row.get("cnt", 0)
+
+    sentiment_by_day = [
+        {"date": bucket_label(bucket, granularity), **time_buckets[bucket]}
+        for bucket in sorted(time_buckets.keys())
+    ]
+
+    total_hits = await queryset.acount()
+
+    # 采样内容用于 AI 分析
+    samples = await _collect_samples(queryset)
+
+    def build_payload(keywords, summary, risks, ai_enabled):
+        return {
+            "success": True,
+            "keywords": keywords,
+            "summary": summary,
+            "sentiment_distribution": {
+                "by_platform": sentiment_by_platform,
+                "by_day": sentiment_by_day
+            },
+            "risks": risks,
+            "meta": {
+                "platform": platform,
+                "time_range": range_display,
+                "total_hits": total_hits,
+                "granularity": granularity,
+                "sample_size": len(samples),
+                "ai_enabled": ai_enabled
+            }
+        }
+
+    if total_hits == 0:
+        summary = _build_default_summary(total_hits, platform, range_display)
+        usage_record.is_success = True
+        usage_record.result_keywords = [keyword]
+        usage_record.error_message = ""
+        await usage_record.asave()
+        return build_payload(
+            [keyword], summary, _build_default_risks({"total": 0, "negative": 0, "sensitive": 0}), False
+        ), status.HTTP_200_OK
+
+    async def fallback(error: str):
+        keywords = _fallback_keywords_from_samples(samples) or [keyword, f"{keyword}热度", "用户讨论", "情绪反馈"]
+        summary = _build_default_summary(total_hits, platform, range_display)
+        risks = _build_default_risks(_platform_risk_stats(sentiment_by_platform, platform))
+        usage_record.error_message = error
+        await usage_record.asave()
+        payload = build_payload(keywords[:15], summary, risks, False)
+        if api_key:
+            payload["meta"]["ai_error"] = error
+        return payload, status.HTTP_200_OK
+
+    if not api_key:
+        return await fallback("未配置智谱 AI API Key")
+
+    try:
+        prompt = (
+            "你是舆情分析助手，请根据样本内容输出结构化 JSON，只输出 JSON。\n"
+            f"关键词：{keyword}\n"
+            f"平台：{platform_display}\n"
+            f"时间范围：{range_display}\n"
+            "样本内容：\n"
+            + "\n".join(samples[:30]) +
+            "\n请输出 JSON，格式如下：\n"
+            "{\n"
+            '  "keywords": ["词1", "词2"],\n'
+            '  "summary": ["句子1", "句子2", "句子3"],\n'
+            '  "risks": [\n'
+            '    {"level": "low/medium/high", "trigger": "触发条件", "reason": "原因"}\n'
+            "  ]\n"
+            "}\n"
+            "summary 请输出 3-5 句中文，risks 1-4 条。"
+        )
+
+        # 熔断中立即返回、重试后仍失败时返回基于统计数据的兜底结果
+        try:
+            result = await llm_client.chat_completion(api_key, [{"role": "user", "content": prompt}])
+        except llm_client.LLMUnavailableError as e:
+            return await fallback(str(e))
+        except httpx.HTTPError as e:
+            return await fallback(f"AI 分析请求失败: {str(e)}")
+        content = llm_client.completion_text(result)
+
+        json_match = re.search(r"\{.*\}", content, re.S)
+        parsed = json.loads(json_match.group(0)) if json_match else {}
+
+        keywords = parsed.get("keywords") or []
+        summary = parsed.get("summary") or []
+        risks = parsed.get("risks") or []
+
+        if not keywords:
+            keywords = _fallback_keywords_from_samples(samples) or [keyword]
+        if not summary:
+            summary = _build_default_summary(total_hits, platform, range_display)
+        if not risks:
+            risks = _build_default_risks(_platform_risk_stats(sentiment_by_platform, platform))
+
+        usage_record.is_success = True
+        usage_record.result_keywords = keywords[:15]
+        usage_record.error_message = ""
+        await usage_record.asave()
+
+        return build_payload(keywords[:15], summary[:5], risks[:4], True), status.HTTP_200_OK
+    except Exception as e:
+        usage_record.error_message = f"AI 分析失败: {str(e)}"
+        await usage_record.asave()
+        return {"error": f"AI 分析失败: {str(e)}"}, status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+AI 分析任务：结果缓存 + 后台执行 + 相同任务去重
+
+任务键 = 任务类型 + 规范化后的分析参数 + monitor_feed 数据水位（见 api/conditional.py 的
+feed_watermark）。关键词分析的提示词不读取 monitor_feed，任务键不含数据水位。
+
+- 结果缓存：成功的结果按任务键缓存 AI_RESULT_CACHE_TIMEOUT 秒（缓存中保存任务 ID，结果在任务表中），
+  参数和数据都不变时直接返回上次的任务，不再调用大模型、不再写 AIUsageRecord
+- 去重：相同任务键的未完成任务（AI_JOB_TIMEOUT 内创建）只执行一次，后来的请求复用同一个任务。
+  "查找未完成任务 - 新建任务"在缓存锁（cache.add）内执行，多个 Web 进程共用 Redis 时跨进程互斥；
+  未配置 Redis 时本地内存缓存只在进程内互斥
+- 执行：每个进程一个后台线程运行独立的事件循环，WSGI / ASGI 部署下行为一致
+
+提交接口立即返回任务 ID，轮询接口（可带 wait 长轮询）返回结果；原有的同步接口
+（/api/ai/analysis、/api/ai/keyword-analysis）同样经过缓存和去重，再等待任务完成。
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from datetime import timedelta
+from typing import Dict, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.utils import timezone
+from rest_framework import status
+
+from api.ai_analysis import run_ai_analysis, run_keyword_analysis
+from api.conditional import feed_watermark
+from api.models import AIAnalysisJob
+from api.time_buckets import GRANULARITIES
+
+logger = logging.getLogger(__name__)
+
+JOB_RUNNERS = {
+    "keywords": run_keyword_analysis,
+    "analysis": run_ai_analysis,
+}
+# 结果依赖 monitor_feed 数据的任务类型
+DATA_DEPENDENT_KINDS = {"analysis"}
+
+RESULT_KEY = "ai:result:{job_key}"
+SUBMIT_LOCK_KEY = "ai:submit:{job_key}"
+# 锁的过期时间，持有锁的进程异常退出时最多阻塞同键提交这么久
+SUBMIT_LOCK_TIMEOUT = 10
+POLL_INTERVAL = 0.5
+
+
+class AIJobError(ValueError):
+    """任务参数错误"""
+
+
+def _result_timeout() -> int:
+    return int(getattr(settings, "AI_RESULT_CACHE_TIMEOUT", 1800))
+
+
+def _job_timeout() -> int:
+    return int(getattr(settings, "AI_JOB_TIMEOUT", 300))
+
+
+def normalize_params(kind: str, data: dict) -> dict:
+    """校验并规范化分析参数（决定任务键，相同请求得到相同参数）"""
+    if kind not in JOB_RUNNERS:
+        raise AIJobError(f"type 仅支持 {' / '.join(JOB_RUNNERS)}")
+    keyword = str(data.get("keyword") or "").strip()
+    if not keyword:
+        raise AIJobError("请输入分析关键词")
+    params = {
+        "keyword": keyword,
+        "platform": data.get("platform") or "all",
+        "time_range": str(data.get("time_range") or "7"),
+    }
+    if kind == "analysis":
+        granularity = data.get("granularity") or "day"
+        if granularity not in GRANULARITIES:
+            raise AIJobError("granularity 仅支持 hour / day / week")
+        params["granularity"] = granularity
+    return params
+
+
+def build_job_key(kind: str, params: dict) -> str:
+    inputs = {"kind": kind, **params}
+    if kind in DATA_DEPENDENT_KINDS:
+        platform = params.get("platform")
+        inputs["watermark"] = feed_watermark(platform if platform != "all" else None)
+    raw = json.dumps(inputs, sort_keys=True, ensure_ascii=False)
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def _is_cacheable(payload: dict, status_code: int) -> bool:
+    """只缓存大模型成功返回的结果；未配置 API Key 时的兜底结果不缓存"""
+    if status_code != status.HTTP_200_OK:
+        return False
+    return (payload.get("meta") or {}).get("ai_enabled", True) is not False
+
+
+class _JobRunner:
+    """进程内的任务执行线程（独立事件循环），记录本进程执行中的任务"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._futures: Dict[int, Future] = {}
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="ai-jobs", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def submit(self, job: AIAnalysisJob) -> Future:
+        future = asyncio.run_coroutine_threadsafe(
+            _execute(job.pk, job.kind, job.params, job.job_key), self._get_loop()
+        )
+        with self._lock:
+            self._futures[job.pk] = future
+        future.add_done_callback(lambda _f, job_id=job.pk: self._discard(job_id))
+        return future
+
+    def _discard(self, job_id: int) -> None:
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+    def get(self, job_id: int) -> Optional[Future]:
+        with self._lock:
+            return self._futures.get(job_id)
+
+
+_runner = _JobRunner()
+
+
+async def _execute(job_id: int, kind: str, params: dict, job_key: str) -> None:
+    await sync_to_async(close_old_connections)()
+    await AIAnalysisJob.objects.filter(pk=job_id).aupdate(status=AIAnalysisJob.STATUS_RUNNING)
+    try:
+        payload, status_code = await JOB_RUNNERS[kind](params)
+    except Exception as e:
+        logger.exception(f"AI job {job_id} failed")
+        payload, status_code = {"error": f"AI 分析失败: {str(e)}"}, status.HTTP_500_INTERNAL_SERVER_ERROR
+
+    await AIAnalysisJob.objects.filter(pk=job_id).aupdate(
+        status=AIAnalysisJob.STATUS_SUCCESS if status_code == status.HTTP_200_OK else AIAnalysisJob.STATUS_FAILED,
+        result=payload,
+        status_code=status_code,
+        finished_at=timezone.now(),
+    )
+    if _is_cacheable(payload, status_code):
+        try:
+            await cache.aset(RESULT_KEY.format(job_key=job_key), job_id, _result_timeout())
+        except Exception as e:
+            logger.warning(f"Failed to cache AI job {job_id} result: {e}")
+
+
+def _cached_job(job_key: str) -> Optional[AIAnalysisJob]:
+    try:
+        job_id = cache.get(RESULT_KEY.format(job_key=job_key))
+    except Exception:
+        job_id = None
+    if job_id is None:
+        return None
+    return AIAnalysisJob.objects.filter(pk=job_id, status=AIAnalysisJob.STATUS_SUCCESS).first()
+
+
+def _acquire_submit_lock(job_key: str) -> bool:
+    """
+    获取任务键的提交锁，最多等待 SUBMIT_LOCK_TIMEOUT 秒
+
+    Returns:
+        是否持有锁；缓存不可用或等待超时时返回 False，由调用方不加锁继续
+    """
+    key = SUBMIT_LOCK_KEY.format(job_key=job_key)
+    deadline = time.monotonic() + SUBMIT_LOCK_TIMEOUT
+    try:
+        while not cache.add(key, 1, SUBMIT_LOCK_TIMEOUT):
+            if time.monotonic() >= deadline:
+                logger.warning(f"Timed out waiting for AI job submit lock {job_key}")
+                return False
+            time.sleep(POLL_INTERVAL / 10)
+    except Exception as e:
+        logger.warning(f"Failed to acquire AI job submit lock {job_key}: {e}")
+        return False
+    return True
+
+
+def _release_submit_lock(job_key: str) -> None:
+    try:
+        cache.delete(SUBMIT_LOCK_KEY.format(job_key=job_key))
+    except Exception as e:
+        logger.warning(f"Failed to release AI job submit lock {job_key}: {e}")
+
+
+def submit_job(kind: str, params: dict) -> AIAnalysisJob:
+    """
+    提交分析任务
+
+    Returns:
+        命中缓存时为已完成的任务；存在相同的未完成任务时为该任务；否则为新建并已开始执行的任务
+    """
+    job_key = build_job_key(kind, params)
+    job = _cached_job(job_key)
+    if job is not None:
+        return job
+
+    locked = _acquire_submit_lock(job_key)
+    try:
+        job = AIAnalysisJob.objects.filter(
+            job_key=job_key,
+            status__in=[AIAnalysisJob.STATUS_PENDING, AIAnalysisJob.STATUS_RUNNING],
+            created_at__gte=timezone.now() - timedelta(seconds=_job_timeout()),
+        ).order_by("id").first()
+        if job is not None:
+            return job
+        # 等锁期间其他请求的同键任务可能已经完成
+        job = _cached_job(job_key)
+        if job is not None:
+            return job
+        job = AIAnalysisJob.objects.create(job_key=job_key, kind=kind, params=params)
+    finally:
+        if locked:
+            _release_submit_lock(job_key)
+
+    _runner.submit(job)
+    return job
+
+
+def _expire_if_stale(job: AIAnalysisJob) -> AIAnalysisJob:
+    """超过 AI_JOB_TIMEOUT 仍未完成且不在本进程执行的任务（执行进程已退出）标记为失败"""
+    if job.is_finished or _runner.get(job.pk) is not None:
+        return job
+    if job.created_at >= timezone.now() - timedelta(seconds=_job_timeout()):
+        return job
+    job.status = AIAnalysisJob.STATUS_FAILED
+    job.result = {"error": "AI 分析任务超时"}
+    job.status_code = status.HTTP_504_GATEWAY_TIMEOUT
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "result", "status_code", "finished_at"])
+    return job
+
+
+def get_job(job_id: int) -> Optional[AIAnalysisJob]:
+    job = AIAnalysisJob.objects.filter(pk=job_id).first()
+    return _expire_if_stale(job) if job is not None else None
+
+
+async def wait_for_job(job: AIAnalysisJob, timeout: float) -> AIAnalysisJob:
+    """
+    等待任务完成（最长 timeout 秒），返回任务的最新状态
+
+    本进程执行的任务直接等待其 Future，其他进程执行的任务按 POLL_INTERVAL 查询任务表。
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not job.is_finished:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        future = _runner.get(job.pk)
+        if future is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), remaining)
+            except asyncio.TimeoutError:
+                pass
+        else:
+            await asyncio.sleep(min(POLL_INTERVAL, remaining))
+        job = await sync_to_async(get_job)(job.pk)
+        if job is None:
+            raise AIJobError("任务不存在")
+    return job
+
+
+def job_to_dict(job: AIAnalysisJob) -> dict:
+    data = {
+        "job_id": job.pk,
+        "type": job.kind,
+        "status": job.status,
+        "params": job.params,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+    if job.is_finished:
+        data["status_code"] = job.status_code
+        data["result"] = job.result
+    return data
@@ -1,6 +1,36 @@
+import os
+import sys
+
 from django.apps import AppConfig
 
+SERVER_PROGRAMS = {"gunicorn", "uvicorn", "daphne"}
+
 
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api"
+
+    def ready(self):
+        from django.conf import settings
+
+        interval = getattr(settings, "SENTIMENT_BACKFILL_INTERVAL", 0)
+        if interval <= 0 or not self._is_server_process():
+            return
+
+        from api.sentiment_backfill import start_backfill_thread
+        start_backfill_thread(interval)
+
+    @staticmethod
+    def _is_server_process() -> bool:
+        """
+        只在 Web 服务进程中启动后台线程，跳过爬虫子进程、migrate 等管理命令
+        以及 runserver 的自动重载父进程
+        """
+        if not sys.argv:
+            return False
+        program = os.path.basename(sys.argv[0])
+        if program in SERVER_PROGRAMS:
+            return True
+        if program != "manage.py" or len(sys.argv) < 2 or sys.argv[1] != "runserver":
+            return False
+        return "--noreload" in sys.argv or os.environ.get("RUN_MAIN") == "true"
@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+接口性能基准：合成数据生成 + 通过 Django 测试客户端压测列表/统计/AI 接口
+
+合成数据按线上分布生成（固定随机种子，可复现）：
+- 平台占比偏向 xhs / dy，敏感内容约 3%，约 2% 的记录尚未打分（sentiment_score 为空）
+- 发布时间集中在最近几周，长尾覆盖 180 天；互动数为长尾分布
+- 每条 monitor_feed 按 content_ratio 生成对应的平台内容表记录
+- 非 MySQL 数据库同时写入关键词检索倒排表 monitor_feed_token
+
+只应在独立的 SQLite 库上运行（mediacrawler_config/settings_benchmark.py），入口为
+python manage.py run_api_benchmark。
+"""
+
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import accumulate
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import AutoField, BigAutoField
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from api.feed_search import use_fulltext_index
+from api.interactions import PLATFORM_INTERACTION_SOURCES
+from api.rollup import rebuild_rollup
+from api.search_tokens import tokenize
+from media_platform.models import MonitorFeed, MonitorFeedRollup, MonitorFeedToken
+
+logger = logging.getLogger(__name__)
+
+PLATFORM_WEIGHTS = {
+    "xhs": 0.36,
+    "dy": 0.30,
+    "wb": 0.10,
+    "bili": 0.08,
+    "ks": 0.08,
+    "zhihu": 0.05,
+    "tieba": 0.03,
+}
+SENSITIVE_RATIO = 0.03
+UNSCORED_RATIO = 0.02
+SENTIMENT_WEIGHTS = {"neutral": 0.5, "positive": 0.3, "negative": 0.2}
+TIME_SPAN_DAYS = 180
+RECENT_DAYS = 14
+INSERT_BATCH_SIZE = 5000
+CONTENT_ID_BASE = 1_000_000_000
+
+VOCABULARY = [
+    "舆情", "热度", "用户", "讨论", "品牌", "口碑", "产品", "体验", "价格", "质量", "服务", "售后",
+    "物流", "客服", "新品", "发布", "活动", "优惠", "直播", "带货", "评测", "推荐", "种草", "避雷",
+    "官方", "回应", "投诉", "维权", "退款", "故障", "召回", "安全", "隐私", "数据", "政策", "监管",
+    "新能源", "汽车", "手机", "电池", "续航", "充电", "芯片", "系统", "更新", "拍照", "屏幕", "性能",
+    "餐饮", "外卖", "食品", "健康", "医疗", "教育", "旅游", "酒店", "门票", "演唱会", "电影", "综艺",
+    "明星", "粉丝", "话题", "热搜", "网友", "评论", "转发", "点赞", "视频", "笔记", "分享", "日常",
+]
+SOURCE_KEYWORDS = ["新能源汽车", "手机评测", "外卖食品安全", "演唱会门票", "品牌售后", "旅游酒店"]
+LOCATIONS = ["北京", "上海", "广东", "浙江", "江苏", "四川", "湖北", "山东", "福建", "河南", "海外"]
+SEARCH_KEYWORD = "售后"
+
+INTEGER_TYPES = {
+    "IntegerField", "BigIntegerField", "SmallIntegerField", "PositiveIntegerField",
+    "PositiveBigIntegerField", "PositiveSmallIntegerField",
+}
+
+
+# ============== 合成数据 ==============
+
+def _cumulative(weights: Dict[str, float]) -> Tuple[List[str], List[float]]:
+    return list(weights), list(accumulate(weights.values()))
+
+
+_PLATFORM_CHOICES = _cumulative(PLATFORM_WEIGHTS)
+_SENTIMENT_CHOICES = _cumulative(SENTIMENT_WEIGHTS)
+
+
+def _choose(rng: random.Random, choices: Tuple[List[str], List[float]]) -> str:
+    population, cum_weights = choices
+    return rng.choices(population, cum_weights=cum_weights)[0]
+
+
+def _created_at(rng: random.Random, now: int) -> int:
+    """大部分落在最近 RECENT_DAYS 天，长尾覆盖 TIME_SPAN_DAYS 天"""
+    age = rng.expovariate(1 / (RECENT_DAYS * 86400))
+    return now - int(min(age, TIME_SPAN_DAYS * 86400))
+
+
+def _count(rng: random.Random, scale: float) -> int:
+    return int(rng.paretovariate(1.3) * scale) - int(scale)
+
+
+def _sentiment(rng: random.Random):
+    """(sentiment, score, labels, is_sensitive)"""
+    if rng.random() < SENSITIVE_RATIO:
+        sentiment = "sensitive" if rng.random() < 0.5 else "negative"
+        return sentiment, round(rng.uniform(-1, -0.3), 3), {"sensitive": True}, True
+    sentiment = _choose(rng, _SENTIMENT_CHOICES)
+    low, high = {"positive": (0.2, 1), "negative": (-1, -0.2), "neutral": (-0.2, 0.2)}[sentiment]
+    score = None if rng.random() < UNSCORED_RATIO else round(rng.uniform(low, high), 3)
+    return sentiment, score, {}, False
+
+
+def synthetic_feed(rng: random.Random, row_id: int, now: int) -> dict:
+    """一条合成的 monitor_feed 记录（字段名同模型）"""
+    platform = _choose(rng, _PLATFORM_CHOICES)
+    content_id = str(CONTENT_ID_BASE + row_id)
+    words = rng.sample(VOCABULARY, rng.randint(6, 24))
+    sentiment, score, labels, is_sensitive = _sentiment(rng)
+    location = rng.choice(LOCATIONS) if rng.random() < 0.8 else None
+    created_at = _created_at(rng, now)
+    modified_ms = (created_at + rng.randint(0, 3600)) * 1000
+    return {
+        "id": row_id,
+        "add_ts": modified_ms,
+        "last_modify_ts": modified_ms,
+        "platform": platform,
+        "platform_name": platform,
+        "content_id": content_id,
+        "content": "，".join(words),
+        "author": f"用户{rng.randrange(200000)}",
+        "url": f"https://example.com/{platform}/{content_id}",
+        "created_at": created_at,
+        "source_keyword": rng.choice(SOURCE_KEYWORDS),
+        # 旧数据的 IP 属地只在 extra_data 中
+        "extra_data": {"ip_location": location} if location and rng.random() < 0.3 else None,
+        "sentiment": sentiment,
+        "sentiment_score": score,
+        "sentiment_labels": labels,
+        "is_sensitive": is_sensitive,
+        "flagged": is_sensitive or sentiment == "sensitive",
+        "liked_count": _count(rng, 50),
+        "comment_count": _count(rng, 10),
+        "share_count": _count(rng, 5),
+        "collected_count": _count(rng, 8),
+        "ip_location": location,
+        "_words": words,
+    }
+
+
+def _fallback_value(model_field):
+    if model_field.null:
+        return None
+    if model_field.has_default():
+        return model_field.get_default()
+    internal_type = model_field.get_internal_type()
+    if internal_type in INTEGER_TYPES:
+        return 0
+    if internal_type == "FloatField":
+        return 0.0
+    if internal_type == "BooleanField":
+        return False
+    if internal_type == "JSONField":
+        return {}
+    return ""
+
+
+def _content_producers(platform: str, config: dict, url_field: Optional[str]) -> Dict[str, Callable[[dict], object]]:
+    """平台内容表各字段 -> 由 monitor_feed 合成记录生成字段值的函数"""
+    model = config["model"]
+    content_fields = config.get("content_fields", [])
+    interaction_fields = {
+        source: feed_field for feed_field, source in PLATFORM_INTERACTION_SOURCES.get(platform, {}).items()
+    }
+    producers = {}
+    for model_field in model._meta.concrete_fields:
+        if isinstance(model_field, (AutoField, BigAutoField)):
+            continue
+        name = model_field.name
+        internal_type = model_field.get_internal_type()
+        is_integer = internal_type in INTEGER_TYPES
+        if name == config.get("id_field"):
+            producers[name] = (lambda r: int(r["content_id"])) if is_integer else (lambda r: r["content_id"])
+        elif name == config.get("time_field"):
+            producers[name] = (lambda r: r["created_at"]) if is_integer else (
+                lambda r: datetime.fromtimestamp(r["created_at"]).strftime("%Y-%m-%d %H:%M:%S")
+            )
+        elif name in content_fields:
+            # 第一个内容字段作为标题（截断），其余字段放正文
+            if name == content_fields[0] and len(content_fields) > 1:
+                producers[name] = lambda r: r["content"][:20]
+            else:
+                producers[name] = lambda r: r["content"]
+        elif name == config.get("author_field"):
+            producers[name] = lambda r: r["author"]
+        elif name == url_field:
+            producers[name] = lambda r: r["url"]
+        elif name in interaction_fields:
+            feed_field = interaction_fields[name]
+            producers[name] = (lambda r, f=feed_field: r[f]) if is_integer else (lambda r, f=feed_field: str(r[f]))
+        elif name == "ip_location":
+            producers[name] = lambda r: r["ip_location"] or ""
+        elif name in ("add_ts", "last_modify_ts", "source_keyword", "sentiment", "is_sensitive"):
+            producers[name] = lambda r, f=name: r[f]
+        else:
+            producers[name] = lambda r, value=_fallback_value(model_field): value
+    return producers
+
+
+def _db_value(model_field, value):
+    if value is not None and model_field.get_internal_type() == "JSONField":
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+class _BatchInserter:
+    """按批 executemany 写入一张表（绕过 ORM 对象构造，生成百万行时快一个数量级）"""
+
+    def __init__(self, model, field_names: List[str]):
+        self.model = model
+        self.fields = [model._meta.get_field(name) for name in field_names]
+        quote = connection.ops.quote_name
+        self.sql = "INSERT INTO {} ({}) VALUES ({})".format(
+            quote(model._meta.db_table),
+            ", ".join(quote(f.column) for f in self.fields),
+            ", ".join(["%s"] * len(self.fields)),
+        )
+        self.rows = []
+        self.count = 0
+
+    def add(self, values: dict) -> None:
+        self.rows.append([_db_value(f, values[f.name]) for f in self.fields])
+        if len(self.rows) >= INSERT_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(self.sql, self.rows)
+        self.count += len(self.rows)
+        self.rows = []
+
+
+def platform_models() -> Dict[str, dict]:
+    from api.views import PLATFORM_FEED_CONFIG
+
+    return PLATFORM_FEED_CONFIG
+
+
+def clear_dataset() -> None:
+    """删除 monitor_feed、倒排表、汇总表和平台内容表中的全部数据"""
+    models = [MonitorFeedToken, MonitorFeedRollup, MonitorFeed]
+    models += [config["model"] for config in platform_models().values()]
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for model in models:
+            cursor.execute(f"DELETE FROM {quote(model._meta.db_table)}")
+
+
+def generate_dataset(rows: int, seed: int = 42, content_ratio: float = 1.0, search_index: bool = True,
+                     progress: Optional[Callable[[int], None]] = None) -> Dict[str, int]:
+    """
+    生成合成数据（调用方应先确认目标库为空或已 clear_dataset）
+
+    Args:
+        rows: monitor_feed 行数
+        seed: 随机种子，相同参数生成相同数据
+        content_ratio: 同时生成平台内容表记录的比例
+        search_index: 非 MySQL 数据库是否写入 monitor_feed_token 倒排表
+        progress: 每写入一批后回调已生成的行数
+
+    Returns:
+        各表写入的行数
+    """
+    from api.views import PLATFORM_URL_FIELDS
+
+    rng = random.Random(seed)
+    now = int(time.time())
+    feeds = _BatchInserter(MonitorFeed, [f.name for f in MonitorFeed._meta.concrete_fields])
+    tokens = _BatchInserter(MonitorFeedToken, ["token", "feed"])
+    contents = {}
+    producers = {}
+    for platform, config in platform_models().items():
+        producers[platform] = _content_producers(platform, config, PLATFORM_URL_FIELDS.get(platform))
+        contents[platform] = _BatchInserter(config["model"], list(producers[platform]))
+    index_tokens = search_index and not use_fulltext_index()
+    word_tokens = {word: tokenize(word) for word in VOCABULARY} if index_tokens else {}
+
+    with transaction.atomic():
+        for row_id in range(1, rows + 1):
+            feed = synthetic_feed(rng, row_id, now)
+            feeds.add(feed)
+            if index_tokens:
+                feed_tokens = dict.fromkeys(
+                    token for word in feed["_words"] for token in word_tokens[word]
+                )
+                for token in feed_tokens:
+                    tokens.add({"token": token, "feed": row_id})
+            if rng.random() < content_ratio:
+                contents[feed["platform"]].add(
+                    {name: produce(feed) for name, produce in producers[feed["platform"]].items()}
+                )
+            if progress and row_id % (INSERT_BATCH_SIZE * 20) == 0:
+                progress(row_id)
+        for inserter in [feeds, tokens, *contents.values()]:
+            inserter.flush()
+
+    rollup_rows = rebuild_rollup()
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+    counts = {"monitor_feed": feeds.count, "monitor_feed_token": tokens.count, "monitor_feed_rollup": rollup_rows}
+    for platform, inserter in contents.items():
+        counts[inserter.model._meta.db_table] = inserter.count
+    return counts
+
+
+# ============== 压测 ==============
+
+@dataclass
+class Scenario:
+    name: str
+    path: str
+    params: Dict[str, object] = field(default_factory=dict)
+    method: str = "GET"
+    body: Optional[dict] = None
+
+
+DEFAULT_SCENARIOS = [
+    Scenario("monitor_feed", "/api/monitor/feed", {"page_size": 50}),
+    Scenario("monitor_feed_cursor", "/api/monitor/feed", {"pagination": "cursor", "page_size": 50}),
+    Scenario("all_feed", "/api/monitor/feed/all", {"page_size": 50}),
+    Scenario("all_feed_deep_page", "/api/monitor/feed/all", {"page": 500, "page_size": 50}),
+    Scenario("all_feed_xhs", "/api/monitor/feed/all", {"platform": "xhs", "page_size": 50}),
+    Scenario("all_feed_sort_sensitive", "/api/monitor/feed/all", {"sort_by": "sensitive", "page_size": 50}),
+    Scenario("all_feed_fields", "/api/monitor/feed/all",
+             {"fields": "id,platform,created_at,sentiment", "page_size": 50}),
+    Scenario("all_feed_search", "/api/monitor/feed/all", {"q": SEARCH_KEYWORD, "page_size": 50}),
+    Scenario("sensitive_feed", "/api/monitor/feed/sensitive", {"page_size": 50}),
+    Scenario("sensitive_feed_dy", "/api/monitor/feed/sensitive", {"platform": "dy", "page_size": 50}),
+    Scenario("data_stats", "/api/data/stats"),
+    Scenario("ai_analysis", "/api/ai/analysis", method="POST",
+             body={"keyword": SEARCH_KEYWORD, "platform": "all", "time_range": "7"}),
+]
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def _request(client: Client, scenario: Scenario):
+    if scenario.method == "POST":
+        return client.post(scenario.path, data=json.dumps(scenario.body or {}), content_type="application/json")
+    return client.get(scenario.path, scenario.params)
+
+
+def run_scenario(client: Client, scenario: Scenario, iterations: int, cold: bool = True) -> dict:
+    """
+    连续请求 iterations 次（先预热一次，不计入）
+
+    Args:
+        cold: 每次请求前清空缓存，测量未命中响应缓存/计数缓存/AI 结果缓存时的开销
+
+    Returns:
+        延迟分位数（毫秒）、平均/最大查询数和状态码分布
+    """
+    _request(client, scenario)
+    latencies, query_counts, statuses = [], [], {}
+    for _ in range(iterations):
+        if cold:
+            cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = _request(client, scenario)
+            latencies.append((time.perf_counter() - started) * 1000)
+        query_counts.append(len(queries))
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    return {
+        "name": scenario.name,
+        "method": scenario.method,
+        "path": scenario.path,
+        "params": scenario.params or scenario.body or {},
+        "requests": iterations,
+        "p50_ms": round(_percentile(latencies, 0.5), 2),
+        "p95_ms": round(_percentile(latencies, 0.95), 2),
+        "max_ms": round(max(latencies, default=0), 2),
+        "avg_queries": round(sum(query_counts) / max(len(query_counts), 1), 1),
+        "max_queries": max(query_counts, default=0),
+        "statuses": statuses,
+    }
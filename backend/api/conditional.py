@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+轮询接口的条件请求（ETag / Last-Modified -> 304）
+
+ETag 由 接口名 + 查询参数 + 数据版本号 + 数据水位（monitor_feed 最大 last_modify_ts）构成，
+校验只需读取缓存，命中时直接返回 304，不执行分页查询和序列化。
+
+用法（放在 @api_view 之上）:
+    @feed_condition("all_feed")
+    @api_view(['GET'])
+    ...
+"""
+
+import hashlib
+from functools import wraps
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+from django.db.models.functions import Coalesce
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from api.feed_cache import build_cache_key, get_data_version
+from api.file_catalog import catalog_signature
+from media_platform.models import MonitorFeed
+
+WATERMARK_KEY = "monitor_feed:watermark:{platform}:{version}"
+
+
+def feed_watermark(platform: Optional[str] = None) -> int:
+    """
+    monitor_feed 的数据水位：最大 last_modify_ts/add_ts（毫秒）
+
+    结果按数据版本号缓存，写入路径递增版本号后重新计算；本地内存缓存下最多延迟 API_CACHE_TIMEOUT 秒。
+    """
+    version = get_data_version(platform)
+    key = WATERMARK_KEY.format(platform=platform or "all", version=version)
+    watermark = cache.get(key)
+    if watermark is None:
+        queryset = MonitorFeed.objects.all()
+        if platform:
+            queryset = queryset.filter(platform=platform)
+        watermark = queryset.aggregate(
+            max_ts=models.Max(Coalesce("last_modify_ts", "add_ts", 0))
+        ).get("max_ts") or 0
+        cache.set(key, int(watermark), getattr(settings, "API_CACHE_TIMEOUT", 15))
+    return int(watermark)
+
+
+def _conditional(etag_func, last_modified_func):
+    """
+    django condition 装饰器 + Cache-Control: no-cache
+
+    no-cache 让浏览器每次都带 If-None-Match 回源校验，避免按 Last-Modified 启发式缓存旧数据
+    """
+    conditional = condition(etag_func=etag_func, last_modified_func=last_modified_func)
+
+    def decorator(view_func):
+        conditional_view = conditional(view_func)
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            patch_cache_control(response, no_cache=True)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _millis_to_datetime(value: int) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromtimestamp(value / 1000, tz=dt_timezone.utc)
+
+
+def feed_condition(view_name: str):
+    """monitor_feed 列表/统计接口的条件请求装饰器"""
+
+    def etag_func(request, *args, **kwargs):
+        platform = request.GET.get("platform")
+        version = get_data_version(platform)
+        watermark = feed_watermark(platform)
+        raw = f"{build_cache_key(view_name, request.GET, version)}:{watermark}"
+        return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+    def last_modified_func(request, *args, **kwargs):
+        return _millis_to_datetime(feed_watermark(request.GET.get("platform")))
+
+    return _conditional(etag_func, last_modified_func)
+
+
+def data_stats_condition(data_dir: Path):
+    """get_data_stats 的条件请求装饰器：数据目录签名 + monitor_feed 数据版本/水位"""
+
+    def signature_for(request) -> tuple:
+        # etag_func 与 last_modified_func 在同一请求内共用一次目录查询
+        if not hasattr(request, "_data_dir_signature"):
+            request._data_dir_signature = catalog_signature(data_dir)
+        return request._data_dir_signature
+
+    def etag_func(request, *args, **kwargs):
+        raw = f"{signature_for(request)}:{get_data_version()}:{feed_watermark()}"
+        return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+    def last_modified_func(request, *args, **kwargs):
+        _count, _size, latest_mtime = signature_for(request)
+        latest = max(int(latest_mtime * 1000), feed_watermark())
+        return _millis_to_datetime(latest)
+
+    return _conditional(etag_func, last_modified_func)
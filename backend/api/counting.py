@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+列表接口的总数统计策略
+
+InnoDB 上对数百万行做精确 COUNT(*) 往往比分页查询本身还慢，这里按结果集大小选择统计方式：
+
+1. 先做有上限的计数（SELECT COUNT(*) FROM (... LIMIT n+1)），最多扫描 COUNT_EXACT_THRESHOLD + 1 行，
+   结果集不超过阈值时就是精确值
+2. 超过阈值时使用优化器估算：无过滤条件取 information_schema.TABLES.TABLE_ROWS，
+   否则取 EXPLAIN 的 rows × filtered（PostgreSQL 取 EXPLAIN 的 Plan Rows）
+3. 无法估算或估算值明显不可信（小于已确认的行数，例如全文检索）时退回精确 COUNT(*)
+
+结果按 查询 SQL + 平台数据版本号 缓存 COUNT_CACHE_TIMEOUT 秒，响应中以 total_is_estimate
+标明总数是否为估算值。
+"""
+
+import hashlib
+import json
+import logging
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+
+from api.feed_cache import get_data_version
+
+logger = logging.getLogger(__name__)
+
+COUNT_KEY = "count:{label}:{version}:{digest}"
+
+
+def _threshold() -> int:
+    return int(getattr(settings, "COUNT_EXACT_THRESHOLD", 10000))
+
+
+def _query_digest(queryset) -> str:
+    sql, params = queryset.query.sql_with_params()
+    return hashlib.md5(repr((sql, params)).encode("utf-8")).hexdigest()
+
+
+def _mysql_estimate(queryset, connection) -> Optional[int]:
+    if not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row and row[0] is not None else None
+
+    sql, params = queryset.values("pk").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN {sql}", params)
+        columns = [col[0].lower() for col in cursor.description]
+        row = cursor.fetchone()
+    if not row:
+        return None
+    plan = dict(zip(columns, row))
+    rows = plan.get("rows")
+    if rows is None:
+        return None
+    filtered = plan.get("filtered")
+    return int(float(rows) * (float(filtered) / 100 if filtered is not None else 1))
+
+
+def _postgresql_estimate(queryset, connection) -> Optional[int]:
+    sql, params = queryset.values("pk").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimate_count(queryset) -> Optional[int]:
+    """优化器估算的行数，数据库不支持或出错时返回 None"""
+    connection = connections[queryset.db]
+    queryset = queryset.order_by()
+    try:
+        if connection.vendor == "mysql":
+            return _mysql_estimate(queryset, connection)
+        if connection.vendor == "postgresql":
+            return _postgresql_estimate(queryset, connection)
+    except EmptyResultSet:
+        return 0
+    except Exception as e:
+        logger.warning(f"Failed to estimate row count: {e}")
+    return None
+
+
+def count_rows(queryset, label: str, platform: Optional[str] = None) -> Tuple[int, bool]:
+    """
+    统计 queryset 的行数
+
+    Args:
+        queryset: 待统计的查询集（排序会被忽略）
+        label: 缓存键前缀（接口名）
+        platform: 数据版本号所属平台，数据写入后缓存随版本号失效
+
+    Returns:
+        (总数, total_is_estimate)
+    """
+    queryset = queryset.order_by()
+    try:
+        digest = _query_digest(queryset)
+    except EmptyResultSet:
+        return 0, False
+    key = COUNT_KEY.format(label=label, version=get_data_version(platform), digest=digest)
+    try:
+        cached = cache.get(key)
+    except Exception:
+        cached = None
+    if cached is not None:
+        return int(cached[0]), bool(cached[1])
+
+    threshold = _threshold()
+    bounded = queryset[:threshold + 1].count()
+    if bounded <= threshold:
+        result = (bounded, False)
+    else:
+        estimate = estimate_count(queryset)
+        if estimate is not None and estimate > threshold:
+            result = (estimate, True)
+        else:
+            result = (queryset.count(), False)
+
+    try:
+        cache.set(key, result, int(getattr(settings, "COUNT_CACHE_TIMEOUT", 60)))
+    except Exception as e:
+        logger.warning(f"Failed to cache {label} count: {e}")
+    return result
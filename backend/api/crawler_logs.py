@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+爬虫子进程日志：带序号的内存缓冲 + 按运行持久化
+
+- 每行日志有进程内单调递增的序号 seq，客户端用 since=<seq> 只取新日志，或通过 SSE 订阅
+- 内存中保留最近 CRAWLER_LOG_BUFFER_SIZE 行，供轮询和 SSE 使用
+- 每次启动爬虫（单平台或批量）为一次运行，日志同时追加写入
+  CRAWLER_LOG_DIR/<run_id>.jsonl，超出内存缓冲的历史日志从文件分页读取
+"""
+
+import asyncio
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+LOG_BUFFER_SIZE = 2000
+LOG_PAGE_LIMIT = 1000
+KEEP_RUNS = 50
+STREAM_HEARTBEAT_SECONDS = 15
+STREAM_MAX_SECONDS = 300
+STREAM_RETRY_MILLIS = 3000
+ASYNC_POLL_SECONDS = 0.5
+
+RUN_ID_PATTERN = re.compile(r"^[\w\-]+$")
+
+
+def log_dir() -> Path:
+    return Path(getattr(settings, "CRAWLER_LOG_DIR", settings.BASE_DIR / "logs" / "crawler"))
+
+
+class CrawlerLogBuffer:
+    """线程安全的日志缓冲，append 时唤醒等待中的 SSE 连接"""
+
+    def __init__(self, maxlen: int = LOG_BUFFER_SIZE):
+        self._lines = deque(maxlen=maxlen)
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._run_id: Optional[str] = None
+        self._run_file = None
+
+    @property
+    def run_id(self) -> Optional[str]:
+        with self._cond:
+            return self._run_id
+
+    @property
+    def latest_seq(self) -> int:
+        with self._cond:
+            return self._seq
+
+    def start_run(self, label: str = "") -> str:
+        """开始一次运行，之后的日志写入该运行的日志文件"""
+        suffix = re.sub(r"[^\w\-]+", "-", label).strip("-")
+        run_id = datetime.now().strftime("%Y%m%d-%H%M%S") + (f"-{suffix}" if suffix else "")
+        directory = log_dir()
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            run_file = open(directory / f"{run_id}.jsonl", "a", encoding="utf-8", buffering=1)
+        except OSError as e:
+            logger.warning(f"Failed to open crawler log file for run {run_id}: {e}")
+            run_file = None
+        with self._cond:
+            self._close_run_file()
+            self._run_id = run_id
+            self._run_file = run_file
+        _prune_runs(directory)
+        return run_id
+
+    def end_run(self) -> None:
+        with self._cond:
+            self._close_run_file()
+
+    def _close_run_file(self) -> None:
+        if self._run_file is not None:
+            try:
+                self._run_file.close()
+            except OSError:
+                pass
+            self._run_file = None
+
+    def append(self, level: str, message: str) -> dict:
+        with self._cond:
+            self._seq += 1
+            entry = {
+                "seq": self._seq,
+                "level": level,
+                "message": message,
+                "timestamp": time.time(),
+            }
+            self._lines.append(entry)
+            if self._run_file is not None:
+                try:
+                    self._run_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                except OSError as e:
+                    logger.warning(f"Failed to persist crawler log line: {e}")
+                    self._close_run_file()
+            self._cond.notify_all()
+        return entry
+
+    def tail(self, limit: int) -> List[dict]:
+        with self._cond:
+            lines = list(self._lines)
+        return lines[-limit:] if limit > 0 else lines
+
+    def since(self, seq: int, limit: int) -> Tuple[List[dict], bool]:
+        """
+        seq 之后的最多 limit 行
+
+        Returns:
+            (日志行, truncated)；truncated 表示 seq 之后的部分日志已移出内存缓冲
+        """
+        with self._cond:
+            oldest = self._lines[0]["seq"] if self._lines else self._seq + 1
+            truncated = seq + 1 < oldest
+            if seq > self._seq:
+                # 客户端的序号来自重启前的进程，从头返回
+                seq, truncated = oldest - 1, True
+            # 序号连续，按偏移定位
+            start = max(seq + 1 - oldest, 0)
+            lines = [self._lines[i] for i in range(start, min(start + limit, len(self._lines)))]
+        return lines, truncated
+
+    def wait(self, seq: int, timeout: float) -> bool:
+        """阻塞直到有序号大于 seq 的日志或超时"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._seq > seq, timeout)
+
+
+def _prune_runs(directory: Path) -> None:
+    keep = int(getattr(settings, "CRAWLER_LOG_KEEP_RUNS", KEEP_RUNS))
+    try:
+        files = sorted(directory.glob("*.jsonl"), key=lambda p: p.stat().st_mtime, reverse=True)
+    except OSError:
+        return
+    for path in files[keep:]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def list_runs() -> List[Dict]:
+    """持久化的运行列表，按时间倒序"""
+    directory = log_dir()
+    if not directory.exists():
+        return []
+    runs = []
+    for path in directory.glob("*.jsonl"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        runs.append({"run_id": path.stem, "size": stat.st_size, "modified_at": stat.st_mtime})
+    runs.sort(key=lambda run: run["modified_at"], reverse=True)
+    return runs
+
+
+def read_run(run_id: str, since: int = 0, limit: int = LOG_PAGE_LIMIT) -> Optional[Tuple[List[dict], bool]]:
+    """
+    分页读取某次运行的日志文件
+
+    Returns:
+        (seq 之后的最多 limit 行, has_more)；运行不存在时返回 None
+    """
+    if not RUN_ID_PATTERN.match(run_id or ""):
+        return None
+    path = log_dir() / f"{run_id}.jsonl"
+    if not path.is_file():
+        return None
+    lines = []
+    with open(path, "r", encoding="utf-8") as f:
+        for raw in f:
+            try:
+                entry = json.loads(raw)
+            except ValueError:
+                continue
+            if entry.get("seq", 0) <= since:
+                continue
+            if len(lines) >= limit:
+                return lines, True
+            lines.append(entry)
+    return lines, False
+
+
+def format_event(entry: dict) -> str:
+    return f"id: {entry['seq']}\nevent: log\ndata: {json.dumps(entry, ensure_ascii=False)}\n\n"
+
+
+def stream_logs(buffer: CrawlerLogBuffer, since: Optional[int]) -> Iterator[str]:
+    """SSE 日志流：先补发 since 之后仍在内存中的日志，再推送新日志"""
+    yield f"retry: {STREAM_RETRY_MILLIS}\n\n"
+    seq = buffer.latest_seq if since is None else since
+    deadline = time.monotonic() + STREAM_MAX_SECONDS
+    while time.monotonic() < deadline:
+        lines, truncated = buffer.since(seq, LOG_PAGE_LIMIT)
+        if truncated:
+            yield "event: reset\ndata: {}\n\n"
+        for entry in lines:
+            yield format_event(entry)
+            seq = entry["seq"]
+        if lines:
+            continue
+        if not buffer.wait(seq, STREAM_HEARTBEAT_SECONDS):
+            yield ": ping\n\n"
+
+
+async def astream_logs(buffer: CrawlerLogBuffer, since: Optional[int]) -> AsyncIterator[str]:
+    """stream_logs 的异步版本（ASGI），按 ASYNC_POLL_SECONDS 检查内存缓冲"""
+    yield f"retry: {STREAM_RETRY_MILLIS}\n\n"
+    seq = buffer.latest_seq if since is None else since
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + STREAM_MAX_SECONDS
+    last_sent = loop.time()
+    while loop.time() < deadline:
+        lines, truncated = buffer.since(seq, LOG_PAGE_LIMIT)
+        if truncated:
+            yield "event: reset\ndata: {}\n\n"
+        for entry in lines:
+            yield format_event(entry)
+            seq = entry["seq"]
+        if lines:
+            last_sent = loop.time()
+            continue
+        if loop.time() - last_sent >= STREAM_HEARTBEAT_SECONDS:
+            yield ": ping\n\n"
+            last_sent = loop.time()
+        await asyncio.sleep(ASYNC_POLL_SECONDS)
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+monitor_feed 及各平台内容/评论表的流式导出（NDJSON / CSV）
+
+按主键分批（id > 上一批最大 id ORDER BY id LIMIT n）读取并逐行写出，内存占用与导出行数无关。
+MySQL 驱动不支持服务端游标，单纯的 QuerySet.iterator() 仍会把整个结果集读入内存，
+因此这里用主键分批，每批内部再用 iterator(chunk_size) 迭代。
+ASGI 部署下使用异步 ORM 逐批读取（async for），生成响应内容时不占用线程。
+"""
+
+import csv
+import json
+from datetime import datetime
+from typing import AsyncIterator, Iterator, List, Optional
+
+from django.apps import apps
+from django.db import models
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from api.feed_search import search_feed
+from api.interactions import PLATFORM_CONTENT_MODELS
+from api.time_buckets import MILLIS_THRESHOLD
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+EXPORT_SOURCES = ("monitor_feed", "contents", "comments")
+
+# 平台 -> 评论表模型名
+PLATFORM_COMMENT_MODELS = {
+    "xhs": "XhsNoteComment",
+    "dy": "DouyinAwemeComment",
+    "ks": "KuaishouVideoComment",
+    "bili": "BilibiliVideoComment",
+    "wb": "WeiboNoteComment",
+    "tieba": "TiebaComment",
+    "zhihu": "ZhihuComment",
+}
+
+# 导出时间范围使用的时间字段，整数时间戳字段之外（字符串时间）退回到入库时间 add_ts
+TIME_FIELD_CANDIDATES = ("created_at", "time", "create_time", "publish_time", "created_time")
+TEXT_FIELD_CANDIDATES = ("content", "title", "desc", "content_text", "source_keyword")
+
+
+class ExportError(ValueError):
+    """导出参数错误"""
+
+
+def resolve_model(source: str, platform: Optional[str]):
+    """根据数据源和平台返回要导出的模型"""
+    if source == "monitor_feed":
+        return apps.get_model("media_platform", "MonitorFeed")
+    if source not in EXPORT_SOURCES:
+        raise ExportError(f"source 仅支持 {' / '.join(EXPORT_SOURCES)}")
+    if not platform:
+        raise ExportError("导出平台内容/评论表时必须指定 platform")
+    mapping = PLATFORM_COMMENT_MODELS if source == "comments" else {
+        code: model_name for code, (model_name, _id_field) in PLATFORM_CONTENT_MODELS.items()
+    }
+    if platform not in mapping:
+        raise ExportError(f"不支持的平台: {platform}")
+    return apps.get_model("media_platform", mapping[platform])
+
+
+def parse_time_param(value: Optional[str]) -> Optional[int]:
+    """
+    解析时间参数为秒级时间戳
+
+    支持秒/毫秒时间戳、"2025-01-01" 和 ISO 日期时间，无时区时按 TIME_ZONE 处理
+    """
+    if value in (None, ""):
+        return None
+    text = str(value).strip()
+    if text.isdigit():
+        ts = int(text)
+        return ts // 1000 if ts > MILLIS_THRESHOLD else ts
+    try:
+        parsed = parse_datetime(text)
+        day = parse_date(text) if parsed is None else None
+    except ValueError:
+        parsed = day = None
+    if parsed is None:
+        if day is None:
+            raise ExportError(f"无法解析的时间: {value}")
+        parsed = datetime(day.year, day.month, day.day)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return int(parsed.timestamp())
+
+
+def _field_names(model) -> List[str]:
+    return [field.name for field in model._meta.concrete_fields]
+
+
+def _time_field(model) -> Optional[str]:
+    for name in TIME_FIELD_CANDIDATES:
+        try:
+            field = model._meta.get_field(name)
+        except Exception:
+            continue
+        if isinstance(field, models.IntegerField):
+            return name
+    return "add_ts"
+
+
+def _epoch_range_filter(field: str, start: Optional[int], end: Optional[int]) -> models.Q:
+    """
+    秒/毫秒混存字段的时间范围过滤
+
+    拆成秒级和毫秒级两个区间再 OR，两个区间都可以走 field 上的索引。
+    """
+    seconds = models.Q(**{f"{field}__lt": MILLIS_THRESHOLD})
+    millis = models.Q(**{f"{field}__gte": MILLIS_THRESHOLD})
+    if start is not None:
+        seconds &= models.Q(**{f"{field}__gte": start})
+        millis &= models.Q(**{f"{field}__gte": start * 1000})
+    if end is not None:
+        seconds &= models.Q(**{f"{field}__lt": end})
+        millis &= models.Q(**{f"{field}__lt": end * 1000})
+    return seconds | millis
+
+
+def build_queryset(model, platform: Optional[str] = None, start: Optional[int] = None,
+                   end: Optional[int] = None, keyword: Optional[str] = None, sensitive: bool = False):
+    """
+    按平台/时间范围（秒）/关键词/敏感标记过滤导出查询集
+    """
+    field_names = set(_field_names(model))
+    queryset = model.objects.all()
+
+    if platform and "platform" in field_names:
+        queryset = queryset.filter(platform=platform)
+
+    if start is not None or end is not None:
+        time_field = _time_field(model)
+        if time_field == "add_ts":
+            # add_ts 固定为毫秒
+            if start is not None:
+                queryset = queryset.filter(add_ts__gte=start * 1000)
+            if end is not None:
+                queryset = queryset.filter(add_ts__lt=end * 1000)
+        else:
+            queryset = queryset.filter(_epoch_range_filter(time_field, start, end))
+
+    if keyword:
+        if model._meta.model_name == "monitorfeed":
+            queryset = search_feed(queryset, keyword)
+        else:
+            text_fields = [name for name in TEXT_FIELD_CANDIDATES if name in field_names]
+            condition = models.Q()
+            for name in text_fields:
+                condition |= models.Q(**{f"{name}__icontains": keyword})
+            queryset = queryset.filter(condition)
+
+    if sensitive:
+        if "is_sensitive" not in field_names:
+            raise ExportError("该数据源没有敏感标记，不支持 sensitive 过滤")
+        if "flagged" in field_names:
+            queryset = queryset.filter(flagged=True)
+        else:
+            queryset = queryset.filter(models.Q(is_sensitive=True) | models.Q(sentiment="sensitive"))
+
+    return queryset
+
+
+def iter_rows(queryset, fields: List[str], chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[dict]:
+    """按主键分批读取，内存中最多保留一批数据"""
+    last_id = None
+    while True:
+        batch = queryset.order_by("id")
+        if last_id is not None:
+            batch = batch.filter(id__gt=last_id)
+        count = 0
+        for row in batch.values(*fields)[:chunk_size].iterator(chunk_size=chunk_size):
+            count += 1
+            last_id = row["id"]
+            yield row
+        if count < chunk_size:
+            return
+
+
+async def aiter_rows(queryset, fields: List[str], chunk_size: int = EXPORT_CHUNK_SIZE) -> AsyncIterator[dict]:
+    """iter_rows 的异步 ORM 版本"""
+    last_id = None
+    while True:
+        batch = queryset.order_by("id")
+        if last_id is not None:
+            batch = batch.filter(id__gt=last_id)
+        count = 0
+        async for row in batch.values(*fields)[:chunk_size]:
+            count += 1
+            last_id = row["id"]
+            yield row
+        if count < chunk_size:
+            return
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class _Echo:
+    """csv.writer 的伪文件对象，write 直接返回写入内容"""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _ndjson_line(row: dict) -> str:
+    return json.dumps(row, ensure_ascii=False, default=_json_default) + "\n"
+
+
+def _iter_content(rows: Iterator[dict], export_format: str, fields: List[str]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    if export_format == "csv":
+        # BOM 让 Excel 正确识别 UTF-8 中文
+        yield "\ufeff" + writer.writerow(fields)
+    for row in rows:
+        if export_format == "csv":
+            yield writer.writerow([_csv_value(row.get(field)) for field in fields])
+        else:
+            yield _ndjson_line(row)
+
+
+async def _aiter_content(rows: AsyncIterator[dict], export_format: str, fields: List[str]) -> AsyncIterator[str]:
+    writer = csv.writer(_Echo())
+    if export_format == "csv":
+        yield "\ufeff" + writer.writerow(fields)
+    async for row in rows:
+        if export_format == "csv":
+            yield writer.writerow([_csv_value(row.get(field)) for field in fields])
+        else:
+            yield _ndjson_line(row)
+
+
+def export_response(queryset, export_format: str, filename: str,
+                    asynchronous: bool = False) -> StreamingHttpResponse:
+    """
+    把查询集以 NDJSON/CSV 流式写出为下载响应
+
+    Args:
+        asynchronous: ASGI 请求传 True，使用异步迭代器生成内容
+            （Django 在 ASGI 下会把同步迭代器整体读入内存后再发送）
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ExportError(f"format 仅支持 {' / '.join(EXPORT_FORMATS)}")
+    fields = _field_names(queryset.model)
+    if asynchronous:
+        content = _aiter_content(aiter_rows(queryset, fields), export_format, fields)
+    else:
+        content = _iter_content(iter_rows(queryset, fields), export_format, fields)
+
+    response = StreamingHttpResponse(content, content_type=EXPORT_FORMATS[export_format])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{export_format}"'
+    response["X-Accel-Buffering"] = "no"
+    return response
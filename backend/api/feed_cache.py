@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+监控数据接口的响应缓存
+
+缓存键 = 接口名 + 查询参数 + 平台数据版本号。monitor_feed 的写入路径在写入后调用
+bump_data_version() 使版本号递增，旧缓存自然失效；数据不变时，任意多个轮询中的仪表盘
+只会在第一次请求时查询数据库。
+
+爬虫子进程不初始化 Django，通过 api/feed_version.py 直接递增 Redis 中的同一个版本号。
+未配置 Redis 时使用本地内存缓存，此时爬虫进程无法通知 Web 进程，依靠较短的
+API_CACHE_TIMEOUT 控制数据延迟。
+"""
+
+import hashlib
+import logging
+import time
+from functools import wraps
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from api.feed_version import version_key, version_keys
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_KEY = "monitor_feed:response:{view}:{version}:{params}"
+
+
+def get_data_version(platform: Optional[str] = None) -> int:
+    """获取平台数据版本号，platform 为空时返回全平台版本号"""
+    key = version_key(platform)
+    try:
+        version = cache.get(key)
+        if version is None:
+            # 以当前毫秒时间初始化，缓存被清空后不会与旧版本号重复
+            cache.add(key, int(time.time() * 1000), timeout=None)
+            version = cache.get(key)
+        return int(version or 0)
+    except Exception as e:
+        logger.warning(f"Failed to read monitor_feed data version: {e}")
+        return 0
+
+
+def bump_data_version(*platforms: str) -> None:
+    """monitor_feed 数据变更后调用，使对应平台和全平台的缓存失效"""
+    for key in version_keys(platforms):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # 版本号尚未初始化
+            cache.set(key, int(time.time() * 1000), timeout=None)
+        except Exception as e:
+            logger.warning(f"Failed to bump monitor_feed data version {key}: {e}")
+
+
+def build_cache_key(view_name: str, query_params, version: int) -> str:
+    """由接口名、排序后的查询参数和数据版本号构造缓存键"""
+    items = sorted((key, tuple(query_params.getlist(key))) for key in query_params.keys())
+    digest = hashlib.md5(repr(items).encode("utf-8")).hexdigest()
+    return RESPONSE_KEY.format(view=view_name, version=version, params=digest)
+
+
+def cache_feed_response(view_name: str, timeout: Optional[int] = None):
+    """
+    缓存 DRF 函数视图的 GET 响应数据
+
+    用法（放在 @api_view / @permission_classes 之下）:
+        @api_view(['GET'])
+        @permission_classes([AllowAny])
+        @cache_feed_response("all_feed")
+        def get_all_feed(request): ...
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method != "GET":
+                return view_func(request, *args, **kwargs)
+
+            version = get_data_version(request.GET.get("platform"))
+            key = build_cache_key(view_name, request.GET, version)
+            try:
+                cached = cache.get(key)
+            except Exception:
+                cached = None
+            if cached is not None:
+                return Response(cached)
+
+            response = view_func(request, *args, **kwargs)
+            if isinstance(response, Response) and response.status_code == 200:
+                try:
+                    cache.set(key, response.data, timeout if timeout is not None else getattr(settings, "API_CACHE_TIMEOUT", 15))
+                except Exception as e:
+                    logger.warning(f"Failed to cache {view_name} response: {e}")
+            return response
+
+        return wrapper
+
+    return decorator
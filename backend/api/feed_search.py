@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+monitor_feed 关键词检索
+
+- MySQL: content/source_keyword 上的 FULLTEXT 索引（ngram 分词器，支持中文），
+  使用 MATCH ... AGAINST 布尔模式做短语匹配
+- 其他数据库（SQLite/Postgres）: monitor_feed_token 倒排表，由 jieba 分词后在同步写入时维护
+  （分词规则见 api/search_tokens.py，爬虫的 SQLAlchemy 写入路径同样维护该表）
+
+关键词过短（短于 ngram 词长或分不出词）时回退到 LIKE '%kw%'。
+"""
+
+import logging
+import re
+from typing import Iterable, List, Optional
+
+from django.db import connection, transaction
+from django.db.models import Count, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from api.search_tokens import feed_tokens, tokenize
+from media_platform.models import MonitorFeed, MonitorFeedToken
+
+logger = logging.getLogger(__name__)
+
+# MySQL ngram_token_size 默认值，更短的关键词无法命中 ngram 索引
+NGRAM_TOKEN_SIZE = 2
+FULLTEXT_MATCH_SQL = "MATCH (content, source_keyword) AGAINST (%s IN BOOLEAN MODE)"
+
+_BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+
+
+def use_fulltext_index() -> bool:
+    """MySQL 使用 FULLTEXT 索引，其他数据库使用 jieba 倒排表"""
+    return connection.vendor == "mysql"
+
+
+def _split_terms(q: str) -> List[str]:
+    return [term for term in _BOOLEAN_OPERATORS.sub(" ", q or "").split() if term]
+
+
+def _contains_filter(terms: Iterable[str]) -> Q:
+    condition = Q()
+    for term in terms:
+        condition &= Q(content__icontains=term) | Q(source_keyword__icontains=term)
+    return condition
+
+
+def search_feed(queryset, q: Optional[str]):
+    """
+    按关键词过滤 monitor_feed 查询集
+
+    多个以空格分隔的关键词之间为 AND 关系；每个关键词匹配 content 或 source_keyword。
+
+    Args:
+        queryset: MonitorFeed 查询集
+        q: 关键词，为空时原样返回
+    """
+    terms = _split_terms(q)
+    if not terms:
+        return queryset
+
+    if use_fulltext_index():
+        if any(len(term) < NGRAM_TOKEN_SIZE for term in terms):
+            return queryset.filter(_contains_filter(terms))
+        boolean_query = " ".join(f'+"{term}"' for term in terms)
+        return queryset.alias(
+            search_rank=RawSQL(FULLTEXT_MATCH_SQL, (boolean_query,), output_field=FloatField())
+        ).filter(search_rank__gt=0)
+
+    tokens = []
+    for term in terms:
+        term_tokens = tokenize(term)
+        if not term_tokens:
+            return queryset.filter(_contains_filter(terms))
+        tokens.extend(term_tokens)
+    tokens = list(dict.fromkeys(tokens))
+    matched_ids = (
+        MonitorFeedToken.objects.filter(token__in=tokens)
+        .values("feed_id")
+        .annotate(matched=Count("token", distinct=True))
+        .filter(matched=len(tokens))
+        .values("feed_id")
+    )
+    return queryset.filter(id__in=matched_ids)
+
+
+def _feed_tokens(feed) -> List[str]:
+    return feed_tokens(feed.content, feed.source_keyword)
+
+
+def index_feed(feed) -> None:
+    """写入 monitor_feed 后更新该条记录的倒排索引（MySQL 由 FULLTEXT 索引负责，无需处理）"""
+    if use_fulltext_index():
+        return
+    try:
+        with transaction.atomic():
+            MonitorFeedToken.objects.filter(feed_id=feed.id).delete()
+            MonitorFeedToken.objects.bulk_create(
+                [MonitorFeedToken(token=token, feed_id=feed.id) for token in _feed_tokens(feed)],
+                ignore_conflicts=True,
+            )
+    except Exception as e:
+        logger.error(f"Failed to index monitor_feed {feed.id}: {e}", exc_info=True)
+
+
+def rebuild_search_index(platform: Optional[str] = None, chunk_size: int = 500,
+                         feed_model=MonitorFeed, token_model=MonitorFeedToken) -> int:
+    """
+    全量重建 monitor_feed_token 倒排表
+
+    Args:
+        platform: 仅重建指定平台，默认全部
+        chunk_size: 每批处理的 monitor_feed 行数
+        feed_model / token_model: 数据迁移中传入历史模型
+
+    Returns:
+        建立索引的 monitor_feed 行数
+    """
+    last_id = 0
+    total = 0
+    while True:
+        queryset = feed_model.objects.filter(id__gt=last_id)
+        if platform:
+            queryset = queryset.filter(platform=platform)
+        feeds = list(queryset.order_by("id").only("id", "content", "source_keyword")[:chunk_size])
+        if not feeds:
+            break
+        last_id = feeds[-1].id
+
+        feed_ids = [feed.id for feed in feeds]
+        rows = [
+            token_model(token=token, feed_id=feed.id)
+            for feed in feeds
+            for token in _feed_tokens(feed)
+        ]
+        with transaction.atomic():
+            token_model.objects.filter(feed_id__in=feed_ids).delete()
+            token_model.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+        total += len(feeds)
+    return total
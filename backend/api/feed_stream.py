@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+monitor_feed 增量推送（Server-Sent Events）
+
+每个 Web 进程只有一个后台线程按 (last_modify_ts, id) 增量查询 monitor_feed，新写入/更新的
+记录分发给该进程内所有订阅者，客户端数量不再放大数据库查询。
+
+事件 ID 为 "<last_modify_ts>:<id>"。EventSource 断线重连时会带上 Last-Event-ID，
+服务端据此补发断线期间的记录；积压超过 STREAM_CATCHUP_LIMIT 时发送 reset 事件，
+由前端重新拉取整页数据。
+
+ASGI 部署使用 astream_events()：等待新记录时挂起协程而不是阻塞线程，
+一个 worker 可以同时保持大量连接。
+"""
+
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, models
+
+from api.interactions import INTERACTION_FIELDS
+from media_platform.models import MonitorFeed
+
+logger = logging.getLogger(__name__)
+
+STREAM_FIELDS = (
+    "id",
+    "platform",
+    "platform_name",
+    "content_id",
+    "content",
+    "author",
+    "url",
+    "created_at",
+    "sentiment",
+    "sentiment_score",
+    "sentiment_labels",
+    "is_sensitive",
+    "last_modify_ts",
+    *INTERACTION_FIELDS,
+)
+STREAM_BATCH_SIZE = 500
+STREAM_CATCHUP_LIMIT = 1000
+STREAM_QUEUE_SIZE = 1000
+STREAM_HEARTBEAT_SECONDS = 15
+# 单个连接的最长时间，到期后由 EventSource 自动重连，避免长期占用同步 worker 线程
+STREAM_MAX_SECONDS = 300
+STREAM_RETRY_MILLIS = 3000
+
+Cursor = Tuple[int, int]
+
+_RESET = object()
+
+
+def parse_event_id(value: Optional[str]) -> Optional[Cursor]:
+    """解析 "<last_modify_ts>:<id>" 格式的事件 ID"""
+    if not value:
+        return None
+    try:
+        ts, row_id = value.split(":", 1)
+        return int(ts), int(row_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_sensitive(row: dict) -> bool:
+    return bool(row.get("is_sensitive")) or row.get("sentiment") == "sensitive"
+
+
+def _filter_queryset(queryset, platform: Optional[str], sensitive_only: bool):
+    if platform:
+        queryset = queryset.filter(platform=platform)
+    if sensitive_only:
+        queryset = queryset.filter(flagged=True)
+    return queryset
+
+
+def _after_queryset(cursor: Cursor, limit: int, platform: Optional[str], sensitive_only: bool):
+    ts, row_id = cursor
+    queryset = MonitorFeed.objects.filter(
+        models.Q(last_modify_ts__gt=ts) | models.Q(last_modify_ts=ts, id__gt=row_id)
+    )
+    queryset = _filter_queryset(queryset, platform, sensitive_only)
+    return queryset.order_by("last_modify_ts", "id").values(*STREAM_FIELDS)[:limit]
+
+
+def fetch_after(cursor: Cursor, limit: int, platform: Optional[str] = None,
+                sensitive_only: bool = False) -> List[dict]:
+    """按 (last_modify_ts, id) 顺序取游标之后的记录"""
+    return list(_after_queryset(cursor, limit, platform, sensitive_only))
+
+
+async def afetch_after(cursor: Cursor, limit: int, platform: Optional[str] = None,
+                       sensitive_only: bool = False) -> List[dict]:
+    """fetch_after 的异步 ORM 版本"""
+    return [row async for row in _after_queryset(cursor, limit, platform, sensitive_only)]
+
+
+def latest_cursor() -> Cursor:
+    row = (
+        MonitorFeed.objects.filter(last_modify_ts__isnull=False)
+        .order_by("-last_modify_ts", "-id")
+        .values("last_modify_ts", "id")
+        .first()
+    )
+    if not row:
+        return 0, 0
+    return int(row["last_modify_ts"]), int(row["id"])
+
+
+def row_cursor(row: dict) -> Cursor:
+    return int(row.get("last_modify_ts") or 0), int(row["id"])
+
+
+def serialize_row(row: dict) -> dict:
+    item = dict(row)
+    item["id"] = str(row["id"])
+    item["is_sensitive"] = _is_sensitive(row)
+    if item["is_sensitive"]:
+        item["sentiment"] = "sensitive"
+    item["sentiment_labels"] = row.get("sentiment_labels") or {}
+    item["ip_location"] = row.get("ip_location") or "-"
+    return item
+
+
+def format_event(row: dict) -> str:
+    ts, row_id = row_cursor(row)
+    data = json.dumps(serialize_row(row), ensure_ascii=False)
+    return f"id: {ts}:{row_id}\nevent: feed\ndata: {data}\n\n"
+
+
+class Subscriber:
+    def __init__(self, platform: Optional[str], sensitive_only: bool):
+        self.platform = platform
+        self.sensitive_only = sensitive_only
+        self.queue: "queue.Queue" = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+
+    def matches(self, row: dict) -> bool:
+        if self.platform and row.get("platform") != self.platform:
+            return False
+        if self.sensitive_only and not _is_sensitive(row):
+            return False
+        return True
+
+    def put(self, row: dict) -> None:
+        try:
+            self.queue.put_nowait(row)
+        except queue.Full:
+            # 消费过慢，通知客户端重新拉取整页
+            self._clear()
+            self.queue.put_nowait(_RESET)
+
+    def _clear(self) -> None:
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                return
+
+
+class AsyncSubscriber(Subscriber):
+    """异步视图的订阅者：查询线程通过 call_soon_threadsafe 把记录投递到事件循环中的 asyncio.Queue"""
+
+    def __init__(self, platform: Optional[str], sensitive_only: bool, loop: asyncio.AbstractEventLoop):
+        super().__init__(platform, sensitive_only)
+        self.loop = loop
+        self.queue: "asyncio.Queue" = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+
+    def put(self, row: dict) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self._put, row)
+        except RuntimeError:
+            # 事件循环已关闭，连接即将被清理
+            pass
+
+    def _put(self, row) -> None:
+        try:
+            self.queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self._clear()
+            self.queue.put_nowait(_RESET)
+
+    def _clear(self) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+
+class FeedTail:
+    """进程内唯一的 monitor_feed 增量查询线程，把新记录分发给所有订阅者"""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._cursor: Optional[Cursor] = None
+
+    @property
+    def interval(self) -> float:
+        return float(getattr(settings, "MONITOR_STREAM_POLL_INTERVAL", 2))
+
+    def subscribe(self, platform: Optional[str] = None, sensitive_only: bool = False,
+                  loop: Optional[asyncio.AbstractEventLoop] = None) -> Subscriber:
+        if loop is not None:
+            subscriber = AsyncSubscriber(platform, sensitive_only, loop)
+        else:
+            subscriber = Subscriber(platform, sensitive_only)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="monitor-feed-tail", daemon=True)
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                subscribers = list(self._subscribers)
+            if not subscribers:
+                # 无订阅者时不查询，下次有订阅者时从最新位置开始
+                self._cursor = None
+                time.sleep(self.interval)
+                continue
+
+            full_batch = False
+            try:
+                if self._cursor is None:
+                    self._cursor = latest_cursor()
+                rows = fetch_after(self._cursor, STREAM_BATCH_SIZE)
+                for row in rows:
+                    for subscriber in subscribers:
+                        if subscriber.matches(row):
+                            subscriber.put(row)
+                if rows:
+                    self._cursor = row_cursor(rows[-1])
+                full_batch = len(rows) >= STREAM_BATCH_SIZE
+            except Exception as e:
+                logger.error(f"monitor_feed tail query failed: {e}", exc_info=True)
+            finally:
+                close_old_connections()
+
+            if not full_batch:
+                time.sleep(self.interval)
+
+
+feed_tail = FeedTail()
+
+
+def stream_events(platform: Optional[str], sensitive_only: bool, last_event_id: Optional[str]) -> Iterator[str]:
+    """SSE 事件流生成器：先补发 Last-Event-ID 之后的记录，再推送实时记录"""
+    subscriber = feed_tail.subscribe(platform, sensitive_only)
+    try:
+        yield f"retry: {STREAM_RETRY_MILLIS}\n\n"
+
+        last_cursor = parse_event_id(last_event_id)
+        if last_cursor is not None:
+            # 先订阅再补发，补发期间到达的实时记录在队列中按游标去重
+            rows = fetch_after(last_cursor, STREAM_CATCHUP_LIMIT + 1, platform, sensitive_only)
+            if len(rows) > STREAM_CATCHUP_LIMIT:
+                yield "event: reset\ndata: {}\n\n"
+                return
+            for row in rows:
+                yield format_event(row)
+                last_cursor = row_cursor(row)
+
+        deadline = time.monotonic() + STREAM_MAX_SECONDS
+        while time.monotonic() < deadline:
+            try:
+                row = subscriber.queue.get(timeout=STREAM_HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield ": ping\n\n"
+                continue
+            if row is _RESET:
+                yield "event: reset\ndata: {}\n\n"
+                return
+            cursor = row_cursor(row)
+            if last_cursor is not None and cursor <= last_cursor:
+                continue
+            yield format_event(row)
+            last_cursor = cursor
+    finally:
+        feed_tail.unsubscribe(subscriber)
+
+
+async def astream_events(platform: Optional[str], sensitive_only: bool,
+                         last_event_id: Optional[str]) -> AsyncIterator[str]:
+    """stream_events 的异步版本（ASGI）：等待新记录时挂起协程，不占用线程"""
+    subscriber = feed_tail.subscribe(platform, sensitive_only, loop=asyncio.get_running_loop())
+    try:
+        yield f"retry: {STREAM_RETRY_MILLIS}\n\n"
+
+        last_cursor = parse_event_id(last_event_id)
+        if last_cursor is not None:
+            rows = await afetch_after(last_cursor, STREAM_CATCHUP_LIMIT + 1, platform, sensitive_only)
+            if len(rows) > STREAM_CATCHUP_LIMIT:
+                yield "event: reset\ndata: {}\n\n"
+                return
+            for row in rows:
+                yield format_event(row)
+                last_cursor = row_cursor(row)
+
+        deadline = time.monotonic() + STREAM_MAX_SECONDS
+        while time.monotonic() < deadline:
+            try:
+                row = await asyncio.wait_for(subscriber.queue.get(), timeout=STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if row is _RESET:
+                yield "event: reset\ndata: {}\n\n"
+                return
+            cursor = row_cursor(row)
+            if last_cursor is not None and cursor <= last_cursor:
+                continue
+            yield format_event(row)
+            last_cursor = cursor
+    finally:
+        feed_tail.unsubscribe(subscriber)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+monitor_feed 数据版本号的键名，以及不依赖 Django 的跨进程递增
+
+Web 进程通过 api/feed_cache.py（Django 缓存）读写版本号。爬虫子进程无法初始化 Django
+（其 sys.path 上的 media_platform 是爬虫自己的包），这里直接对 Redis 中同一个键执行
+SET NX / INCR：键名按 django-redis 的规则拼接（KEY_PREFIX:版本:键），整数以原始值存储，
+两边读写的是同一个计数器。
+
+未配置 REDIS_HOST 时 Web 端使用本地内存缓存，其他进程无法通知，依靠 API_CACHE_TIMEOUT 过期。
+"""
+
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+ALL_PLATFORMS = "all"
+VERSION_KEY = "monitor_feed:version:{platform}"
+# 与 settings.CACHES["default"] 的 KEY_PREFIX / VERSION 保持一致
+REDIS_KEY_PREFIX = "mediacrawler"
+REDIS_KEY_VERSION = 1
+
+BACKEND_ENV_FILE = Path(__file__).resolve().parent.parent / ".env"
+
+
+def version_key(platform=None) -> str:
+    return VERSION_KEY.format(platform=platform or ALL_PLATFORMS)
+
+
+def version_keys(platforms: Iterable[str]) -> set:
+    """平台版本号和全平台版本号的键"""
+    keys = {version_key(platform) for platform in platforms if platform}
+    keys.add(version_key(ALL_PLATFORMS))
+    return keys
+
+
+def redis_key(key: str) -> str:
+    """django-redis 实际写入 Redis 的键名"""
+    return f"{REDIS_KEY_PREFIX}:{REDIS_KEY_VERSION}:{key}"
+
+
+def _redis_client():
+    """按后端 .env 中的 REDIS_* 配置创建客户端，未配置 Redis 时返回 None"""
+    if not os.environ.get("REDIS_HOST") and BACKEND_ENV_FILE.exists():
+        from dotenv import load_dotenv
+        load_dotenv(BACKEND_ENV_FILE)
+    host = os.environ.get("REDIS_HOST", "")
+    if not host:
+        return None
+    import redis
+
+    return redis.Redis(
+        host=host,
+        port=int(os.environ.get("REDIS_PORT", "6379")),
+        db=int(os.environ.get("REDIS_DB", "0")),
+        password=os.environ.get("REDIS_PASSWORD") or None,
+        socket_connect_timeout=2,
+        socket_timeout=2,
+    )
+
+
+def bump_shared_data_version(platforms: Iterable[str], client=None) -> bool:
+    """
+    在 Redis 中递增平台和全平台的数据版本号（与 feed_cache.bump_data_version 效果相同）
+
+    Args:
+        platforms: 数据有变更的平台
+        client: Redis 客户端，默认按 REDIS_* 环境变量创建
+
+    Returns:
+        是否已写入 Redis（未配置 Redis 时为 False）
+    """
+    if client is None:
+        client = _redis_client()
+        if client is None:
+            return False
+    now_ms = int(time.time() * 1000)
+    for key in version_keys(platforms):
+        key = redis_key(key)
+        # 版本号不存在时与 get_data_version 一样以当前毫秒时间初始化
+        if not client.set(key, now_ms, nx=True):
+            client.incr(key)
+    return True
@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+DATA_DIR 下爬虫输出文件的目录（data_file 表）
+
+记录每个文件的路径、大小、修改时间、格式和记录数，文件列表/统计接口直接查表，
+不再每次遍历目录并解析文件计数。
+
+- 爬虫写完文件时把路径、大小、修改时间和记录数追加到侧写索引（api/file_index.py），
+  读接口每次先读取索引的新增条目登记到表中，写入方已知的记录数不再重新解析
+- 读接口按 DATA_CATALOG_REFRESH_INTERVAL 节流做一次目录 stat 扫描，只重新解析大小或
+  修改时间变化的文件，并删除已不存在的文件记录（覆盖未经索引写入或写入后又被修改的文件）
+"""
+
+import csv
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, models
+
+from api.file_index import read_entries
+from api.file_preview import count_json_records, count_jsonl_records
+from media_platform.models import DataFile
+
+logger = logging.getLogger(__name__)
+
+DATA_FILE_EXTENSIONS = {".json", ".jsonl", ".csv", ".xlsx", ".xls"}
+PLATFORM_PATH_ALIASES = {
+    "xhs": ["xhs"],
+    "dy": ["douyin", "dy"],
+    "ks": ["kuaishou", "ks"],
+    "bili": ["bilibili", "bili"],
+    "wb": ["weibo", "wb"],
+    "tieba": ["tieba"],
+    "zhihu": ["zhihu"],
+}
+REFRESH_KEY = "data_file:refreshed:{data_dir}"
+INDEX_OFFSET_KEY = "data_file:index_offset:{data_dir}"
+
+
+def _data_dir(data_dir: Optional[Path] = None) -> Path:
+    return Path(data_dir if data_dir is not None else settings.DATA_DIR)
+
+
+def platform_from_path(rel_path: str) -> Optional[str]:
+    """根据相对路径推断平台"""
+    path_lower = rel_path.lower()
+    for platform, aliases in PLATFORM_PATH_ALIASES.items():
+        if any(alias in path_lower for alias in aliases):
+            return platform
+    return None
+
+
+def count_records(file_path: Path) -> Optional[int]:
+    """
+    统计文件记录数：JSON 数组长度、JSONL 非空行数、CSV 数据行数、xlsx/xls 第一个工作表的数据行数
+
+    除 xls（xlrd 按需只加载第一个工作表）外均为流式读取，无法统计时返回 None
+    """
+    suffix = file_path.suffix.lower()
+    try:
+        if suffix == ".json":
+            return count_json_records(file_path)
+        if suffix == ".jsonl":
+            return count_jsonl_records(file_path)
+        if suffix == ".csv":
+            with open(file_path, "r", encoding="utf-8-sig", newline="") as f:
+                return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+        if suffix == ".xlsx":
+            import openpyxl
+
+            workbook = openpyxl.load_workbook(file_path, read_only=True)
+            try:
+                sheet = workbook.worksheets[0] if workbook.worksheets else None
+                return max((sheet.max_row or 1) - 1, 0) if sheet is not None else 0
+            finally:
+                workbook.close()
+        if suffix == ".xls":
+            import xlrd
+
+            workbook = xlrd.open_workbook(file_path, on_demand=True)
+            try:
+                return max(workbook.sheet_by_index(0).nrows - 1, 0) if workbook.nsheets else 0
+            finally:
+                workbook.release_resources()
+    except Exception as e:
+        logger.warning(f"Failed to count records in {file_path}: {e}")
+    return None
+
+
+def _relative_path(file_path: Path, data_dir: Path) -> Optional[str]:
+    try:
+        return str(Path(file_path).resolve().relative_to(data_dir.resolve()))
+    except ValueError:
+        return None
+
+
+def record_file(file_path, data_dir: Optional[Path] = None,
+                record_count: Optional[int] = None) -> Optional[DataFile]:
+    """
+    登记或更新单个文件
+
+    Args:
+        file_path: 文件路径（绝对路径或相对当前目录）
+        data_dir: 数据目录，默认 settings.DATA_DIR
+        record_count: 已知的记录数（写入方传入时不再解析文件）
+
+    Returns:
+        目录记录；文件不在数据目录下或格式不支持时返回 None
+    """
+    data_dir = _data_dir(data_dir)
+    file_path = Path(file_path)
+    if file_path.suffix.lower() not in DATA_FILE_EXTENSIONS:
+        return None
+    rel_path = _relative_path(file_path, data_dir)
+    if rel_path is None:
+        return None
+    try:
+        file_stat = file_path.stat()
+    except OSError:
+        DataFile.objects.filter(path=rel_path).delete()
+        return None
+
+    if record_count is None:
+        record_count = count_records(file_path)
+    values = {
+        "platform": platform_from_path(rel_path),
+        "file_type": file_path.suffix[1:].lower(),
+        "size": file_stat.st_size,
+        "mtime": file_stat.st_mtime,
+        "record_count": record_count,
+        "scanned_at": int(time.time() * 1000),
+    }
+    try:
+        entry, _created = DataFile.objects.update_or_create(path=rel_path, defaults=values)
+    except IntegrityError:
+        # 并发登记同一文件
+        DataFile.objects.filter(path=rel_path).update(**values)
+        entry = DataFile.objects.filter(path=rel_path).first()
+    return entry
+
+
+def apply_index(data_dir: Optional[Path] = None) -> int:
+    """
+    登记侧写索引中上次读取之后新增的条目
+
+    索引中的大小/修改时间与文件当前状态不一致（写入后又被修改）时跳过，由目录扫描重新统计。
+
+    Returns:
+        登记的文件数
+    """
+    data_dir = _data_dir(data_dir)
+    offset_key = INDEX_OFFSET_KEY.format(data_dir=data_dir)
+    entries, offset = read_entries(data_dir, cache.get(offset_key) or 0)
+    cache.set(offset_key, offset, None)
+    if not entries:
+        return 0
+
+    # 同一文件只保留最后一条
+    latest = {entry["path"]: entry for entry in entries}
+    known = {
+        path: (size, mtime)
+        for path, size, mtime in DataFile.objects.filter(path__in=list(latest)).values_list("path", "size", "mtime")
+    }
+    applied = 0
+    for rel_path, entry in latest.items():
+        file_path = data_dir / rel_path
+        try:
+            file_stat = file_path.stat()
+        except OSError:
+            continue
+        current = (file_stat.st_size, file_stat.st_mtime)
+        if current != (entry.get("size"), entry.get("mtime")) or known.get(rel_path) == current:
+            continue
+        if record_file(file_path, data_dir, record_count=entry.get("record_count")) is not None:
+            applied += 1
+    return applied
+
+
+def refresh_catalog(data_dir: Optional[Path] = None, force: bool = False) -> int:
+    """
+    登记侧写索引的新条目，并按文件大小/修改时间增量刷新目录
+
+    读取索引只涉及新增的几行，每次调用都执行；目录扫描在非 force 调用时
+    DATA_CATALOG_REFRESH_INTERVAL 秒内只执行一次。
+
+    Returns:
+        重新登记的文件数
+    """
+    data_dir = _data_dir(data_dir)
+    try:
+        refreshed = apply_index(data_dir)
+    except Exception as e:
+        logger.warning(f"Failed to apply data file index in {data_dir}: {e}")
+        refreshed = 0
+    interval = int(getattr(settings, "DATA_CATALOG_REFRESH_INTERVAL", 30))
+    if not force and interval > 0:
+        if not cache.add(REFRESH_KEY.format(data_dir=data_dir), 1, interval):
+            return refreshed
+
+    known = {
+        path: (size, mtime)
+        for path, size, mtime in DataFile.objects.values_list("path", "size", "mtime")
+    }
+    seen = set()
+    if data_dir.exists():
+        for root, _dirs, filenames in os.walk(data_dir):
+            root_path = Path(root)
+            for filename in filenames:
+                file_path = root_path / filename
+                if file_path.suffix.lower() not in DATA_FILE_EXTENSIONS:
+                    continue
+                rel_path = str(file_path.relative_to(data_dir))
+                try:
+                    file_stat = file_path.stat()
+                except OSError:
+                    continue
+                seen.add(rel_path)
+                if known.get(rel_path) == (file_stat.st_size, file_stat.st_mtime):
+                    continue
+                if record_file(file_path, data_dir) is not None:
+                    refreshed += 1
+
+    removed = [path for path in known if path not in seen]
+    if removed:
+        DataFile.objects.filter(path__in=removed).delete()
+    return refreshed
+
+
+def entry_to_info(entry: DataFile) -> Dict:
+    """目录记录 -> 文件列表接口的文件信息"""
+    return {
+        "name": Path(entry.path).name,
+        "path": entry.path,
+        "size": entry.size,
+        "modified_at": entry.mtime,
+        "record_count": entry.record_count,
+        "type": entry.file_type or "unknown",
+    }
+
+
+def list_files(platform: Optional[str] = None, file_type: Optional[str] = None,
+               data_dir: Optional[Path] = None) -> List[Dict]:
+    """按修改时间倒序列出数据文件"""
+    refresh_catalog(data_dir)
+    queryset = DataFile.objects.all()
+    if platform:
+        queryset = queryset.filter(platform=platform.lower())
+    if file_type:
+        queryset = queryset.filter(file_type=file_type.lower())
+    return [entry_to_info(entry) for entry in queryset.order_by("-mtime")]
+
+
+def catalog_stats(data_dir: Optional[Path] = None) -> Dict:
+    """文件总数、总大小及按格式/平台的文件数"""
+    refresh_catalog(data_dir)
+    totals = DataFile.objects.aggregate(total_files=models.Count("id"), total_size=models.Sum("size"))
+    by_type = {
+        row["file_type"]: row["count"]
+        for row in DataFile.objects.values("file_type").annotate(count=models.Count("id"))
+    }
+    by_platform = {
+        row["platform"]: row["count"]
+        for row in DataFile.objects.exclude(platform__isnull=True)
+        .values("platform").annotate(count=models.Count("id"))
+    }
+    return {
+        "total_files": totals["total_files"] or 0,
+        "total_size": totals["total_size"] or 0,
+        "by_type": by_type,
+        "by_platform": by_platform,
+    }
+
+
+def catalog_signature(data_dir: Optional[Path] = None) -> tuple:
+    """数据目录签名：(文件数, 总大小, 最大修改时间)"""
+    refresh_catalog(data_dir)
+    totals = DataFile.objects.aggregate(
+        count=models.Count("id"), size=models.Sum("size"), mtime=models.Max("mtime")
+    )
+    return totals["count"] or 0, totals["size"] or 0, totals["mtime"] or 0.0
+
+
+def get_record_count(file_path: Path, data_dir: Optional[Path] = None) -> Optional[int]:
+    """文件记录数，目录中的大小/修改时间与文件一致时直接返回，否则重新登记"""
+    data_dir = _data_dir(data_dir)
+    rel_path = _relative_path(file_path, data_dir)
+    if rel_path is None:
+        return count_records(file_path)
+    try:
+        file_stat = Path(file_path).stat()
+    except OSError:
+        return None
+    entry = DataFile.objects.filter(path=rel_path).first()
+    if entry is None or (entry.size, entry.mtime) != (file_stat.st_size, file_stat.st_mtime):
+        entry = record_file(file_path, data_dir)
+    return entry.record_count if entry is not None else None
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+数据文件侧写索引（DATA_DIR/.data_file_index，不依赖 Django）
+
+爬虫写完文件后（AsyncFileWriter.flush_index / ExcelStoreBase.flush）把相对路径、大小、修改时间和
+记录数追加为一行 JSON；Web 端的 api/file_catalog.refresh_catalog 从上次读到的位置继续读取，
+把新条目登记到 data_file 表，记录数已知时不再解析文件。
+
+爬虫子进程无法初始化 Django（同 api/feed_version.py），因此通过数据目录中的文件传递。
+索引文件没有数据文件扩展名，不会被目录扫描当作数据文件登记。
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = ".data_file_index"
+
+
+def index_path(data_dir) -> Path:
+    return Path(data_dir) / INDEX_FILENAME
+
+
+def append_entries(files: Dict[str, Optional[int]], data_dir) -> int:
+    """
+    把写完的文件追加到侧写索引
+
+    Args:
+        files: 文件路径 -> 记录数（未知时为 None，由 Web 端统计）
+        data_dir: 数据目录，路径按相对该目录记录，目录外的文件忽略
+
+    Returns:
+        写入的条目数（写入失败时为 0）
+    """
+    data_dir = Path(data_dir)
+    lines = []
+    for file_path, record_count in files.items():
+        file_path = Path(file_path)
+        try:
+            rel_path = file_path.resolve().relative_to(data_dir.resolve())
+            file_stat = file_path.stat()
+        except (OSError, ValueError):
+            continue
+        entry = {
+            "path": str(rel_path),
+            "size": file_stat.st_size,
+            "mtime": file_stat.st_mtime,
+            "record_count": record_count,
+        }
+        lines.append(json.dumps(entry, ensure_ascii=False) + "\n")
+    if not lines:
+        return 0
+    try:
+        data_dir.mkdir(parents=True, exist_ok=True)
+        # 整批一次追加写入，多个爬虫进程同时写入时各行不会交错
+        with open(index_path(data_dir), "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+    except OSError as e:
+        # 写入失败不影响爬虫，这些文件由 Web 端的目录扫描登记
+        logger.warning(f"Failed to append data file index in {data_dir}: {e}")
+        return 0
+    return len(lines)
+
+
+def read_entries(data_dir, offset: int = 0) -> Tuple[List[dict], int]:
+    """
+    从 offset 字节处读取侧写索引中的新条目
+
+    Returns:
+        (条目列表, 下次读取的位置)；索引被删除或截短时从头读取
+    """
+    path = index_path(data_dir)
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return [], 0
+    if size < offset:
+        offset = 0
+
+    entries = []
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                # 正在写入的半行，下次再读
+                break
+            offset += len(line)
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                logger.warning(f"Skipping malformed data file index line in {path}")
+                continue
+            if isinstance(entry, dict) and entry.get("path"):
+                entries.append(entry)
+    return entries, offset
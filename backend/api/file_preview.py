@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+数据文件的流式预览
+
+只读取文件开头的 limit 条记录，内存和耗时与文件大小无关：
+- JSON 数组: 按块读取并用 JSONDecoder.raw_decode 逐个解析元素
+- JSONL: 逐行解析
+- CSV: csv.DictReader 读到 limit 行即停止
+- xlsx: openpyxl read_only 模式逐行迭代
+
+总记录数优先取数据文件目录（api/file_catalog.py）中的缓存值。
+"""
+
+import csv
+import json
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+JSON_READ_SIZE = 64 * 1024
+LINE_COUNT_READ_SIZE = 1024 * 1024
+
+_decoder = json.JSONDecoder()
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+class PreviewError(ValueError):
+    """文件无法预览（格式错误或不支持）"""
+
+
+def _skip_whitespace(buffer: str, pos: int) -> int:
+    while pos < len(buffer) and buffer[pos] in " \t\r\n":
+        pos += 1
+    return pos
+
+
+def iter_json_array(f: IO[str]) -> Iterator[Any]:
+    """
+    逐个产出顶层 JSON 数组的元素，每次只在内存中保留当前元素和一个读取块
+
+    顶层不是数组时产出整个值。
+    """
+    buffer = f.read(JSON_READ_SIZE)
+    # 按实际读到的内容判断是否读完（第一个块可能只有 BOM）
+    eof = not buffer
+    buffer = buffer.lstrip("\ufeff")
+    pos = _skip_whitespace(buffer, 0)
+
+    while pos >= len(buffer) and not eof:
+        chunk = f.read(JSON_READ_SIZE)
+        eof = not chunk
+        buffer += chunk
+        pos = _skip_whitespace(buffer, pos)
+    if pos >= len(buffer):
+        return
+
+    if buffer[pos] != "[":
+        # 顶层为单个对象，按原样整体解析
+        try:
+            yield json.loads(buffer[pos:] + f.read())
+        except json.JSONDecodeError as e:
+            raise PreviewError(f"Invalid JSON file: {e}") from e
+        return
+
+    pos += 1
+    expect_value = True
+    while True:
+        pos = _skip_whitespace(buffer, pos)
+        if pos < len(buffer):
+            char = buffer[pos]
+            if char == "]":
+                return
+            if char == "," and not expect_value:
+                pos += 1
+                expect_value = True
+                continue
+            if not expect_value:
+                raise PreviewError("Invalid JSON file: expected ',' or ']'")
+            try:
+                value, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                value = end = None
+            # 元素被块边界截断时继续读取再解析；数字在块尾或后面紧跟可能属于同一个数字的字符
+            # （如 "12." + "5"）时同样要等下一个块
+            if end is not None and (eof or (end < len(buffer) and buffer[end] not in _NUMBER_CHARS)):
+                yield value
+                pos = end
+                expect_value = False
+                # 丢弃已解析部分，保持缓冲区只含未解析内容
+                buffer = buffer[pos:]
+                pos = 0
+                continue
+            if eof:
+                raise PreviewError("Invalid JSON file")
+        elif eof:
+            raise PreviewError("Invalid JSON file: unexpected end of data")
+
+        chunk = f.read(JSON_READ_SIZE)
+        eof = not chunk
+        buffer += chunk
+
+
+def iter_jsonl(f: IO[str]) -> Iterator[Any]:
+    for line_no, line in enumerate(f, 1):
+        line = line.strip().lstrip("\ufeff")
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise PreviewError(f"Invalid JSON on line {line_no}: {e}") from e
+
+
+def count_lines(file_path: Path) -> int:
+    """按二进制块统计换行数（不解析内容）"""
+    count = 0
+    last = b""
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(LINE_COUNT_READ_SIZE)
+            if not chunk:
+                break
+            count += chunk.count(b"\n")
+            last = chunk
+    if last and not last.endswith(b"\n"):
+        count += 1
+    return count
+
+
+def count_jsonl_records(file_path: Path) -> int:
+    with open(file_path, "rb") as f:
+        return sum(1 for line in f if line.strip())
+
+
+def count_json_records(file_path: Path) -> int:
+    """JSON 数组元素个数（顶层为对象时为 1）"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        return sum(1 for _ in iter_json_array(f))
+
+
+def preview_json(file_path: Path, limit: int) -> Tuple[Any, Optional[int]]:
+    """
+    Returns:
+        (前 limit 个数组元素, None)；顶层为对象时返回 (对象, 1)
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        head = f.read(JSON_READ_SIZE).lstrip("\ufeff").lstrip()
+        f.seek(0)
+        values = iter_json_array(f)
+        if head and not head.startswith("["):
+            return next(values, None), 1
+        return list(islice(values, limit)), None
+
+
+def preview_jsonl(file_path: Path, limit: int) -> List[Any]:
+    with open(file_path, "r", encoding="utf-8") as f:
+        return list(islice(iter_jsonl(f), limit))
+
+
+def preview_csv(file_path: Path, limit: int) -> List[Dict]:
+    with open(file_path, "r", encoding="utf-8-sig", newline="") as f:
+        return list(islice(csv.DictReader(f), limit))
+
+
+def preview_xlsx(file_path: Path, limit: int) -> Tuple[List[Dict], List[str], int]:
+    """
+    读取第一个工作表的表头和前 limit 行
+
+    Returns:
+        (rows, columns, 数据行总数)；总数取自工作表的 dimension 元数据
+    """
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        if not workbook.worksheets:
+            return [], [], 0
+        sheet = workbook.worksheets[0]
+        rows_iter = sheet.iter_rows(values_only=True)
+        header = next(rows_iter, None)
+        if header is None:
+            return [], [], 0
+        columns = [str(value) if value is not None else f"Unnamed: {i}" for i, value in enumerate(header)]
+        rows = [
+            dict(zip(columns, values))
+            for values in islice(rows_iter, limit)
+        ]
+        total = max((sheet.max_row or 1) - 1, len(rows))
+        return rows, columns, total
+    finally:
+        workbook.close()
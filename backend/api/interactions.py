@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+monitor_feed 互动数据（点赞/评论/分享/收藏/IP 属地）
+
+各平台内容表的互动字段名不同，且计数多为 "7.9万" 这样的字符串。同步写入 monitor_feed 时
+在这里统一换算成整数，读接口只查 monitor_feed 一张表。
+
+提取函数不依赖 Django，爬虫子进程（SQLAlchemy 同步）也可以直接导入；
+refresh_feed_interactions() 用于给存量 monitor_feed 记录补齐互动数据。
+"""
+
+from typing import Dict, List, Optional
+
+INTERACTION_COUNT_FIELDS = ("liked_count", "comment_count", "share_count", "collected_count")
+INTERACTION_FIELDS = INTERACTION_COUNT_FIELDS + ("ip_location",)
+
+# monitor_feed 字段 -> 平台内容表（及爬虫 content_item）字段，缺省的计数记为 0
+PLATFORM_INTERACTION_SOURCES = {
+    "xhs": {
+        "liked_count": "liked_count",
+        "comment_count": "comment_count",
+        "share_count": "share_count",
+        "collected_count": "collected_count",
+    },
+    "dy": {
+        "liked_count": "liked_count",
+        "comment_count": "comment_count",
+        "share_count": "share_count",
+        "collected_count": "collected_count",
+    },
+    "bili": {
+        "liked_count": "liked_count",
+        "comment_count": "video_comment",
+        "share_count": "video_share_count",
+        "collected_count": "video_favorite_count",
+    },
+    "wb": {
+        "liked_count": "liked_count",
+        "comment_count": "comments_count",
+        "share_count": "shared_count",
+    },
+    "ks": {
+        "liked_count": "liked_count",
+    },
+    "zhihu": {
+        "liked_count": "voteup_count",
+        "comment_count": "comment_count",
+    },
+    "tieba": {
+        "comment_count": "total_replay_num",
+    },
+}
+
+# 平台 -> (内容表模型名, 内容 ID 字段)
+PLATFORM_CONTENT_MODELS = {
+    "xhs": ("XhsNote", "note_id"),
+    "dy": ("DouyinAweme", "aweme_id"),
+    "ks": ("KuaishouVideo", "video_id"),
+    "bili": ("BilibiliVideo", "video_id"),
+    "wb": ("WeiboNote", "note_id"),
+    "tieba": ("TiebaNote", "note_id"),
+    "zhihu": ("ZhihuContent", "content_id"),
+}
+
+_COUNT_UNITS = (("万", 10000), ("w", 10000), ("k", 1000))
+
+
+def parse_count(value) -> int:
+    """把 "7.9万"、"1.2K"、"3w"、"123" 等计数换算为整数，无法解析时返回 0"""
+    if value is None or value == "":
+        return 0
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    text = str(value).strip().lower().replace(",", "")
+    multiplier = 1
+    for unit, unit_value in _COUNT_UNITS:
+        if unit in text:
+            text = text.replace(unit, "").strip()
+            multiplier = unit_value
+            break
+    try:
+        return int(float(text) * multiplier)
+    except (TypeError, ValueError):
+        return 0
+
+
+def source_fields(platform: str) -> List[str]:
+    """平台内容表中与互动数据相关的字段名"""
+    return list(PLATFORM_INTERACTION_SOURCES.get(platform, {}).values()) + ["ip_location"]
+
+
+def _get_value(source, field: str):
+    if isinstance(source, dict):
+        return source.get(field)
+    return getattr(source, field, None)
+
+
+def extract_interactions(platform: str, source) -> Dict:
+    """
+    从平台内容记录（模型实例或爬虫 content_item dict）提取 monitor_feed 互动字段
+
+    Returns:
+        {"liked_count": int, "comment_count": int, "share_count": int,
+         "collected_count": int, "ip_location": str | None}
+    """
+    mapping = PLATFORM_INTERACTION_SOURCES.get(platform, {})
+    interactions = {
+        field: parse_count(_get_value(source, mapping[field])) if field in mapping else 0
+        for field in INTERACTION_COUNT_FIELDS
+    }
+    ip_location: Optional[str] = _get_value(source, "ip_location")
+    interactions["ip_location"] = str(ip_location)[:255] if ip_location else None
+    return interactions
+
+
+def refresh_feed_interactions(platform: Optional[str] = None, chunk_size: int = 500, get_model=None) -> int:
+    """
+    从平台内容表回填 monitor_feed 的互动字段
+
+    Args:
+        platform: 仅处理指定平台，默认全部
+        chunk_size: 每批处理的 monitor_feed 行数
+        get_model: (app_label, model_name) -> 模型，数据迁移中传入 apps.get_model
+
+    Returns:
+        更新的行数
+    """
+    from django.db import models
+
+    if get_model is None:
+        from django.apps import apps
+        get_model = apps.get_model
+
+    feed_model = get_model("media_platform", "MonitorFeed")
+    platforms = [platform] if platform else list(PLATFORM_CONTENT_MODELS)
+    updated = 0
+    for platform_code in platforms:
+        if platform_code not in PLATFORM_CONTENT_MODELS:
+            continue
+        model_name, id_field = PLATFORM_CONTENT_MODELS[platform_code]
+        content_model = get_model("media_platform", model_name)
+        numeric_id = isinstance(content_model._meta.get_field(id_field), models.IntegerField)
+        fields = source_fields(platform_code)
+
+        last_id = 0
+        while True:
+            feeds = list(
+                feed_model.objects.filter(platform=platform_code, id__gt=last_id)
+                .order_by("id")
+                .only("id", "content_id")[:chunk_size]
+            )
+            if not feeds:
+                break
+            last_id = feeds[-1].id
+
+            content_ids = [feed.content_id for feed in feeds if feed.content_id]
+            if numeric_id:
+                content_ids = [cid for cid in content_ids if cid.isdigit()]
+            sources = {
+                str(row[id_field]): row
+                for row in content_model.objects.filter(**{f"{id_field}__in": content_ids})
+                .values(id_field, *fields)
+            }
+
+            changed = []
+            for feed in feeds:
+                source = sources.get(feed.content_id)
+                if source is None:
+                    continue
+                for field, value in extract_interactions(platform_code, source).items():
+                    setattr(feed, field, value)
+                changed.append(feed)
+            if changed:
+                feed_model.objects.bulk_update(changed, list(INTERACTION_FIELDS), batch_size=chunk_size)
+                updated += len(changed)
+    return updated
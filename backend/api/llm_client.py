@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+智谱 AI 对话接口的异步客户端
+
+- 连接池：httpx.AsyncClient 与事件循环绑定，每个事件循环复用一个客户端
+  （AI 分析任务都在 api/ai_jobs.py 的后台事件循环中执行，即每个进程一个客户端）
+- 并发上限：同时在途的请求数不超过 LLM_MAX_CONCURRENCY
+- 限流：进程内令牌桶，平均 LLM_RATE_LIMIT 次/秒，允许 LLM_RATE_BURST 次突发
+- 重试：超时、连接错误、429 和 5xx 最多重试 LLM_MAX_RETRIES 次，指数退避 + 随机抖动
+- 熔断：连续 LLM_BREAKER_FAILURES 次失败后熔断 LLM_BREAKER_COOLDOWN 秒，期间直接抛出
+  LLMUnavailableError，调用方立即走兜底逻辑；冷却结束后放行一个探测请求，成功即恢复
+
+离线测试/压测可将 ZHIPU_API_URL 指向本地模拟服务（python manage.py run_llm_stub）。
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+ZHIPU_CHAT_URL = "https://open.bigmodel.cn/api/paas/v4/chat/completions"
+ZHIPU_MODEL = "glm-4.7-flash"
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class LLMUnavailableError(Exception):
+    """熔断中，未发出请求"""
+
+
+def _setting(name: str, default):
+    return type(default)(getattr(settings, name, default))
+
+
+def get_api_key() -> Optional[str]:
+    return os.environ.get("ZHIPU_API_KEY")
+
+
+def get_chat_url() -> str:
+    return getattr(settings, "ZHIPU_API_URL", None) or ZHIPU_CHAT_URL
+
+
+class TokenBucket:
+    """
+    令牌桶限流（线程安全，不绑定事件循环）
+
+    令牌不足时预占一个令牌（余额可为负）并等待到该令牌生成，排队的请求按到达顺序依次放行。
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """取一个令牌，返回需要等待的秒数"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class CircuitBreaker:
+    """
+    连续失败计数熔断器
+
+    closed: 正常放行；连续失败 failure_threshold 次后 open
+    open: cooldown 秒内拒绝所有请求；之后 half-open，只放行一个探测请求
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = max(failure_threshold, 1)
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = self.CLOSED
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                # 放行一个探测请求，结果返回前其余请求仍被拒绝
+                self._state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"LLM circuit opened after {self._failures} consecutive failures")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class _LoopResources:
+    def __init__(self):
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(_setting("LLM_TIMEOUT", 90.0), connect=10.0),
+            limits=httpx.Limits(max_connections=_setting("LLM_MAX_CONCURRENCY", 4) * 2),
+            verify=True,
+        )
+        self.semaphore = asyncio.Semaphore(max(_setting("LLM_MAX_CONCURRENCY", 4), 1))
+
+
+_loop_resources: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopResources]" = weakref.WeakKeyDictionary()
+_state_lock = threading.Lock()
+_rate_limiter: Optional[TokenBucket] = None
+_breaker: Optional[CircuitBreaker] = None
+
+
+def _resources() -> _LoopResources:
+    loop = asyncio.get_running_loop()
+    resources = _loop_resources.get(loop)
+    if resources is None or resources.client.is_closed:
+        resources = _LoopResources()
+        _loop_resources[loop] = resources
+    return resources
+
+
+def get_client() -> httpx.AsyncClient:
+    """当前事件循环的共享 AsyncClient"""
+    return _resources().client
+
+
+def get_rate_limiter() -> TokenBucket:
+    global _rate_limiter
+    with _state_lock:
+        if _rate_limiter is None:
+            _rate_limiter = TokenBucket(_setting("LLM_RATE_LIMIT", 2.0), _setting("LLM_RATE_BURST", 4.0))
+        return _rate_limiter
+
+
+def get_breaker() -> CircuitBreaker:
+    global _breaker
+    with _state_lock:
+        if _breaker is None:
+            _breaker = CircuitBreaker(_setting("LLM_BREAKER_FAILURES", 5), _setting("LLM_BREAKER_COOLDOWN", 30.0))
+        return _breaker
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRY_STATUS_CODES
+    return isinstance(error, (httpx.TimeoutException, httpx.TransportError))
+
+
+def _retry_delay(attempt: int, error: Exception) -> float:
+    """指数退避 + 全抖动；429 响应带 Retry-After 时以其为下限"""
+    delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+    if isinstance(error, httpx.HTTPStatusError):
+        retry_after = error.response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), RETRY_MAX_DELAY))
+    return delay
+
+
+async def _post(resources: _LoopResources, payload: dict, headers: dict) -> Dict:
+    await get_rate_limiter().acquire()
+    async with resources.semaphore:
+        response = await resources.client.post(get_chat_url(), json=payload, headers=headers)
+    response.raise_for_status()
+    return response.json()
+
+
+async def chat_completion(api_key: str, messages: List[Dict], model: str = ZHIPU_MODEL) -> Dict:
+    """
+    调用智谱 AI chat/completions 接口（含限流、重试和熔断）
+
+    Raises:
+        LLMUnavailableError: 熔断中，未发出请求
+        httpx.TimeoutException: 重试后仍超时
+        httpx.HTTPStatusError: 非 2xx 响应（可重试状态码为重试后的最后一次）
+        httpx.HTTPError: 其他请求错误
+    """
+    breaker = get_breaker()
+    if not breaker.allow():
+        raise LLMUnavailableError("AI 服务暂时不可用（熔断中）")
+
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {api_key}",
+    }
+    payload = {"model": model, "messages": messages}
+    resources = _resources()
+    max_retries = max(_setting("LLM_MAX_RETRIES", 2), 0)
+
+    for attempt in range(max_retries + 1):
+        try:
+            result = await _post(resources, payload, headers)
+        except httpx.HTTPError as e:
+            if not _is_retryable(e):
+                # 4xx（如 API Key 无效）不代表服务不可用，不计入熔断
+                breaker.record_success()
+                raise
+            if attempt == max_retries:
+                breaker.record_failure()
+                raise
+            delay = _retry_delay(attempt, e)
+            logger.warning(f"LLM request failed ({e!r}), retry {attempt + 1}/{max_retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+        except Exception:
+            # 非 JSON 响应等，同样视为失败（同时结束 half-open 的探测）
+            breaker.record_failure()
+            raise
+        else:
+            breaker.record_success()
+            return result
+
+
+def completion_text(result: Dict) -> str:
+    """取出第一条回复的文本"""
+    return (result.get("choices") or [{}])[0].get("message", {}).get("content", "") or ""
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+本地模拟的智谱 chat/completions 服务，用于离线测试和压测 api/llm_client.py
+
+可配置响应延迟、抖动、错误率和卡死（超过客户端超时）比例，返回与智谱接口相同结构的 JSON。
+只依赖标准库，启动方式:
+    python manage.py run_llm_stub --port 8765 --latency 1.5 --error-rate 0.2
+    ZHIPU_API_URL=http://127.0.0.1:8765/api/paas/v4/chat/completions python manage.py runserver
+"""
+
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_PATH = "/api/paas/v4/chat/completions"
+
+STUB_KEYWORDS = ["舆情热度", "用户讨论", "情绪反馈", "品牌口碑", "话题扩散", "负面评价", "官方回应",
+                 "网友观点", "热门评论", "传播趋势", "关注焦点", "争议内容"]
+
+
+@dataclass
+class StubBehavior:
+    latency: float = 1.0
+    jitter: float = 0.5
+    error_rate: float = 0.0
+    error_status: int = 503
+    hang_rate: float = 0.0
+    hang_seconds: float = 120.0
+
+
+@dataclass
+class StubStats:
+    requests: int = 0
+    errors: int = 0
+    hangs: int = 0
+
+    def __post_init__(self):
+        self.lock = threading.Lock()
+
+
+def _completion_content(prompt: str) -> str:
+    if "JSON" in prompt:
+        return json.dumps({
+            "keywords": STUB_KEYWORDS[:8],
+            "summary": ["模拟摘要：相关讨论热度平稳。", "模拟摘要：主要观点集中在产品体验。", "模拟摘要：暂无明显风险扩散。"],
+            "risks": [{"level": "low", "trigger": "模拟风险", "reason": "本地模拟服务返回的示例风险"}],
+        }, ensure_ascii=False)
+    return "\n".join(f"{i}. {word}" for i, word in enumerate(STUB_KEYWORDS, 1))
+
+
+def _completion(prompt: str, model: str) -> dict:
+    content = _completion_content(prompt)
+    return {
+        "id": f"stub-{int(time.time() * 1000)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": len(prompt), "completion_tokens": len(content),
+                  "total_tokens": len(prompt) + len(content)},
+    }
+
+
+def make_handler(behavior: StubBehavior, stats: StubStats):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status_code: int, data: dict):
+            body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+            self.send_response(status_code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._send_json(400, {"error": {"code": "1210", "message": "invalid json"}})
+                return
+            if self.path.split("?")[0] != STUB_PATH:
+                self._send_json(404, {"error": {"code": "404", "message": "not found"}})
+                return
+
+            with stats.lock:
+                stats.requests += 1
+            roll = random.random()
+            if roll < behavior.hang_rate:
+                with stats.lock:
+                    stats.hangs += 1
+                time.sleep(behavior.hang_seconds)
+            else:
+                time.sleep(max(0.0, behavior.latency + random.uniform(-behavior.jitter, behavior.jitter)))
+            if roll >= behavior.hang_rate and roll < behavior.hang_rate + behavior.error_rate:
+                with stats.lock:
+                    stats.errors += 1
+                self._send_json(behavior.error_status, {"error": {"code": "1302", "message": "stub failure"}})
+                return
+
+            messages = payload.get("messages") or [{}]
+            prompt = str(messages[-1].get("content") or "")
+            self._send_json(200, _completion(prompt, payload.get("model") or "stub"))
+
+    return StubHandler
+
+
+def create_server(host: str = "127.0.0.1", port: int = 8765,
+                  behavior: StubBehavior = None) -> ThreadingHTTPServer:
+    """创建模拟服务（调用方负责 serve_forever / shutdown）；server.stats 为请求计数"""
+    behavior = behavior or StubBehavior()
+    stats = StubStats()
+    server = ThreadingHTTPServer((host, port), make_handler(behavior, stats))
+    server.daemon_threads = True
+    server.stats = stats
+    server.behavior = behavior
+    return server
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+为 monitor_feed 中 sentiment_score 为空的记录回填情绪分析结果
+
+用法:
+    python manage.py backfill_sentiment
+    python manage.py backfill_sentiment --platform xhs --chunk-size 1000
+    # 词表调整后重算全部记录，8 个进程并行打分
+    python manage.py backfill_sentiment --rescore --workers 8 --chunk-size 20000
+"""
+
+from django.core.management.base import BaseCommand
+
+from api.sentiment_backfill import DEFAULT_CHUNK_SIZE, backfill_sentiment
+
+
+class Command(BaseCommand):
+    help = "Score monitor_feed rows that have no sentiment_score yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--platform", help="Only backfill rows of this platform code")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                            help="Rows scored and written per batch")
+        parser.add_argument("--limit", type=int, default=None, help="Stop after this many rows")
+        parser.add_argument("--rescore", action="store_true",
+                            help="Rescore all rows, not only unscored ones (only changed rows are written)")
+        parser.add_argument("--workers", type=int, default=1,
+                            help="Scoring processes; use a larger --chunk-size so each worker gets enough rows")
+
+    def handle(self, *args, **options):
+        platform = options.get("platform")
+        count = backfill_sentiment(
+            chunk_size=max(1, options["chunk_size"]),
+            platform=platform,
+            max_rows=options.get("limit"),
+            rescore=options["rescore"],
+            workers=max(1, options["workers"]),
+        )
+        scope = platform or "all platforms"
+        if options["rescore"]:
+            self.stdout.write(self.style.SUCCESS(f"Rescored sentiment of {scope}: {count} rows changed"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Backfilled sentiment for {count} rows of {scope}"))
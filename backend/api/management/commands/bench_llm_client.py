@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+压测 api/llm_client.py（并发上限、限流、重试、熔断）
+
+默认在进程内启动模拟服务（api/llm_stub.py），不访问真实接口:
+    python manage.py bench_llm_client --requests 50 --concurrency 20 --error-rate 0.3
+    python manage.py bench_llm_client --url http://127.0.0.1:8765/api/paas/v4/chat/completions
+"""
+
+import asyncio
+import threading
+import time
+
+import httpx
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from api import llm_client
+from api.llm_stub import STUB_PATH, StubBehavior, create_server
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class Command(BaseCommand):
+    help = "Benchmark the LLM client against the local stub server"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", help="Use a running stub/provider instead of an in-process stub")
+        parser.add_argument("--requests", type=int, default=50)
+        parser.add_argument("--concurrency", type=int, default=20, help="Concurrent callers")
+        parser.add_argument("--latency", type=float, default=0.5)
+        parser.add_argument("--jitter", type=float, default=0.2)
+        parser.add_argument("--error-rate", type=float, default=0.0)
+        parser.add_argument("--hang-rate", type=float, default=0.0)
+        parser.add_argument("--timeout", type=float, default=5.0, help="LLM_TIMEOUT for this run (seconds)")
+
+    def handle(self, *args, **options):
+        server = None
+        url = options.get("url")
+        if not url:
+            server = create_server("127.0.0.1", 0, StubBehavior(
+                latency=options["latency"],
+                jitter=options["jitter"],
+                error_rate=options["error_rate"],
+                hang_rate=options["hang_rate"],
+                hang_seconds=options["timeout"] * 2,
+            ))
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = f"http://127.0.0.1:{server.server_address[1]}{STUB_PATH}"
+
+        try:
+            with override_settings(ZHIPU_API_URL=url, LLM_TIMEOUT=options["timeout"]):
+                results = asyncio.run(self._run(options["requests"], options["concurrency"]))
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+
+        latencies, outcomes, elapsed = results
+        self.stdout.write(f"url: {url}")
+        self.stdout.write(f"requests: {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:.1f} req/s)")
+        for outcome, count in sorted(outcomes.items()):
+            self.stdout.write(f"  {outcome}: {count}")
+        self.stdout.write(
+            f"latency p50 {_percentile(latencies, 0.5):.3f}s  p95 {_percentile(latencies, 0.95):.3f}s  "
+            f"max {max(latencies, default=0):.3f}s"
+        )
+        self.stdout.write(f"circuit: {llm_client.get_breaker().state}")
+        if server is not None:
+            self.stdout.write(f"stub served {server.stats.requests} requests ({server.stats.errors} errors, "
+                              f"{server.stats.hangs} hangs)")
+
+    async def _run(self, total, concurrency):
+        latencies = []
+        outcomes = {}
+        queue = asyncio.Queue()
+        for i in range(total):
+            queue.put_nowait(i)
+        messages = [{"role": "user", "content": "请列出10-15个关于\"测试\"在所有平台的关键词，每行一个。"}]
+
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                started = time.perf_counter()
+                try:
+                    await llm_client.chat_completion("stub-key", messages)
+                    outcome = "ok"
+                except llm_client.LLMUnavailableError:
+                    outcome = "circuit_open"
+                except httpx.TimeoutException:
+                    outcome = "timeout"
+                except httpx.HTTPStatusError as e:
+                    outcome = f"http_{e.response.status_code}"
+                except httpx.HTTPError as e:
+                    outcome = type(e).__name__
+                latencies.append(time.perf_counter() - started)
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        try:
+            await llm_client.get_client().aclose()
+        except Exception:
+            pass
+        return latencies, outcomes, time.perf_counter() - started
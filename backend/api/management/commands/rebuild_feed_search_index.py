@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+重建 monitor_feed 关键词检索的 jieba 倒排表（monitor_feed_token）
+
+MySQL 使用 FULLTEXT 索引，无需执行本命令。
+
+用法:
+    python manage.py rebuild_feed_search_index
+    python manage.py rebuild_feed_search_index --platform xhs
+"""
+
+from django.core.management.base import BaseCommand
+
+from api.feed_search import rebuild_search_index, use_fulltext_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the monitor_feed_token keyword index (not needed on MySQL)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--platform", help="Only rebuild rows of this platform code")
+        parser.add_argument("--chunk-size", type=int, default=500, help="monitor_feed rows per batch")
+
+    def handle(self, *args, **options):
+        if use_fulltext_index():
+            self.stdout.write("MySQL uses the FULLTEXT index on monitor_feed, nothing to rebuild")
+            return
+        platform = options.get("platform")
+        count = rebuild_search_index(platform=platform, chunk_size=max(1, options["chunk_size"]))
+        scope = platform or "all platforms"
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} monitor_feed rows of {scope}"))
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+从 monitor_feed 全量重建 monitor_feed_rollup
+
+用法:
+    python manage.py rebuild_monitor_feed_rollup
+    python manage.py rebuild_monitor_feed_rollup --platform xhs
+"""
+
+from django.core.management.base import BaseCommand
+
+from api.rollup import rebuild_rollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild the monitor_feed_rollup sentiment summary table from monitor_feed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--platform", help="Only rebuild rows of this platform code")
+
+    def handle(self, *args, **options):
+        platform = options.get("platform")
+        count = rebuild_rollup(platform=platform)
+        scope = platform or "all platforms"
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} rollup rows for {scope}"))
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+从平台内容表回填 monitor_feed 的点赞/评论/分享/收藏数和 IP 属地
+
+用法:
+    python manage.py refresh_feed_interactions
+    python manage.py refresh_feed_interactions --platform xhs
+"""
+
+from django.core.management.base import BaseCommand
+
+from api.feed_cache import bump_data_version
+from api.interactions import refresh_feed_interactions
+
+
+class Command(BaseCommand):
+    help = "Copy interaction counters from the platform content tables into monitor_feed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--platform", help="Only refresh rows of this platform code")
+        parser.add_argument("--chunk-size", type=int, default=500, help="monitor_feed rows per batch")
+
+    def handle(self, *args, **options):
+        platform = options.get("platform")
+        count = refresh_feed_interactions(platform=platform, chunk_size=max(1, options["chunk_size"]))
+        if count:
+            bump_data_version(platform)
+        scope = platform or "all platforms"
+        self.stdout.write(self.style.SUCCESS(f"Refreshed interactions for {count} rows of {scope}"))
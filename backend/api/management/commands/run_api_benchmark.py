@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+接口性能基准：在独立 SQLite 库中生成百万级合成数据，通过 Django 测试客户端压测列表、统计和 AI 接口，
+输出各场景的 p50/p95 延迟和查询数（AI 分析使用进程内的模拟大模型服务 api/llm_stub.py）
+
+用法:
+    python manage.py run_api_benchmark --settings=mediacrawler_config.settings_benchmark
+    python manage.py run_api_benchmark --settings=mediacrawler_config.settings_benchmark --rows 2000000 --regenerate
+    python manage.py run_api_benchmark --settings=mediacrawler_config.settings_benchmark --only all_feed,sensitive_feed --json bench.json
+
+数据只在库中行数与 --rows 不一致或传入 --regenerate 时重新生成，之后的运行复用同一份数据。
+"""
+
+import json
+import os
+import threading
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+
+from api import benchmark
+from api.llm_stub import STUB_PATH, StubBehavior, create_server
+from media_platform.models import MonitorFeed
+
+
+class Command(BaseCommand):
+    help = "Benchmark feed/stats/AI endpoints on a synthetic SQLite dataset (use settings_benchmark)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000, help="monitor_feed rows to generate")
+        parser.add_argument("--content-ratio", type=float, default=1.0,
+                            help="Share of feed rows that also get a platform content row")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--regenerate", action="store_true", help="Drop and regenerate the dataset")
+        parser.add_argument("--no-search-index", action="store_true",
+                            help="Skip monitor_feed_token rows (q= and AI keyword matching then find nothing)")
+        parser.add_argument("--iterations", type=int, default=20, help="Requests per scenario")
+        parser.add_argument("--warm", action="store_true",
+                            help="Keep response/count/AI caches between requests (default: clear before each)")
+        parser.add_argument("--only", help="Comma-separated scenario names")
+        parser.add_argument("--llm-latency", type=float, default=0.2, help="Stub LLM latency (seconds)")
+        parser.add_argument("--json", dest="json_path", help="Also write the results to this JSON file")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError(
+                "The benchmark writes synthetic data; run it against SQLite with "
+                "--settings=mediacrawler_config.settings_benchmark"
+            )
+
+        scenarios = benchmark.DEFAULT_SCENARIOS
+        if options["only"]:
+            names = {name.strip() for name in options["only"].split(",") if name.strip()}
+            unknown = names - {scenario.name for scenario in scenarios}
+            if unknown:
+                raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+            scenarios = [scenario for scenario in scenarios if scenario.name in names]
+
+        self._prepare_dataset(options)
+
+        server = create_server("127.0.0.1", 0, StubBehavior(latency=options["llm_latency"], jitter=0.0))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        llm_url = f"http://127.0.0.1:{server.server_address[1]}{STUB_PATH}"
+        previous_key = os.environ.get("ZHIPU_API_KEY")
+        os.environ["ZHIPU_API_KEY"] = "benchmark-stub"
+        results = []
+        try:
+            with override_settings(ZHIPU_API_URL=llm_url):
+                client = Client()
+                for scenario in scenarios:
+                    result = benchmark.run_scenario(
+                        client, scenario, max(options["iterations"], 1), cold=not options["warm"]
+                    )
+                    results.append(result)
+                    self.stdout.write(
+                        f"  {result['name']:<26} p50 {result['p50_ms']:>9.1f} ms  p95 {result['p95_ms']:>9.1f} ms  "
+                        f"queries {result['avg_queries']:>5.1f}  status {result['statuses']}"
+                    )
+        finally:
+            if previous_key is None:
+                os.environ.pop("ZHIPU_API_KEY", None)
+            else:
+                os.environ["ZHIPU_API_KEY"] = previous_key
+            server.shutdown()
+            server.server_close()
+
+        self._print_summary(results)
+        if options["json_path"]:
+            report = {
+                "generated_at": int(time.time()),
+                "rows": MonitorFeed.objects.count(),
+                "seed": options["seed"],
+                "iterations": options["iterations"],
+                "cache": "warm" if options["warm"] else "cold",
+                "results": results,
+            }
+            with open(options["json_path"], "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(f"Results written to {options['json_path']}")
+
+    def _prepare_dataset(self, options):
+        call_command("migrate", run_syncdb=True, verbosity=0)
+        rows = options["rows"]
+        existing = MonitorFeed.objects.count()
+        if existing == rows and not options["regenerate"]:
+            self.stdout.write(f"Reusing existing dataset ({existing} monitor_feed rows)")
+            return
+        if existing:
+            self.stdout.write(f"Clearing existing dataset ({existing} monitor_feed rows)")
+            benchmark.clear_dataset()
+
+        self.stdout.write(f"Generating {rows} monitor_feed rows (seed {options['seed']})...")
+        started = time.perf_counter()
+        counts = benchmark.generate_dataset(
+            rows,
+            seed=options["seed"],
+            content_ratio=options["content_ratio"],
+            search_index=not options["no_search_index"],
+            progress=lambda done: self.stdout.write(f"  {done} rows"),
+        )
+        self.stdout.write(f"Generated in {time.perf_counter() - started:.1f}s:")
+        for table, count in counts.items():
+            self.stdout.write(f"  {table}: {count}")
+
+    def _print_summary(self, results):
+        self.stdout.write("")
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{'scenario':<26} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'avg q':>7} {'max q':>6}"
+        ))
+        for result in results:
+            self.stdout.write(
+                f"{result['name']:<26} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} "
+                f"{result['max_ms']:>9.1f} {result['avg_queries']:>7.1f} {result['max_queries']:>6}"
+            )
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+启动本地模拟的智谱 AI 服务（见 api/llm_stub.py）
+
+用法:
+    python manage.py run_llm_stub
+    python manage.py run_llm_stub --port 8765 --latency 2 --jitter 1 --error-rate 0.3 --hang-rate 0.05
+然后设置 ZHIPU_API_URL=http://127.0.0.1:8765/api/paas/v4/chat/completions
+"""
+
+from django.core.management.base import BaseCommand
+
+from api.llm_stub import STUB_PATH, StubBehavior, create_server
+
+
+class Command(BaseCommand):
+    help = "Run a local stub of the Zhipu chat/completions API with configurable latency and failures"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--latency", type=float, default=1.0, help="Mean response latency in seconds")
+        parser.add_argument("--jitter", type=float, default=0.5, help="Uniform latency jitter in seconds")
+        parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with --error-status")
+        parser.add_argument("--error-status", type=int, default=503)
+        parser.add_argument("--hang-rate", type=float, default=0.0,
+                            help="Fraction of requests that stall for --hang-seconds (client timeouts)")
+        parser.add_argument("--hang-seconds", type=float, default=120.0)
+
+    def handle(self, *args, **options):
+        behavior = StubBehavior(
+            latency=options["latency"],
+            jitter=options["jitter"],
+            error_rate=options["error_rate"],
+            error_status=options["error_status"],
+            hang_rate=options["hang_rate"],
+            hang_seconds=options["hang_seconds"],
+        )
+        server = create_server(options["host"], options["port"], behavior)
+        self.stdout.write(self.style.SUCCESS(
+            f"LLM stub listening on http://{options['host']}:{options['port']}{STUB_PATH} ({behavior})"
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            stats = server.stats
+            self.stdout.write(f"Served {stats.requests} requests ({stats.errors} errors, {stats.hangs} hangs)")
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+汇总 QUERY_PROFILING 记录的慢请求日志：按接口统计耗时分位数和查询数，列出最慢和重复执行最多的 SQL
+
+用法:
+    python manage.py summarize_slow_requests
+    python manage.py summarize_slow_requests --hours 24 --top 10
+    python manage.py summarize_slow_requests --route /api/monitor --file logs/slow_requests.jsonl
+"""
+
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def _log_files(path: Path):
+    """日志文件及 RotatingFileHandler 的轮转文件（.1、.2 ...），按时间从旧到新"""
+    rotated = sorted(
+        (p for p in path.parent.glob(f"{path.name}.*") if p.suffix.lstrip(".").isdigit()),
+        key=lambda p: int(p.suffix.lstrip(".")),
+        reverse=True,
+    )
+    return rotated + ([path] if path.exists() else [])
+
+
+def _percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _shorten(sql: str, width: int = 160) -> str:
+    sql = " ".join(sql.split())
+    return sql if len(sql) <= width else sql[:width - 3] + "..."
+
+
+class Command(BaseCommand):
+    help = "Summarize the slow request log written by QUERY_PROFILING (per-route latency, query counts, worst SQL)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", help="Log file (default: QUERY_PROFILING_LOG)")
+        parser.add_argument("--hours", type=float, default=None, help="Only include requests from the last N hours")
+        parser.add_argument("--route", default=None, help="Only include routes starting with this prefix")
+        parser.add_argument("--top", type=int, default=10, help="Number of routes / SQL statements to list")
+
+    def handle(self, *args, **options):
+        path = Path(options["file"] or getattr(
+            settings, "QUERY_PROFILING_LOG", settings.BASE_DIR / "logs" / "slow_requests.jsonl"
+        ))
+        files = _log_files(path)
+        if not files:
+            raise CommandError(f"No slow request log found at {path}")
+
+        since = time.time() - options["hours"] * 3600 if options["hours"] else None
+        route_prefix = options["route"]
+        top = max(options["top"], 1)
+
+        routes = defaultdict(list)
+        slow_sql = {}
+        repeated_sql = defaultdict(lambda: {"requests": 0, "max_count": 0})
+        skipped = 0
+        for log_file in files:
+            with open(log_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        skipped += 1
+                        continue
+                    if since and record.get("ts", 0) < since:
+                        continue
+                    route = f"{record.get('method', '')} {record.get('route') or record.get('path', '')}"
+                    if route_prefix and not (record.get("route") or "").startswith(route_prefix):
+                        continue
+                    routes[route].append(record)
+                    for query in record.get("slowest") or []:
+                        stats = slow_sql.setdefault(query["sql"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "route": route})
+                        stats["count"] += 1
+                        stats["total_ms"] += query["ms"]
+                        stats["max_ms"] = max(stats["max_ms"], query["ms"])
+                    for query in record.get("repeated") or []:
+                        stats = repeated_sql[query["sql"]]
+                        stats["requests"] += 1
+                        stats["max_count"] = max(stats["max_count"], query["count"])
+                        stats["route"] = route
+
+        total_requests = sum(len(records) for records in routes.values())
+        if not total_requests:
+            self.stdout.write("No matching slow requests.")
+            return
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{total_requests} slow requests from {len(files)} file(s)"
+            + (f", {skipped} unparsable line(s) skipped" if skipped else "")
+        ))
+        self.stdout.write("")
+        self.stdout.write(f"{'route':<48} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} "
+                          f"{'db %':>6} {'avg q':>7} {'max q':>6}")
+        ranked = sorted(routes.items(), key=lambda item: sum(r["total_ms"] for r in item[1]), reverse=True)
+        for route, records in ranked[:top]:
+            totals = [r["total_ms"] for r in records]
+            db_share = sum(r["db_ms"] for r in records) / max(sum(totals), 1e-9) * 100
+            queries = [r["queries"] for r in records]
+            self.stdout.write(
+                f"{route[:48]:<48} {len(records):>6} {_percentile(totals, 50):>9.1f} "
+                f"{_percentile(totals, 95):>9.1f} {max(totals):>9.1f} {db_share:>6.1f} "
+                f"{sum(queries) / len(queries):>7.1f} {max(queries):>6}"
+            )
+
+        if slow_sql:
+            self.stdout.write("")
+            self.stdout.write(self.style.MIGRATE_HEADING("Slowest SQL (by max duration)"))
+            for sql, stats in sorted(slow_sql.items(), key=lambda item: item[1]["max_ms"], reverse=True)[:top]:
+                self.stdout.write(
+                    f"  max {stats['max_ms']:.1f} ms, avg {stats['total_ms'] / stats['count']:.1f} ms, "
+                    f"seen {stats['count']}x  [{stats['route']}]"
+                )
+                self.stdout.write(f"    {_shorten(sql)}")
+
+        if repeated_sql:
+            self.stdout.write("")
+            self.stdout.write(self.style.MIGRATE_HEADING("Repeated SQL within one request (possible N+1)"))
+            for sql, stats in sorted(repeated_sql.items(), key=lambda item: item[1]["max_count"], reverse=True)[:top]:
+                self.stdout.write(
+                    f"  up to {stats['max_count']}x per request, in {stats['requests']} request(s)  [{stats['route']}]"
+                )
+                self.stdout.write(f"    {_shorten(sql)}")
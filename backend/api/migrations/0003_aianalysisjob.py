@@ -0,0 +1,79 @@
+# Generated by Django 5.0.14 on 2026-10-18 19:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0002_aiusagerecord"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AIAnalysisJob",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                (
+                    "job_key",
+                    models.CharField(
+                        help_text="分析参数 + monitor_feed 数据水位的摘要，相同键的任务共享结果",
+                        max_length=64,
+                        verbose_name="任务键",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("keywords", "关键词分析"), ("analysis", "聚合分析")],
+                        max_length=20,
+                        verbose_name="任务类型",
+                    ),
+                ),
+                ("params", models.JSONField(verbose_name="分析参数")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "等待中"),
+                            ("running", "执行中"),
+                            ("success", "成功"),
+                            ("failed", "失败"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                        verbose_name="状态",
+                    ),
+                ),
+                (
+                    "result",
+                    models.JSONField(blank=True, null=True, verbose_name="分析结果"),
+                ),
+                (
+                    "status_code",
+                    models.IntegerField(blank=True, null=True, verbose_name="结果状态码"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, db_index=True, verbose_name="创建时间"
+                    ),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="完成时间"),
+                ),
+            ],
+            options={
+                "verbose_name": "AI分析任务",
+                "verbose_name_plural": "AI分析任务",
+                "db_table": "ai_analysis_job",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["job_key", "status"], name="ai_job_key_status_idx"
+                    )
+                ],
+            },
+        ),
+    ]
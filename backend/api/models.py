@@ -68,6 +68,80 @@ class AIUsageRecord(models.Model):
         return f'{self.keyword} - {self.get_platform_display()}'
 
 
+
+class AIAnalysisJob(models.Model):
+    """AI 分析任务：提交后立即返回任务 ID，后台执行，结果通过轮询接口获取"""
+
+    KIND_CHOICES = [
+        ('keywords', '关键词分析'),
+        ('analysis', '聚合分析'),
+    ]
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCESS = 'success'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '等待中'),
+        (STATUS_RUNNING, '执行中'),
+        (STATUS_SUCCESS, '成功'),
+        (STATUS_FAILED, '失败'),
+    ]
+
+    id = models.AutoField(primary_key=True)
+    job_key = models.CharField(
+        max_length=64,
+        verbose_name='任务键',
+        help_text='分析参数 + monitor_feed 数据水位的摘要，相同键的任务共享结果'
+    )
+    kind = models.CharField(
+        max_length=20,
+        choices=KIND_CHOICES,
+        verbose_name='任务类型'
+    )
+    params = models.JSONField(verbose_name='分析参数')
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        verbose_name='状态'
+    )
+    result = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name='分析结果'
+    )
+    status_code = models.IntegerField(
+        null=True,
+        blank=True,
+        verbose_name='结果状态码'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='创建时间',
+        db_index=True
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='完成时间'
+    )
+
+    class Meta:
+        db_table = 'ai_analysis_job'
+        verbose_name = 'AI分析任务'
+        verbose_name_plural = 'AI分析任务'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['job_key', 'status'], name='ai_job_key_status_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} #{self.id} - {self.status}'
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (self.STATUS_SUCCESS, self.STATUS_FAILED)
+
 class CookieConfig(models.Model):
     """Cookie配置模型，用于存储各平台的登录Cookie"""
 
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import os
+import time
 import django
 import logging
 
@@ -9,6 +10,10 @@ logger = logging.getLogger(__name__)
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mediacrawler_config.settings')
 django.setup()
 
+from api.feed_cache import bump_data_version
+from api.feed_search import index_feed
+from api.interactions import extract_interactions
+from api.rollup import record_feed_change, snapshot
 from api.sentiment_service import analyze_sentiment
 from media_platform.models import MonitorFeed
 
@@ -60,7 +65,15 @@ def sync_to_monitor_feed(platform: str, content_item: dict):
         sentiment = sentiment_result.get("sentiment", "neutral")
         sentiment_score = sentiment_result.get("score")
         sentiment_labels = sentiment_result.get("labels") or {}
+        # 已包含 sentiment == "sensitive"，同时作为 flagged 写入
         is_sensitive = bool(sentiment_labels.get("sensitive")) or sentiment == "sensitive"
+        interactions = extract_interactions(platform, content_item)
+        if not interactions["ip_location"]:
+            # 本次数据没有 IP 属地时保留已有值
+            interactions.pop("ip_location")
+
+        # 毫秒时间戳，作为条件请求和增量推送的数据水位
+        now_ts = int(time.time() * 1000)
 
         existing = MonitorFeed.objects.filter(
             platform=platform,
@@ -68,6 +81,7 @@ def sync_to_monitor_feed(platform: str, content_item: dict):
         ).first()
 
         if existing:
+            before = snapshot(existing)
             existing.content = content
             existing.author = author
             existing.url = url
@@ -77,10 +91,17 @@ def sync_to_monitor_feed(platform: str, content_item: dict):
             existing.sentiment_score = sentiment_score
             existing.sentiment_labels = sentiment_labels
             existing.is_sensitive = is_sensitive
+            existing.flagged = is_sensitive
+            for field, value in interactions.items():
+                setattr(existing, field, value)
+            existing.last_modify_ts = now_ts
             existing.save()
+            record_feed_change(before, snapshot(existing))
+            index_feed(existing)
+            bump_data_version(platform)
             logger.debug(f"Updated {platform} item {content_id}")
         else:
-            MonitorFeed.objects.create(
+            feed = MonitorFeed.objects.create(
                 platform=platform,
                 platform_name=PLATFORM_NAMES.get(platform, platform),
                 content_id=content_id,
@@ -93,7 +114,14 @@ def sync_to_monitor_feed(platform: str, content_item: dict):
                 sentiment_score=sentiment_score,
                 sentiment_labels=sentiment_labels,
                 is_sensitive=is_sensitive,
+                flagged=is_sensitive,
+                **interactions,
+                add_ts=now_ts,
+                last_modify_ts=now_ts,
             )
+            record_feed_change(None, snapshot(feed))
+            index_feed(feed)
+            bump_data_version(platform)
             logger.info(f"Created {platform} item {content_id}")
 
     except Exception as e:
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+MonitorFeed 游标（keyset）分页
+
+按 (created_at, id) 倒序翻页，每页只需在 `-created_at` / `platform, -created_at`
+索引上做一次范围扫描，不再随 offset 增大而变慢。游标对客户端是不透明的字符串。
+"""
+
+import base64
+import json
+from typing import Optional, Tuple
+
+from django.db.models import Q
+
+DIRECTION_NEXT = "next"
+DIRECTION_PREV = "prev"
+
+
+class InvalidCursor(ValueError):
+    """游标无法解析"""
+
+
+def encode_cursor(created_at: int, row_id: int, direction: str = DIRECTION_NEXT) -> str:
+    """将 (created_at, id) 编码为不透明的游标字符串"""
+    payload = json.dumps([int(created_at or 0), int(row_id), direction[0]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int, str]:
+    """解析游标，返回 (created_at, id, direction)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id, flag = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        direction = DIRECTION_PREV if flag == "p" else DIRECTION_NEXT
+        return int(created_at), int(row_id), direction
+    except (TypeError, ValueError, UnicodeError):
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}")
+
+
+def wants_cursor_pagination(request) -> bool:
+    """请求是否使用游标分页：显式传入 cursor 或 pagination=cursor"""
+    return "cursor" in request.GET or request.GET.get("pagination") == "cursor"
+
+
+def wants_total(request, default: bool) -> bool:
+    """是否需要返回总数（COUNT(*)），游标模式下默认不统计"""
+    raw = request.GET.get("include_total")
+    if raw is None:
+        return default
+    return raw.lower() in ("1", "true", "yes")
+
+
+def paginate_by_cursor(queryset, cursor: Optional[str], page_size: int) -> Tuple[list, dict]:
+    """
+    对 queryset 做 (created_at, id) 游标分页
+
+    Args:
+        queryset: 已过滤、尚未排序的 MonitorFeed queryset（可以是 .values() 结果）
+        cursor: 上一页返回的 next_cursor / prev_cursor，首页传 None
+        page_size: 每页条数
+
+    Returns:
+        (rows, pagination)，rows 按 created_at、id 倒序排列
+    """
+    direction = DIRECTION_NEXT
+    if cursor:
+        created_at, row_id, direction = decode_cursor(cursor)
+        if direction == DIRECTION_PREV:
+            queryset = queryset.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=row_id)
+            ).order_by("created_at", "id")
+        else:
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=row_id)
+            ).order_by("-created_at", "-id")
+    else:
+        queryset = queryset.order_by("-created_at", "-id")
+
+    # 多取一条用于判断是否还有下一页（或上一页）
+    rows = list(queryset[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if direction == DIRECTION_PREV:
+        rows.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, bool(cursor)
+
+    next_cursor = prev_cursor = None
+    if rows:
+        first, last = rows[0], rows[-1]
+        if has_next:
+            next_cursor = encode_cursor(_get(last, "created_at"), _get(last, "id"), DIRECTION_NEXT)
+        if has_prev:
+            prev_cursor = encode_cursor(_get(first, "created_at"), _get(first, "id"), DIRECTION_PREV)
+
+    return rows, {
+        "mode": "cursor",
+        "page_size": page_size,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+        "has_next": has_next,
+        "has_prev": has_prev,
+    }
+
+
+def _get(row, field: str):
+    if isinstance(row, dict):
+        return row.get(field)
+    return getattr(row, field, None)
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+按请求统计数据库查询（可选开启，QUERY_PROFILING=true）
+
+- 所有数据库连接安装同一个 execute wrapper，ORM 和 connection.cursor() 的原生 SQL 都会被计入；
+  当前请求的统计对象放在 contextvar 中，sync_to_async 线程里执行的查询同样归属该请求
+- 响应带 Server-Timing 头（db / app / total），浏览器开发者工具的 Timing 面板可直接查看
+- 总耗时超过 QUERY_PROFILING_SLOW_MS 或查询数超过 QUERY_PROFILING_MAX_QUERIES 的请求，
+  以 JSON 行写入 logger "api.profiling"（默认 logs/slow_requests.jsonl），
+  包含最慢的几条 SQL 和重复执行的 SQL（N+1）；用 manage.py summarize_slow_requests 汇总
+
+流式响应（SSE、导出）在返回响应后才执行的查询不计入。
+"""
+
+import contextvars
+import heapq
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from typing import List, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+SLOWEST_QUERIES = 5
+REPEATED_QUERIES = 5
+SQL_LOG_LENGTH = 1000
+
+_current_profile: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar(
+    "query_profile", default=None
+)
+
+
+class RequestProfile:
+    """单个请求的查询计数、数据库耗时和最慢的 SQL"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self._slowest = []
+        self._sql_counts = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, sql: str, duration: float, alias: str) -> None:
+        with self._lock:
+            self.queries += 1
+            self.db_time += duration
+            self._sql_counts[sql] += 1
+            entry = (duration, self.queries, sql, alias)
+            if len(self._slowest) < SLOWEST_QUERIES:
+                heapq.heappush(self._slowest, entry)
+            elif duration > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self) -> List[dict]:
+        with self._lock:
+            entries = sorted(self._slowest, reverse=True)
+        return [
+            {"sql": sql[:SQL_LOG_LENGTH], "ms": round(duration * 1000, 2), "alias": alias}
+            for duration, _, sql, alias in entries
+        ]
+
+    def repeated(self) -> List[dict]:
+        """参数不同、SQL 相同且执行多次的查询，通常是循环内查询（N+1）"""
+        with self._lock:
+            common = self._sql_counts.most_common(REPEATED_QUERIES)
+        return [{"sql": sql[:SQL_LOG_LENGTH], "count": count} for sql, count in common if count > 1]
+
+
+def _record_query(execute, sql, params, many, context):
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.add(str(sql), time.perf_counter() - started, context["connection"].alias)
+
+
+def _install_wrapper(connection, **kwargs) -> None:
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def install_query_recorder() -> None:
+    """为现有和之后建立的数据库连接安装查询记录器（重复调用无副作用）"""
+    connection_created.connect(_install_wrapper, dispatch_uid="api.profiling.install_wrapper")
+    for connection in connections.all(initialized_only=True):
+        _install_wrapper(connection)
+
+
+def profiling_enabled() -> bool:
+    return bool(getattr(settings, "QUERY_PROFILING", False))
+
+
+def _server_timing(profile: RequestProfile, total_ms: float) -> str:
+    db_ms = profile.db_time * 1000
+    return (
+        f'db;desc="{profile.queries} queries";dur={db_ms:.1f}, '
+        f"app;dur={max(total_ms - db_ms, 0):.1f}, "
+        f"total;dur={total_ms:.1f}"
+    )
+
+
+def _route(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    route = getattr(match, "route", None)
+    return f"/{route}" if route else request.path
+
+
+class QueryProfilingMiddleware:
+    """
+    统计每个请求的查询数和数据库耗时，输出 Server-Timing 头并记录慢请求
+
+    QUERY_PROFILING 关闭时抛出 MiddlewareNotUsed，Django 不会加载本中间件，无额外开销。
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not profiling_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = float(getattr(settings, "QUERY_PROFILING_SLOW_MS", 500))
+        self.max_queries = int(getattr(settings, "QUERY_PROFILING_MAX_QUERIES", 50))
+        install_query_recorder()
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        self._finish(request, response, profile)
+        return response
+
+    async def __acall__(self, request):
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        self._finish(request, response, profile)
+        return response
+
+    def _finish(self, request, response, profile: RequestProfile) -> None:
+        total_ms = (time.perf_counter() - profile.started) * 1000
+        timing = _server_timing(profile, total_ms)
+        existing = response.headers.get("Server-Timing")
+        response.headers["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+
+        if total_ms < self.slow_ms and profile.queries <= self.max_queries:
+            return
+        record = {
+            "ts": time.time(),
+            "method": request.method,
+            "route": _route(request),
+            "path": request.get_full_path(),
+            "status": response.status_code,
+            "total_ms": round(total_ms, 2),
+            "db_ms": round(profile.db_time * 1000, 2),
+            "queries": profile.queries,
+            "slowest": profile.slowest(),
+            "repeated": profile.repeated(),
+        }
+        logger.info(json.dumps(record, ensure_ascii=False, default=str))
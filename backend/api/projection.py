@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+列表接口的字段投影（fields=）
+
+fields=id,platform,created_at,sentiment 只返回指定字段，同时只从数据库读取生成这些字段所需的列，
+列表页不再为正文 content、sentiment_labels / extra_data 等 JSON 列付出读取和序列化开销。
+不传 fields 时返回全部字段。
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from api.interactions import INTERACTION_COUNT_FIELDS
+
+# 游标分页和排序依赖的列，总是读取
+KEY_COLUMNS = ("id", "created_at")
+
+# feed 列表项字段 -> 生成该字段需要读取的 monitor_feed 列
+FEED_ITEM_SOURCES: Dict[str, Tuple[str, ...]] = {
+    "id": ("id",),
+    "platform": ("platform",),
+    "platform_name": ("platform_name",),
+    "content_id": ("content_id",),
+    "content": ("content",),
+    "author": ("author",),
+    "url": ("url",),
+    "created_at": ("created_at",),
+    "sentiment": ("sentiment", "is_sensitive", "sentiment_labels"),
+    "sentiment_score": ("sentiment_score",),
+    "sentiment_labels": ("sentiment_labels",),
+    "is_sensitive": ("is_sensitive", "sentiment_labels", "sentiment"),
+}
+
+# 敏感/全部列表额外返回的互动数据（ip_location 缺失时回退到 extra_data）
+FEED_INTERACTION_SOURCES: Dict[str, Tuple[str, ...]] = {
+    "ip_location": ("ip_location", "extra_data"),
+    **{field: (field,) for field in INTERACTION_COUNT_FIELDS},
+}
+FEED_LIST_SOURCES = {**FEED_ITEM_SOURCES, **FEED_INTERACTION_SOURCES}
+
+# 数据预览行字段 -> monitor_feed 列（None 表示常量字段，无需读取）
+PREVIEW_ROW_SOURCES: Dict[str, Optional[str]] = {
+    "create_time": "created_at",
+    "created_time": "created_at",
+    "content": "content",
+    "desc": None,
+    "title": None,
+    "nickname": "author",
+    "avatar": None,
+    "ip_location": "ip_location",
+    "sentiment": "sentiment",
+    "is_sensitive": "is_sensitive",
+    "content_id": "content_id",
+    "platform": "platform",
+    "platform_name": "platform_name",
+    "url": "url",
+    **{field: field for field in INTERACTION_COUNT_FIELDS},
+}
+
+
+class InvalidFields(ValueError):
+    """fields 参数包含未知字段"""
+
+
+def parse_fields(request, allowed: Optional[Iterable[str]] = None) -> Optional[Tuple[str, ...]]:
+    """
+    解析 fields=a,b,c
+
+    Args:
+        request: DRF Request
+        allowed: 可选字段；为 None 时不校验（文件预览的列由文件决定）
+
+    Returns:
+        去重后的字段元组；未传或为空时返回 None（表示全部字段）
+
+    Raises:
+        InvalidFields: 包含 allowed 之外的字段
+    """
+    raw = request.GET.get("fields")
+    if not raw:
+        return None
+    fields = tuple(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+    if not fields:
+        return None
+    if allowed is not None:
+        allowed = list(allowed)
+        unknown = [name for name in fields if name not in allowed]
+        if unknown:
+            raise InvalidFields(
+                f"Unknown fields: {', '.join(unknown)}. Available fields: {', '.join(allowed)}"
+            )
+    return fields
+
+
+def source_columns(fields: Sequence[str], sources: Dict[str, Tuple[str, ...]]) -> List[str]:
+    """fields 对应的数据库列（含 KEY_COLUMNS），保持顺序去重"""
+    columns = dict.fromkeys(KEY_COLUMNS)
+    for name in fields:
+        columns.update(dict.fromkeys(sources[name]))
+    return list(columns)
+
+
+def project(item: dict, fields: Optional[Sequence[str]]) -> dict:
+    """只保留 fields 中的键（按 fields 的顺序），fields 为 None 时原样返回"""
+    if fields is None:
+        return item
+    return {name: item[name] for name in fields if name in item}
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+基于 orjson 的 DRF JSON 渲染器
+
+列表接口一页几百条记录时，标准库 json 的序列化是响应耗时的主要部分；orjson 快数倍且直接输出 UTF-8 字节。
+输出与 DRF JSONRenderer 一致（不转义中文、紧凑格式，日期时间沿用 DRF 的格式）；请求指定缩进（Accept: application/json; indent=2）
+或未安装 orjson 时退回 DRF 自带实现。orjson 不认识的类型（Decimal、惰性翻译字符串等）交给 DRF 的
+JSONEncoder 处理。
+"""
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 可选依赖
+    orjson = None
+
+_fallback_encoder = JSONEncoder()
+
+if orjson is not None:
+    # datetime 交给 DRF 编码器，保持与 JSONRenderer 相同的输出（毫秒精度、UTC 记为 Z）
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+else:
+    ORJSON_OPTIONS = 0
+
+
+def _default(obj):
+    return _fallback_encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """orjson 版 JSONRenderer，作为 REST_FRAMEWORK 的默认渲染器"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+monitor_feed 情绪汇总表（monitor_feed_rollup）
+
+按 (platform, day, sentiment, is_sensitive) 维护条数与情绪分数之和，由同步写入路径
+增量更新。仪表盘统计只需读取 平台数 × 天数 量级的汇总行，不再扫描整张 monitor_feed。
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Coalesce, NullIf
+
+from api.time_buckets import (
+    EPOCH_DATE,
+    SECONDS_PER_DAY,
+    epoch_bucket_expression,
+    feed_day,
+    local_utc_offset_seconds,
+)
+from media_platform.models import MonitorFeed, MonitorFeedRollup
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_FIELDS = ("platform", "created_at", "sentiment", "is_sensitive", "sentiment_score")
+
+
+def snapshot(feed) -> Optional[Dict]:
+    """提取影响汇总的字段，feed 可以是模型实例或 dict"""
+    if feed is None:
+        return None
+    if isinstance(feed, dict):
+        return {field: feed.get(field) for field in ROLLUP_FIELDS}
+    return {field: getattr(feed, field, None) for field in ROLLUP_FIELDS}
+
+
+def _bucket_key(platform: str, created_at, sentiment: Optional[str], is_sensitive) -> Tuple:
+    return platform, feed_day(created_at), sentiment or "neutral", bool(is_sensitive)
+
+
+def _apply_bucket(key: Tuple, feed_count: int, scored_count: int, score_sum: float) -> None:
+    """对单个汇总桶加减条数/已打分条数/分数之和"""
+    platform, day, sentiment, is_sensitive = key
+    lookup = {"platform": platform, "day": day, "sentiment": sentiment, "is_sensitive": is_sensitive}
+    updates = {
+        "feed_count": F("feed_count") + feed_count,
+        "scored_count": F("scored_count") + scored_count,
+        "score_sum": F("score_sum") + score_sum,
+    }
+
+    if MonitorFeedRollup.objects.filter(**lookup).update(**updates):
+        return
+    if feed_count <= 0:
+        # 汇总表缺少该桶（尚未重建），忽略扣减，等待 rebuild 校正
+        return
+    try:
+        with transaction.atomic():
+            MonitorFeedRollup.objects.create(
+                **lookup,
+                feed_count=feed_count,
+                scored_count=scored_count,
+                score_sum=score_sum,
+            )
+    except IntegrityError:
+        # 并发写入时桶已被其他进程创建，改为更新
+        MonitorFeedRollup.objects.filter(**lookup).update(**updates)
+
+
+def apply_delta(platform: str, created_at, sentiment: Optional[str], is_sensitive,
+                sentiment_score=None, delta: int = 1) -> None:
+    """对单个汇总桶加减一条记录"""
+    if not platform or not delta:
+        return
+    scored = 1 if sentiment_score is not None else 0
+    _apply_bucket(
+        _bucket_key(platform, created_at, sentiment, is_sensitive),
+        delta,
+        scored * delta,
+        float(sentiment_score or 0) * delta,
+    )
+
+
+def record_feed_change(before: Optional[Dict], after: Optional[Dict]) -> None:
+    """
+    根据写入前后的快照调整汇总表
+
+    Args:
+        before: 写入前的 snapshot()，新建记录时为 None
+        after: 写入后的 snapshot()，删除记录时为 None
+    """
+    if before == after:
+        return
+    try:
+        if before:
+            apply_delta(delta=-1, **before)
+        if after:
+            apply_delta(delta=1, **after)
+    except Exception as e:
+        logger.error(f"Failed to update monitor_feed_rollup: {e}", exc_info=True)
+
+
+class RollupChanges:
+    """
+    批量写入时累计汇总表的变化，按 (platform, day, sentiment, is_sensitive) 合并后每个桶只写一次
+
+    用法:
+        changes = RollupChanges()
+        for feed in chunk:
+            before = snapshot(feed)
+            ...
+            changes.record(before, snapshot(feed))
+        MonitorFeed.objects.bulk_update(chunk, fields)
+        changes.apply()
+    """
+
+    def __init__(self):
+        self._buckets: Dict[Tuple, List] = defaultdict(lambda: [0, 0, 0.0])
+
+    def _add(self, snap: Dict, delta: int) -> None:
+        if not snap.get("platform"):
+            return
+        counts = self._buckets[
+            _bucket_key(snap["platform"], snap.get("created_at"), snap.get("sentiment"), snap.get("is_sensitive"))
+        ]
+        counts[0] += delta
+        if snap.get("sentiment_score") is not None:
+            counts[1] += delta
+            counts[2] += float(snap["sentiment_score"]) * delta
+
+    def record(self, before: Optional[Dict], after: Optional[Dict]) -> None:
+        """与 record_feed_change 参数相同，只累计不写库"""
+        if before == after:
+            return
+        if before:
+            self._add(before, -1)
+        if after:
+            self._add(after, 1)
+
+    def apply(self) -> int:
+        """写入累计的变化并清空，返回写入的桶数"""
+        buckets = [(key, counts) for key, counts in self._buckets.items() if counts[0] or counts[1] or counts[2]]
+        self._buckets.clear()
+        try:
+            for key, (feed_count, scored_count, score_sum) in buckets:
+                _apply_bucket(key, feed_count, scored_count, score_sum)
+        except Exception as e:
+            logger.error(f"Failed to update monitor_feed_rollup: {e}", exc_info=True)
+        return len(buckets)
+
+
+def rebuild_rollup(platform: Optional[str] = None, feed_model=MonitorFeed, rollup_model=MonitorFeedRollup) -> int:
+    """
+    从 monitor_feed 全量重建汇总表
+
+    Args:
+        platform: 仅重建指定平台，默认全部
+        feed_model / rollup_model: 数据迁移中传入历史模型
+
+    Returns:
+        写入的汇总行数
+    """
+    feed_qs = feed_model.objects.all()
+    rollup_qs = rollup_model.objects.all()
+    if platform:
+        feed_qs = feed_qs.filter(platform=platform)
+        rollup_qs = rollup_qs.filter(platform=platform)
+
+    # 空情绪与 neutral 落在同一个汇总桶（见 _bucket_key），必须在 SQL 里先归一再分组，
+    # 否则两组行映射到同一个唯一键，bulk_create 会违反 unique_together
+    grouped = (
+        feed_qs.annotate(
+            day_bucket=epoch_bucket_expression("created_at", SECONDS_PER_DAY, local_utc_offset_seconds()),
+            bucket_sentiment=Coalesce(NullIf("sentiment", Value("")), Value("neutral")),
+        )
+        .values("platform", "day_bucket", "bucket_sentiment", "is_sensitive")
+        .annotate(
+            feed_count=Count("id"),
+            scored_count=Count("sentiment_score"),
+            score_sum=Sum("sentiment_score"),
+        )
+        .order_by()
+    )
+
+    rows = [
+        rollup_model(
+            platform=row["platform"],
+            day=EPOCH_DATE + timedelta(days=int(row["day_bucket"] or 0)),
+            sentiment=row["bucket_sentiment"],
+            is_sensitive=bool(row["is_sensitive"]),
+            feed_count=row["feed_count"] or 0,
+            scored_count=row["scored_count"] or 0,
+            score_sum=row["score_sum"] or 0,
+        )
+        for row in grouped.iterator()
+    ]
+
+    with transaction.atomic():
+        rollup_qs.delete()
+        rollup_model.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def global_stats() -> Dict:
+    """全局情绪统计，字段与原先 MonitorFeed.aggregate 的结果一致"""
+    stats = MonitorFeedRollup.objects.aggregate(
+        total_count=Sum("feed_count"),
+        sensitive_count=Sum("feed_count", filter=models.Q(is_sensitive=True)),
+        positive_count=Sum("feed_count", filter=models.Q(sentiment="positive")),
+        negative_count=Sum("feed_count", filter=models.Q(sentiment="negative")),
+        neutral_count=Sum("feed_count", filter=models.Q(sentiment="neutral")),
+        scored_count=Sum("scored_count"),
+        score_sum=Sum("score_sum"),
+    )
+    scored_count = stats.pop("scored_count") or 0
+    score_sum = stats.pop("score_sum") or 0
+    stats["avg_sentiment_score"] = score_sum / scored_count if scored_count else None
+    return stats
+
+
+def platform_sentiment_rows(platform: Optional[str] = None):
+    """按平台/情绪/敏感标记汇总的条数，字段与 values(...).annotate(cnt=Count("id")) 一致"""
+    queryset = MonitorFeedRollup.objects.all()
+    if platform:
+        queryset = queryset.filter(platform=platform)
+    return (
+        queryset.values("platform", "sentiment", "is_sensitive")
+        .annotate(cnt=Sum("feed_count"))
+        .order_by()
+    )
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+monitor_feed_token 倒排表的分词规则（不依赖 Django）
+
+Web 端（api/feed_search.py）和爬虫的 SQLAlchemy 写入路径（crawler/tools/monitor_feed_sync.py）
+共用这里的规则，两边写入的 token 与检索时的分词结果一致。
+"""
+
+from typing import List
+
+MIN_TOKEN_LENGTH = 2
+MAX_TOKEN_LENGTH = 64
+
+
+def tokenize(text: str) -> List[str]:
+    """jieba 搜索引擎模式分词，去重、转小写并丢弃单字"""
+    if not text:
+        return []
+    import jieba
+
+    tokens = []
+    seen = set()
+    for token in jieba.cut_for_search(text):
+        token = token.strip().lower()[:MAX_TOKEN_LENGTH]
+        if len(token) < MIN_TOKEN_LENGTH or token in seen:
+            continue
+        if not any(ch.isalnum() for ch in token):
+            continue
+        seen.add(token)
+        tokens.append(token)
+    return tokens
+
+
+def feed_tokens(content, source_keyword) -> List[str]:
+    """一条 monitor_feed 记录（content + source_keyword）的 token"""
+    return tokenize(f"{content or ''} {source_keyword or ''}")
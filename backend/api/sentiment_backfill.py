@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+monitor_feed 情绪分数回填
+
+sentiment_score 为空的记录（如绕过同步层直接导入的数据）由这里按 id 顺序分批打分，
+每批一次 bulk_update 写回。读接口不再做任何写入。
+
+两种运行方式：
+    - 管理命令: python manage.py backfill_sentiment
+    - 进程内线程: 设置 SENTIMENT_BACKFILL_INTERVAL（秒）后随 Web 进程启动
+
+词表调整后可用 rescore=True 重算全部记录，只写回结果有变化的行；workers > 1 时各批文本交给
+同一个进程池并行打分（api.sentiment_service.analyze_many）。
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+from django.db import close_old_connections, connection, transaction
+
+from api.feed_cache import bump_data_version
+from api.rollup import RollupChanges, snapshot
+from api.sentiment_service import analyze_many, sentiment_pool
+from media_platform.models import MonitorFeed
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+SCORE_FIELDS = ["sentiment", "sentiment_score", "sentiment_labels", "flagged"]
+
+_backfill_thread: Optional[threading.Thread] = None
+_backfill_lock = threading.Lock()
+
+
+def backfill_sentiment(chunk_size: int = DEFAULT_CHUNK_SIZE, platform: Optional[str] = None,
+                       max_rows: Optional[int] = None, rescore: bool = False, workers: int = 1) -> int:
+    """
+    为 sentiment_score 为空的记录补齐情绪分析结果
+
+    Args:
+        chunk_size: 每批处理的行数
+        platform: 仅处理指定平台，默认全部
+        max_rows: 最多处理的行数，默认不限
+        rescore: 重算所有记录（不只是 sentiment_score 为空的），只写回结果有变化的行
+        workers: 打分进程数，1 表示在当前进程中打分
+
+    Returns:
+        写回的行数
+    """
+    pool = sentiment_pool(workers) if workers > 1 else None
+    try:
+        return _backfill(chunk_size, platform, max_rows, rescore, pool, workers)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def _backfill(chunk_size: int, platform: Optional[str], max_rows: Optional[int], rescore: bool,
+              pool, workers: int) -> int:
+    last_id = 0
+    scanned = 0
+    total = 0
+    while max_rows is None or scanned < max_rows:
+        limit = chunk_size if max_rows is None else min(chunk_size, max_rows - scanned)
+        queryset = MonitorFeed.objects.filter(id__gt=last_id)
+        if not rescore:
+            queryset = queryset.filter(sentiment_score__isnull=True)
+        if platform:
+            queryset = queryset.filter(platform=platform)
+
+        with transaction.atomic():
+            # 多个 Web 进程同时回填时，跳过已被其他进程锁定的行，避免重复计入汇总表
+            if connection.features.has_select_for_update_skip_locked:
+                queryset = queryset.select_for_update(skip_locked=True)
+            chunk = list(
+                queryset.order_by("id").only(
+                    "id", "platform", "content", "created_at", "is_sensitive", "last_modify_ts", *SCORE_FIELDS
+                )[:limit]
+            )
+            if not chunk:
+                break
+
+            # 每批平均分给各 worker
+            results = analyze_many(
+                [feed.content or "" for feed in chunk],
+                chunk_size=-(-len(chunk) // max(workers, 1)),
+                executor=pool,
+            )
+            changed = []
+            rollup_changes = RollupChanges()
+            now_ts = int(time.time() * 1000)
+            for feed, result in zip(chunk, results):
+                before = snapshot(feed)
+                scores = [getattr(feed, field) for field in SCORE_FIELDS]
+                feed.sentiment = result.get("sentiment", feed.sentiment)
+                feed.sentiment_score = result.get("score", 0)
+                feed.sentiment_labels = result.get("labels") or {}
+                feed.flagged = bool(feed.is_sensitive) or feed.sentiment == "sensitive"
+                if [getattr(feed, field) for field in SCORE_FIELDS] != scores:
+                    # 推进修改时间，SSE 推送（按 last_modify_ts 增量查询）才能发出回填后的结果
+                    feed.last_modify_ts = now_ts
+                    changed.append(feed)
+                    rollup_changes.record(before, snapshot(feed))
+            if changed:
+                MonitorFeed.objects.bulk_update(changed, [*SCORE_FIELDS, "last_modify_ts"], batch_size=chunk_size)
+                # 整批的汇总变化按桶合并，每个桶一次写入
+                rollup_changes.apply()
+
+        last_id = chunk[-1].id
+        scanned += len(chunk)
+        if changed:
+            bump_data_version(*{feed.platform for feed in changed})
+            total += len(changed)
+        logger.info(
+            f"Backfilled sentiment for {len(changed)} of {len(chunk)} monitor_feed rows (up to id {last_id})"
+        )
+    return total
+
+
+def _backfill_loop(interval: int, chunk_size: int):
+    while True:
+        try:
+            backfill_sentiment(chunk_size=chunk_size)
+        except Exception as e:
+            logger.error(f"Sentiment backfill failed: {e}", exc_info=True)
+        finally:
+            close_old_connections()
+        time.sleep(interval)
+
+
+def start_backfill_thread(interval: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> bool:
+    """启动后台回填线程，每个进程只启动一次，返回是否新启动"""
+    global _backfill_thread
+    if interval <= 0:
+        return False
+    with _backfill_lock:
+        if _backfill_thread is not None and _backfill_thread.is_alive():
+            return False
+        _backfill_thread = threading.Thread(
+            target=_backfill_loop,
+            args=(interval, chunk_size),
+            name="sentiment-backfill",
+            daemon=True,
+        )
+        _backfill_thread.start()
+    logger.info(f"Sentiment backfill thread started (interval={interval}s)")
+    return True
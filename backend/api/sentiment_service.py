@@ -7,10 +7,24 @@
 """
 情绪分析服务
 用于分析内容的情绪倾向（积极、消极、中性、敏感）
+
+各词表在首次分析时编译成一个 Aho-Corasick 自动机（KeywordMatcher），一次扫描文本即可找出所有出现的
+关键词（包括互相重叠的，如“棒”和“棒棒”），耗时只与文本长度有关、不再随词表长度线性增长。
+安装了 pyahocorasick 时使用其 C 实现，否则使用纯 Python 实现，两者结果相同。
+
+大批量打分（全量同步、历史数据重算）用 analyze_many：相同文本只分析一次，可分块交给多进程并行。
 """
 
+import multiprocessing
 import re
-from typing import Dict, List, Tuple
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - 可选依赖
+    ahocorasick = None
 
 
 class SentimentType:
@@ -21,6 +35,88 @@ class SentimentType:
     SENSITIVE = 'sensitive'  # 敏感（涉黄、涉政等）
 
 
+class KeywordMatcher:
+    """
+    Aho-Corasick 多模式匹配器
+
+    find(text) 返回 text 中出现过的关键词集合，与逐个判断 ``keyword in text`` 的结果一致。
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(keyword for keyword in keywords if keyword))
+        self._automaton = None
+        if not self.keywords:
+            return
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+        else:
+            self._build()
+
+    def _build(self) -> None:
+        """构建 trie 的转移表，再按 BFS 计算失败指针，并把失败链上的输出合并到每个状态"""
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[str, ...]] = [()]
+        for keyword in self.keywords:
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto.append({})
+                    outputs.append(())
+                    goto[state][char] = next_state
+                state = next_state
+            outputs[state] += (keyword,)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(char, 0)
+                fail[next_state] = target if target != next_state else 0
+                outputs[next_state] += outputs[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+        self._first_chars = re.compile('[' + ''.join(re.escape(char) for char in goto[0]) + ']')
+
+    def find(self, text: str) -> FrozenSet[str]:
+        if not text or not self.keywords:
+            return frozenset()
+        if self._automaton is not None:
+            return frozenset([keyword for _, keyword in self._automaton.iter(text)])
+
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found = set()
+        state = 0
+        position = 0
+        length = len(text)
+        while position < length:
+            if not state:
+                # 根状态下遇到非关键词首字符时停在原地，直接跳到下一个首字符
+                match = self._first_chars.search(text, position)
+                if match is None:
+                    break
+                position = match.start()
+            char = text[position]
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+            position += 1
+        return frozenset(found)
+
+
 class SentimentAnalyzer:
     """基于规则的情绪分析器"""
 
@@ -92,8 +188,13 @@ class SentimentAnalyzer:
         # 合并标题和内容进行分析
         text = f"{title} {content}".lower()
 
+        matcher, weights = cls._lexicon()
+        found = matcher.find(text)
+        if not found:
+            return cls._neutral_result()
+
         # 1. 优先检测敏感内容
-        sensitive_result = cls._check_sensitive(text)
+        sensitive_result = cls._check_sensitive(text, found)
         if sensitive_result['is_sensitive']:
             return {
                 'sentiment': SentimentType.SENSITIVE,
@@ -101,9 +202,9 @@ class SentimentAnalyzer:
                 'labels': sensitive_result['labels']
             }
 
-        # 2. 检测积极/消极倾向
-        positive_count = sum(1 for keyword in cls.POSITIVE_KEYWORDS if keyword in text)
-        negative_count = sum(1 for keyword in cls.NEGATIVE_KEYWORDS if keyword in text)
+        # 2. 检测积极/消极倾向（词表中重复出现的词按出现次数计）
+        positive_count = sum(weights[keyword][1] for keyword in found)
+        negative_count = sum(weights[keyword][2] for keyword in found)
 
         # 计算情绪分数 (-1 到 1)
         total_count = positive_count + negative_count
@@ -133,10 +234,39 @@ class SentimentAnalyzer:
         }
 
     @classmethod
-    def _check_sensitive(cls, text: str) -> Dict:
+    def _lexicon(cls) -> Tuple[KeywordMatcher, Dict[str, Tuple[Tuple[str, ...], int, int]]]:
+        """
+        把各词表编译成一个匹配器（每个类首次调用时构建并缓存）
+
+        weights[keyword] 为 (所属敏感分类, 在积极词表中出现的次数, 在消极词表中出现的次数)。
+        """
+        lexicon = cls.__dict__.get('_compiled_lexicon')
+        if lexicon is None:
+            weights: Dict[str, Tuple[Tuple[str, ...], int, int]] = {}
+            for category, keywords in cls.SENSITIVE_KEYWORDS.items():
+                for keyword in keywords:
+                    categories, positive, negative = weights.get(keyword, ((), 0, 0))
+                    if category not in categories:
+                        weights[keyword] = (categories + (category,), positive, negative)
+            for keyword in cls.POSITIVE_KEYWORDS:
+                categories, positive, negative = weights.get(keyword, ((), 0, 0))
+                weights[keyword] = (categories, positive + 1, negative)
+            for keyword in cls.NEGATIVE_KEYWORDS:
+                categories, positive, negative = weights.get(keyword, ((), 0, 0))
+                weights[keyword] = (categories, positive, negative + 1)
+            lexicon = (KeywordMatcher(weights), weights)
+            cls._compiled_lexicon = lexicon
+        return lexicon
+
+    @classmethod
+    def _check_sensitive(cls, text: str, found: FrozenSet[str] = None) -> Dict:
         """
         检测敏感内容
 
+        Args:
+            text: 已转为小写的文本
+            found: text 中已匹配到的关键词（analyze 已扫描过时传入，避免重复扫描）
+
         Returns:
             {
                 'is_sensitive': bool,
@@ -155,12 +285,15 @@ class SentimentAnalyzer:
             'illegal': False
         }
 
-        for category, keywords in cls.SENSITIVE_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in text:
-                    labels[category] = True
-                    break
-            if labels[category]:
+        matcher, weights = cls._lexicon()
+        if found is None:
+            found = matcher.find(text)
+        matched = {category for keyword in found for category in weights[keyword][0]}
+
+        # 按 SENSITIVE_KEYWORDS 的顺序只标记第一个命中的分类
+        for category in cls.SENSITIVE_KEYWORDS:
+            if category in matched:
+                labels[category] = True
                 break
 
         is_sensitive = any(labels.values())
@@ -190,3 +323,69 @@ class SentimentAnalyzer:
 def analyze_sentiment(content: str, title: str = '') -> Dict:
     """分析内容情绪的便捷函数"""
     return SentimentAnalyzer.analyze(content, title)
+
+
+# 每块的文本数：块太小时进程间传输开销占比高，太大时各 worker 负载不均
+DEFAULT_BATCH_CHUNK_SIZE = 2000
+
+
+def _init_worker() -> None:
+    """进程池 worker 启动时编译一次词表，之后的每块直接复用"""
+    SentimentAnalyzer._lexicon()
+
+
+def _analyze_chunk(texts: List[str]) -> List[Dict]:
+    return [SentimentAnalyzer.analyze(text) for text in texts]
+
+
+def sentiment_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    创建批量情绪分析用的进程池，可在多次 analyze_many 之间复用（调用方负责 shutdown）
+
+    使用 spawn 启动 worker：调用方可能是带后台线程的 Web 进程，fork 会复制其他线程持有的锁。
+    """
+    return ProcessPoolExecutor(
+        max_workers=max(1, workers),
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+    )
+
+
+def analyze_many(texts: Iterable[str], workers: int = 1, chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE,
+                 executor: Optional[Executor] = None) -> List[Dict]:
+    """
+    批量分析内容情绪，结果与逐条调用 analyze_sentiment 相同，顺序与输入一致
+
+    Args:
+        texts: 内容文本（None 按空文本处理）
+        workers: 进程数，1 表示在当前进程中分析；大于 1 时临时创建进程池，用完关闭
+        chunk_size: 每块交给 worker 的文本数；去重后不足两块时直接在当前进程中分析
+        executor: 已有的进程池（sentiment_pool），传入时忽略 workers
+
+    Returns:
+        每条文本的分析结果；重复文本得到各自独立的结果副本
+    """
+    texts = [text or '' for text in texts]
+    unique = list(dict.fromkeys(texts))
+    chunk_size = max(1, chunk_size)
+    chunks = [unique[i:i + chunk_size] for i in range(0, len(unique), chunk_size)]
+
+    if len(chunks) <= 1 or (executor is None and workers <= 1):
+        scored = _analyze_chunk(unique)
+    elif executor is not None:
+        scored = [result for results in executor.map(_analyze_chunk, chunks) for result in results]
+    else:
+        with sentiment_pool(min(workers, len(chunks))) as pool:
+            scored = [result for results in pool.map(_analyze_chunk, chunks) for result in results]
+
+    by_text = dict(zip(unique, scored))
+    results = []
+    returned = set()
+    for text in texts:
+        result = by_text[text]
+        if text in returned:
+            result = {**result, 'labels': dict(result['labels'])}
+        else:
+            returned.add(text)
+        results.append(result)
+    return results
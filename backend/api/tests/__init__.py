@@ -0,0 +1,5 @@
+"""
+api 模块测试
+
+    python manage.py test api media_platform --settings=mediacrawler_config.settings_test
+"""
@@ -0,0 +1,22 @@
+"""测试共用的数据构造函数"""
+
+from media_platform.models import MonitorFeed
+
+# 2023-11-15 00:00:00 +08:00（周三）
+LOCAL_MIDNIGHT = 1699977600
+
+
+def create_feed(content_id, created_at, platform="xhs", sentiment="neutral",
+                sentiment_score=None, is_sensitive=False, content="内容", **extra):
+    return MonitorFeed.objects.create(
+        platform=platform,
+        platform_name=platform,
+        content_id=str(content_id),
+        content=content,
+        created_at=created_at,
+        sentiment=sentiment,
+        sentiment_score=sentiment_score,
+        is_sensitive=is_sensitive,
+        flagged=is_sensitive,
+        **extra,
+    )
@@ -0,0 +1,96 @@
+"""AI 分析任务的缓存、去重与日志"""
+
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase
+
+from api import ai_jobs, llm_client
+from api.ai_analysis import run_keyword_analysis
+from api.ai_jobs import AIJobError, RESULT_KEY, SUBMIT_LOCK_KEY, build_job_key, normalize_params, submit_job
+from api.feed_cache import bump_data_version
+from api.models import AIAnalysisJob
+from api.tests.helpers import LOCAL_MIDNIGHT, create_feed
+
+PARAMS = {"keyword": "新能源", "platform": "all", "time_range": "7"}
+
+
+class SubmitJobTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(ai_jobs._runner, "submit")
+        self.runner_submit = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_normalize_params(self):
+        self.assertEqual(normalize_params("keywords", {"keyword": " 新能源 "}), PARAMS)
+        self.assertEqual(normalize_params("analysis", {"keyword": "a"})["granularity"], "day")
+        for kind, data in [("nope", {"keyword": "a"}), ("keywords", {}), ("analysis", {"keyword": "a", "granularity": "month"})]:
+            with self.assertRaises(AIJobError):
+                normalize_params(kind, data)
+
+    def test_same_request_reuses_unfinished_job(self):
+        first = submit_job("keywords", PARAMS)
+        second = submit_job("keywords", dict(PARAMS))
+        self.assertEqual(first.pk, second.pk)
+        self.runner_submit.assert_called_once()
+        self.assertIsNone(cache.get(SUBMIT_LOCK_KEY.format(job_key=first.job_key)))
+
+    def test_cached_result_returned_without_new_job(self):
+        job_key = build_job_key("keywords", PARAMS)
+        done = AIAnalysisJob.objects.create(job_key=job_key, kind="keywords", params=PARAMS,
+                                            status=AIAnalysisJob.STATUS_SUCCESS, result={"keywords": []})
+        cache.set(RESULT_KEY.format(job_key=job_key), done.pk)
+        self.assertEqual(submit_job("keywords", PARAMS).pk, done.pk)
+        self.runner_submit.assert_not_called()
+
+    def test_waits_for_submit_lock_held_by_another_process(self):
+        job_key = build_job_key("keywords", PARAMS)
+        lock_key = SUBMIT_LOCK_KEY.format(job_key=job_key)
+        cache.add(lock_key, 1)
+        other = {}
+
+        def other_process_finishes_submit(_seconds):
+            # 持锁的进程建好任务后释放锁
+            if "job" not in other:
+                other["job"] = AIAnalysisJob.objects.create(job_key=job_key, kind="keywords", params=PARAMS)
+                cache.delete(lock_key)
+
+        with mock.patch.object(ai_jobs.time, "sleep", side_effect=other_process_finishes_submit):
+            job = submit_job("keywords", PARAMS)
+        self.assertEqual(job.pk, other["job"].pk)
+        self.runner_submit.assert_not_called()
+        self.assertEqual(AIAnalysisJob.objects.count(), 1)
+
+    def test_stale_lock_does_not_block_forever(self):
+        job_key = build_job_key("keywords", PARAMS)
+        cache.add(SUBMIT_LOCK_KEY.format(job_key=job_key), 1)
+        with mock.patch.object(ai_jobs, "SUBMIT_LOCK_TIMEOUT", 0):
+            job = submit_job("keywords", PARAMS)
+        self.assertEqual(job.job_key, job_key)
+        self.runner_submit.assert_called_once()
+
+    def test_analysis_key_follows_feed_data(self):
+        params = normalize_params("analysis", {"keyword": "a", "platform": "xhs"})
+        before = build_job_key("analysis", params)
+        create_feed(1, LOCAL_MIDNIGHT, last_modify_ts=1700000000000)
+        bump_data_version("xhs")
+        self.assertNotEqual(build_job_key("analysis", params), before)
+        # 关键词分析不读取 monitor_feed，任务键不变
+        keyword_params = normalize_params("keywords", {"keyword": "a"})
+        self.assertEqual(build_job_key("keywords", keyword_params), build_job_key("keywords", keyword_params))
+
+
+class KeywordAnalysisLoggingTests(TestCase):
+    def test_prompt_and_response_not_logged(self):
+        response = {"choices": [{"message": {"content": "1. 电动汽车\n2. 充电桩\n3. 续航焦虑"}}]}
+        with mock.patch.object(llm_client, "get_api_key", return_value="key"), \
+                mock.patch.object(llm_client, "chat_completion", mock.AsyncMock(return_value=response)), \
+                self.assertLogs("api.ai_analysis", level="DEBUG") as logs:
+            payload, status_code = async_to_sync(run_keyword_analysis)(PARAMS)
+        self.assertEqual(status_code, 200)
+        self.assertIn("充电桩", payload["keywords"])
+        output = "\n".join(logs.output)
+        self.assertNotIn("充电桩", output)
+        self.assertNotIn("请列出", output)
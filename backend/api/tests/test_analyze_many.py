@@ -0,0 +1,38 @@
+"""批量情绪分析 analyze_many"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import SimpleTestCase
+
+from api.sentiment_service import SentimentAnalyzer, analyze_many, sentiment_pool
+from api.tests.test_sentiment_service import sample_texts
+
+
+class AnalyzeManyTests(SimpleTestCase):
+    """结果与逐条 SentimentAnalyzer.analyze 一致，顺序与输入相同"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.texts = sample_texts(25, 200) + [None, "恐怖主义", "恐怖主义"]
+        cls.expected = [SentimentAnalyzer.analyze(text or "") for text in cls.texts]
+
+    def test_in_process(self):
+        self.assertEqual(analyze_many(self.texts), self.expected)
+        self.assertEqual(analyze_many([]), [])
+
+    def test_chunks_through_executor(self):
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            self.assertEqual(analyze_many(self.texts, chunk_size=7, executor=executor), self.expected)
+
+    def test_process_pool(self):
+        pool = sentiment_pool(2)
+        self.addCleanup(pool.shutdown)
+        self.assertEqual(analyze_many(self.texts, chunk_size=50, executor=pool), self.expected)
+        self.assertEqual(analyze_many(self.texts[:60], workers=2, chunk_size=20), self.expected[:60])
+
+    def test_duplicate_texts_get_independent_results(self):
+        first, second = analyze_many(["恐怖主义", "恐怖主义"])
+        self.assertEqual(first, second)
+        second["labels"]["violence"] = not second["labels"]["violence"]
+        self.assertNotEqual(first["labels"], second["labels"])
@@ -0,0 +1,43 @@
+"""轮询接口的条件请求（ETag / Last-Modified -> 304）"""
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from api.feed_cache import bump_data_version
+from api.tests.helpers import LOCAL_MIDNIGHT, create_feed
+
+FEED_URL = "/api/monitor/feed/all"
+
+
+class FeedConditionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        create_feed(1, LOCAL_MIDNIGHT, last_modify_ts=1700000000000)
+
+    def test_unchanged_data_returns_304_without_queries(self):
+        response = self.client.get(FEED_URL)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertEqual(response["Last-Modified"], "Tue, 14 Nov 2023 22:13:20 GMT")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(FEED_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_write_changes_etag(self):
+        etag = self.client.get(FEED_URL)["ETag"]
+        create_feed(2, LOCAL_MIDNIGHT + 1, last_modify_ts=1700000001000)
+        bump_data_version("xhs")
+
+        response = self.client.get(FEED_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.json()["items"]), 2)
+
+    def test_query_params_change_etag(self):
+        etag = self.client.get(FEED_URL)["ETag"]
+        response = self.client.get(FEED_URL, {"page_size": 10}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
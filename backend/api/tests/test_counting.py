@@ -0,0 +1,60 @@
+"""列表总数的精确/估算策略"""
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from api import counting
+from api.feed_cache import bump_data_version
+from api.tests.helpers import LOCAL_MIDNIGHT, create_feed
+from media_platform.models import MonitorFeed
+
+
+@override_settings(COUNT_EXACT_THRESHOLD=5)
+class CountStrategyTests(TestCase):
+    """总数统计策略的阈值"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_exact_at_threshold(self):
+        for i in range(5):
+            create_feed(i, LOCAL_MIDNIGHT + i)
+        with mock.patch.object(counting, "estimate_count") as estimate:
+            self.assertEqual(counting.count_rows(MonitorFeed.objects.all(), "test"), (5, False))
+        estimate.assert_not_called()
+
+    def test_estimate_above_threshold(self):
+        for i in range(6):
+            create_feed(i, LOCAL_MIDNIGHT + i)
+        with mock.patch.object(counting, "estimate_count", return_value=1000) as estimate:
+            self.assertEqual(counting.count_rows(MonitorFeed.objects.all(), "test"), (1000, True))
+        estimate.assert_called_once()
+
+    def test_untrusted_estimate_falls_back_to_exact(self):
+        for i in range(8):
+            create_feed(i, LOCAL_MIDNIGHT + i)
+        # 估算值不超过阈值（小于已确认的行数）或无法估算时做精确 COUNT(*)
+        for estimate in (3, 5, None):
+            cache.clear()
+            with mock.patch.object(counting, "estimate_count", return_value=estimate):
+                self.assertEqual(counting.count_rows(MonitorFeed.objects.all(), "test"), (8, False))
+
+    def test_result_cached_until_data_version_changes(self):
+        for i in range(3):
+            create_feed(i, LOCAL_MIDNIGHT + i)
+        queryset = MonitorFeed.objects.filter(platform="xhs")
+        self.assertEqual(counting.count_rows(queryset, "test", "xhs"), (3, False))
+        create_feed(3, LOCAL_MIDNIGHT + 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(counting.count_rows(queryset, "test", "xhs"), (3, False))
+
+        bump_data_version("xhs")
+        self.assertEqual(counting.count_rows(queryset, "test", "xhs"), (4, False))
+
+    def test_different_filters_cached_separately(self):
+        create_feed(1, LOCAL_MIDNIGHT, sentiment="negative")
+        create_feed(2, LOCAL_MIDNIGHT + 1)
+        self.assertEqual(counting.count_rows(MonitorFeed.objects.all(), "test"), (2, False))
+        self.assertEqual(counting.count_rows(MonitorFeed.objects.filter(sentiment="negative"), "test"), (1, False))
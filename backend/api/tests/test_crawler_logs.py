@@ -0,0 +1,112 @@
+"""爬虫日志的序号游标、持久化与 SSE"""
+
+import json
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from api import views
+from api.crawler_logs import CrawlerLogBuffer, list_runs, read_run, stream_logs
+
+
+class CrawlerLogTestCase(SimpleTestCase):
+    def setUp(self):
+        log_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(log_dir.cleanup)
+        settings_patcher = override_settings(CRAWLER_LOG_DIR=log_dir.name, CRAWLER_LOG_KEEP_RUNS=2)
+        settings_patcher.enable()
+        self.addCleanup(settings_patcher.disable)
+        self.buffer = CrawlerLogBuffer(maxlen=5)
+        self.addCleanup(self.buffer.end_run)
+
+    def fill(self, count):
+        for i in range(count):
+            self.buffer.append("info", f"line {i + 1}")
+
+
+class CrawlerLogBufferTests(CrawlerLogTestCase):
+    def test_since_returns_lines_after_seq(self):
+        self.fill(4)
+        lines, truncated = self.buffer.since(2, 10)
+        self.assertEqual([line["seq"] for line in lines], [3, 4])
+        self.assertFalse(truncated)
+        lines, _ = self.buffer.since(0, 2)
+        self.assertEqual([line["seq"] for line in lines], [1, 2])
+        self.assertEqual(self.buffer.since(4, 10), ([], False))
+
+    def test_since_reports_lines_evicted_from_buffer(self):
+        self.fill(8)
+        lines, truncated = self.buffer.since(1, 10)
+        self.assertTrue(truncated)
+        self.assertEqual([line["seq"] for line in lines], [4, 5, 6, 7, 8])
+        # 序号大于当前最大值（进程重启前的游标）时从缓冲开头返回
+        lines, truncated = self.buffer.since(100, 2)
+        self.assertTrue(truncated)
+        self.assertEqual([line["seq"] for line in lines], [4, 5])
+
+    def test_run_is_persisted_and_paged(self):
+        run_id = self.buffer.start_run("xhs")
+        self.fill(7)
+        self.buffer.end_run()
+        self.assertEqual([run["run_id"] for run in list_runs()], [run_id])
+        lines, has_more = read_run(run_id, since=0, limit=4)
+        self.assertEqual([line["seq"] for line in lines], [1, 2, 3, 4])
+        self.assertTrue(has_more)
+        lines, has_more = read_run(run_id, since=4, limit=4)
+        self.assertEqual([line["seq"] for line in lines], [5, 6, 7])
+        self.assertFalse(has_more)
+        self.assertIsNone(read_run("../settings"))
+        self.assertIsNone(read_run("missing"))
+
+    def test_old_runs_are_pruned(self):
+        for label in ("xhs", "dy", "ks"):
+            self.buffer.start_run(label)
+        self.assertEqual(len(list_runs()), 2)
+
+    def test_stream_replays_since_then_waits(self):
+        self.fill(3)
+        stream = stream_logs(self.buffer, since=1)
+        self.addCleanup(stream.close)
+        self.assertTrue(next(stream).startswith("retry: "))
+        events = [next(stream), next(stream)]
+        self.assertEqual([json.loads(event.split("data: ", 1)[1])["seq"] for event in events], [2, 3])
+        self.assertTrue(events[0].startswith("id: 2\n"))
+        with mock.patch.object(self.buffer, "wait", return_value=False):
+            self.assertEqual(next(stream), ": ping\n\n")
+
+
+class CrawlerLogsEndpointTests(CrawlerLogTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(views, "CRAWLER_LOGS", self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_logs(self, **params):
+        response = self.client.get("/api/crawler/logs", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_poll_with_next_seq(self):
+        self.fill(3)
+        data = self.get_logs()
+        self.assertEqual(data["next_seq"], 3)
+        self.fill(2)
+        data = self.get_logs(since=data["next_seq"])
+        self.assertEqual([line["message"] for line in data["logs"]], ["line 1", "line 2"])
+        self.assertEqual(data["next_seq"], 5)
+        data = self.get_logs(since=data["next_seq"])
+        self.assertEqual((data["logs"], data["next_seq"], data["has_more"]), ([], 5, False))
+
+    def test_evicted_lines_read_from_run_file(self):
+        self.buffer.start_run("dy")
+        self.fill(8)
+        data = self.get_logs(since=1, limit=3)
+        self.assertEqual([line["seq"] for line in data["logs"]], [2, 3, 4])
+        self.assertFalse(data["truncated"])
+        self.assertTrue(data["has_more"])
+
+    def test_invalid_since(self):
+        self.assertEqual(self.client.get("/api/crawler/logs", {"since": "x"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/crawler/logs/stream", {"since": "x"}).status_code, 400)
@@ -0,0 +1,68 @@
+"""monitor_feed 流式导出"""
+
+import csv
+import io
+import json
+
+from django.test import TestCase
+
+from api.export import ExportError, iter_rows, parse_time_param
+from api.tests.helpers import LOCAL_MIDNIGHT, create_feed
+from media_platform.models import MonitorFeed
+
+EXPORT_URL = "/api/data/export"
+
+
+def streamed_text(response) -> str:
+    return b"".join(response.streaming_content).decode("utf-8")
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        create_feed(1, LOCAL_MIDNIGHT - 1, content="前一天")
+        create_feed(2, LOCAL_MIDNIGHT * 1000, content="毫秒时间戳", is_sensitive=True, sentiment="sensitive")
+        create_feed(3, LOCAL_MIDNIGHT + 60, platform="dy", content="抖音内容")
+
+    def test_ndjson_export(self):
+        response = self.client.get(EXPORT_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("application/x-ndjson"))
+        self.assertIn("attachment;", response["Content-Disposition"])
+        rows = [json.loads(line) for line in streamed_text(response).splitlines()]
+        self.assertEqual([row["content_id"] for row in rows], ["1", "2", "3"])
+
+    def test_csv_export(self):
+        response = self.client.get(EXPORT_URL, {"format": "csv", "platform": "xhs"})
+        text = streamed_text(response)
+        self.assertTrue(text.startswith("\ufeff"))
+        rows = list(csv.DictReader(io.StringIO(text[1:])))
+        self.assertEqual([row["content_id"] for row in rows], ["1", "2"])
+
+    def test_time_range_covers_seconds_and_millis(self):
+        response = self.client.get(EXPORT_URL, {"start": "2023-11-15", "end": LOCAL_MIDNIGHT + 3600})
+        rows = [json.loads(line) for line in streamed_text(response).splitlines()]
+        self.assertEqual(sorted(row["content_id"] for row in rows), ["2", "3"])
+
+    def test_sensitive_filter(self):
+        response = self.client.get(EXPORT_URL, {"sensitive": "true"})
+        rows = [json.loads(line) for line in streamed_text(response).splitlines()]
+        self.assertEqual([row["content_id"] for row in rows], ["2"])
+
+    def test_invalid_params(self):
+        for params in ({"source": "nope"}, {"source": "contents"}, {"source": "contents", "platform": "x"},
+                       {"start": "not-a-date"}, {"format": "xml"}):
+            response = self.client.get(EXPORT_URL, params)
+            self.assertEqual(response.status_code, 400, params)
+
+    def test_iter_rows_walks_all_chunks(self):
+        for i in range(4, 12):
+            create_feed(i, LOCAL_MIDNIGHT + i)
+        rows = list(iter_rows(MonitorFeed.objects.all(), ["id", "content_id"], chunk_size=3))
+        self.assertEqual([row["id"] for row in rows], list(MonitorFeed.objects.order_by("id").values_list("id", flat=True)))
+
+    def test_parse_time_param(self):
+        self.assertEqual(parse_time_param(str(LOCAL_MIDNIGHT * 1000)), LOCAL_MIDNIGHT)
+        self.assertEqual(parse_time_param("2023-11-15"), LOCAL_MIDNIGHT)
+        self.assertIsNone(parse_time_param(""))
+        with self.assertRaises(ExportError):
+            parse_time_param("yesterday")
@@ -0,0 +1,70 @@
+"""监控接口响应缓存与数据版本号"""
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from api.feed_cache import bump_data_version, get_data_version
+from api.feed_version import bump_shared_data_version, redis_key, version_key
+from api.tests.helpers import LOCAL_MIDNIGHT, create_feed
+
+
+class FeedResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _total(self, **params):
+        response = self.client.get("/api/monitor/feed/all", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["pagination"]["total_count"]
+
+    def test_cached_until_data_version_bumped(self):
+        create_feed(1, LOCAL_MIDNIGHT)
+        self.assertEqual(self._total(), 1)
+
+        create_feed(2, LOCAL_MIDNIGHT + 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self._total(), 1)
+
+        bump_data_version("xhs")
+        self.assertEqual(self._total(), 2)
+
+    def test_platform_bump_invalidates_platform_and_all(self):
+        create_feed(1, LOCAL_MIDNIGHT, platform="xhs")
+        create_feed(2, LOCAL_MIDNIGHT, platform="dy")
+        self.assertEqual(self._total(platform="xhs"), 1)
+        self.assertEqual(self._total(platform="dy"), 1)
+        self.assertEqual(self._total(), 2)
+
+        create_feed(3, LOCAL_MIDNIGHT + 1, platform="xhs")
+        xhs_version, dy_version = get_data_version("xhs"), get_data_version("dy")
+        bump_data_version("xhs")
+        self.assertGreater(get_data_version("xhs"), xhs_version)
+        self.assertEqual(get_data_version("dy"), dy_version)
+        self.assertEqual(self._total(platform="xhs"), 2)
+        self.assertEqual(self._total(), 3)
+
+    def test_query_params_are_part_of_key(self):
+        for i in range(3):
+            create_feed(i, LOCAL_MIDNIGHT + i)
+        first = self.client.get("/api/monitor/feed/all", {"page_size": 1}).json()
+        second = self.client.get("/api/monitor/feed/all", {"page_size": 1, "page": 2}).json()
+        self.assertNotEqual(first["items"][0]["content_id"], second["items"][0]["content_id"])
+
+
+class SharedDataVersionTests(SimpleTestCase):
+    def test_bumps_django_redis_keys(self):
+        client = mock.Mock()
+        client.set.return_value = False
+        self.assertTrue(bump_shared_data_version(["xhs"], client=client))
+        expected = {redis_key(version_key("xhs")), redis_key(version_key(None))}
+        self.assertEqual({call.args[0] for call in client.incr.call_args_list}, expected)
+        self.assertEqual(redis_key(version_key("xhs")), "mediacrawler:1:monitor_feed:version:xhs")
+
+    def test_initializes_missing_version(self):
+        client = mock.Mock()
+        client.set.return_value = True
+        bump_shared_data_version(["dy"], client=client)
+        client.incr.assert_not_called()
+        self.assertTrue(all(call.kwargs.get("nx") for call in client.set.call_args_list))
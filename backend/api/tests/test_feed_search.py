@@ -0,0 +1,69 @@
+"""monitor_feed 关键词检索（SQLite 下走 jieba 倒排表）"""
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from api.feed_search import rebuild_search_index, search_feed
+from api.monitor_feed_sync import _sync_to_monitor_feed_sync
+from api.search_tokens import feed_tokens, tokenize
+from api.tests.helpers import LOCAL_MIDNIGHT, create_feed
+from media_platform.models import MonitorFeed, MonitorFeedToken
+
+
+class TokenizeTests(SimpleTestCase):
+    def test_drops_single_chars_and_punctuation(self):
+        tokens = tokenize("北京大学的 Python 教程！！")
+        self.assertIn("北京大学", tokens)
+        self.assertIn("python", tokens)
+        self.assertTrue(all(len(token) >= 2 for token in tokens))
+        self.assertNotIn("！！", tokens)
+        self.assertEqual(len(tokens), len(set(tokens)))
+
+    def test_feed_tokens_include_source_keyword(self):
+        self.assertIn("新能源", feed_tokens("今天去看车", "新能源"))
+        self.assertEqual(feed_tokens(None, None), [])
+
+
+class SearchFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _search(self, q):
+        return sorted(search_feed(MonitorFeed.objects.all(), q).values_list("content_id", flat=True))
+
+    def test_matches_all_terms_via_token_index(self):
+        create_feed(1, LOCAL_MIDNIGHT, content="北京大学开学典礼")
+        create_feed(2, LOCAL_MIDNIGHT, content="清华大学开学典礼")
+        create_feed(3, LOCAL_MIDNIGHT, content="北京的天气", source_keyword="天气预报")
+        self.assertEqual(rebuild_search_index(), 3)
+
+        self.assertEqual(self._search("开学典礼"), ["1", "2"])
+        self.assertEqual(self._search("北京 开学"), ["1"])
+        self.assertEqual(self._search("天气预报"), ["3"])
+        self.assertEqual(self._search("上海"), [])
+        self.assertEqual(self._search(""), ["1", "2", "3"])
+
+    def test_short_term_falls_back_to_contains(self):
+        create_feed(1, LOCAL_MIDNIGHT, content="北京大学")
+        create_feed(2, LOCAL_MIDNIGHT, content="上海交大")
+        self.assertEqual(self._search("京"), ["1"])
+
+    def test_sync_keeps_index_current(self):
+        _sync_to_monitor_feed_sync("xhs", {"note_id": "n1", "title": "北京大学开学典礼", "time": LOCAL_MIDNIGHT})
+        self.assertEqual(self._search("开学典礼"), ["n1"])
+
+        _sync_to_monitor_feed_sync("xhs", {"note_id": "n1", "title": "清华大学毕业典礼", "time": LOCAL_MIDNIGHT})
+        self.assertEqual(self._search("开学典礼"), [])
+        self.assertEqual(self._search("毕业典礼"), ["n1"])
+        feed = MonitorFeed.objects.get(content_id="n1")
+        self.assertEqual(
+            set(MonitorFeedToken.objects.filter(feed_id=feed.id).values_list("token", flat=True)),
+            set(feed_tokens(feed.content, feed.source_keyword)),
+        )
+
+    def test_feed_endpoint_q_param(self):
+        create_feed(1, LOCAL_MIDNIGHT, content="北京大学开学典礼")
+        create_feed(2, LOCAL_MIDNIGHT, content="清华大学开学典礼")
+        rebuild_search_index()
+        response = self.client.get("/api/monitor/feed/all", {"q": "北京大学"})
+        self.assertEqual([item["content_id"] for item in response.json()["items"]], ["1"])
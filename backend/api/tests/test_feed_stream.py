@@ -0,0 +1,66 @@
+"""monitor_feed 增量推送（SSE）的断线补发"""
+
+import json
+from unittest import mock
+
+from django.test import TestCase
+
+from api import feed_stream
+from api.feed_stream import parse_event_id, stream_events
+from api.tests.helpers import LOCAL_MIDNIGHT, create_feed
+
+
+def event_ids(events):
+    return [line[len("id: "):] for event in events for line in event.splitlines() if line.startswith("id: ")]
+
+
+class StreamResumeTests(TestCase):
+    def setUp(self):
+        # 不启动后台查询线程，实时记录由测试直接投递到订阅者队列
+        patcher = mock.patch.object(feed_stream.feed_tail, "_run", lambda: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.feeds = [
+            create_feed(i, LOCAL_MIDNIGHT + i, last_modify_ts=1000 * (i + 1),
+                        is_sensitive=(i == 2), sentiment="sensitive" if i == 2 else "neutral")
+            for i in range(4)
+        ]
+
+    def _open(self, last_event_id, sensitive_only=False):
+        stream = stream_events(None, sensitive_only, last_event_id)
+        self.addCleanup(stream.close)
+        self.assertTrue(next(stream).startswith("retry: "))
+        return stream
+
+    def test_parse_event_id(self):
+        self.assertEqual(parse_event_id("1000:5"), (1000, 5))
+        for value in (None, "", "1000", "a:b"):
+            self.assertIsNone(parse_event_id(value))
+
+    def test_replays_rows_after_last_event_id(self):
+        first = self.feeds[0]
+        stream = self._open(f"1000:{first.id}")
+        events = [next(stream) for _ in range(3)]
+        self.assertEqual(event_ids(events), [f"{feed.last_modify_ts}:{feed.id}" for feed in self.feeds[1:]])
+        self.assertEqual(json.loads(events[1].split("data: ", 1)[1])["sentiment"], "sensitive")
+
+    def test_live_rows_already_replayed_are_skipped(self):
+        stream = self._open(f"1000:{self.feeds[0].id}")
+        for _ in range(3):
+            next(stream)
+        subscriber = next(iter(feed_stream.feed_tail._subscribers))
+        late = create_feed("late", LOCAL_MIDNIGHT, last_modify_ts=9000)
+        for feed in (self.feeds[3], late):
+            subscriber.put(feed_stream.fetch_after((feed.last_modify_ts, feed.id - 1), 1)[0])
+        self.assertEqual(event_ids([next(stream)]), [f"9000:{late.id}"])
+
+    def test_sensitive_only_replay(self):
+        stream = self._open("0:0", sensitive_only=True)
+        self.assertEqual(event_ids([next(stream)]), [f"3000:{self.feeds[2].id}"])
+
+    def test_backlog_over_limit_sends_reset(self):
+        with mock.patch.object(feed_stream, "STREAM_CATCHUP_LIMIT", 2):
+            stream = self._open("0:0")
+            self.assertEqual(next(stream), "event: reset\ndata: {}\n\n")
+            with self.assertRaises(StopIteration):
+                next(stream)
@@ -0,0 +1,149 @@
+"""数据文件目录（data_file 表）与爬虫写入的侧写索引"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from api import file_catalog
+from api.file_catalog import REFRESH_KEY, catalog_stats, get_record_count, list_files, refresh_catalog
+from api.file_index import INDEX_FILENAME, append_entries, index_path, read_entries
+from media_platform.models import DataFile
+
+
+class FileCatalogTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.data_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.data_dir, ignore_errors=True)
+
+    def write(self, rel_path, text):
+        path = self.data_dir / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def write_json(self, rel_path, count):
+        return self.write(rel_path, json.dumps([{"i": i} for i in range(count)]))
+
+    def skip_scan(self):
+        """模拟节流期内：只读取侧写索引，不扫描目录"""
+        cache.set(REFRESH_KEY.format(data_dir=self.data_dir), 1, 60)
+
+
+class FileIndexTests(FileCatalogTestCase):
+    def test_append_and_read_from_offset(self):
+        first = self.write_json("xhs/json/a.json", 2)
+        self.assertEqual(append_entries({str(first): 2}, self.data_dir), 1)
+        entries, offset = read_entries(self.data_dir)
+        self.assertEqual([(entry["path"], entry["record_count"]) for entry in entries], [("xhs/json/a.json", 2)])
+        self.assertEqual(entries[0]["size"], first.stat().st_size)
+
+        second = self.write("dy/csv/b.csv", "a\n1\n")
+        append_entries({str(second): None}, self.data_dir)
+        entries, offset = read_entries(self.data_dir, offset)
+        self.assertEqual([entry["path"] for entry in entries], ["dy/csv/b.csv"])
+        self.assertEqual(read_entries(self.data_dir, offset), ([], offset))
+
+    def test_ignores_files_outside_data_dir(self):
+        outside = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, outside, ignore_errors=True)
+        (outside / "x.json").write_text("[]")
+        self.assertEqual(append_entries({str(outside / "x.json"): 0}, self.data_dir), 0)
+        self.assertFalse(index_path(self.data_dir).exists())
+
+    def test_partial_line_is_read_later(self):
+        with open(index_path(self.data_dir), "w", encoding="utf-8") as f:
+            f.write('{"path": "a.json", "size": 2, "mtime": 1.0, "record_count": 0}\n{"path": "b.js')
+        entries, offset = read_entries(self.data_dir)
+        self.assertEqual([entry["path"] for entry in entries], ["a.json"])
+        with open(index_path(self.data_dir), "a", encoding="utf-8") as f:
+            f.write('on", "size": 2, "mtime": 1.0, "record_count": 0}\n')
+        entries, _ = read_entries(self.data_dir, offset)
+        self.assertEqual([entry["path"] for entry in entries], ["b.json"])
+
+    def test_truncated_index_is_read_from_start(self):
+        path = self.write_json("a.json", 1)
+        append_entries({str(path): 1}, self.data_dir)
+        append_entries({str(path): 1}, self.data_dir)
+        _, offset = read_entries(self.data_dir)
+        index_path(self.data_dir).unlink()
+        append_entries({str(path): 1}, self.data_dir)
+        entries, _ = read_entries(self.data_dir, offset)
+        self.assertEqual(len(entries), 1)
+
+
+class CatalogTests(FileCatalogTestCase):
+    def test_index_entries_registered_without_scan_or_parsing(self):
+        self.skip_scan()
+        path = self.write_json("xhs/json/search_contents.json", 3)
+        append_entries({str(path): 3}, self.data_dir)
+
+        with mock.patch.object(file_catalog, "count_records") as count_records:
+            files = list_files(data_dir=self.data_dir)
+        count_records.assert_not_called()
+        self.assertEqual([(info["path"], info["record_count"]) for info in files],
+                         [("xhs/json/search_contents.json", 3)])
+        entry = DataFile.objects.get()
+        self.assertEqual((entry.platform, entry.file_type), ("xhs", "json"))
+
+        # 已读取的索引条目不会重复登记
+        self.assertEqual(refresh_catalog(self.data_dir), 0)
+
+    def test_unknown_count_in_index_is_counted(self):
+        self.skip_scan()
+        path = self.write("dy/csv/search_contents.csv", "a,b\n1,2\n3,4\n")
+        append_entries({str(path): None}, self.data_dir)
+        self.assertEqual(list_files(data_dir=self.data_dir)[0]["record_count"], 2)
+
+    def test_stale_index_entry_left_to_scan(self):
+        path = self.write_json("xhs/json/a.json", 1)
+        append_entries({str(path): 1}, self.data_dir)
+        # 写入索引后文件又被修改，索引中的记录数已过期
+        self.write_json("xhs/json/a.json", 5)
+        os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 10))
+
+        self.skip_scan()
+        self.assertEqual(refresh_catalog(self.data_dir), 0)
+        self.assertFalse(DataFile.objects.exists())
+        self.assertEqual(refresh_catalog(self.data_dir, force=True), 1)
+        self.assertEqual(DataFile.objects.get().record_count, 5)
+
+    def test_scan_registers_changed_and_removes_deleted_files(self):
+        kept = self.write_json("xhs/json/kept.json", 2)
+        removed = self.write("bili/csv/removed.csv", "a\n1\n")
+        self.write("notes.txt", "not a data file")
+        self.assertEqual(refresh_catalog(self.data_dir, force=True), 2)
+        self.assertFalse(DataFile.objects.filter(path=INDEX_FILENAME).exists())
+
+        removed.unlink()
+        with mock.patch.object(file_catalog, "count_records", wraps=file_catalog.count_records) as count_records:
+            self.assertEqual(refresh_catalog(self.data_dir, force=True), 0)
+        count_records.assert_not_called()
+        self.assertEqual(list(DataFile.objects.values_list("path", flat=True)), ["xhs/json/kept.json"])
+
+        self.write_json("xhs/json/kept.json", 4)
+        os.utime(kept, (kept.stat().st_atime, kept.stat().st_mtime + 10))
+        self.assertEqual(get_record_count(kept, self.data_dir), 4)
+
+    def test_stats_by_type_and_platform(self):
+        self.write_json("xhs/json/a.json", 1)
+        self.write_json("xhs/json/b.json", 1)
+        self.write("douyin/csv/c.csv", "a\n1\n")
+        stats = catalog_stats(self.data_dir)
+        self.assertEqual(stats["total_files"], 3)
+        self.assertEqual(stats["by_type"], {"json": 2, "csv": 1})
+        self.assertEqual(stats["by_platform"], {"xhs": 2, "dy": 1})
+
+    @override_settings(DATA_CATALOG_REFRESH_INTERVAL=60)
+    def test_scan_is_throttled(self):
+        self.write_json("a.json", 1)
+        self.assertEqual(refresh_catalog(self.data_dir), 1)
+        self.write_json("b.json", 1)
+        self.assertEqual(refresh_catalog(self.data_dir), 0)
+        self.assertEqual(refresh_catalog(self.data_dir, force=True), 1)
@@ -0,0 +1,100 @@
+"""数据文件的流式预览"""
+
+import io
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from api import file_preview
+from api.file_preview import (
+    PreviewError,
+    count_json_records,
+    count_jsonl_records,
+    count_lines,
+    iter_json_array,
+    preview_csv,
+    preview_json,
+    preview_jsonl,
+    preview_xlsx,
+)
+
+SAMPLE = [
+    {"title": "含 ] 和 , 的字符串", "nested": {"list": [1, 2, [3]]}},
+    12345678901234567890,
+    -0.5,
+    1.25e-07,
+    "plain",
+    None,
+    True,
+    [],
+    {"emoji": "😊", "escaped": "\"quoted\" \\ back"},
+]
+
+
+class FilePreviewTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+    def write(self, name, text):
+        path = self.tmp / name
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_iter_json_array_across_small_chunks(self):
+        text = "\ufeff" + json.dumps(SAMPLE, ensure_ascii=False, indent=2)
+        for read_size in (1, 3, 7, 64):
+            with mock.patch.object(file_preview, "JSON_READ_SIZE", read_size):
+                self.assertEqual(list(iter_json_array(io.StringIO(text))), SAMPLE, read_size)
+
+    def test_iter_json_array_edge_cases(self):
+        self.assertEqual(list(iter_json_array(io.StringIO(""))), [])
+        self.assertEqual(list(iter_json_array(io.StringIO(" [ ] "))), [])
+        self.assertEqual(list(iter_json_array(io.StringIO('{"a": 1}'))), [{"a": 1}])
+        for text in ("[1, 2", "[1 2]", "[1, }"):
+            with self.assertRaises(PreviewError, msg=text):
+                list(iter_json_array(io.StringIO(text)))
+
+    def test_preview_json_reads_only_the_head(self):
+        # 文件尾部损坏不影响预览开头的记录
+        path = self.write("a.json", json.dumps(list(range(10)))[:-1] + ", {broken")
+        self.assertEqual(preview_json(path, 3), ([0, 1, 2], None))
+        with self.assertRaises(PreviewError):
+            count_json_records(path)
+
+    def test_preview_json_object(self):
+        path = self.write("obj.json", '{"a": [1, 2]}')
+        self.assertEqual(preview_json(path, 3), ({"a": [1, 2]}, 1))
+        self.assertEqual(count_json_records(path), 1)
+
+    def test_jsonl(self):
+        path = self.write("a.jsonl", '\ufeff{"i": 0}\n\n{"i": 1}\n{"i": 2}')
+        self.assertEqual(preview_jsonl(path, 2), [{"i": 0}, {"i": 1}])
+        self.assertEqual(count_jsonl_records(path), 3)
+        self.assertEqual(count_lines(path), 4)
+        bad = self.write("bad.jsonl", '{"i": 0}\nnot json\n')
+        with self.assertRaises(PreviewError):
+            preview_jsonl(bad, 5)
+
+    def test_csv(self):
+        path = self.write("a.csv", "\ufeffid,text\n1,\"多行\n文本\"\n2,b\n3,c\n")
+        self.assertEqual(preview_csv(path, 2), [{"id": "1", "text": "多行\n文本"}, {"id": "2", "text": "b"}])
+
+    def test_xlsx(self):
+        import openpyxl
+
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(["id", None])
+        for i in range(5):
+            sheet.append([i, f"row{i}"])
+        path = self.tmp / "a.xlsx"
+        workbook.save(path)
+        rows, columns, total = preview_xlsx(path, 2)
+        self.assertEqual(columns, ["id", "Unnamed: 1"])
+        self.assertEqual(rows, [{"id": 0, "Unnamed: 1": "row0"}, {"id": 1, "Unnamed: 1": "row1"}])
+        self.assertEqual(total, 5)
@@ -0,0 +1,147 @@
+"""LLM 客户端的限流、熔断与重试"""
+
+from unittest import mock
+
+import httpx
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, override_settings
+
+from api import llm_client
+from api.llm_client import CircuitBreaker, LLMUnavailableError, TokenBucket
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TokenBucketTests(SimpleTestCase):
+    """令牌桶限流"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("api.llm_client.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(rate=2.0, capacity=3.0)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.0])
+        # 令牌用完后按到达顺序排队：第 4、5 个请求分别等 0.5、1 秒
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+        self.assertAlmostEqual(bucket.reserve(), 1.0)
+
+    def test_refill_is_capped_at_capacity(self):
+        bucket = TokenBucket(rate=2.0, capacity=2.0)
+        bucket.reserve()
+        bucket.reserve()
+        self.clock.now += 60
+        self.assertEqual([bucket.reserve() for _ in range(2)], [0.0, 0.0])
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+
+    def test_zero_rate_disables_limit(self):
+        bucket = TokenBucket(rate=0, capacity=1.0)
+        self.assertEqual([bucket.reserve() for _ in range(10)], [0.0] * 10)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    """熔断器状态切换"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("api.llm_client.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(failure_threshold=3, cooldown=30.0)
+
+    def _open(self):
+        for _ in range(3):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        # 成功后计数清零，仍未达到阈值
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_half_open_allows_single_probe(self):
+        self._open()
+        self.clock.now += 29.9
+        self.assertFalse(self.breaker.allow())
+        self.clock.now += 0.1
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_probe_reopens(self):
+        self._open()
+        self.clock.now += 30
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+
+def http_error(status_code):
+    request = httpx.Request("POST", llm_client.ZHIPU_CHAT_URL)
+    response = httpx.Response(status_code, request=request)
+    return httpx.HTTPStatusError(f"HTTP {status_code}", request=request, response=response)
+
+
+@override_settings(LLM_MAX_RETRIES=2)
+class ChatCompletionRetryTests(SimpleTestCase):
+    """chat_completion 的重试与熔断计数"""
+
+    def setUp(self):
+        self.breaker = CircuitBreaker(failure_threshold=2, cooldown=30.0)
+        for patcher in (
+            mock.patch.object(llm_client, "get_breaker", return_value=self.breaker),
+            mock.patch.object(llm_client.asyncio, "sleep", mock.AsyncMock()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def call(self, side_effect):
+        post = mock.AsyncMock(side_effect=side_effect)
+        with mock.patch.object(llm_client, "_post", post):
+            try:
+                return async_to_sync(llm_client.chat_completion)("key", [{"role": "user", "content": "hi"}])
+            finally:
+                self.post_calls = post.await_count
+
+    def test_retries_transient_errors(self):
+        result = self.call([http_error(503), httpx.ConnectError("refused"), {"choices": []}])
+        self.assertEqual(result, {"choices": []})
+        self.assertEqual(self.post_calls, 3)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_client_error_is_not_retried_or_counted(self):
+        for _ in range(3):
+            with self.assertRaises(httpx.HTTPStatusError):
+                self.call([http_error(401)])
+            self.assertEqual(self.post_calls, 1)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_exhausted_retries_open_breaker(self):
+        for _ in range(2):
+            with self.assertRaises(httpx.HTTPStatusError):
+                self.call([http_error(429)] * 3)
+            self.assertEqual(self.post_calls, 3)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(LLMUnavailableError):
+            self.call([{"choices": []}])
+        self.assertEqual(self.post_calls, 0)
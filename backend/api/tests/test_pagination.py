@@ -0,0 +1,95 @@
+"""monitor_feed 游标分页"""
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from api.pagination import (
+    DIRECTION_NEXT,
+    DIRECTION_PREV,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    paginate_by_cursor,
+)
+from api.tests.helpers import create_feed
+from media_platform.models import MonitorFeed
+
+
+class CursorCodecTests(TestCase):
+    def test_round_trip(self):
+        for created_at, row_id, direction in [
+            (1700000000, 1, DIRECTION_NEXT),
+            (1700000000123, 987654321, DIRECTION_PREV),
+            (0, 5, DIRECTION_NEXT),
+        ]:
+            cursor = encode_cursor(created_at, row_id, direction)
+            self.assertNotIn("=", cursor)
+            self.assertEqual(decode_cursor(cursor), (created_at, row_id, direction))
+
+    def test_invalid_cursor(self):
+        for cursor in ["", "not-a-cursor", encode_cursor(1, 1)[:-3] + "!!!"]:
+            with self.assertRaises(InvalidCursor):
+                decode_cursor(cursor)
+
+
+class PaginateByCursorTests(TestCase):
+    def test_pages_are_stable_and_complete(self):
+        # 大量重复的 created_at，翻页时需要用 id 区分
+        for i in range(25):
+            create_feed(i, 1700000000 + (i // 4))
+        expected = list(MonitorFeed.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+
+        seen = []
+        pages = []
+        cursor = None
+        while True:
+            rows, pagination = paginate_by_cursor(MonitorFeed.objects.values("id", "created_at"), cursor, 7)
+            pages.append((cursor, [row["id"] for row in rows]))
+            seen.extend(row["id"] for row in rows)
+            if not pagination["has_next"]:
+                self.assertIsNone(pagination["next_cursor"])
+                break
+            cursor = pagination["next_cursor"]
+        self.assertEqual(seen, expected)
+        self.assertEqual([len(ids) for _, ids in pages], [7, 7, 7, 4])
+
+        # 新数据写入后，已发出的游标翻到的仍是原来的那一页
+        create_feed("new", 1700000000 + 100)
+        rows, _ = paginate_by_cursor(MonitorFeed.objects.values("id", "created_at"), pages[2][0], 7)
+        self.assertEqual([row["id"] for row in rows], pages[2][1])
+
+    def test_prev_cursor_returns_previous_page(self):
+        for i in range(10):
+            create_feed(i, 1700000000 + i)
+        first, pagination = paginate_by_cursor(MonitorFeed.objects.all(), None, 4)
+        self.assertFalse(pagination["has_prev"])
+        _second, pagination = paginate_by_cursor(MonitorFeed.objects.all(), pagination["next_cursor"], 4)
+        self.assertTrue(pagination["has_prev"])
+        back, pagination = paginate_by_cursor(MonitorFeed.objects.all(), pagination["prev_cursor"], 4)
+        self.assertEqual([row.id for row in back], [row.id for row in first])
+        self.assertFalse(pagination["has_prev"])
+        self.assertTrue(pagination["has_next"])
+
+
+class MonitorFeedCursorEndpointTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(9):
+            create_feed(i, 1700000000 + (i // 2))
+
+    def test_walks_all_rows(self):
+        seen = []
+        params = {"pagination": "cursor", "page_size": 4}
+        while True:
+            data = self.client.get("/api/monitor/feed", params).json()
+            self.assertEqual(data["pagination"]["mode"], "cursor")
+            seen.extend(item["content_id"] for item in data["items"])
+            if not data["pagination"]["has_next"]:
+                break
+            params = {"cursor": data["pagination"]["next_cursor"], "page_size": 4}
+        expected = list(MonitorFeed.objects.order_by("-created_at", "-id").values_list("content_id", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get("/api/monitor/feed", {"cursor": "garbage"})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,56 @@
+"""monitor_feed 为空时各平台内容表的归并分页"""
+
+from unittest import mock
+
+from django.test import TestCase
+
+from api import views
+from api.tests.helpers import LOCAL_MIDNIGHT
+from media_platform.models import DouyinAweme, XhsNote
+
+# PLATFORM_FEED_QUERIES 使用 MySQL 的 CONCAT_WS，这里换成 SQLite 可执行的等价查询
+SQLITE_FEED_QUERIES = {
+    "xhs": (
+        "SELECT 'xhs' as platform, '小红书' as platform_name, note_id as content_id, "
+        "IFNULL(title, '') as content, nickname as author, note_url as url, "
+        "time as created_at, source_keyword FROM xhs_note"
+    ),
+    "dy": (
+        "SELECT 'dy' as platform, '抖音' as platform_name, CAST(aweme_id AS TEXT) as content_id, "
+        "IFNULL(title, '') as content, nickname as author, aweme_url as url, "
+        "create_time as created_at, source_keyword FROM douyin_aweme"
+    ),
+}
+
+
+@mock.patch.object(views, "PLATFORM_FEED_QUERIES", SQLITE_FEED_QUERIES)
+class PlatformMergeTests(TestCase):
+    def setUp(self):
+        # 秒/毫秒混存：毫秒时间戳按数值远大于秒级时间戳，但不一定更新
+        self.expected = []
+        for i, (seconds, millis) in enumerate([(60, False), (10, True), (50, True), (5, False), (40, False)]):
+            created_at = LOCAL_MIDNIGHT + seconds
+            XhsNote.objects.create(note_id=f"x{i}", title=f"x{i}", time=created_at * 1000 if millis else created_at)
+            self.expected.append((created_at, f"x{i}"))
+        for i, (seconds, millis) in enumerate([(55, True), (30, False), (1, True)]):
+            created_at = LOCAL_MIDNIGHT + seconds
+            DouyinAweme.objects.create(aweme_id=100 + i, title=f"d{i}",
+                                       create_time=created_at * 1000 if millis else created_at)
+            self.expected.append((created_at, str(100 + i)))
+        self.expected = [content_id for _, content_id in sorted(self.expected, reverse=True)]
+
+    def test_limit_returns_newest_across_tables(self):
+        items = views._fetch_from_platform_tables(limit=2)
+        self.assertEqual([item["content_id"] for item in items], self.expected[:2])
+
+    def test_unlimited_returns_everything_in_order(self):
+        items = views._fetch_from_platform_tables()
+        self.assertEqual([item["content_id"] for item in items], self.expected)
+
+    def test_pages_concatenate_to_full_order(self):
+        seen = []
+        for page in (1, 2, 3):
+            items, total_count, total_pages = views._fetch_from_platform_tables_paginated(page, 3)
+            self.assertEqual((total_count, total_pages), (8, 3))
+            seen.extend(item["content_id"] for item in items)
+        self.assertEqual(seen, self.expected)
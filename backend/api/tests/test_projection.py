@@ -0,0 +1,78 @@
+"""列表接口的 fields= 字段投影与 orjson 渲染"""
+
+import datetime
+import json
+from decimal import Decimal
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.projection import FEED_ITEM_SOURCES, InvalidFields, parse_fields, project, source_columns
+from api.renderers import ORJSONRenderer
+from api.tests.helpers import LOCAL_MIDNIGHT, create_feed
+
+
+def drf_get(params):
+    return Request(APIRequestFactory().get("/", params))
+
+
+class ParseFieldsTests(SimpleTestCase):
+    def test_parse_and_deduplicate(self):
+        self.assertEqual(parse_fields(drf_get({"fields": " id,sentiment,,id "}), FEED_ITEM_SOURCES),
+                         ("id", "sentiment"))
+        self.assertIsNone(parse_fields(drf_get({}), FEED_ITEM_SOURCES))
+        self.assertIsNone(parse_fields(drf_get({"fields": " , "}), FEED_ITEM_SOURCES))
+        # 不校验时任意列名都可以
+        self.assertEqual(parse_fields(drf_get({"fields": "昵称"})), ("昵称",))
+
+    def test_unknown_field(self):
+        with self.assertRaisesMessage(InvalidFields, "Unknown fields: password"):
+            parse_fields(drf_get({"fields": "id,password"}), FEED_ITEM_SOURCES)
+
+    def test_source_columns_and_project(self):
+        self.assertEqual(source_columns(["sentiment_score", "id"], FEED_ITEM_SOURCES),
+                         ["id", "created_at", "sentiment_score"])
+        item = {"id": 1, "content": "x", "sentiment": "neutral"}
+        self.assertEqual(list(project(item, ("sentiment", "id", "author"))), ["sentiment", "id"])
+        self.assertIs(project(item, None), item)
+
+
+class FeedProjectionEndpointTests(TestCase):
+    def setUp(self):
+        for i in range(3):
+            create_feed(i, LOCAL_MIDNIGHT + i, content=f"正文 {i}", is_sensitive=True)
+
+    def test_only_requested_fields_are_read_and_returned(self):
+        for url in ("/api/monitor/feed", "/api/monitor/feed/sensitive", "/api/monitor/feed/all"):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, {"fields": "content_id,sentiment_score"})
+            self.assertEqual(response.status_code, 200, url)
+            items = response.json()["items"]
+            self.assertEqual(len(items), 3, url)
+            self.assertEqual([list(item) for item in items], [["content_id", "sentiment_score"]] * 3, url)
+            list_sql = [query["sql"] for query in queries.captured_queries if "sentiment_score" in query["sql"]]
+            self.assertTrue(list_sql, url)
+            self.assertFalse(any('"content"' in sql for sql in list_sql), url)
+
+    def test_unknown_field_is_rejected(self):
+        for url in ("/api/monitor/feed", "/api/monitor/feed/all"):
+            response = self.client.get(url, {"fields": "id,password"})
+            self.assertEqual(response.status_code, 400, url)
+            self.assertIn("password", response.json()["error"])
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_matches_drf_json_renderer(self):
+        data = {
+            "text": "中文",
+            "decimal": Decimal("1.50"),
+            "when": datetime.datetime(2023, 11, 15, 8, 30, 0, 123456, tzinfo=datetime.timezone.utc),
+            "day": datetime.date(2023, 11, 15),
+            1: [None, True, 0.5],
+        }
+        self.assertEqual(json.loads(ORJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+        self.assertEqual(ORJSONRenderer().render(None), b"")
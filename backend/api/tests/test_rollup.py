@@ -0,0 +1,104 @@
+"""monitor_feed_rollup 增量更新与全量重建"""
+
+import random
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from api.rollup import RollupChanges, rebuild_rollup, record_feed_change, snapshot
+from api.tests.helpers import LOCAL_MIDNIGHT, create_feed
+from api.time_buckets import SECONDS_PER_DAY
+from media_platform.models import MonitorFeed, MonitorFeedRollup
+
+
+def rollup_rows():
+    return sorted(
+        (row.platform, row.day, row.sentiment, row.is_sensitive,
+         row.feed_count, row.scored_count, round(row.score_sum, 6))
+        for row in MonitorFeedRollup.objects.all()
+        if row.feed_count or row.scored_count
+    )
+
+
+class RollupTests(TestCase):
+    """增量维护的汇总行与全量重建结果一致"""
+
+    def setUp(self):
+        self.rng = random.Random(7)
+
+    def _random_values(self):
+        sentiment = self.rng.choice(["positive", "negative", "neutral", "sensitive"])
+        return {
+            "platform": self.rng.choice(["xhs", "dy", "wb"]),
+            # 同一天内的秒级和毫秒级时间戳混存
+            "created_at": self.rng.choice([1, 1000]) * (LOCAL_MIDNIGHT + self.rng.randrange(-2, 3) * SECONDS_PER_DAY
+                                                        + self.rng.randrange(SECONDS_PER_DAY)),
+            "sentiment": sentiment,
+            "sentiment_score": self.rng.choice([None, -1.0, 0.25, 0.5, 1.0]),
+            "is_sensitive": sentiment == "sensitive",
+        }
+
+    def _assert_matches_rebuild(self):
+        incremental = rollup_rows()
+        rebuild_rollup()
+        self.assertEqual(incremental, rollup_rows())
+
+    def test_record_feed_change_matches_rebuild(self):
+        feeds = []
+        for i in range(60):
+            feed = create_feed(i, **self._random_values())
+            record_feed_change(None, snapshot(feed))
+            feeds.append(feed)
+        for feed in self.rng.sample(feeds, 30):
+            before = snapshot(feed)
+            for field, value in self._random_values().items():
+                setattr(feed, field, value)
+            feed.save()
+            record_feed_change(before, snapshot(feed))
+        for feed in self.rng.sample(feeds, 10):
+            record_feed_change(snapshot(feed), None)
+            feed.delete()
+        self._assert_matches_rebuild()
+
+    def test_batched_changes_match_rebuild(self):
+        feeds = [create_feed(i, **self._random_values()) for i in range(60)]
+        rebuild_rollup()
+
+        changes = RollupChanges()
+        for feed in feeds:
+            before = snapshot(feed)
+            feed.sentiment = self.rng.choice(["positive", "negative", "neutral"])
+            feed.sentiment_score = self.rng.choice([None, 0.5, -0.5])
+            feed.is_sensitive = False
+            changes.record(before, snapshot(feed))
+        MonitorFeed.objects.bulk_update(feeds, ["sentiment", "sentiment_score", "is_sensitive"])
+        with CaptureQueriesContext(connection) as queries:
+            applied = changes.apply()
+        # 每个桶只写一次（UPDATE，桶不存在时再 INSERT），与变更行数无关
+        updates = [query for query in queries.captured_queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), applied)
+        self.assertLess(applied, len(feeds))
+        self._assert_matches_rebuild()
+
+    def test_rebuild_merges_empty_and_neutral_sentiment(self):
+        # 空情绪按 neutral 计入同一个桶，重建时不能生成两行相同唯一键的汇总
+        create_feed(1, LOCAL_MIDNIGHT, sentiment="", sentiment_score=0.5)
+        create_feed(2, LOCAL_MIDNIGHT + 60, sentiment="neutral", sentiment_score=0.25)
+        create_feed(3, LOCAL_MIDNIGHT + 120, sentiment="neutral")
+        self.assertEqual(rebuild_rollup(), 1)
+        row = MonitorFeedRollup.objects.get()
+        self.assertEqual(row.sentiment, "neutral")
+        self.assertEqual((row.feed_count, row.scored_count, row.score_sum), (3, 2, 0.75))
+
+        # 与增量路径的结果一致
+        rows = rollup_rows()
+        MonitorFeedRollup.objects.all().delete()
+        for feed in MonitorFeed.objects.all():
+            record_feed_change(None, snapshot(feed))
+        self.assertEqual(rollup_rows(), rows)
+
+    def test_missing_bucket_ignores_negative_delta(self):
+        feed = create_feed(1, LOCAL_MIDNIGHT, sentiment="positive", sentiment_score=1.0)
+        record_feed_change(snapshot(feed), None)
+        self.assertFalse(MonitorFeedRollup.objects.exists())
@@ -0,0 +1,55 @@
+"""情绪分数回填"""
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from api.feed_stream import fetch_after, latest_cursor
+from api.rollup import rebuild_rollup
+from api.sentiment_backfill import backfill_sentiment
+from api.tests.helpers import LOCAL_MIDNIGHT, create_feed
+from media_platform.models import MonitorFeed, MonitorFeedRollup
+
+
+class BackfillSentimentTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _rollup_rows(self):
+        return sorted(
+            MonitorFeedRollup.objects.values_list("platform", "day", "sentiment", "is_sensitive",
+                                                  "feed_count", "scored_count")
+        )
+
+    def test_scores_missing_rows_and_updates_rollup(self):
+        create_feed(1, LOCAL_MIDNIGHT, content="今天很开心，感谢支持", last_modify_ts=1)
+        create_feed(2, LOCAL_MIDNIGHT, content="涉及赌博和诈骗", last_modify_ts=1)
+        create_feed(3, LOCAL_MIDNIGHT, content="已打分", sentiment_score=0.0, last_modify_ts=1)
+        rebuild_rollup()
+
+        self.assertEqual(backfill_sentiment(chunk_size=1), 2)
+        self.assertFalse(MonitorFeed.objects.filter(sentiment_score__isnull=True).exists())
+        self.assertEqual(MonitorFeed.objects.get(content_id="1").sentiment, "positive")
+        flagged = MonitorFeed.objects.get(content_id="2")
+        self.assertEqual(flagged.sentiment, "sensitive")
+        self.assertTrue(flagged.flagged)
+
+        incremental = self._rollup_rows()
+        rebuild_rollup()
+        self.assertEqual(incremental, self._rollup_rows())
+
+    def test_changed_rows_reach_the_stream(self):
+        create_feed(1, LOCAL_MIDNIGHT, content="涉及赌博", last_modify_ts=1000)
+        create_feed(2, LOCAL_MIDNIGHT, content="已打分", sentiment_score=0.0, last_modify_ts=2000)
+        cursor = latest_cursor()
+
+        backfill_sentiment()
+        rows = fetch_after(cursor, 10, sensitive_only=True)
+        self.assertEqual([row["content_id"] for row in rows], ["1"])
+        self.assertGreater(rows[0]["last_modify_ts"], 2000)
+
+    def test_rescore_only_writes_changed_rows(self):
+        create_feed(1, LOCAL_MIDNIGHT, content="普通内容", last_modify_ts=1)
+        backfill_sentiment()
+        modified = MonitorFeed.objects.get().last_modify_ts
+        self.assertEqual(backfill_sentiment(rescore=True), 0)
+        self.assertEqual(MonitorFeed.objects.get().last_modify_ts, modified)
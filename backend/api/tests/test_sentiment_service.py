@@ -0,0 +1,80 @@
+"""情绪词表的 Aho-Corasick 匹配"""
+
+import random
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from api.sentiment_service import KeywordMatcher, SentimentAnalyzer, SentimentType
+
+
+def substring_scan(text: str):
+    """改为 Aho-Corasick 之前的实现：逐个关键词判断 keyword in text"""
+    for category, keywords in SentimentAnalyzer.SENSITIVE_KEYWORDS.items():
+        if any(keyword in text for keyword in keywords):
+            labels = {"adult": False, "political": False, "violence": False, "illegal": False}
+            labels[category] = True
+            return {"sentiment": SentimentType.SENSITIVE, "score": -1.0, "labels": labels}
+
+    positive_count = sum(1 for keyword in SentimentAnalyzer.POSITIVE_KEYWORDS if keyword in text)
+    negative_count = sum(1 for keyword in SentimentAnalyzer.NEGATIVE_KEYWORDS if keyword in text)
+    total_count = positive_count + negative_count
+    score = (positive_count - negative_count) / total_count if total_count else 0.0
+    if score > 0.3:
+        sentiment = SentimentType.POSITIVE
+    elif score < -0.3:
+        sentiment = SentimentType.NEGATIVE
+    else:
+        sentiment = SentimentType.NEUTRAL
+    return {
+        "sentiment": sentiment,
+        "score": score,
+        "labels": {"sensitive": False, "adult": False, "political": False, "violence": False, "illegal": False},
+    }
+
+
+def sample_texts(seed, count):
+    """由词表关键词和常见字随机拼接的文本，覆盖关键词重叠、相邻的情况"""
+    rng = random.Random(seed)
+    lexicon = SentimentAnalyzer._lexicon()[1]
+    pieces = list(lexicon) + ["今天", "天气", "的", "了", "abc", " ", "，", "好", "恐", "六"]
+    return [
+        "".join(rng.choice(pieces) for _ in range(rng.randrange(0, 12)))
+        for _ in range(count)
+    ] + ["", "完全无关的文字", "恐怖主义", "六合彩六四", "棒棒棒", "痛苦"]
+
+
+class KeywordMatcherTests(SimpleTestCase):
+    """Aho-Corasick 匹配与逐个子串判断的结果一致"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.texts = sample_texts(24, 500)
+
+    def _assert_same_as_scan(self, matcher, keywords):
+        for text in self.texts:
+            self.assertEqual(matcher.find(text), {keyword for keyword in keywords if keyword in text}, text)
+
+    def test_overlapping_keywords(self):
+        keywords = ["he", "she", "his", "hers", "恐怖", "恐怖主义", "怖主", "六合彩", "合彩"]
+        matcher = KeywordMatcher(keywords)
+        self.assertEqual(matcher.find("ushers"), {"he", "she", "hers"})
+        self.assertEqual(matcher.find("恐怖主义"), {"恐怖", "恐怖主义", "怖主"})
+        self.assertEqual(matcher.find("买六合彩"), {"六合彩", "合彩"})
+        self.assertEqual(KeywordMatcher([]).find("任何文本"), frozenset())
+
+    def test_pure_python_automaton_matches_scan(self):
+        keywords = list(SentimentAnalyzer._lexicon()[1])
+        with mock.patch("api.sentiment_service.ahocorasick", None):
+            matcher = KeywordMatcher(keywords)
+        self.assertIsNone(matcher._automaton)
+        self._assert_same_as_scan(matcher, keywords)
+
+    def test_default_matcher_matches_scan(self):
+        keywords = list(SentimentAnalyzer._lexicon()[1])
+        self._assert_same_as_scan(KeywordMatcher(keywords), keywords)
+
+    def test_analyze_matches_substring_scan(self):
+        for text in self.texts:
+            self.assertEqual(SentimentAnalyzer.analyze(text), substring_scan(f" {text}".lower()), text)
@@ -0,0 +1,62 @@
+"""秒/毫秒混存时间戳的分桶边界"""
+
+from datetime import date
+
+from django.test import TestCase
+
+from api.tests.helpers import LOCAL_MIDNIGHT, create_feed
+from api.time_buckets import (
+    MILLIS_THRESHOLD,
+    SECONDS_PER_DAY,
+    bucket_label,
+    epoch_day,
+    feed_day,
+    granularity_bucket_expression,
+    normalize_epoch_seconds,
+)
+from media_platform.models import MonitorFeed
+
+SHANGHAI_OFFSET = 8 * 3600
+# 2023-11-13 00:00:00 +08:00（周一）
+LOCAL_MONDAY = LOCAL_MIDNIGHT - 2 * SECONDS_PER_DAY
+
+
+class TimeBucketTests(TestCase):
+    def test_normalize_threshold(self):
+        self.assertEqual(normalize_epoch_seconds(MILLIS_THRESHOLD), MILLIS_THRESHOLD)
+        self.assertEqual(normalize_epoch_seconds(MILLIS_THRESHOLD + 1), MILLIS_THRESHOLD // 1000)
+        self.assertEqual(normalize_epoch_seconds(1700000000123), 1700000000)
+        self.assertEqual(normalize_epoch_seconds("1700000000"), 1700000000)
+        self.assertEqual(normalize_epoch_seconds(None), 0)
+        self.assertEqual(normalize_epoch_seconds("abc"), 0)
+
+    def test_local_day_boundary(self):
+        self.assertEqual(feed_day(LOCAL_MIDNIGHT - 1, SHANGHAI_OFFSET), date(2023, 11, 14))
+        self.assertEqual(feed_day(LOCAL_MIDNIGHT, SHANGHAI_OFFSET), date(2023, 11, 15))
+        self.assertEqual(feed_day(LOCAL_MIDNIGHT * 1000 - 1, SHANGHAI_OFFSET), date(2023, 11, 14))
+        self.assertEqual(feed_day(LOCAL_MIDNIGHT * 1000, SHANGHAI_OFFSET), date(2023, 11, 15))
+        self.assertEqual(feed_day(None, SHANGHAI_OFFSET), date(1970, 1, 1))
+
+    def test_sql_buckets_match_python(self):
+        values = [
+            LOCAL_MIDNIGHT - 1, LOCAL_MIDNIGHT, LOCAL_MIDNIGHT + 3599, LOCAL_MIDNIGHT + 3600,
+            (LOCAL_MIDNIGHT - 1) * 1000 + 999, LOCAL_MIDNIGHT * 1000, LOCAL_MONDAY - 1, LOCAL_MONDAY * 1000,
+        ]
+        for i, value in enumerate(values):
+            create_feed(i, value)
+        rows = MonitorFeed.objects.annotate(
+            hour=granularity_bucket_expression("created_at", "hour", SHANGHAI_OFFSET),
+            day=granularity_bucket_expression("created_at", "day", SHANGHAI_OFFSET),
+            week=granularity_bucket_expression("created_at", "week", SHANGHAI_OFFSET),
+        ).values_list("created_at", "hour", "day", "week")
+        for created_at, hour, day, week in rows:
+            seconds = normalize_epoch_seconds(created_at)
+            self.assertEqual(hour, (seconds + SHANGHAI_OFFSET) // 3600, created_at)
+            self.assertEqual(day, epoch_day(created_at, SHANGHAI_OFFSET), created_at)
+            self.assertEqual(bucket_label(day, "day"), feed_day(created_at, SHANGHAI_OFFSET).strftime("%Y-%m-%d"))
+            expected_week = "2023-11-06" if seconds < LOCAL_MONDAY else "2023-11-13"
+            self.assertEqual(bucket_label(week, "week"), expected_week, created_at)
+
+    def test_hour_label(self):
+        bucket = (LOCAL_MIDNIGHT + 3600 + SHANGHAI_OFFSET) // 3600
+        self.assertEqual(bucket_label(bucket, "hour"), "2023-11-15 01:00")
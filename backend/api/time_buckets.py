@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+
+"""
+created_at 时间分桶工具
+
+monitor_feed.created_at 里同时存在秒级和毫秒级时间戳，这里统一换算成秒后按本地时区
+切分成桶。Python 侧与 SQL 侧使用同一套整数运算，保证两边分桶结果一致。
+"""
+
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from django.db import models
+from django.db.models.functions import Floor
+
+DEFAULT_TIME_ZONE = "Asia/Shanghai"
+MILLIS_THRESHOLD = 10**12
+SECONDS_PER_DAY = 86400
+EPOCH_DATE = date(1970, 1, 1)
+EPOCH_DATETIME = datetime(1970, 1, 1)
+
+# 趋势图支持的时间粒度 -> 桶宽（秒）
+GRANULARITIES = {
+    "hour": 3600,
+    "day": SECONDS_PER_DAY,
+    "week": 7 * SECONDS_PER_DAY,
+}
+# 1970-01-01 是周四，平移 3 天后周桶从周一开始
+WEEK_SHIFT_SECONDS = 3 * SECONDS_PER_DAY
+
+
+def local_utc_offset_seconds() -> int:
+    """本地时区相对 UTC 的偏移（秒），未配置 Django 时（爬虫子进程）使用默认时区"""
+    try:
+        from django.conf import settings
+        tz_name = settings.TIME_ZONE or DEFAULT_TIME_ZONE
+    except Exception:
+        tz_name = DEFAULT_TIME_ZONE
+    return int(datetime.now(ZoneInfo(tz_name)).utcoffset().total_seconds())
+
+
+def normalize_epoch_seconds(value) -> int:
+    """秒/毫秒时间戳统一为秒，无法解析时返回 0"""
+    try:
+        ts = int(value)
+    except (TypeError, ValueError):
+        return 0
+    if ts > MILLIS_THRESHOLD:
+        ts = ts // 1000
+    return ts
+
+
+def epoch_day(created_at, utc_offset: int = None) -> int:
+    """created_at 所在的本地自然日（距 1970-01-01 的天数）"""
+    if utc_offset is None:
+        utc_offset = local_utc_offset_seconds()
+    return (normalize_epoch_seconds(created_at) + utc_offset) // SECONDS_PER_DAY
+
+
+def feed_day(created_at, utc_offset: int = None) -> date:
+    """created_at 所在的本地日期，created_at 缺失时落在 1970-01-01"""
+    return EPOCH_DATE + timedelta(days=epoch_day(created_at, utc_offset))
+
+
+def epoch_seconds_sql(column: str) -> str:
+    """
+    原生 SQL 中把秒/毫秒时间列统一换算为秒的表达式，用于 ORDER BY 等无法使用 ORM 表达式的场景
+
+    Args:
+        column: 已转义的列名
+    """
+    return f"(CASE WHEN {column} > {MILLIS_THRESHOLD} THEN {column} / 1000 ELSE {column} END)"
+
+
+def epoch_bucket_expression(field: str, bucket_seconds: int, utc_offset: int = None, shift: int = 0):
+    """
+    构造 SQL 分桶表达式：FLOOR((秒级时间 + 时区偏移 + shift) / bucket_seconds)
+
+    Args:
+        field: 时间戳字段名（秒或毫秒）
+        bucket_seconds: 桶宽（秒）
+        utc_offset: 时区偏移，默认取本地时区
+        shift: 额外平移量，用于让周桶从周一开始
+    """
+    if utc_offset is None:
+        utc_offset = local_utc_offset_seconds()
+    seconds = models.Case(
+        models.When(**{f"{field}__gt": MILLIS_THRESHOLD}, then=models.F(field) / 1000),
+        default=models.F(field),
+        output_field=models.BigIntegerField(),
+    )
+    return Floor(
+        models.ExpressionWrapper(
+            (seconds + models.Value(utc_offset + shift)) / models.Value(bucket_seconds),
+            output_field=models.FloatField(),
+        ),
+        output_field=models.BigIntegerField(),
+    )
+
+
+def granularity_bucket_expression(field: str, granularity: str, utc_offset: int = None):
+    """按 hour/day/week 粒度构造 created_at 的 SQL 分桶表达式"""
+    shift = WEEK_SHIFT_SECONDS if granularity == "week" else 0
+    return epoch_bucket_expression(field, GRANULARITIES[granularity], utc_offset, shift=shift)
+
+
+def bucket_label(bucket: int, granularity: str) -> str:
+    """
+    把 granularity_bucket_expression 的桶编号转成本地时间标签
+
+    hour -> "2025-01-01 08:00"，day -> "2025-01-01"，week -> 该周周一的日期
+    """
+    if granularity == "hour":
+        return (EPOCH_DATETIME + timedelta(hours=bucket)).strftime("%Y-%m-%d %H:00")
+    if granularity == "week":
+        days = bucket * 7 - WEEK_SHIFT_SECONDS // SECONDS_PER_DAY
+        return (EPOCH_DATE + timedelta(days=days)).strftime("%Y-%m-%d")
+    return (EPOCH_DATE + timedelta(days=bucket)).strftime("%Y-%m-%d")
@@ -15,10 +15,11 @@ import subprocess
 import sys
 import time
 import threading
-from collections import deque
+import heapq
+from itertools import islice
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterator, Optional, List
 
 # 创建爬虫日志记录器，输出到 Django 终端
 crawler_logger = logging.getLogger("crawler")
@@ -33,9 +34,10 @@ if not crawler_logger.handlers:
 
 from django.conf import settings
 from django.db import connection, models
-from django.db.models import Count, Q
+from django.db.models import Count
 from django.db.models.functions import Coalesce
-from django.http import JsonResponse, FileResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, FileResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
@@ -43,8 +45,50 @@ from django.utils.dateparse import parse_datetime, parse_date
 from django.utils import timezone
 from django.views import View
 
-# 导入情绪分析服务
-from api.sentiment_service import analyze_sentiment
+from api.pagination import (
+    InvalidCursor,
+    paginate_by_cursor,
+    wants_cursor_pagination,
+    wants_total,
+)
+from api import rollup
+from api.interactions import INTERACTION_COUNT_FIELDS, INTERACTION_FIELDS, extract_interactions
+from api.conditional import data_stats_condition, feed_condition
+from api.counting import count_rows
+from api.feed_cache import cache_feed_response
+from api.feed_search import search_feed
+from api.feed_stream import astream_events, stream_events
+from api.projection import (
+    FEED_ITEM_SOURCES,
+    FEED_LIST_SOURCES,
+    PREVIEW_ROW_SOURCES,
+    InvalidFields,
+    parse_fields,
+    project,
+    source_columns,
+)
+from api.crawler_logs import (
+    LOG_BUFFER_SIZE,
+    LOG_PAGE_LIMIT,
+    CrawlerLogBuffer,
+    astream_logs,
+    list_runs,
+    read_run,
+    stream_logs,
+)
+from api.file_preview import (
+    PreviewError,
+    count_lines,
+    preview_csv,
+    preview_json,
+    preview_jsonl,
+    preview_xlsx,
+)
+from api.file_catalog import catalog_stats, get_record_count, list_files, platform_from_path
+from api import ai_jobs
+from api.export import ExportError, build_queryset, export_response, parse_time_param, resolve_model
+from api.time_buckets import epoch_seconds_sql
+from asgiref.sync import sync_to_async
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -60,7 +104,7 @@ from media_platform.models import (
     ZhihuContent,
     MonitorFeed,
 )
-from .models import CookieConfig, AIUsageRecord
+from .models import CookieConfig
 
 # Data directory
 DATA_DIR = Path(__file__).parent.parent.parent / "data"
@@ -71,23 +115,13 @@ CRAWLER_LOCK = threading.Lock()
 CRAWLER_PROCESS = None
 CRAWLER_BATCH_RUNNING = False
 CRAWLER_BATCH_CANCEL = threading.Event()
-CRAWLER_LOGS = deque(maxlen=2000)
+CRAWLER_LOGS = CrawlerLogBuffer(maxlen=LOG_BUFFER_SIZE)
 CRAWLER_STATE = {
     "platform": "xhs",
     "login_type": "qrcode",
     "crawler_type": "search",
 }
 
-PLATFORM_PATH_ALIASES = {
-    "xhs": ["xhs"],
-    "dy": ["douyin", "dy"],
-    "ks": ["kuaishou", "ks"],
-    "bili": ["bilibili", "bili"],
-    "wb": ["weibo", "wb"],
-    "tieba": ["tieba"],
-    "zhihu": ["zhihu"],
-}
-
 PLATFORM_NAMES = {
     "xhs": "小红书",
     "dy": "抖音",
@@ -160,6 +194,34 @@ PLATFORM_URL_FIELDS = {
     "zhihu": "content_url",
 }
 
+# 列表接口从 monitor_feed 读取的字段
+FEED_VALUE_FIELDS = (
+    "id",
+    "platform",
+    "platform_name",
+    "content_id",
+    "content",
+    "author",
+    "url",
+    "created_at",
+    "sentiment",
+    "sentiment_score",
+    "sentiment_labels",
+    "is_sensitive",
+    "extra_data",
+    *INTERACTION_FIELDS,
+)
+
+
+def _feed_interactions(row: dict) -> dict:
+    """monitor_feed 行中的互动数据，IP 属地缺失时回退到 extra_data.ip_location"""
+    extra_data = row.get("extra_data") or {}
+    extra_ip = extra_data.get("ip_location") if isinstance(extra_data, dict) else None
+    return {
+        "ip_location": row.get("ip_location") or extra_ip or "-",
+        **{field: row.get(field) or 0 for field in INTERACTION_COUNT_FIELDS},
+    }
+
 
 def _build_run_cmd(args):
     """Build command to run main.py via the current Python executable."""
@@ -167,13 +229,8 @@ def _build_run_cmd(args):
 
 
 def _append_log(level: str, message: str):
-    """添加日志到内存队列，同时输出到 Django 终端"""
-    with CRAWLER_LOCK:
-        CRAWLER_LOGS.append({
-            "level": level,
-            "message": message,
-            "timestamp": time.time(),
-        })
+    """添加日志到内存缓冲和当前运行的日志文件，同时输出到 Django 终端"""
+    CRAWLER_LOGS.append(level, message)
     # 同时输出到 Django 终端
     log_level = logging.INFO if level == "INFO" else logging.ERROR
     crawler_logger.log(log_level, message)
@@ -206,11 +263,6 @@ def _is_crawler_busy():
     return (process is not None and process.poll() is None) or _is_batch_running()
 
 
-def _get_logs():
-    with CRAWLER_LOCK:
-        return list(CRAWLER_LOGS)
-
-
 def _update_state(platform: str, login_type: str, crawler_type: str):
     with CRAWLER_LOCK:
         CRAWLER_STATE["platform"] = platform
@@ -278,18 +330,21 @@ def _pick_first_value(row: dict, fields):
     return None
 
 
+@feed_condition("monitor_feed")
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@cache_feed_response("monitor_feed")
 def get_monitor_feed(request):
     """Get latest feed items from monitor_feed table with pagination support.
 
     优化版本：
     1. 使用数据库聚合计算统计数据，避免全表扫描
-    2. 仅对需要的数据进行情绪分析（sentiment_score为None时）
+    2. 不在请求内做情绪分析，未打分的记录由后台回填任务处理（manage.py backfill_sentiment）
     3. 使用更高效的分页查询
+    4. 支持游标分页：传 cursor（或 pagination=cursor）时按 (created_at, id) 翻页
+    5. 支持 q= 关键词检索（走全文索引，见 api.feed_search）
+    6. 支持 fields= 字段投影，只读取和返回指定字段（见 api.projection）
     """
-    from django.db.models import Count, Avg, Case, When, IntegerField, F
-
     # 获取分页参数
     try:
         page = max(1, int(request.GET.get("page", 1)))
@@ -297,25 +352,32 @@ def get_monitor_feed(request):
     except ValueError:
         page = 1
         page_size = 100
+    try:
+        fields = parse_fields(request, FEED_ITEM_SOURCES)
+    except InvalidFields as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     # 计算 offset
     offset = (page - 1) * page_size
+    use_cursor = wants_cursor_pagination(request)
 
     items = []
 
-    # ============== 优化1: 使用数据库聚合获取全局统计数据 ==============
-    # 一次性获取所有统计信息，避免多次查询
-    global_stats = MonitorFeed.objects.aggregate(
-        total_count=Count('id'),
-        sensitive_count=Count(Case(When(is_sensitive=True, then=1), output_field=IntegerField())),
-        positive_count=Count(Case(When(sentiment='positive', then=1), output_field=IntegerField())),
-        negative_count=Count(Case(When(sentiment='negative', then=1), output_field=IntegerField())),
-        neutral_count=Count(Case(When(sentiment='neutral', then=1), output_field=IntegerField())),
-        avg_sentiment_score=Avg('sentiment_score'),
-    )
+    # ============== 优化1: 从汇总表读取全局统计数据 ==============
+    # monitor_feed_rollup 由同步写入路径增量维护，只需读取 平台数 × 天数 行
+    global_stats = rollup.global_stats()
 
     total_count = global_stats['total_count'] or 0
-    total_pages = (total_count + page_size - 1) // page_size if total_count > 0 else 1
+
+    # 关键词检索（q=）只影响列表和分页，统计仍为全局数据
+    search_query = request.GET.get("q")
+    feed_queryset = search_feed(MonitorFeed.objects.all(), search_query)
+    match_is_estimate = False
+    if search_query:
+        match_count, match_is_estimate = count_rows(feed_queryset, "monitor_feed")
+    else:
+        match_count = total_count
+    total_pages = (match_count + page_size - 1) // page_size if match_count > 0 else 1
 
     # 获取全局情绪分布统计
     sentiment_distribution = {
@@ -327,22 +389,20 @@ def get_monitor_feed(request):
 
     # ============== 优化2: 分页查询，只获取当前页数据 ==============
     # 使用 select_related/prefetch_related 如果有外键关系（当前没有）
-    # 只查询需要的字段
-    queryset = MonitorFeed.objects.order_by("-created_at").values(
-        "id",
-        "platform",
-        "platform_name",
-        "content_id",
-        "content",
-        "author",
-        "url",
-        "created_at",
-        "sentiment",
-        "sentiment_score",
-        "sentiment_labels",
-        "is_sensitive",
-    )[offset:offset + page_size]
-    rows = list(queryset)
+    # 只查询需要的字段（未指定 fields 时为列表项的全部字段，不含 extra_data）
+    columns = source_columns(fields, FEED_ITEM_SOURCES) if fields else list(FEED_ITEM_SOURCES)
+    queryset = feed_queryset.values(*columns)
+    cursor_pagination = None
+    if use_cursor:
+        try:
+            rows, cursor_pagination = paginate_by_cursor(queryset, request.GET.get("cursor"), page_size)
+        except InvalidCursor as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        # 全局统计已经给出了总数，游标模式下直接附带，无需额外 COUNT
+        cursor_pagination["total_count"] = match_count
+        cursor_pagination["total_is_estimate"] = match_is_estimate
+    else:
+        rows = list(queryset.order_by("-created_at")[offset:offset + page_size])
 
     for row in rows:
         content_text = row.get("content") or ""
@@ -351,30 +411,14 @@ def get_monitor_feed(request):
         sentiment_labels = row.get("sentiment_labels")
         is_sensitive = row.get("is_sensitive")
 
-        # ============== 优化3: 仅对需要的数据进行情绪分析 ==============
-        # 只有当 sentiment_score 为 None 时才进行分析
-        if sentiment_score is None:
-            sentiment_result = analyze_sentiment(content_text)
-            sentiment = sentiment_result.get("sentiment", sentiment)
-            sentiment_score = sentiment_result.get("score", 0)
-            sentiment_labels = sentiment_result.get("labels", {})
-
-            # 可选：异步更新数据库，下次查询时就不需要再分析了
-            try:
-                MonitorFeed.objects.filter(id=row.get("id")).update(
-                    sentiment=sentiment,
-                    sentiment_score=sentiment_score,
-                    sentiment_labels=sentiment_labels,
-                )
-            except Exception:
-                pass  # 更新失败不影响返回数据
-
+        # ============== 优化3: 读接口不做情绪分析和写入 ==============
+        # sentiment_score 为空的记录由 api.sentiment_backfill 后台批量回填
         if is_sensitive is None:
-            is_sensitive = bool(sentiment_labels.get("sensitive")) or sentiment == "sensitive"
+            is_sensitive = bool((sentiment_labels or {}).get("sensitive")) or sentiment == "sensitive"
         if is_sensitive:
             sentiment = "sensitive"
 
-        items.append({
+        items.append(project({
             "id": str(row.get("id")),
             "platform": row.get("platform", ""),
             "platform_name": row.get("platform_name", ""),
@@ -387,7 +431,7 @@ def get_monitor_feed(request):
             "sentiment_score": sentiment_score or 0,
             "sentiment_labels": sentiment_labels or {},
             "is_sensitive": bool(is_sensitive),
-        })
+        }, fields))
 
     # 计算情感指数（使用全局平均值而不是当前页）
     avg_sentiment = global_stats['avg_sentiment_score'] or 0
@@ -404,10 +448,11 @@ def get_monitor_feed(request):
             "hot_score": hot_score,
         },
         "sentiment_distribution": sentiment_distribution,
-        "pagination": {
+        "pagination": cursor_pagination or {
             "page": page,
             "page_size": page_size,
-            "total_count": total_count,
+            "total_count": match_count,
+            "total_is_estimate": match_is_estimate,
             "total_pages": total_pages,
             "has_next": page < total_pages,
             "has_prev": page > 1,
@@ -416,105 +461,99 @@ def get_monitor_feed(request):
     })
 
 
+@feed_condition("sensitive_feed")
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@cache_feed_response("sensitive_feed")
 def get_sensitive_feed(request):
-    """Get sensitive feed items from monitor_feed with optional platform filter."""
+    """Get sensitive feed items from monitor_feed with optional platform filter.
+
+    Pass ``cursor`` (or ``pagination=cursor``) for keyset pagination; the total
+    count is then only computed when ``include_total=true``. ``q`` filters by
+    keyword through the full-text index (see ``api.feed_search``). ``fields``
+    limits the returned (and fetched) columns (see ``api.projection``).
+    """
     platform = request.GET.get("platform")
-    sort_by = request.GET.get("sort_by")
-    sort_order = request.GET.get("sort_order", "asc").lower()
     try:
         page = max(1, int(request.GET.get("page", 1)))
         page_size = max(1, int(request.GET.get("page_size", 50)))
     except ValueError:
         page = 1
         page_size = 50
+    try:
+        fields = parse_fields(request, FEED_LIST_SOURCES)
+    except InvalidFields as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    columns = source_columns(fields, FEED_LIST_SOURCES) if fields else FEED_VALUE_FIELDS
 
     offset = (page - 1) * page_size
-    queryset = MonitorFeed.objects.filter(
-        models.Q(is_sensitive=True) | models.Q(sentiment="sensitive")
-    )
+    use_cursor = wants_cursor_pagination(request)
+    # flagged 由写入路径维护（is_sensitive 或 sentiment == "sensitive"），每页是
+    # (flagged, platform, created_at) 索引上的一次范围扫描；结果全部为敏感数据，
+    # sort_by=sensitive 与按时间倒序等价
+    queryset = MonitorFeed.objects.filter(flagged=True)
     if platform:
         queryset = queryset.filter(platform=platform)
+    search_query = request.GET.get("q")
+    queryset = search_feed(queryset, search_query)
 
     latest_update_ts = queryset.aggregate(
         max_ts=models.Max(Coalesce("last_modify_ts", "add_ts", 0))
     ).get("max_ts") or 0
 
-    if sort_by == "sensitive":
-        queryset = queryset.annotate(
-            sensitive_rank=models.Case(
-                models.When(
-                    models.Q(is_sensitive=True) | models.Q(sentiment="sensitive"),
-                    then=models.Value(0),
-                ),
-                default=models.Value(1),
-                output_field=models.IntegerField(),
+    queryset = queryset.order_by("-created_at", "-id")
+
+    if use_cursor:
+        try:
+            rows, pagination = paginate_by_cursor(
+                queryset.values(*columns), request.GET.get("cursor"), page_size
             )
-        )
-        order_field = "sensitive_rank" if sort_order != "desc" else "-sensitive_rank"
-        queryset = queryset.order_by(order_field, "-created_at")
+        except InvalidCursor as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if wants_total(request, default=False):
+            pagination["total_count"], pagination["total_is_estimate"] = count_rows(
+                queryset, "sensitive_feed", platform
+            )
+        is_empty = not rows and not request.GET.get("cursor")
     else:
-        queryset = queryset.order_by("-created_at")
+        total_count, total_is_estimate = count_rows(queryset, "sensitive_feed", platform)
+        is_empty = total_count == 0
 
-    total_count = queryset.count()
-    if platform and total_count == 0:
-        items, total_count, total_pages, latest_update_ts = _fetch_platform_feed_data(
+    if platform and is_empty and not search_query:
+        items, total_count, total_pages, latest_update_ts, total_is_estimate = _fetch_platform_feed_data(
             platform, page, page_size
         )
         return Response({
-            "items": items,
+            "items": [project(item, fields) for item in items],
             "latest_update_ts": latest_update_ts,
             "pagination": {
                 "page": page,
                 "page_size": page_size,
                 "total_count": total_count,
+                "total_is_estimate": total_is_estimate,
                 "total_pages": total_pages,
                 "has_next": page < total_pages,
                 "has_prev": page > 1,
             },
             "fetched_at": int(time.time() * 1000),
         })
-    total_pages = (total_count + page_size - 1) // page_size if total_count > 0 else 1
-
-    rows = list(
-        queryset.values(
-            "id",
-            "platform",
-            "platform_name",
-            "content_id",
-            "content",
-            "author",
-            "url",
-            "created_at",
-            "sentiment",
-            "sentiment_score",
-            "sentiment_labels",
-            "is_sensitive",
-            "extra_data",
-        )[offset:offset + page_size]
-    )
 
-    content_ids_by_platform = {}
-    for row in rows:
-        platform_key = row.get("platform")
-        content_ids_by_platform.setdefault(platform_key, []).append(row.get("content_id"))
-
-    interactions_map_by_platform = {
-        platform_key: _get_interactions_from_platform(platform_key, ids)
-        for platform_key, ids in content_ids_by_platform.items()
-    }
+    if not use_cursor:
+        total_pages = (total_count + page_size - 1) // page_size if total_count > 0 else 1
+        pagination = {
+            "page": page,
+            "page_size": page_size,
+            "total_count": total_count,
+            "total_is_estimate": total_is_estimate,
+            "total_pages": total_pages,
+            "has_next": page < total_pages,
+            "has_prev": page > 1,
+        }
+        rows = list(queryset.values(*columns)[offset:offset + page_size])
 
     items = []
     for row in rows:
-        extra_data = row.get("extra_data") or {}
-        extra_ip = extra_data.get("ip_location") if isinstance(extra_data, dict) else None
-
-        # 获取互动数据，优先使用interactions_map中的ip_location，否则使用extra_ip
-        interaction_data = interactions_map_by_platform.get(row.get("platform"), {}).get(row.get("content_id"), {})
-        final_ip_location = interaction_data.get("ip_location") or extra_ip or "-"
-
-        items.append({
+        items.append(project({
             "id": str(row.get("id")),
             "platform": row.get("platform", ""),
             "platform_name": row.get("platform_name", ""),
@@ -527,29 +566,30 @@ def get_sensitive_feed(request):
             "sentiment_score": row.get("sentiment_score") or 0,
             "sentiment_labels": row.get("sentiment_labels") or {},
             "is_sensitive": True,
-            "ip_location": final_ip_location,
-            **{k: v for k, v in interaction_data.items() if k != "ip_location"},
-        })
+            # 互动数据已由同步层写入 monitor_feed，无需再查平台表
+            **_feed_interactions(row),
+        }, fields))
 
     return Response({
         "items": items,
         "latest_update_ts": latest_update_ts,
-        "pagination": {
-            "page": page,
-            "page_size": page_size,
-            "total_count": total_count,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
-        },
+        "pagination": pagination,
         "fetched_at": int(time.time() * 1000),
     })
 
 
+@feed_condition("all_feed")
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@cache_feed_response("all_feed")
 def get_all_feed(request):
-    """Get all feed items from monitor_feed with optional platform filter."""
+    """Get all feed items from monitor_feed with optional platform filter.
+
+    Pass ``cursor`` (or ``pagination=cursor``) for keyset pagination; the total
+    count is then only computed when ``include_total=true``. ``q`` filters by
+    keyword through the full-text index (see ``api.feed_search``). ``fields``
+    limits the returned (and fetched) columns (see ``api.projection``).
+    """
     platform = request.GET.get("platform")
     sort_by = request.GET.get("sort_by")
     sort_order = request.GET.get("sort_order", "asc").lower()
@@ -559,80 +599,67 @@ def get_all_feed(request):
     except ValueError:
         page = 1
         page_size = 50
+    try:
+        fields = parse_fields(request, FEED_LIST_SOURCES)
+    except InvalidFields as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    columns = source_columns(fields, FEED_LIST_SOURCES) if fields else FEED_VALUE_FIELDS
 
     offset = (page - 1) * page_size
+    # 游标分页按时间倒序翻页，sort_by=sensitive 的自定义排序仍走 offset 分页
+    use_cursor = wants_cursor_pagination(request) and sort_by != "sensitive"
     queryset = MonitorFeed.objects.all()
     if platform:
         queryset = queryset.filter(platform=platform)
+    queryset = search_feed(queryset, request.GET.get("q"))
 
     latest_update_ts = queryset.aggregate(
         max_ts=models.Max(Coalesce("last_modify_ts", "add_ts", 0))
     ).get("max_ts") or 0
 
     if sort_by == "sensitive":
-        queryset = queryset.annotate(
-            sensitive_rank=models.Case(
-                models.When(
-                    models.Q(is_sensitive=True) | models.Q(sentiment="sensitive"),
-                    then=models.Value(0),
-                ),
-                default=models.Value(1),
-                output_field=models.IntegerField(),
-            )
-        )
-        order_field = "sensitive_rank" if sort_order != "desc" else "-sensitive_rank"
+        # 敏感优先（sort_order=desc 时敏感置后），直接按 flagged 列排序
+        order_field = "-flagged" if sort_order != "desc" else "flagged"
         queryset = queryset.order_by(order_field, "-created_at")
     else:
         queryset = queryset.order_by("-created_at")
 
-    total_count = queryset.count()
-    total_pages = (total_count + page_size - 1) // page_size if total_count > 0 else 1
-
-    rows = list(
-        queryset.values(
-            "id",
-            "platform",
-            "platform_name",
-            "content_id",
-            "content",
-            "author",
-            "url",
-            "created_at",
-            "sentiment",
-            "sentiment_score",
-            "sentiment_labels",
-            "is_sensitive",
-            "extra_data",
-        )[offset:offset + page_size]
-    )
-
-    content_ids_by_platform = {}
-    for row in rows:
-        platform_key = row.get("platform")
-        content_ids_by_platform.setdefault(platform_key, []).append(row.get("content_id"))
-
-    interactions_map_by_platform = {
-        platform_key: _get_interactions_from_platform(platform_key, ids)
-        for platform_key, ids in content_ids_by_platform.items()
-    }
+    if use_cursor:
+        try:
+            rows, pagination = paginate_by_cursor(
+                queryset.values(*columns), request.GET.get("cursor"), page_size
+            )
+        except InvalidCursor as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if wants_total(request, default=False):
+            pagination["total_count"], pagination["total_is_estimate"] = count_rows(
+                queryset, "all_feed", platform
+            )
+    else:
+        total_count, total_is_estimate = count_rows(queryset, "all_feed", platform)
+        total_pages = (total_count + page_size - 1) // page_size if total_count > 0 else 1
+        pagination = {
+            "page": page,
+            "page_size": page_size,
+            "total_count": total_count,
+            "total_is_estimate": total_is_estimate,
+            "total_pages": total_pages,
+            "has_next": page < total_pages,
+            "has_prev": page > 1,
+        }
+        rows = list(queryset.values(*columns)[offset:offset + page_size])
 
     items = []
     for row in rows:
         is_sensitive = row.get("is_sensitive")
         sentiment = row.get("sentiment") or "neutral"
         sentiment_labels = row.get("sentiment_labels") or {}
-        extra_data = row.get("extra_data") or {}
-        extra_ip = extra_data.get("ip_location") if isinstance(extra_data, dict) else None
 
         # 确保敏感状态正确设置
         if is_sensitive is None:
             is_sensitive = bool(sentiment_labels.get("sensitive")) or sentiment == "sensitive"
 
-        # 获取互动数据，优先使用interactions_map中的ip_location，否则使用extra_ip
-        interaction_data = interactions_map_by_platform.get(row.get("platform"), {}).get(row.get("content_id"), {})
-        final_ip_location = interaction_data.get("ip_location") or extra_ip or "-"
-
-        items.append({
+        items.append(project({
             "id": str(row.get("id")),
             "platform": row.get("platform", ""),
             "platform_name": row.get("platform_name", ""),
@@ -645,28 +672,185 @@ def get_all_feed(request):
             "sentiment_score": row.get("sentiment_score") or 0,
             "sentiment_labels": sentiment_labels,
             "is_sensitive": bool(is_sensitive),
-            "ip_location": final_ip_location,
-            **{k: v for k, v in interaction_data.items() if k != "ip_location"},
-        })
+            # 互动数据已由同步层写入 monitor_feed，无需再查平台表
+            **_feed_interactions(row),
+        }, fields))
 
     return Response({
         "items": items,
         "latest_update_ts": latest_update_ts,
-        "pagination": {
-            "page": page,
-            "page_size": page_size,
-            "total_count": total_count,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
-        },
+        "pagination": pagination,
         "fetched_at": int(time.time() * 1000),
     })
 
 
+def _is_asgi_request(request) -> bool:
+    """
+    是否为 ASGI 请求（DRF Request 取其内部的 HttpRequest）
+
+    ASGI 下 StreamingHttpResponse 必须使用异步迭代器，同步迭代器会被整体读入内存后才发送
+    """
+    return isinstance(getattr(request, "_request", request), ASGIRequest)
+
+
+@require_http_methods(["GET"])
+def monitor_stream(request):
+    """Server-Sent Events stream of newly synced monitor_feed rows.
+
+    Query params: ``platform`` and ``sensitive=true`` filter the stream.
+    Reconnects resume after ``Last-Event-ID`` (or ``last_event_id``), which
+    has the form ``<last_modify_ts>:<id>``.
+    """
+    platform = request.GET.get("platform") or None
+    sensitive_only = str(request.GET.get("sensitive", "")).lower() in {"1", "true", "yes"}
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+
+    events = astream_events if _is_asgi_request(request) else stream_events
+    response = StreamingHttpResponse(
+        events(platform, sensitive_only, last_event_id),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    # 关闭 Nginx 缓冲，保证事件实时到达
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@require_http_methods(["GET"])
+def export_data(request):
+    """Stream a bulk export of monitor_feed or a platform content/comment table.
+
+    Query params: ``source`` (monitor_feed | contents | comments),
+    ``platform`` (required for contents/comments), ``start``/``end``
+    (epoch seconds/ms or ISO date), ``q``, ``sensitive=true`` and
+    ``format`` (ndjson | csv).
+    """
+    source = request.GET.get("source", "monitor_feed")
+    platform = request.GET.get("platform") or None
+    export_format = request.GET.get("format", "ndjson").lower()
+    sensitive_only = str(request.GET.get("sensitive", "")).lower() in {"1", "true", "yes"}
+    try:
+        model = resolve_model(source, platform)
+        queryset = build_queryset(
+            model,
+            platform=platform,
+            start=parse_time_param(request.GET.get("start")),
+            end=parse_time_param(request.GET.get("end")),
+            keyword=(request.GET.get("q") or "").strip() or None,
+            sensitive=sensitive_only,
+        )
+        filename = f"{source}_{platform or 'all'}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        return export_response(queryset, export_format, filename, asynchronous=_is_asgi_request(request))
+    except ExportError as e:
+        return JsonResponse({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+# 平台内容表 -> monitor_feed 字段的查询，表名和排序列取自 PLATFORM_FEED_CONFIG
+PLATFORM_FEED_QUERIES = {
+    "xhs": (
+        "SELECT 'xhs' as platform, '小红书' as platform_name, CAST(note_id AS CHAR) as content_id, "
+        "CONCAT_WS(' ', IFNULL(`title`, ''), IFNULL(`desc`, '')) as content, nickname as author, "
+        "note_url as url, `time` as created_at, COALESCE(source_keyword, '') as source_keyword FROM xhs_note"
+    ),
+    "dy": (
+        "SELECT 'dy' as platform, '抖音' as platform_name, CAST(aweme_id AS CHAR) as content_id, "
+        "CONCAT_WS(' ', IFNULL(`title`, ''), IFNULL(`desc`, '')) as content, nickname as author, "
+        "aweme_url as url, create_time as created_at, COALESCE(source_keyword, '') as source_keyword FROM douyin_aweme"
+    ),
+    "ks": (
+        "SELECT 'ks' as platform, '快手' as platform_name, video_id as content_id, "
+        "CONCAT_WS(' ', IFNULL(`title`, ''), IFNULL(`desc`, '')) as content, nickname as author, "
+        "video_url as url, create_time as created_at, COALESCE(source_keyword, '') as source_keyword FROM kuaishou_video"
+    ),
+    "bili": (
+        "SELECT 'bili' as platform, 'B站' as platform_name, CAST(video_id AS CHAR) as content_id, "
+        "CONCAT_WS(' ', IFNULL(`title`, ''), IFNULL(`desc`, '')) as content, nickname as author, "
+        "video_url as url, create_time as created_at, COALESCE(source_keyword, '') as source_keyword FROM bilibili_video"
+    ),
+    "wb": (
+        "SELECT 'wb' as platform, '微博' as platform_name, CAST(note_id AS CHAR) as content_id, "
+        "IFNULL(`content`, '') as content, nickname as author, "
+        "note_url as url, create_time as created_at, COALESCE(source_keyword, '') as source_keyword FROM weibo_note"
+    ),
+    "tieba": (
+        "SELECT 'tieba' as platform, '贴吧' as platform_name, note_id as content_id, "
+        "CONCAT_WS(' ', IFNULL(`title`, ''), IFNULL(`desc`, '')) as content, user_nickname as author, "
+        "note_url as url, 0 as created_at, COALESCE(source_keyword, '') as source_keyword FROM tieba_note"
+    ),
+    "zhihu": (
+        "SELECT 'zhihu' as platform, '知乎' as platform_name, content_id as content_id, "
+        "CONCAT_WS(' ', IFNULL(`title`, ''), IFNULL(`desc`, ''), IFNULL(`content_text`, '')) as content, user_nickname as author, "
+        "content_url as url, 0 as created_at, COALESCE(source_keyword, '') as source_keyword FROM zhihu_content"
+    ),
+}
+
+
+def _platform_order_expression(config: dict) -> str:
+    """
+    平台表取最新记录的排序表达式：整数发布时间列按换算成秒后的值排序，秒/毫秒混存时
+    LIMIT 取到的也是真正最新的记录；贴吧/知乎的发布时间是字符串，按主键倒序取最新入库的记录
+    """
+    model = config["model"]
+    field = model._meta.get_field(config["time_field"])
+    if isinstance(field, models.IntegerField):
+        return epoch_seconds_sql(connection.ops.quote_name(field.column))
+    return connection.ops.quote_name(model._meta.pk.column)
+
+
+def _platform_row_time(row: dict) -> int:
+    return _to_millis(row.get("created_at")) or 0
+
+
+def _platform_row_item(row: dict) -> dict:
+    return {
+        "id": str(hash(row.get("content_id", ""))),
+        "platform": row.get("platform", ""),
+        "platform_name": row.get("platform_name", ""),
+        "content_id": str(row.get("content_id", "")),
+        "content": row.get("content") or "",
+        "author": row.get("author") or "",
+        "url": row.get("url") or "",
+        "created_at": row.get("created_at") or 0,
+    }
+
+
+def _merge_platform_table_rows(limit: Optional[int]) -> Iterator[dict]:
+    """
+    各平台内容表按发布时间倒序的归并结果
+
+    每张表只取按归一化时间倒序的前 limit 行，再按归一化后的毫秒时间做 k 路归并，
+    返回的行数与 limit 成正比。limit 为 None 时不限制。
+    """
+    per_table = []
+    with connection.cursor() as cursor:
+        for platform, query in PLATFORM_FEED_QUERIES.items():
+            order_expression = _platform_order_expression(PLATFORM_FEED_CONFIG[platform])
+            if limit is not None:
+                cursor.execute(f"{query} ORDER BY {order_expression} DESC LIMIT %s", [limit])
+            else:
+                cursor.execute(f"{query} ORDER BY {order_expression} DESC")
+            columns = [col[0] for col in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            # SQL 侧按秒排序（SQLite 整除丢掉毫秒部分），归并前按毫秒时间在表内重排
+            rows.sort(key=_platform_row_time, reverse=True)
+            per_table.append(rows)
+
+    merged = heapq.merge(*per_table, key=_platform_row_time, reverse=True)
+    return islice(merged, limit) if limit is not None else merged
+
+
+def _count_platform_table_rows() -> int:
+    total = 0
+    with connection.cursor() as cursor:
+        for platform in PLATFORM_FEED_QUERIES:
+            table = connection.ops.quote_name(PLATFORM_FEED_CONFIG[platform]["model"]._meta.db_table)
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            total += cursor.fetchone()[0]
+    return total
+
+
 def _fetch_from_platform_tables(limit: int = None) -> list:
     """Fetch items from platform tables when monitor_feed is empty"""
-    items = []
     try:
         # 如果 limit 为 None，则不限制返回数量
         if limit is not None:
@@ -674,145 +858,21 @@ def _fetch_from_platform_tables(limit: int = None) -> list:
                 limit = max(1, int(limit))
             except (TypeError, ValueError):
                 limit = 50
-
-        # Fetch from all platform tables and merge
-        queries = [
-            # xhs
-            "SELECT 'xhs' as platform, '小红书' as platform_name, CAST(note_id AS CHAR) as content_id, "
-            "CONCAT_WS(' ', IFNULL(`title`, ''), IFNULL(`desc`, '')) as content, nickname as author, "
-            "note_url as url, `time` as created_at, COALESCE(source_keyword, '') as source_keyword FROM xhs_note",
-            # douyin
-            "SELECT 'dy' as platform, '抖音' as platform_name, CAST(aweme_id AS CHAR) as content_id, "
-            "CONCAT_WS(' ', IFNULL(`title`, ''), IFNULL(`desc`, '')) as content, nickname as author, "
-            "aweme_url as url, create_time as created_at, COALESCE(source_keyword, '') as source_keyword FROM douyin_aweme",
-            # kuaishou
-            "SELECT 'ks' as platform, '快手' as platform_name, video_id as content_id, "
-            "CONCAT_WS(' ', IFNULL(`title`, ''), IFNULL(`desc`, '')) as content, nickname as author, "
-            "video_url as url, create_time as created_at, COALESCE(source_keyword, '') as source_keyword FROM kuaishou_video",
-            # bilibili
-            "SELECT 'bili' as platform, 'B站' as platform_name, CAST(video_id AS CHAR) as content_id, "
-            "CONCAT_WS(' ', IFNULL(`title`, ''), IFNULL(`desc`, '')) as content, nickname as author, "
-            "video_url as url, create_time as created_at, COALESCE(source_keyword, '') as source_keyword FROM bilibili_video",
-            # weibo
-            "SELECT 'wb' as platform, '微博' as platform_name, CAST(note_id AS CHAR) as content_id, "
-            "IFNULL(`content`, '') as content, nickname as author, "
-            "note_url as url, create_time as created_at, COALESCE(source_keyword, '') as source_keyword FROM weibo_note",
-            # tieba
-            "SELECT 'tieba' as platform, '贴吧' as platform_name, note_id as content_id, "
-            "CONCAT_WS(' ', IFNULL(`title`, ''), IFNULL(`desc`, '')) as content, user_nickname as author, "
-            "note_url as url, 0 as created_at, COALESCE(source_keyword, '') as source_keyword FROM tieba_note",
-            # zhihu
-            "SELECT 'zhihu' as platform, '知乎' as platform_name, content_id as content_id, "
-            "CONCAT_WS(' ', IFNULL(`title`, ''), IFNULL(`desc`, ''), IFNULL(`content_text`, '')) as content, user_nickname as author, "
-            "content_url as url, 0 as created_at, COALESCE(source_keyword, '') as source_keyword FROM zhihu_content",
-        ]
-
-        all_rows = []
-        with connection.cursor() as cursor:
-            for query in queries:
-                # 根据 limit 决定是否添加 LIMIT 子句
-                if limit is not None:
-                    cursor.execute(f"{query} ORDER BY created_at DESC LIMIT %s", [limit])
-                else:
-                    cursor.execute(f"{query} ORDER BY created_at DESC")
-                columns = [col[0] for col in cursor.description]
-                for row in cursor.fetchall():
-                    all_rows.append(dict(zip(columns, row)))
-
-        # Sort by created_at descending
-        all_rows.sort(key=lambda x: (_to_millis(x.get("created_at")) or 0), reverse=True)
-
-        # 如果 limit 不为 None，则限制返回数量
-        rows_to_process = all_rows[:limit] if limit is not None else all_rows
-
-        for row in rows_to_process:
-            items.append({
-                "id": str(hash(row.get("content_id", ""))),
-                "platform": row.get("platform", ""),
-                "platform_name": row.get("platform_name", ""),
-                "content_id": str(row.get("content_id", "")),
-                "content": row.get("content") or "",
-                "author": row.get("author") or "",
-                "url": row.get("url") or "",
-                "created_at": row.get("created_at") or 0,
-            })
-
+        return [_platform_row_item(row) for row in _merge_platform_table_rows(limit)]
     except Exception as e:
-        items = []
-
-    return items
+        return []
 
 
 def _fetch_from_platform_tables_paginated(page: int = 1, page_size: int = 100) -> tuple:
     """Fetch items from platform tables with pagination when monitor_feed is empty"""
-    items = []
-    total_count = 0
-    total_pages = 1
-
     try:
-        # Fetch from all platform tables and merge
-        queries = [
-            # xhs
-            "SELECT 'xhs' as platform, '小红书' as platform_name, CAST(note_id AS CHAR) as content_id, "
-            "CONCAT_WS(' ', IFNULL(`title`, ''), IFNULL(`desc`, '')) as content, nickname as author, "
-            "note_url as url, `time` as created_at, COALESCE(source_keyword, '') as source_keyword FROM xhs_note",
-            # douyin
-            "SELECT 'dy' as platform, '抖音' as platform_name, CAST(aweme_id AS CHAR) as content_id, "
-            "CONCAT_WS(' ', IFNULL(`title`, ''), IFNULL(`desc`, '')) as content, nickname as author, "
-            "aweme_url as url, create_time as created_at, COALESCE(source_keyword, '') as source_keyword FROM douyin_aweme",
-            # kuaishou
-            "SELECT 'ks' as platform, '快手' as platform_name, video_id as content_id, "
-            "CONCAT_WS(' ', IFNULL(`title`, ''), IFNULL(`desc`, '')) as content, nickname as author, "
-            "video_url as url, create_time as created_at, COALESCE(source_keyword, '') as source_keyword FROM kuaishou_video",
-            # bilibili
-            "SELECT 'bili' as platform, 'B站' as platform_name, CAST(video_id AS CHAR) as content_id, "
-            "CONCAT_WS(' ', IFNULL(`title`, ''), IFNULL(`desc`, '')) as content, nickname as author, "
-            "video_url as url, create_time as created_at, COALESCE(source_keyword, '') as source_keyword FROM bilibili_video",
-            # weibo
-            "SELECT 'wb' as platform, '微博' as platform_name, CAST(note_id AS CHAR) as content_id, "
-            "IFNULL(`content`, '') as content, nickname as author, "
-            "note_url as url, create_time as created_at, COALESCE(source_keyword, '') as source_keyword FROM weibo_note",
-            # tieba
-            "SELECT 'tieba' as platform, '贴吧' as platform_name, note_id as content_id, "
-            "CONCAT_WS(' ', IFNULL(`title`, ''), IFNULL(`desc`, '')) as content, user_nickname as author, "
-            "note_url as url, 0 as created_at, COALESCE(source_keyword, '') as source_keyword FROM tieba_note",
-            # zhihu
-            "SELECT 'zhihu' as platform, '知乎' as platform_name, content_id as content_id, "
-            "CONCAT_WS(' ', IFNULL(`title`, ''), IFNULL(`desc`, ''), IFNULL(`content_text`, '')) as content, user_nickname as author, "
-            "content_url as url, 0 as created_at, COALESCE(source_keyword, '') as source_keyword FROM zhihu_content",
-        ]
-
-        all_rows = []
-        with connection.cursor() as cursor:
-            for query in queries:
-                cursor.execute(f"{query} ORDER BY created_at DESC")
-                columns = [col[0] for col in cursor.description]
-                for row in cursor.fetchall():
-                    all_rows.append(dict(zip(columns, row)))
-
-        # Sort by created_at descending
-        all_rows.sort(key=lambda x: (_to_millis(x.get("created_at")) or 0), reverse=True)
-
-        # Calculate pagination
-        total_count = len(all_rows)
+        total_count = _count_platform_table_rows()
         total_pages = (total_count + page_size - 1) // page_size if total_count > 0 else 1
 
-        # Get current page data
+        # 每张表只需取前 offset + page_size 行，归并后跳过 offset 行
         offset = (page - 1) * page_size
-        rows_to_process = all_rows[offset:offset + page_size]
-
-        for row in rows_to_process:
-            items.append({
-                "id": str(hash(row.get("content_id", ""))),
-                "platform": row.get("platform", ""),
-                "platform_name": row.get("platform_name", ""),
-                "content_id": str(row.get("content_id", "")),
-                "content": row.get("content") or "",
-                "author": row.get("author") or "",
-                "url": row.get("url") or "",
-                "created_at": row.get("created_at") or 0,
-            })
-
+        rows = islice(_merge_platform_table_rows(offset + page_size), offset, None)
+        items = [_platform_row_item(row) for row in rows]
     except Exception as e:
         items = []
         total_count = 0
@@ -930,12 +990,13 @@ class CrawlerView(APIView):
         return Response({"error": "Invalid action"}, status=status.HTTP_400_BAD_REQUEST)
 
     def get(self, request, action=None):
-        """Get crawler status or logs"""
+        """Get crawler status, logs or persisted runs"""
         if action == "status":
             return self._get_status()
         elif action == "logs":
-            limit = int(request.GET.get("limit", 100))
-            return self._get_logs(limit)
+            return self._get_logs(request)
+        elif action == "runs":
+            return Response({"runs": list_runs(), "current_run": CRAWLER_LOGS.run_id})
         return Response({"error": "Invalid action"}, status=status.HTTP_400_BAD_REQUEST)
 
     def _start_crawler(self, request):
@@ -1007,6 +1068,7 @@ class CrawlerView(APIView):
                 def _run_batch():
                     _set_batch_running(True)
                     CRAWLER_BATCH_CANCEL.clear()
+                    CRAWLER_LOGS.start_run(f"batch-{'-'.join(platform_list)}")
                     try:
                         _append_log("INFO", f"Batch crawler started: {', '.join(platform_list)}")
                         for item in platform_list:
@@ -1020,6 +1082,7 @@ class CrawlerView(APIView):
                     finally:
                         _set_process(None)
                         _set_batch_running(False)
+                        CRAWLER_LOGS.end_run()
 
                 threading.Thread(target=_run_batch, daemon=True).start()
                 return Response({
@@ -1030,10 +1093,11 @@ class CrawlerView(APIView):
             platform = platform_list[0]
             _update_state(platform, login_type, crawler_type)
             cmd = _build_run_cmd(_build_cmd_args(platform))
+            CRAWLER_LOGS.start_run(f"{platform}-{crawler_type}")
             process = _start_process(cmd, platform, crawler_type)
 
             threading.Thread(
-                target=_finalize_process,
+                target=_finalize_run,
                 args=(process,),
                 daemon=True,
             ).start()
@@ -1098,51 +1162,89 @@ class CrawlerView(APIView):
             "crawler_type": state["crawler_type"],
         })
 
-    def _get_logs(self, limit: int):
-        """Get recent logs"""
-        logs = _get_logs()
-        logs = logs[-limit:] if limit > 0 else logs
-        return Response({"logs": logs})
+    def _get_logs(self, request):
+        """
+        Get crawler logs
 
+        Query params:
+            limit: max lines to return (default 100)
+            since: only lines with seq > since; pass back ``next_seq`` on the next poll
+            run: page through a persisted run (see ``runs`` action) instead of the live buffer
+        """
+        try:
+            limit = min(int(request.GET.get("limit", 100)), LOG_PAGE_LIMIT)
+            since = request.GET.get("since")
+            since = int(since) if since not in (None, "") else None
+        except ValueError:
+            return Response({"error": "limit and since must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+        limit = limit if limit > 0 else LOG_PAGE_LIMIT
+
+        current_run = CRAWLER_LOGS.run_id
+        run_id = request.GET.get("run")
+        if run_id and run_id != current_run:
+            page = read_run(run_id, since or 0, limit)
+            if page is None:
+                return Response({"error": "Run not found"}, status=status.HTTP_404_NOT_FOUND)
+            logs, has_more = page
+            return Response({
+                "run_id": run_id,
+                "logs": logs,
+                "next_seq": logs[-1]["seq"] if logs else since or 0,
+                "has_more": has_more,
+            })
+
+        latest_seq = CRAWLER_LOGS.latest_seq
+        if since is None:
+            return Response({
+                "run_id": current_run,
+                "logs": CRAWLER_LOGS.tail(limit),
+                "next_seq": latest_seq,
+                "latest_seq": latest_seq,
+            })
+
+        logs, truncated = CRAWLER_LOGS.since(since, limit)
+        if truncated and current_run and since <= latest_seq:
+            # 已移出内存缓冲的部分从当前运行的日志文件读取
+            page = read_run(current_run, since, limit)
+            if page is not None and page[0]:
+                logs, truncated = page[0], False
+        return Response({
+            "run_id": current_run,
+            "logs": logs,
+            "next_seq": logs[-1]["seq"] if logs else min(since, latest_seq),
+            "latest_seq": latest_seq,
+            "has_more": bool(logs) and logs[-1]["seq"] < latest_seq,
+            "truncated": truncated,
+        })
 
-# ============== Data Management ==============
 
-def get_file_info(file_path: Path) -> dict:
-    """Get file information"""
-    stat = file_path.stat()
-    record_count = None
+@require_http_methods(["GET"])
+def crawler_log_stream(request):
+    """Server-Sent Events stream of crawler log lines.
 
-    # Try to get record count
+    Starts after ``since`` (or ``Last-Event-ID`` on reconnect); without either
+    only new lines are sent. Event IDs are the log line ``seq``.
+    """
+    since = request.headers.get("Last-Event-ID") or request.GET.get("since")
     try:
-        if file_path.suffix == ".json":
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    record_count = len(data)
-        elif file_path.suffix == ".csv":
-            with open(file_path, "r", encoding="utf-8") as f:
-                record_count = sum(1 for _ in f) - 1  # Subtract header row
-    except Exception:
-        pass
+        since = int(since) if since not in (None, "") else None
+    except ValueError:
+        return JsonResponse({"error": "since must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
 
-    return {
-        "name": file_path.name,
-        "path": str(file_path.relative_to(DATA_DIR)),
-        "size": stat.st_size,
-        "modified_at": stat.st_mtime,
-        "record_count": record_count,
-        "type": file_path.suffix[1:] if file_path.suffix else "unknown"
-    }
+    events = astream_logs if _is_asgi_request(request) else stream_logs
+    response = StreamingHttpResponse(events(CRAWLER_LOGS, since), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
 
 
-def _get_db_preview_row(platform: str, obj) -> dict:
-    from media_platform.models import MonitorFeed
+# ============== Data Management ==============
 
+def _get_db_preview_row(platform: str, obj) -> dict:
     config = PLATFORM_FEED_CONFIG.get(platform, {})
     content_fields = config.get("content_fields", [])
     time_field = config.get("time_field")
     author_field = config.get("author_field")
-    id_field = config.get("id_field")
 
     content_parts = []
     for field in content_fields:
@@ -1156,20 +1258,12 @@ def _get_db_preview_row(platform: str, obj) -> dict:
     sentiment = getattr(obj, "sentiment", None)
     is_sensitive = getattr(obj, "is_sensitive", None)
 
-    # Try to get fresh data from MonitorFeed (more up-to-date)
-    content_id = getattr(obj, id_field, None) if id_field else None
-    if content_id:
-        try:
-            monitor_feed = MonitorFeed.objects.filter(
-                platform=platform,
-                content_id=str(content_id)
-            ).first()
-            if monitor_feed:
-                # Use MonitorFeed values if they exist
-                sentiment = monitor_feed.sentiment
-                is_sensitive = monitor_feed.is_sensitive
-        except Exception:
-            pass
+    # MonitorFeed values are more up-to-date; the row is joined for the whole page
+    # by PlatformContentQuerySet.with_monitor_feed()
+    monitor_feed = getattr(obj, "monitor_feed", None)
+    if monitor_feed:
+        sentiment = monitor_feed.sentiment
+        is_sensitive = monitor_feed.is_sensitive
 
     return {
         "create_time": time_value,
@@ -1189,10 +1283,10 @@ def _get_db_preview_row(platform: str, obj) -> dict:
     }
 
 
-def _get_db_preview_data(platform: str, limit: int) -> tuple[list, int]:
+def _get_db_preview_data(platform: str, limit: int) -> tuple[list, int, bool]:
     config = PLATFORM_FEED_CONFIG.get(platform)
     if not config:
-        return [], 0
+        return [], 0, False
 
     model = config["model"]
     time_field = config.get("time_field")
@@ -1203,68 +1297,57 @@ def _get_db_preview_data(platform: str, limit: int) -> tuple[list, int]:
             queryset = queryset.order_by(f"-{time_field}")
         else:
             queryset = queryset.order_by("-id")
-        total = queryset.count()
-        rows = [_get_db_preview_row(platform, obj) for obj in queryset[:limit]]
-        return rows, total
+        total, total_is_estimate = count_rows(queryset, f"db_preview:{platform}", platform)
+        page = queryset.with_monitor_feed("sentiment", "is_sensitive")[:limit]
+        rows = [_get_db_preview_row(platform, obj) for obj in page]
+        return rows, total, total_is_estimate
     except Exception:
-        return [], 0
+        return [], 0, False
 
 
-def _get_monitor_feed_data(platform: str, limit: int = 100, page: int = 1) -> tuple[list, int]:
-    """Get data from MonitorFeed table for the given platform"""
+def _get_monitor_feed_data(
+    platform: str, limit: int = 100, page: int = 1, fields: Optional[tuple] = None
+) -> tuple[list, int, bool]:
+    """Get data from MonitorFeed table for the given platform
+
+    ``fields`` (keys of ``PREVIEW_ROW_SOURCES``) restricts both the returned
+    keys and the loaded columns via ``.only()``.
+    """
     from media_platform.models import MonitorFeed
 
     if not platform:
-        return [], 0
+        return [], 0, False
 
     try:
         offset = (page - 1) * limit
         queryset = MonitorFeed.objects.filter(platform=platform).order_by("-created_at")
-        total = queryset.count()
+        total, total_is_estimate = count_rows(queryset, "monitor_feed_preview", platform)
 
-        # Get interactions data from original platform tables
-        content_ids_to_fetch = []
-        for feed in queryset[offset:offset + limit]:
-            content_ids_to_fetch.append(feed.content_id)
-
-        interactions_map = _get_interactions_from_platform(platform, content_ids_to_fetch)
+        # Interactions are denormalized into monitor_feed by the sync layer
+        row_sources = [
+            (key, column) for key, column in PREVIEW_ROW_SOURCES.items()
+            if fields is None or key in fields
+        ]
+        if fields is not None:
+            queryset = queryset.only("id", *{column for _, column in row_sources if column})
 
         rows = []
         for feed in queryset[offset:offset + limit]:
-            row_data = {
-                "create_time": feed.created_at,
-                "created_time": feed.created_at,
-                "content": feed.content,
-                "desc": None,
-                "title": None,
-                "nickname": feed.author,
-                "avatar": None,
-                "ip_location": None,
-                "sentiment": feed.sentiment,
-                "is_sensitive": feed.is_sensitive,
-                # Extra fields from MonitorFeed
-                "content_id": feed.content_id,
-                "platform": feed.platform,
-                "platform_name": feed.platform_name,
-                "url": feed.url,
-            }
-
-            # Add interactions data
-            interactions = interactions_map.get(feed.content_id, {})
-            row_data.update(interactions)
-
-            rows.append(row_data)
-        return rows, total
+            rows.append({
+                key: getattr(feed, column) if column else None
+                for key, column in row_sources
+            })
+        return rows, total, total_is_estimate
     except Exception as e:
         import traceback
         traceback.print_exc()
-        return [], 0
+        return [], 0, False
 
 
-def _fetch_platform_feed_data(platform: str, page: int, page_size: int) -> tuple[list, int, int, int]:
+def _fetch_platform_feed_data(platform: str, page: int, page_size: int) -> tuple[list, int, int, int, bool]:
     config = PLATFORM_FEED_CONFIG.get(platform)
     if not config:
-        return [], 0, 1, 0
+        return [], 0, 1, 0, False
 
     model = config["model"]
     id_field = config.get("id_field")
@@ -1284,20 +1367,12 @@ def _fetch_platform_feed_data(platform: str, page: int, page_size: int) -> tuple
             max_ts=models.Max(Coalesce("last_modify_ts", "add_ts", 0))
         ).get("max_ts") or 0
 
-        total_count = queryset.count()
+        total_count, total_is_estimate = count_rows(queryset, f"platform_feed:{platform}", platform)
         total_pages = (total_count + page_size - 1) // page_size if total_count > 0 else 1
 
         offset = (page - 1) * page_size
         rows = list(queryset[offset:offset + page_size])
 
-        content_ids = []
-        for obj in rows:
-            content_id = getattr(obj, id_field, None) if id_field else None
-            if content_id is not None:
-                content_ids.append(str(content_id))
-
-        interactions_map = _get_interactions_from_platform(platform, content_ids)
-
         items = []
         for obj in rows:
             content_parts = []
@@ -1318,8 +1393,9 @@ def _fetch_platform_feed_data(platform: str, page: int, page_size: int) -> tuple
             if is_sensitive is None:
                 is_sensitive = sentiment == "sensitive"
 
-            interaction_data = interactions_map.get(content_id_str, {})
-            final_ip_location = interaction_data.get("ip_location") or getattr(obj, "ip_location", None) or "-"
+            # 行本身就是平台内容表记录，直接换算互动数据
+            interaction_data = extract_interactions(platform, obj)
+            final_ip_location = interaction_data.get("ip_location") or "-"
 
             items.append({
                 "id": str(getattr(obj, "id", "")),
@@ -1338,176 +1414,14 @@ def _fetch_platform_feed_data(platform: str, page: int, page_size: int) -> tuple
                 **{k: v for k, v in interaction_data.items() if k != "ip_location"},
             })
 
-        return items, total_count, total_pages, latest_update_ts
+        return items, total_count, total_pages, latest_update_ts, total_is_estimate
     except Exception:
-        return [], 0, 1, 0
-
-
-def _get_interactions_from_platform(platform: str, content_ids: list) -> dict:
-    """Get interactions and ip_location data from original platform tables"""
-    if not content_ids:
-        return {}
-
-    interactions_map = {}
-
-    try:
-        if platform == "xhs":
-            from media_platform.models import XhsNote
-            notes = XhsNote.objects.filter(note_id__in=content_ids)
-            for note in notes:
-                interactions_map[note.note_id] = {
-                    "ip_location": note.ip_location,
-                    "liked_count": _safe_int(note.liked_count),
-                    "comment_count": _safe_int(note.comment_count),
-                    "share_count": _safe_int(note.share_count),
-                    "collected_count": _safe_int(note.collected_count),
-                }
-
-        elif platform == "dy":
-            from media_platform.models import DouyinAweme
-            # Convert string IDs to integers for query
-            int_ids = []
-            for cid in content_ids:
-                try:
-                    int_ids.append(int(cid))
-                except (ValueError, TypeError):
-                    pass
-            awemes = DouyinAweme.objects.filter(aweme_id__in=int_ids)
-            for aweme in awemes:
-                interactions_map[str(aweme.aweme_id)] = {
-                    "ip_location": aweme.ip_location,
-                    "liked_count": _safe_int(aweme.liked_count),
-                    "comment_count": _safe_int(aweme.comment_count),
-                    "share_count": _safe_int(aweme.share_count),
-                    "collected_count": _safe_int(aweme.collected_count),
-                }
-
-        elif platform == "bili":
-            from media_platform.models import BilibiliVideo
-            int_ids = []
-            for cid in content_ids:
-                try:
-                    int_ids.append(int(cid))
-                except (ValueError, TypeError):
-                    pass
-            videos = BilibiliVideo.objects.filter(video_id__in=int_ids)
-            for video in videos:
-                interactions_map[str(video.video_id)] = {
-                    "ip_location": video.ip_location or None,
-                    "liked_count": _safe_int(video.liked_count),
-                    "comment_count": _safe_int(video.video_comment),
-                    "share_count": _safe_int(video.video_share_count),
-                    "collected_count": _safe_int(video.video_favorite_count),
-                }
-
-        elif platform == "wb":
-            from media_platform.models import WeiboNote
-            int_ids = []
-            for cid in content_ids:
-                try:
-                    int_ids.append(int(cid))
-                except (ValueError, TypeError):
-                    pass
-            notes = WeiboNote.objects.filter(note_id__in=int_ids)
-            for note in notes:
-                interactions_map[str(note.note_id)] = {
-                    "ip_location": note.ip_location,
-                    "liked_count": _safe_int(note.liked_count),
-                    "comment_count": _safe_int(note.comments_count),
-                    "share_count": _safe_int(note.shared_count),
-                    "collected_count": "0",
-                }
-
-        elif platform == "ks":
-            from media_platform.models import KuaishouVideo
-            videos = KuaishouVideo.objects.filter(video_id__in=content_ids)
-            for video in videos:
-                interactions_map[video.video_id] = {
-                    "ip_location": video.ip_location or None,
-                    "liked_count": _safe_int(video.liked_count),
-                    "comment_count": "0",
-                    "share_count": "0",
-                    "collected_count": "0",
-                }
-
-        elif platform == "zhihu":
-            from media_platform.models import ZhihuContent
-            contents = ZhihuContent.objects.filter(content_id__in=content_ids)
-            for content in contents:
-                interactions_map[content.content_id] = {
-                    "ip_location": content.ip_location or None,
-                    "liked_count": _safe_int(content.voteup_count),
-                    "comment_count": _safe_int(content.comment_count),
-                    "share_count": "0",
-                    "collected_count": "0",
-                }
-
-        elif platform == "tieba":
-            from media_platform.models import TiebaNote
-            notes = TiebaNote.objects.filter(note_id__in=content_ids)
-            for note in notes:
-                interactions_map[note.note_id] = {
-                    "ip_location": note.ip_location,
-                    "liked_count": "0",
-                    "comment_count": _safe_int(note.total_replay_num),
-                    "share_count": "0",
-                    "collected_count": "0",
-                }
-
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-
-    return interactions_map
-
-
-def _safe_int(value):
-    """Safely convert value to integer string"""
-    if value is None or value == "":
-        return "0"
-
-    # Handle Chinese number format (e.g., "7.9万", "1.2K")
-    if isinstance(value, str):
-        value = value.strip()
-        # Handle "万" (ten thousand)
-        if "万" in value:
-            try:
-                num_part = value.replace("万", "").strip()
-                num = float(num_part) * 10000
-                return str(int(num))
-            except (ValueError, TypeError):
-                pass
-        # Handle "K" (thousand)
-        elif "K" in value.upper():
-            try:
-                num_part = value.upper().replace("K", "").strip()
-                num = float(num_part) * 1000
-                return str(int(num))
-            except (ValueError, TypeError):
-                pass
-        # Handle "w" (ten thousand, lowercase variant)
-        elif "w" in value.lower():
-            try:
-                num_part = value.lower().replace("w", "").strip()
-                num = float(num_part) * 10000
-                return str(int(num))
-            except (ValueError, TypeError):
-                pass
-
-    try:
-        # If already an int or valid string int
-        return str(int(value))
-    except (ValueError, TypeError):
-        return "0"
+        return [], 0, 1, 0, False
 
 
 def _detect_platform_from_path(file_path: str) -> str:
     """Detect platform from file path"""
-    path_lower = file_path.lower()
-    for platform, aliases in PLATFORM_PATH_ALIASES.items():
-        if any(alias in path_lower for alias in aliases):
-            return platform
-    return None
+    return platform_from_path(file_path)
 
 
 def _get_sensitive_map_from_monitor_feed(platform: str, rows: list) -> dict:
@@ -1566,29 +1480,34 @@ def _start_process(cmd, platform: str, crawler_type: str):
     )
     _set_process(process)
     _append_log("INFO", f"Crawler started: {platform} {crawler_type}")
-    if process.stdout:
-        threading.Thread(
-            target=_stream_pipe,
-            args=(process.stdout, "INFO"),
-            daemon=True,
-        ).start()
-    if process.stderr:
-        threading.Thread(
-            target=_stream_pipe,
-            args=(process.stderr, "ERROR"),
-            daemon=True,
-        ).start()
+    process.log_threads = []
+    for pipe, level in ((process.stdout, "INFO"), (process.stderr, "ERROR")):
+        if pipe:
+            thread = threading.Thread(target=_stream_pipe, args=(pipe, level), daemon=True)
+            thread.start()
+            process.log_threads.append(thread)
     return process
 
 
 def _finalize_process(process):
     exit_code = process.wait()
+    # 等待管道读完，退出日志排在子进程输出之后
+    for thread in getattr(process, "log_threads", []):
+        thread.join(timeout=5)
     level = "INFO" if exit_code == 0 else "ERROR"
     _append_log(level, f"Crawler exited with code {exit_code}")
     _set_process(None)
     return exit_code
 
 
+def _finalize_run(process):
+    """单平台运行结束：等待进程退出并关闭本次运行的日志文件"""
+    try:
+        return _finalize_process(process)
+    finally:
+        CRAWLER_LOGS.end_run()
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def list_data_files(request):
@@ -1599,11 +1518,12 @@ def list_data_files(request):
     file_type = request.GET.get("file_type")
 
     files = []
-    supported_extensions = {".json", ".csv", ".xlsx", ".xls"}
 
     # If platform is specified, check MonitorFeed first
     if platform:
-        platform_count = MonitorFeed.objects.filter(platform=platform).count()
+        platform_count, count_is_estimate = count_rows(
+            MonitorFeed.objects.filter(platform=platform), "monitor_feed_preview", platform
+        )
         if platform_count > 0:
             platform_name_map = {
                 "xhs": "小红书",
@@ -1620,34 +1540,13 @@ def list_data_files(request):
                 "size": 0,
                 "modified_at": time.time(),
                 "record_count": platform_count,
+                "record_count_is_estimate": count_is_estimate,
                 "type": "db",
             })
 
     # Also include actual files if needed (optional, can be removed)
     if not platform or not file_type:
-        if DATA_DIR.exists():
-            for root, dirs, filenames in os.walk(DATA_DIR):
-                root_path = Path(root)
-                for filename in filenames:
-                    file_path = root_path / filename
-                    if file_path.suffix.lower() not in supported_extensions:
-                        continue
-
-                    # Platform filter
-                    if platform:
-                        rel_path = str(file_path.relative_to(DATA_DIR)).lower()
-                        aliases = PLATFORM_PATH_ALIASES.get(platform.lower(), [platform.lower()])
-                        if not any(alias in rel_path for alias in aliases):
-                            continue
-
-                    # Type filter
-                    if file_type and file_path.suffix[1:].lower() != file_type.lower():
-                        continue
-
-                    try:
-                        files.append(get_file_info(file_path))
-                    except Exception:
-                        continue
+        files.extend(list_files(platform=platform, file_type=file_type, data_dir=DATA_DIR))
 
     # Sort by modification time (newest first)
     files.sort(key=lambda x: x["modified_at"], reverse=True)
@@ -1655,10 +1554,21 @@ def list_data_files(request):
     return Response({"files": files})
 
 
+def _project_rows(rows: list, fields: Optional[tuple]) -> list:
+    """文件预览行的字段投影（非对象行原样返回）"""
+    if fields is None:
+        return rows
+    return [project(row, fields) if isinstance(row, dict) else row for row in rows]
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_file_content(request, file_path: str):
-    """Get file content or preview"""
+    """Get file content or preview
+
+    ``fields=a,b`` limits preview rows to the given keys; for database-backed
+    previews only those columns are loaded.
+    """
     if file_path.startswith("db/"):
         parts = Path(file_path).parts
         if len(parts) < 2:
@@ -1668,12 +1578,22 @@ def get_file_content(request, file_path: str):
         limit = int(request.GET.get("limit", 100))
         page = int(request.GET.get("page", 1))
         if not preview:
-            return Response({"error": "DB content does not support download"}, status=status.HTTP_400_BAD_REQUEST)
+            # 下载该平台 monitor_feed 全量数据（流式 CSV）
+            model = resolve_model("monitor_feed", platform)
+            filename = f"monitor_feed_{platform}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+            return export_response(
+                build_queryset(model, platform=platform), "csv", filename,
+                asynchronous=_is_asgi_request(request),
+            )
+        try:
+            fields = parse_fields(request, PREVIEW_ROW_SOURCES)
+        except InvalidFields as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         # Use MonitorFeed instead of platform table
-        rows, total = _get_monitor_feed_data(platform, limit=limit, page=page)
+        rows, total, total_is_estimate = _get_monitor_feed_data(platform, limit=limit, page=page, fields=fields)
         if total == 0:
-            return Response({"data": [], "total": 0})
-        return Response({"data": rows, "total": total})
+            return Response({"data": [], "total": 0, "total_is_estimate": False})
+        return Response({"data": rows, "total": total, "total_is_estimate": total_is_estimate})
 
     full_path = DATA_DIR / file_path
 
@@ -1705,47 +1625,59 @@ def get_file_content(request, file_path: str):
     platform = _detect_platform_from_path(file_path)
     if platform and preview:
         page = int(request.GET.get("page", 1))
-        rows, total = _get_monitor_feed_data(platform, limit=limit, page=page)
-        return Response({"data": rows, "total": total})
+        try:
+            fields = parse_fields(request, PREVIEW_ROW_SOURCES)
+        except InvalidFields as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        rows, total, total_is_estimate = _get_monitor_feed_data(platform, limit=limit, page=page, fields=fields)
+        return Response({"data": rows, "total": total, "total_is_estimate": total_is_estimate})
 
     if preview:
-        # Return preview data
+        # Return preview data (streaming: only the first `limit` records are read)
+        suffix = full_path.suffix.lower()
+        # 文件的列由文件本身决定，fields 不做校验
+        fields = parse_fields(request)
         try:
-            if full_path.suffix == ".json":
-                with open(full_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        return Response({
-                            "data": data[:limit],
-                            "total": len(data)
-                        })
-                    return Response({"data": data, "total": 1})
-
-            elif full_path.suffix == ".csv":
-                import csv
-                with open(full_path, "r", encoding="utf-8") as f:
-                    reader = csv.DictReader(f)
-                    rows = []
-                    for i, row in enumerate(reader):
-                        if i >= limit:
-                            break
-                        rows.append(row)
-                    # Re-read to get total count
-                    f.seek(0)
-                    total = sum(1 for _ in f) - 1
-                    return Response({"data": rows, "total": total})
-
-            elif full_path.suffix.lower() in (".xlsx", ".xls"):
+            if suffix == ".json":
+                data, total = preview_json(full_path, limit)
+                if total is None:
+                    total = get_record_count(full_path, DATA_DIR)
+                return Response({"data": _project_rows(data, fields), "total": total})
+
+            elif suffix == ".jsonl":
+                rows = preview_jsonl(full_path, limit)
+                total = get_record_count(full_path, DATA_DIR)
+                return Response({"data": _project_rows(rows, fields), "total": total})
+
+            elif suffix == ".csv":
+                rows = preview_csv(full_path, limit)
+                total = get_record_count(full_path, DATA_DIR)
+                if total is None:
+                    total = max(count_lines(full_path) - 1, 0)
+                return Response({"data": _project_rows(rows, fields), "total": total})
+
+            elif suffix == ".xlsx":
+                rows, columns, total = preview_xlsx(full_path, limit)
+                return Response({
+                    "data": _project_rows(rows, fields),
+                    "total": total,
+                    "columns": columns if fields is None else [c for c in columns if c in fields]
+                })
+
+            elif suffix == ".xls":
                 import pandas as pd
                 # Read first limit rows
                 df = pd.read_excel(full_path, nrows=limit)
                 # Get total row count
-                df_count = pd.read_excel(full_path, usecols=[0])
-                total = len(df_count)
+                total = get_record_count(full_path, DATA_DIR)
+                if total is None:
+                    total = len(pd.read_excel(full_path, usecols=[0]))
+                if fields is not None:
+                    df = df[[c for c in df.columns if c in fields]]
                 # Convert to list of dictionaries
                 rows = df.where(pd.notnull(df), None).to_dict(orient='records')
                 return Response({
-                    "data": rows,
+                    "data": _project_rows(rows, fields),
                     "total": total,
                     "columns": list(df.columns)
                 })
@@ -1755,9 +1687,9 @@ def get_file_content(request, file_path: str):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-        except json.JSONDecodeError:
+        except PreviewError as e:
             return Response(
-                {"error": "Invalid JSON file"},
+                {"error": str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
@@ -1808,6 +1740,7 @@ def download_file(request, file_path: str):
     )
 
 
+@data_stats_condition(DATA_DIR)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_data_stats(request):
@@ -1820,39 +1753,16 @@ def get_data_stats(request):
         "updated_at_by_platform": {},
     }
 
-    supported_extensions = {".json", ".csv", ".xlsx", ".xls"}
-
-    if DATA_DIR.exists():
-        for root, dirs, filenames in os.walk(DATA_DIR):
-            root_path = Path(root)
-            for filename in filenames:
-                file_path = root_path / filename
-                if file_path.suffix.lower() not in supported_extensions:
-                    continue
-
-                try:
-                    file_stat = file_path.stat()
-                    stats["total_files"] += 1
-                    stats["total_size"] += file_stat.st_size
-
-                    # Statistics by type
-                    file_type = file_path.suffix[1:].lower()
-                    stats["by_type"][file_type] = stats["by_type"].get(file_type, 0) + 1
-
-                    # Statistics by platform (inferred from path)
-                    rel_path = str(file_path.relative_to(DATA_DIR)).lower()
-                    for platform, aliases in PLATFORM_PATH_ALIASES.items():
-                        if any(alias in rel_path for alias in aliases):
-                            stats["by_platform"][platform] = stats["by_platform"].get(platform, 0) + 1
-                            break
-                except Exception:
-                    continue
+    # 文件数/大小来自 data_file 目录表，不再遍历 DATA_DIR
+    stats.update(catalog_stats(DATA_DIR))
 
     for platform, config_item in PLATFORM_FEED_CONFIG.items():
         if stats["by_platform"].get(platform, 0) > 0:
             continue
         try:
-            db_count = config_item["model"].objects.count()
+            db_count, _is_estimate = count_rows(
+                config_item["model"].objects.all(), f"platform_table:{platform}", platform
+            )
         except Exception:
             db_count = 0
         if db_count > 0:
@@ -2098,12 +2008,12 @@ def get_active_cookie(request):
     })
 
 
+@feed_condition("platform_sentiment_stats")
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@cache_feed_response("platform_sentiment_stats")
 def get_platform_sentiment_stats(request):
-    """获取各平台的情绪统计数据（用于饼图展示）"""
-    from django.db.models import Count
-
+    """获取各平台的情绪统计数据（用于饼图展示），读取 monitor_feed_rollup 汇总表"""
     stats = {
         "xhs": {"positive": 0, "negative": 0, "neutral": 0, "sensitive": 0, "total": 0},
         "dy": {"positive": 0, "negative": 0, "neutral": 0, "sensitive": 0, "total": 0},
@@ -2115,7 +2025,7 @@ def get_platform_sentiment_stats(request):
     }
 
     try:
-        queryset = MonitorFeed.objects.values("platform", "sentiment", "is_sensitive").annotate(cnt=Count("id"))
+        queryset = rollup.platform_sentiment_rows()
         for row in queryset:
             platform = row.get("platform")
             if platform not in stats:
@@ -2135,504 +2045,95 @@ def get_platform_sentiment_stats(request):
 
 # ============== AI Analysis ==============
 
-@api_view(['POST'])
-@permission_classes([AllowAny])
-def ai_keyword_analysis(request):
-    """使用智谱 AI 分析关键词"""
-    import os
-    import re
-    import time
-
-    # 打印调试信息
-    print(f"[DEBUG] 收到 AI 分析请求")
-
-    # 获取 API Key
-    api_key = os.environ.get('ZHIPU_API_KEY')
-    print(f"[DEBUG] API Key 存在: {bool(api_key)}")
-    print(f"[DEBUG] API Key 格式: {api_key[:20]}..." if api_key else "[DEBUG] API Key: None")
-
-    # 获取请求参数
-    data = request.data
-    print(f"[DEBUG] 请求数据: {data}")
-    keyword = data.get('keyword')
-    platform = data.get('platform', 'all')
-    time_range = data.get('time_range', '7')
-
-    if not keyword:
-        return Response(
-            {"error": "请输入分析关键词"},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-
-    # 平台名称映射
-    platform_names = {
-        'all': '所有平台',
-        'xhs': '小红书',
-        'dy': '抖音',
-        'ks': '快手',
-        'bili': 'B站',
-        'wb': '微博',
-        'tieba': '贴吧',
-        'zhihu': '知乎'
-    }
-
-    platform_display = platform_names.get(platform, platform)
-    time_range_display = f"过去{time_range}天" if str(time_range).isdigit() else "自定义时间"
+def _request_json(request) -> dict:
+    """解析 JSON 请求体（异步视图不经过 DRF 的 request.data），兼容表单提交"""
+    if request.body:
+        try:
+            data = json.loads(request.body)
+            if isinstance(data, dict):
+                return data
+        except ValueError:
+            pass
+    return request.POST.dict()
 
-    print(f"[DEBUG] 关键词: {keyword}, 平台: {platform_display}, 时间: {time_range_display}")
 
-    # 创建AI使用记录（初始状态）
-    usage_record = AIUsageRecord.objects.create(
-        keyword=keyword,
-        platform=platform,
-        time_range=time_range_display,
-        is_success=False
-    )
+def _json_response(data: dict, status_code: int = status.HTTP_200_OK) -> JsonResponse:
+    return JsonResponse(data, status=status_code, json_dumps_params={"ensure_ascii": False})
 
-    if not api_key:
-        usage_record.error_message = "未配置智谱 AI API Key"
-        usage_record.save()
-        return Response(
-            {"error": "未配置智谱 AI API Key，请在后端 .env 文件中设置 ZHIPU_API_KEY"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
 
+async def _run_ai_job(request, kind: str):
+    """提交（或复用）分析任务并等待结果，供原有的同步 AI 接口使用"""
     try:
-        # 调用智谱 AI API
-        import requests
-        url = "https://open.bigmodel.cn/api/paas/v4/chat/completions"
-
-        # 按照智谱 AI 文档的标准格式
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}"
-        }
-
-        # 简化提示词，使用更简洁的格式
-        prompt = f'请列出10-15个关于"{keyword}"在{platform_display}的关键词，每行一个。'
-
-        payload = {
-            "model": "glm-4.7-flash",
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        }
-
-        print(f"[DEBUG] 请求URL: {url}")
-        print(f"[DEBUG] 请求头: Content-Type={headers['Content-Type']}")
-        print(f"[DEBUG] 请求体: {payload}")
-        print(f"[DEBUG] 开始调用智谱 AI API...")
-
-        # 重试机制：最多重试 2 次
-        max_retries = 2
-
-        for attempt in range(max_retries + 1):
-            try:
-                if attempt > 0:
-                    print(f"[DEBUG] 第 {attempt + 1} 次尝试...")
-                    time.sleep(1)
-
-                # 增加超时时间，添加连接超时
-                response = requests.post(
-                    url,
-                    json=payload,
-                    headers=headers,
-                    timeout=(10, 90),  # (连接超时, 读取超时)
-                    verify=True  # 验证 SSL
-                )
-
-                print(f"[DEBUG] API 响应状态码: {response.status_code}")
-                print(f"[DEBUG] API 响应头: {dict(response.headers)}")
-
-                if response.status_code != 200:
-                    print(f"[DEBUG] API 错误响应: {response.text}")
-
-                response.raise_for_status()
-                result = response.json()
-                print(f"[DEBUG] API 返回 JSON: {result}")
-
-                # 检查返回格式
-                if 'choices' not in result or not result['choices']:
-                    usage_record.error_message = "AI 返回格式异常，未包含 choices"
-                    usage_record.save()
-                    return Response(
-                        {"error": "AI 返回格式异常，未包含 choices"},
-                        status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                    )
-
-                # 解析返回的关键词
-                content = result['choices'][0]['message']['content']
-                print(f"[DEBUG] AI 返回内容: {content}")
-
-                keywords = []
-                for line in content.split('\n'):
-                    line = line.strip()
-                    # 使用正则表达式移除序号和其他符号
-                    line = re.sub(r'^[\d\-\*\.\、]+\s*', '', line).strip()
-                    # 移除可能的引号和特殊符号
-                    line = line.strip('"\'""''《》【】()（）-—–')
-                    if line and 1 < len(line) < 20:
-                        keywords.append(line)
-
-                print(f"[DEBUG] 解析后的关键词: {keywords}")
-
-                if not keywords:
-                    usage_record.error_message = "AI 未能生成有效关键词"
-                    usage_record.save()
-                    return Response(
-                        {"error": "AI 未能生成有效关键词，请重试"},
-                        status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                    )
-
-                # 更新使用记录为成功状态
-                usage_record.is_success = True
-                usage_record.result_keywords = keywords[:15]
-                usage_record.error_message = ""
-                usage_record.save()
-
-                return Response({
-                    "success": True,
-                    "keywords": keywords[:15]
-                })
-
-            except requests.exceptions.Timeout as e:
-                print(f"[DEBUG] 第 {attempt + 1} 次尝试超时: {e}")
-                if attempt == max_retries:
-                    usage_record.error_message = f"AI 服务响应超时: {str(e)}"
-                    usage_record.save()
-                    raise
-            except requests.exceptions.RequestException as e:
-                print(f"[DEBUG] 第 {attempt + 1} 次尝试失败: {e}")
-                if hasattr(e, 'response') and e.response is not None:
-                    print(f"[DEBUG] 错误响应状态码: {e.response.status_code}")
-                    print(f"[DEBUG] 错误响应内容: {e.response.text[:500]}")
-                if attempt == max_retries:
-                    usage_record.error_message = f"请求失败: {str(e)}"
-                    usage_record.save()
-                    raise
-
-    except requests.exceptions.Timeout as e:
-        print(f"[ERROR] 所有尝试均超时: {e}")
-        return Response(
-            {"error": "AI 服务响应超时，可能是网络问题。请检查服务器网络连接，或稍后重试。"},
-            status=status.HTTP_504_GATEWAY_TIMEOUT
-        )
-    except requests.exceptions.RequestException as e:
-        print(f"[ERROR] 请求异常: {e}")
-        error_msg = str(e)
-        if hasattr(e, 'response') and e.response is not None:
-            print(f"[ERROR] 响应状态码: {e.response.status_code}")
-            error_content = e.response.text[:500]
-            print(f"[ERROR] 响应内容: {error_content}")
-            # 尝试解析错误信息
-            try:
-                error_json = e.response.json()
-                if 'error' in error_json:
-                    error_msg = error_json['error'].get('message', error_msg)
-            except:
-                pass
-        return Response(
-            {"error": f"AI 分析请求失败: {error_msg}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
-    except Exception as e:
-        import traceback
-        print(f"[ERROR] 异常: {e}")
-        traceback.print_exc()
-        usage_record.error_message = f"未知错误: {str(e)}"
-        usage_record.save()
-        return Response(
-            {"error": f"AI 分析失败: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        params = ai_jobs.normalize_params(kind, _request_json(request))
+        job = await sync_to_async(ai_jobs.submit_job)(kind, params)
+        job = await ai_jobs.wait_for_job(job, settings.AI_JOB_TIMEOUT)
+    except ai_jobs.AIJobError as e:
+        return _json_response({"error": str(e)}, status.HTTP_400_BAD_REQUEST)
+    if not job.is_finished:
+        return _json_response(
+            {"error": "AI 分析仍在进行中，请稍后通过任务接口查询结果", "job_id": job.pk},
+            status.HTTP_504_GATEWAY_TIMEOUT
         )
+    return _json_response(job.result or {}, job.status_code or status.HTTP_200_OK)
 
 
-def _normalize_epoch_seconds(value) -> Optional[int]:
-    try:
-        ts = int(value)
-    except (TypeError, ValueError):
-        return None
-    if ts > 10**12:
-        ts = ts // 1000
-    return ts
-
-
-def _sentiment_key(sentiment: Optional[str], is_sensitive: bool) -> str:
-    if is_sensitive or sentiment == "sensitive":
-        return "sensitive"
-    if sentiment in {"positive", "negative", "neutral"}:
-        return sentiment
-    return "neutral"
-
-
-def _fallback_keywords_from_samples(samples: List[str]) -> List[str]:
-    import re
-    tokens = []
-    for text in samples:
-        tokens.extend(re.findall(r"[\u4e00-\u9fa5]{2,6}", text))
-    freq = {}
-    for token in tokens:
-        freq[token] = freq.get(token, 0) + 1
-    return [k for k, _ in sorted(freq.items(), key=lambda item: item[1], reverse=True)[:12]]
-
-
-def _build_default_summary(total_hits: int, platform: str, time_range_display: str) -> List[str]:
-    platform_name = PLATFORM_NAMES.get(platform, platform) if platform != "all" else "全平台"
-    return [
-        f"当前分析覆盖{platform_name}，时间范围为{time_range_display}。",
-        f"本次共匹配到{total_hits}条相关内容，后续可继续观察情绪变化。",
-        "建议结合高频观点与风险提示进行重点研判。"
-    ]
-
-
-def _build_default_risks(sentiment_stats: dict) -> List[dict]:
-    risks = []
-    total = sentiment_stats.get("total", 0) or 0
-    negative = sentiment_stats.get("negative", 0) or 0
-    sensitive = sentiment_stats.get("sensitive", 0) or 0
-    if total:
-        neg_ratio = negative / total
-        if neg_ratio >= 0.35:
-            risks.append({
-                "level": "medium",
-                "trigger": "负面占比偏高",
-                "reason": f"负面内容占比约{neg_ratio:.0%}，需要关注情绪扩散趋势。"
-            })
-    if sensitive > 0:
-        risks.append({
-            "level": "high",
-            "trigger": "敏感内容命中",
-            "reason": f"监测到{sensitive}条敏感内容，需确认话题来源与扩散路径。"
-        })
-    if not risks:
-        risks.append({
-            "level": "low",
-            "trigger": "风险信号较弱",
-            "reason": "当前未出现明显敏感或负面集中现象，可持续观察。"
-        })
-    return risks
+@csrf_exempt
+@require_http_methods(["POST"])
+async def ai_keyword_analysis(request):
+    """使用智谱 AI 分析关键词（异步视图，等待 AI 响应期间不占用 worker 线程）
 
+    相同参数的结果会被缓存，并发的相同请求只调用一次大模型（见 api/ai_jobs.py）
+    """
+    return await _run_ai_job(request, "keywords")
 
-@api_view(['POST'])
-@permission_classes([AllowAny])
-def ai_analysis(request):
-    """AI 聚合分析：关键词 + 摘要 + 情绪分布 + 风险提示"""
-    import re
-    import time
-    import requests
-    from django.utils import timezone
 
-    data = request.data
-    keyword = data.get('keyword')
-    platform = data.get('platform', 'all')
-    time_range = data.get('time_range', '7')
+@csrf_exempt
+@require_http_methods(["POST"])
+async def ai_analysis(request):
+    """AI 聚合分析：关键词 + 摘要 + 情绪分布 + 风险提示（异步视图）
 
-    if not keyword:
-        return Response(
-            {"error": "请输入分析关键词"},
-            status=status.HTTP_400_BAD_REQUEST
-        )
+    granularity 控制 sentiment_distribution.by_day 的时间粒度：hour / day（默认）/ week。
+    结果按参数 + monitor_feed 数据水位缓存，数据不变时不再重复调用大模型
+    """
+    return await _run_ai_job(request, "analysis")
 
-    platform_display = PLATFORM_NAMES.get(platform, platform) if platform != "all" else "所有平台"
-    time_range_display = f"过去{time_range}天" if str(time_range).isdigit() else "自定义时间"
 
-    api_key = os.environ.get('ZHIPU_API_KEY')
+@csrf_exempt
+@require_http_methods(["POST"])
+async def submit_ai_job(request):
+    """
+    提交 AI 分析任务，立即返回任务 ID
 
-    usage_record = AIUsageRecord.objects.create(
-        keyword=keyword,
-        platform=platform,
-        time_range=time_range_display,
-        is_success=False
+    请求体: {"type": "analysis" | "keywords", "keyword": ..., "platform": ..., "time_range": ..., "granularity": ...}
+    命中结果缓存时直接返回已完成的任务（含 result）
+    """
+    data = _request_json(request)
+    kind = data.get("type") or "analysis"
+    try:
+        params = ai_jobs.normalize_params(kind, data)
+    except ai_jobs.AIJobError as e:
+        return _json_response({"error": str(e)}, status.HTTP_400_BAD_REQUEST)
+    job = await sync_to_async(ai_jobs.submit_job)(kind, params)
+    return _json_response(
+        ai_jobs.job_to_dict(job),
+        status.HTTP_200_OK if job.is_finished else status.HTTP_202_ACCEPTED
     )
 
-    queryset = MonitorFeed.objects.all()
-    if platform != "all":
-        queryset = queryset.filter(platform=platform)
-
-    keyword_filter = Q(content__icontains=keyword) | Q(source_keyword__icontains=keyword)
-    queryset = queryset.filter(keyword_filter)
-
-    if str(time_range).isdigit():
-        days = int(time_range)
-        cutoff_ts = int(time.time()) - days * 86400
-        queryset = queryset.filter(created_at__gte=cutoff_ts)
 
-    # 情绪分布（按平台）
-    sentiment_by_platform = {
-        code: {"positive": 0, "negative": 0, "neutral": 0, "sensitive": 0, "total": 0}
-        for code in PLATFORM_NAMES.keys()
-    }
-    platform_rows = queryset.values("platform", "sentiment", "is_sensitive").annotate(cnt=Count("id"))
-    for row in platform_rows:
-        platform_code = row.get("platform")
-        if platform_code not in sentiment_by_platform:
-            continue
-        sentiment = row.get("sentiment")
-        is_sensitive = bool(row.get("is_sensitive"))
-        key = _sentiment_key(sentiment, is_sensitive)
-        sentiment_by_platform[platform_code][key] += row.get("cnt", 0)
-        sentiment_by_platform[platform_code]["total"] += row.get("cnt", 0)
-
-    # 情绪分布（按时间）
-    day_buckets = {}
-    for row in queryset.values("created_at", "sentiment", "is_sensitive"):
-        ts = _normalize_epoch_seconds(row.get("created_at"))
-        if not ts:
-            continue
-        day = timezone.localtime(datetime.fromtimestamp(ts, tz=timezone.get_current_timezone())).strftime("%Y-%m-%d")
-        bucket = day_buckets.setdefault(day, {"positive": 0, "negative": 0, "neutral": 0, "sensitive": 0, "total": 0})
-        key = _sentiment_key(row.get("sentiment"), bool(row.get("is_sensitive")))
-        bucket[key] += 1
-        bucket["total"] += 1
-
-    sentiment_by_day = [{"date": day, **day_buckets[day]} for day in sorted(day_buckets.keys())]
-
-    total_hits = queryset.count()
-
-    # 采样内容用于 AI 分析
-    sample_qs = queryset.order_by("-created_at").values("content", "author", "platform")[:40]
-    samples = []
-    for item in sample_qs:
-        content = (item.get("content") or "").strip().replace("\n", " ")
-        content = re.sub(r"\s+", " ", content)
-        if not content:
-            continue
-        samples.append(f"[{PLATFORM_NAMES.get(item.get('platform'), item.get('platform'))}] {item.get('author') or '匿名'}: {content[:120]}")
-
-    if total_hits == 0:
-        summary = _build_default_summary(total_hits, platform, time_range_display)
-        usage_record.is_success = True
-        usage_record.result_keywords = [keyword]
-        usage_record.error_message = ""
-        usage_record.save()
-        return Response({
-            "success": True,
-            "keywords": [keyword],
-            "summary": summary,
-            "sentiment_distribution": {
-                "by_platform": sentiment_by_platform,
-                "by_day": sentiment_by_day
-            },
-            "risks": _build_default_risks({"total": 0, "negative": 0, "sensitive": 0}),
-            "meta": {
-                "platform": platform,
-                "time_range": time_range_display,
-                "total_hits": total_hits,
-                "sample_size": len(samples),
-                "ai_enabled": False
-            }
-        })
-
-    if not api_key:
-        keywords = _fallback_keywords_from_samples(samples) or [keyword, f"{keyword}热度", "用户讨论", "情绪反馈"]
-        summary = _build_default_summary(total_hits, platform, time_range_display)
-        risks = _build_default_risks(sentiment_by_platform.get(platform, {}) if platform != "all" else {
-            "total": sum(p["total"] for p in sentiment_by_platform.values()),
-            "negative": sum(p["negative"] for p in sentiment_by_platform.values()),
-            "sensitive": sum(p["sensitive"] for p in sentiment_by_platform.values()),
-        })
-        usage_record.error_message = "未配置智谱 AI API Key"
-        usage_record.save()
-        return Response({
-            "success": True,
-            "keywords": keywords[:15],
-            "summary": summary,
-            "sentiment_distribution": {
-                "by_platform": sentiment_by_platform,
-                "by_day": sentiment_by_day
-            },
-            "risks": risks,
-            "meta": {
-                "platform": platform,
-                "time_range": time_range_display,
-                "total_hits": total_hits,
-                "sample_size": len(samples),
-                "ai_enabled": False
-            }
-        })
+@require_http_methods(["GET"])
+async def get_ai_job(request, job_id: int):
+    """
+    查询 AI 分析任务状态和结果
 
+    wait: 任务未完成时最多等待的秒数（长轮询，上限 60 秒，默认不等待）
+    """
+    job = await sync_to_async(ai_jobs.get_job)(job_id)
+    if job is None:
+        return _json_response({"error": "任务不存在"}, status.HTTP_404_NOT_FOUND)
     try:
-        url = "https://open.bigmodel.cn/api/paas/v4/chat/completions"
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}"
-        }
-
-        prompt = (
-            "你是舆情分析助手，请根据样本内容输出结构化 JSON，只输出 JSON。\n"
-            f"关键词：{keyword}\n"
-            f"平台：{platform_display}\n"
-            f"时间范围：{time_range_display}\n"
-            "样本内容：\n"
-            + "\n".join(samples[:30]) +
-            "\n请输出 JSON，格式如下：\n"
-            "{\n"
-            '  "keywords": ["词1", "词2"],\n'
-            '  "summary": ["句子1", "句子2", "句子3"],\n'
-            '  "risks": [\n'
-            '    {"level": "low/medium/high", "trigger": "触发条件", "reason": "原因"}\n'
-            "  ]\n"
-            "}\n"
-            "summary 请输出 3-5 句中文，risks 1-4 条。"
-        )
-
-        payload = {
-            "model": "glm-4.7-flash",
-            "messages": [{"role": "user", "content": prompt}]
-        }
-
-        response = requests.post(url, json=payload, headers=headers, timeout=(10, 90), verify=True)
-        response.raise_for_status()
-        result = response.json()
-        content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
-
-        json_match = re.search(r"\{.*\}", content, re.S)
-        parsed = json.loads(json_match.group(0)) if json_match else {}
-
-        keywords = parsed.get("keywords") or []
-        summary = parsed.get("summary") or []
-        risks = parsed.get("risks") or []
-
-        if not keywords:
-            keywords = _fallback_keywords_from_samples(samples) or [keyword]
-        if not summary:
-            summary = _build_default_summary(total_hits, platform, time_range_display)
-        if not risks:
-            risks = _build_default_risks(sentiment_by_platform.get(platform, {}) if platform != "all" else {
-                "total": sum(p["total"] for p in sentiment_by_platform.values()),
-                "negative": sum(p["negative"] for p in sentiment_by_platform.values()),
-                "sensitive": sum(p["sensitive"] for p in sentiment_by_platform.values()),
-            })
-
-        usage_record.is_success = True
-        usage_record.result_keywords = keywords[:15]
-        usage_record.error_message = ""
-        usage_record.save()
-
-        return Response({
-            "success": True,
-            "keywords": keywords[:15],
-            "summary": summary[:5],
-            "sentiment_distribution": {
-                "by_platform": sentiment_by_platform,
-                "by_day": sentiment_by_day
-            },
-            "risks": risks[:4],
-            "meta": {
-                "platform": platform,
-                "time_range": time_range_display,
-                "total_hits": total_hits,
-                "sample_size": len(samples),
-                "ai_enabled": True
-            }
-        })
-    except Exception as e:
-        usage_record.error_message = f"AI 分析失败: {str(e)}"
-        usage_record.save()
-        return Response(
-            {"error": f"AI 分析失败: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+        wait = min(max(float(request.GET.get("wait") or 0), 0), 60)
+    except ValueError:
+        wait = 0
+    if wait and not job.is_finished:
+        job = await ai_jobs.wait_for_job(job, wait)
+    return _json_response(ai_jobs.job_to_dict(job))
@@ -16,7 +16,7 @@
 # 详细许可条款请参阅项目根目录下的LICENSE文件。
 # 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
 
-from sqlalchemy import create_engine, Column, Integer, Text, String, BigInteger, Boolean, Float, JSON, UniqueConstraint
+from sqlalchemy import create_engine, Column, Integer, Text, String, BigInteger, Boolean, Float, Double, Date, JSON, UniqueConstraint, false
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -349,6 +349,35 @@ class MonitorFeed(Base):
     sentiment_score = Column(Float)
     sentiment_labels = Column(JSON)
     is_sensitive = Column(Boolean, default=False)
+    flagged = Column(Boolean, nullable=False, default=False, server_default=false())
+    liked_count = Column(BigInteger, nullable=False, default=0, server_default='0')
+    comment_count = Column(BigInteger, nullable=False, default=0, server_default='0')
+    share_count = Column(BigInteger, nullable=False, default=0, server_default='0')
+    collected_count = Column(BigInteger, nullable=False, default=0, server_default='0')
+    ip_location = Column(String(255))
+
+class MonitorFeedRollup(Base):
+    __tablename__ = 'monitor_feed_rollup'
+    __table_args__ = (UniqueConstraint("platform", "day", "sentiment", "is_sensitive"),)
+
+    # SQLite 只对 INTEGER PRIMARY KEY 自增
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    platform = Column(String(20), nullable=False)
+    day = Column(Date, nullable=False)
+    sentiment = Column(String(20), nullable=False)
+    is_sensitive = Column(Boolean, nullable=False, default=False)
+    feed_count = Column(BigInteger, nullable=False, default=0)
+    scored_count = Column(BigInteger, nullable=False, default=0)
+    score_sum = Column(Double, nullable=False, default=0)
+
+class MonitorFeedToken(Base):
+    __tablename__ = 'monitor_feed_token'
+    __table_args__ = (UniqueConstraint("token", "feed_id"),)
+
+    # SQLite 只对 INTEGER PRIMARY KEY 自增
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    token = Column(String(64), nullable=False)
+    feed_id = Column(BigInteger, index=True, nullable=False)
 
 class TiebaNote(Base):
     __tablename__ = 'tieba_note'
@@ -122,6 +122,18 @@ async def _generate_wordcloud_if_needed() -> None:
         print(f"[Main] Error generating wordcloud: {e}")
 
 
+def _flush_file_index_if_needed() -> None:
+    if config.SAVE_DATA_OPTION not in ("json", "csv"):
+        return
+
+    try:
+        from tools.async_file_writer import AsyncFileWriter
+
+        AsyncFileWriter.flush_index()
+    except Exception as e:
+        print(f"[Main] Error writing data file index: {e}")
+
+
 async def main() -> None:
     global crawler
 
@@ -143,6 +155,7 @@ async def main() -> None:
             print(f"[Main] monitor_feed sync failed: {e}")
 
     _flush_excel_if_needed()
+    _flush_file_index_if_needed()
 
     # Generate wordcloud after crawling is complete
     # Only for JSON save mode
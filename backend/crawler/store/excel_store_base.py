@@ -44,6 +44,7 @@ try:
 except ImportError:
     EXCEL_AVAILABLE = False
 
+from api.file_index import append_entries
 from base.base_crawler import AbstractStore
 from tools import utils
 import config
@@ -379,6 +380,9 @@ class ExcelStoreBase(AbstractStore):
             self.workbook.save(self.filename)
             utils.logger.info(f"[ExcelStoreBase] Excel file saved successfully: {self.filename}")
 
+            # Append to the data file index (record count of the first sheet, as the backend counts it)
+            append_entries({str(self.filename): self.workbook.worksheets[0].max_row - 1}, self.data_dir.parent)
+
         except Exception as e:
             utils.logger.error(f"[ExcelStoreBase] Error saving Excel file: {e}")
             raise
@@ -21,13 +21,27 @@ import csv
 import json
 import os
 import pathlib
-from typing import Dict, List
+from typing import Dict, List, Optional
 import aiofiles
 import config
+from api.file_index import append_entries
 from tools.utils import utils
 from tools.words import AsyncWordCloudGenerator
 
 class AsyncFileWriter:
+    # 本次运行写过的文件 -> 记录数（追加到运行前已存在的 CSV 时未知，为 None）
+    _written_files: Dict[str, Optional[int]] = {}
+
+    @classmethod
+    def flush_index(cls):
+        """
+        Append every file written in this run to the data file index (api/file_index.py)
+        Should be called at the end of crawler execution
+        """
+        files, cls._written_files = cls._written_files, {}
+        if files:
+            append_entries(files, config.SAVE_DATA_PATH or "data")
+
     def __init__(self, platform: str, crawler_type: str):
         self.lock = asyncio.Lock()
         self.platform = platform
@@ -51,7 +65,10 @@ class AsyncFileWriter:
                 writer = csv.DictWriter(f, fieldnames=item.keys())
                 if not file_exists or await f.tell() == 0:
                     await writer.writeheader()
+                    AsyncFileWriter._written_files[file_path] = 0
                 await writer.writerow(item)
+            count = AsyncFileWriter._written_files.get(file_path)
+            AsyncFileWriter._written_files[file_path] = count + 1 if count is not None else None
 
     async def write_single_item_to_json(self, item: Dict, item_type: str):
         file_path = self._get_file_path('json', item_type)
@@ -72,6 +89,7 @@ class AsyncFileWriter:
 
             async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
                 await f.write(json.dumps(existing_data, ensure_ascii=False, indent=4))
+            AsyncFileWriter._written_files[file_path] = len(existing_data)
 
     async def generate_wordcloud_from_comments(self):
         """
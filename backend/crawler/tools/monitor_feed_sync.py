@@ -1,12 +1,20 @@
 # -*- coding: utf-8 -*-
+import logging
 from typing import Dict, Optional
 
-from sqlalchemy import select, func
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
 
-from api.sentiment_service import analyze_sentiment
+from api.feed_version import bump_shared_data_version
+from api.interactions import extract_interactions, source_fields
+from api.search_tokens import feed_tokens
+from api.sentiment_service import analyze_many, analyze_sentiment
+from api.time_buckets import feed_day
 from database.db_session import get_session
 from database.models import (
     MonitorFeed,
+    MonitorFeedRollup,
+    MonitorFeedToken,
     XhsNote,
     DouyinAweme,
     KuaishouVideo,
@@ -18,6 +26,8 @@ from database.models import (
 from tools.time_util import get_current_timestamp
 
 
+logger = logging.getLogger(__name__)
+
 PLATFORM_NAMES = {
     "xhs": "小红书",
     "dy": "抖音",
@@ -65,7 +75,102 @@ def _get_created_at(content_item: Dict) -> int:
         return 0
 
 
-async def _sync_with_session(session, platform: str, content_item: Dict) -> bool:
+def _bump_feed_cache_version(*platforms: str) -> None:
+    """
+    通知 Web 端 monitor_feed 已变更，使接口响应缓存失效
+
+    爬虫进程不初始化 Django，直接递增 Redis 中的数据版本号（见 api/feed_version.py）；
+    未配置 Redis 时 Web 端缓存按 API_CACHE_TIMEOUT 过期。每次同步（而非每条记录）调用一次。
+    """
+    try:
+        if not bump_shared_data_version(platforms):
+            logger.debug("REDIS_HOST not set, monitor_feed cache expires by API_CACHE_TIMEOUT")
+    except Exception as e:
+        logger.warning(f"Failed to bump monitor_feed cache version for {', '.join(platforms)}: {e}")
+
+
+def _rollup_snapshot(feed) -> Optional[Dict]:
+    if feed is None:
+        return None
+    return {
+        "platform": feed.platform,
+        "created_at": feed.created_at,
+        "sentiment": feed.sentiment,
+        "is_sensitive": feed.is_sensitive,
+        "sentiment_score": feed.sentiment_score,
+    }
+
+
+async def _apply_rollup_delta(session, platform: str, created_at, sentiment: Optional[str],
+                              is_sensitive, sentiment_score=None, delta: int = 1) -> None:
+    """与 api.rollup.apply_delta 相同的增量逻辑，供 SQLAlchemy 写入路径使用"""
+    key = (
+        MonitorFeedRollup.platform == platform,
+        MonitorFeedRollup.day == feed_day(created_at),
+        MonitorFeedRollup.sentiment == (sentiment or "neutral"),
+        MonitorFeedRollup.is_sensitive == bool(is_sensitive),
+    )
+    scored = 1 if sentiment_score is not None else 0
+    score = float(sentiment_score or 0)
+    stmt = (
+        update(MonitorFeedRollup)
+        .where(*key)
+        .values(
+            feed_count=MonitorFeedRollup.feed_count + delta,
+            scored_count=MonitorFeedRollup.scored_count + scored * delta,
+            score_sum=MonitorFeedRollup.score_sum + score * delta,
+        )
+    )
+    result = await session.execute(stmt)
+    if result.rowcount or delta < 0:
+        return
+    try:
+        async with session.begin_nested():
+            session.add(
+                MonitorFeedRollup(
+                    platform=platform,
+                    day=feed_day(created_at),
+                    sentiment=sentiment or "neutral",
+                    is_sensitive=bool(is_sensitive),
+                    feed_count=delta,
+                    scored_count=scored * delta,
+                    score_sum=score * delta,
+                )
+            )
+    except IntegrityError:
+        await session.execute(stmt)
+
+
+async def _record_rollup_change(session, before: Optional[Dict], after: Optional[Dict]) -> None:
+    if before == after:
+        return
+    if before:
+        await _apply_rollup_delta(session, delta=-1, **before)
+    if after:
+        await _apply_rollup_delta(session, delta=1, **after)
+
+
+async def _index_feed_tokens(session, feed) -> None:
+    """
+    与 api.feed_search.index_feed 相同：非 MySQL 数据库维护 monitor_feed_token 倒排表，
+    否则关键词检索查不到爬虫写入的记录；MySQL 由 FULLTEXT 索引负责，无需处理
+    """
+    if session.get_bind().dialect.name == "mysql":
+        return
+    if feed.id is None:
+        # 新记录需要先写入才有 id
+        await session.flush()
+    await session.execute(delete(MonitorFeedToken).where(MonitorFeedToken.feed_id == feed.id))
+    tokens = feed_tokens(feed.content, feed.source_keyword)
+    if tokens:
+        await session.execute(
+            insert(MonitorFeedToken),
+            [{"token": token, "feed_id": feed.id} for token in tokens],
+        )
+
+
+async def _sync_with_session(session, platform: str, content_item: Dict,
+                             sentiment_result: Optional[Dict] = None) -> bool:
     content_id = _get_content_id(content_item)
     if not content_id:
         return False
@@ -82,11 +187,17 @@ async def _sync_with_session(session, platform: str, content_item: Dict) -> bool
     )
     created_at = _get_created_at(content_item)
 
-    sentiment_result = analyze_sentiment(content)
+    if sentiment_result is None:
+        sentiment_result = analyze_sentiment(content)
     sentiment = sentiment_result.get("sentiment", "neutral")
     sentiment_score = sentiment_result.get("score")
     sentiment_labels = sentiment_result.get("labels") or {}
+    # 已包含 sentiment == "sensitive"，同时作为 flagged 写入
     is_sensitive = bool(sentiment_labels.get("sensitive")) or sentiment == "sensitive"
+    interactions = extract_interactions(platform, content_item)
+    if not interactions["ip_location"]:
+        # 本次数据没有 IP 属地时保留已有值
+        interactions.pop("ip_location")
 
     now_ts = int(get_current_timestamp())
 
@@ -97,7 +208,10 @@ async def _sync_with_session(session, platform: str, content_item: Dict) -> bool
         )
     )
     existing = result.scalar_one_or_none()
+    source_keyword = content_item.get("source_keyword", "")
     if existing:
+        before = _rollup_snapshot(existing)
+        text_changed = existing.content != content or existing.source_keyword != source_keyword
         if ip_location:
             extra_data = existing.extra_data or {}
             if isinstance(extra_data, dict):
@@ -107,33 +221,42 @@ async def _sync_with_session(session, platform: str, content_item: Dict) -> bool
         existing.author = author
         existing.url = url
         existing.created_at = created_at
-        existing.source_keyword = content_item.get("source_keyword", "")
+        existing.source_keyword = source_keyword
         existing.sentiment = sentiment
         existing.sentiment_score = sentiment_score
         existing.sentiment_labels = sentiment_labels
         existing.is_sensitive = is_sensitive
+        existing.flagged = is_sensitive
+        for field, value in interactions.items():
+            setattr(existing, field, value)
         existing.last_modify_ts = now_ts
+        await _record_rollup_change(session, before, _rollup_snapshot(existing))
+        if text_changed:
+            await _index_feed_tokens(session, existing)
     else:
         extra_data = {"ip_location": ip_location} if ip_location else None
-        session.add(
-            MonitorFeed(
-                platform=platform,
-                platform_name=PLATFORM_NAMES.get(platform, platform),
-                content_id=content_id,
-                content=content,
-                author=author,
-                url=url,
-                created_at=created_at,
-                source_keyword=content_item.get("source_keyword", ""),
-                extra_data=extra_data,
-                sentiment=sentiment,
-                sentiment_score=sentiment_score,
-                sentiment_labels=sentiment_labels,
-                is_sensitive=is_sensitive,
-                add_ts=now_ts,
-                last_modify_ts=now_ts,
-            )
+        feed = MonitorFeed(
+            platform=platform,
+            platform_name=PLATFORM_NAMES.get(platform, platform),
+            content_id=content_id,
+            content=content,
+            author=author,
+            url=url,
+            created_at=created_at,
+            source_keyword=source_keyword,
+            extra_data=extra_data,
+            sentiment=sentiment,
+            sentiment_score=sentiment_score,
+            sentiment_labels=sentiment_labels,
+            is_sensitive=is_sensitive,
+            flagged=is_sensitive,
+            **interactions,
+            add_ts=now_ts,
+            last_modify_ts=now_ts,
         )
+        session.add(feed)
+        await _record_rollup_change(session, None, _rollup_snapshot(feed))
+        await _index_feed_tokens(session, feed)
     return True
 
 
@@ -141,7 +264,9 @@ async def sync_to_monitor_feed(platform: str, content_item: Dict) -> None:
     async with get_session() as session:
         if session is None:
             return
-        await _sync_with_session(session, platform, content_item)
+        synced = await _sync_with_session(session, platform, content_item)
+    if synced:
+        _bump_feed_cache_version(platform)
 
 
 async def _get_monitor_feed_cutoff(session, platform: str) -> int:
@@ -171,6 +296,14 @@ def _safe_int(value) -> int:
 
 
 def _model_to_content_item(platform: str, record) -> Dict:
+    content_item = _model_to_base_content_item(platform, record)
+    if content_item:
+        for field in source_fields(platform):
+            content_item[field] = _safe_attr(record, field)
+    return content_item
+
+
+def _model_to_base_content_item(platform: str, record) -> Dict:
     if platform == "xhs":
         return {
             "note_id": _safe_attr(record, "note_id"),
@@ -277,11 +410,15 @@ async def sync_platform_incremental(platform: str, batch_size: int = 500) -> int
             rows = result.scalars().all()
             if not rows:
                 break
-            for row in rows:
-                content_item = _model_to_content_item(platform, row)
-                if await _sync_with_session(session, platform, content_item):
+            content_items = [_model_to_content_item(platform, row) for row in rows]
+            # 整批一次打分，重复内容只分析一次
+            sentiment_results = analyze_many(_build_content_text(item) for item in content_items)
+            for content_item, sentiment_result in zip(content_items, sentiment_results):
+                if await _sync_with_session(session, platform, content_item, sentiment_result):
                     synced += 1
             offset += batch_size
+    if synced:
+        _bump_feed_cache_version(platform)
     return synced
 
 
@@ -0,0 +1,112 @@
+# Generated by Django 5.0.14 on 2026-10-18 10:12
+
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copy of the bucketing rules in api/time_buckets.py at the time of this migration.
+MILLIS_THRESHOLD = 10**12
+SECONDS_PER_DAY = 86400
+EPOCH_DATE = date(1970, 1, 1)
+
+
+def populate_rollup(apps, schema_editor):
+    """Build the initial rollup from the existing monitor_feed rows."""
+    MonitorFeed = apps.get_model("media_platform", "MonitorFeed")
+    MonitorFeedRollup = apps.get_model("media_platform", "MonitorFeedRollup")
+    tz = ZoneInfo(getattr(settings, "TIME_ZONE", None) or "Asia/Shanghai")
+    utc_offset = int(datetime.now(tz).utcoffset().total_seconds())
+
+    buckets = {}
+    rows = MonitorFeed.objects.values_list(
+        "platform", "created_at", "sentiment", "is_sensitive", "sentiment_score"
+    ).iterator(chunk_size=2000)
+    for platform, created_at, sentiment, is_sensitive, score in rows:
+        try:
+            ts = int(created_at or 0)
+        except (TypeError, ValueError):
+            ts = 0
+        if ts > MILLIS_THRESHOLD:
+            ts //= 1000
+        day = EPOCH_DATE + timedelta(days=(ts + utc_offset) // SECONDS_PER_DAY)
+        counts = buckets.setdefault((platform, day, sentiment or "neutral", bool(is_sensitive)), [0, 0, 0.0])
+        counts[0] += 1
+        if score is not None:
+            counts[1] += 1
+            counts[2] += score
+
+    MonitorFeedRollup.objects.bulk_create(
+        [
+            MonitorFeedRollup(
+                platform=platform,
+                day=day,
+                sentiment=sentiment,
+                is_sensitive=is_sensitive,
+                feed_count=feed_count,
+                scored_count=scored_count,
+                score_sum=score_sum,
+            )
+            for (platform, day, sentiment, is_sensitive), (feed_count, scored_count, score_sum) in buckets.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("media_platform", "0007_add_ip_location_to_ks_bili_zhihu"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonitorFeedRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "platform",
+                    models.CharField(max_length=20, verbose_name="Platform code"),
+                ),
+                ("day", models.DateField(verbose_name="Publish day (local time)")),
+                (
+                    "sentiment",
+                    models.CharField(max_length=20, verbose_name="Sentiment type"),
+                ),
+                (
+                    "is_sensitive",
+                    models.BooleanField(default=False, verbose_name="Is sensitive content"),
+                ),
+                (
+                    "feed_count",
+                    models.BigIntegerField(default=0, verbose_name="Feed rows"),
+                ),
+                (
+                    "scored_count",
+                    models.BigIntegerField(
+                        default=0, verbose_name="Rows with sentiment score"
+                    ),
+                ),
+                (
+                    "score_sum",
+                    models.FloatField(default=0, verbose_name="Sum of sentiment scores"),
+                ),
+            ],
+            options={
+                "verbose_name": "Monitor Feed Rollup",
+                "verbose_name_plural": "Monitor Feed Rollups",
+                "db_table": "monitor_feed_rollup",
+                "unique_together": {("platform", "day", "sentiment", "is_sensitive")},
+            },
+        ),
+        migrations.RunPython(populate_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,145 @@
+# Generated by Django 5.0.14 on 2026-10-18 14:30
+
+from django.db import migrations, models
+
+# Frozen copy of api/interactions.py at the time of this migration:
+# monitor_feed field -> platform content table field
+INTERACTION_SOURCES = {
+    "xhs": {
+        "liked_count": "liked_count",
+        "comment_count": "comment_count",
+        "share_count": "share_count",
+        "collected_count": "collected_count",
+    },
+    "dy": {
+        "liked_count": "liked_count",
+        "comment_count": "comment_count",
+        "share_count": "share_count",
+        "collected_count": "collected_count",
+    },
+    "bili": {
+        "liked_count": "liked_count",
+        "comment_count": "video_comment",
+        "share_count": "video_share_count",
+        "collected_count": "video_favorite_count",
+    },
+    "wb": {
+        "liked_count": "liked_count",
+        "comment_count": "comments_count",
+        "share_count": "shared_count",
+    },
+    "ks": {"liked_count": "liked_count"},
+    "zhihu": {"liked_count": "voteup_count", "comment_count": "comment_count"},
+    "tieba": {"comment_count": "total_replay_num"},
+}
+CONTENT_MODELS = {
+    "xhs": ("XhsNote", "note_id"),
+    "dy": ("DouyinAweme", "aweme_id"),
+    "ks": ("KuaishouVideo", "video_id"),
+    "bili": ("BilibiliVideo", "video_id"),
+    "wb": ("WeiboNote", "note_id"),
+    "tieba": ("TiebaNote", "note_id"),
+    "zhihu": ("ZhihuContent", "content_id"),
+}
+COUNT_FIELDS = ("liked_count", "comment_count", "share_count", "collected_count")
+COUNT_UNITS = (("万", 10000), ("w", 10000), ("k", 1000))
+CHUNK_SIZE = 500
+
+
+def parse_count(value):
+    if value is None or value == "":
+        return 0
+    if isinstance(value, (bool, int, float)):
+        return int(value)
+    text = str(value).strip().lower().replace(",", "")
+    multiplier = 1
+    for unit, unit_value in COUNT_UNITS:
+        if unit in text:
+            text = text.replace(unit, "").strip()
+            multiplier = unit_value
+            break
+    try:
+        return int(float(text) * multiplier)
+    except (TypeError, ValueError):
+        return 0
+
+
+def populate_interactions(apps, schema_editor):
+    """Copy interaction counters from the platform content tables."""
+    MonitorFeed = apps.get_model("media_platform", "MonitorFeed")
+    for platform, (model_name, id_field) in CONTENT_MODELS.items():
+        content_model = apps.get_model("media_platform", model_name)
+        mapping = INTERACTION_SOURCES[platform]
+        numeric_id = isinstance(content_model._meta.get_field(id_field), models.IntegerField)
+        source_columns = list(mapping.values()) + ["ip_location"]
+
+        last_id = 0
+        while True:
+            feeds = list(
+                MonitorFeed.objects.filter(platform=platform, id__gt=last_id)
+                .order_by("id")
+                .only("id", "content_id")[:CHUNK_SIZE]
+            )
+            if not feeds:
+                break
+            last_id = feeds[-1].id
+
+            content_ids = [feed.content_id for feed in feeds if feed.content_id]
+            if numeric_id:
+                content_ids = [cid for cid in content_ids if cid.isdigit()]
+            sources = {
+                str(row[id_field]): row
+                for row in content_model.objects.filter(**{f"{id_field}__in": content_ids})
+                .values(id_field, *source_columns)
+            }
+
+            changed = []
+            for feed in feeds:
+                source = sources.get(feed.content_id)
+                if source is None:
+                    continue
+                for field in COUNT_FIELDS:
+                    setattr(feed, field, parse_count(source.get(mapping[field])) if field in mapping else 0)
+                ip_location = source.get("ip_location")
+                feed.ip_location = str(ip_location)[:255] if ip_location else None
+                changed.append(feed)
+            if changed:
+                MonitorFeed.objects.bulk_update(changed, [*COUNT_FIELDS, "ip_location"], batch_size=CHUNK_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("media_platform", "0008_monitorfeedrollup"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="monitorfeed",
+            name="liked_count",
+            field=models.BigIntegerField(default=0, db_default=0, verbose_name="Like count"),
+        ),
+        migrations.AddField(
+            model_name="monitorfeed",
+            name="comment_count",
+            field=models.BigIntegerField(default=0, db_default=0, verbose_name="Comment count"),
+        ),
+        migrations.AddField(
+            model_name="monitorfeed",
+            name="share_count",
+            field=models.BigIntegerField(default=0, db_default=0, verbose_name="Share count"),
+        ),
+        migrations.AddField(
+            model_name="monitorfeed",
+            name="collected_count",
+            field=models.BigIntegerField(default=0, db_default=0, verbose_name="Collected count"),
+        ),
+        migrations.AddField(
+            model_name="monitorfeed",
+            name="ip_location",
+            field=models.CharField(
+                blank=True, max_length=255, null=True, verbose_name="IP location"
+            ),
+        ),
+        migrations.RunPython(populate_interactions, migrations.RunPython.noop),
+    ]
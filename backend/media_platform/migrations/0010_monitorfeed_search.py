@@ -0,0 +1,95 @@
+# Generated by Django 5.0.14 on 2026-10-18 16:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+FULLTEXT_INDEX_NAME = "ft_monitor_feed_content"
+CHUNK_SIZE = 500
+MIN_TOKEN_LENGTH = 2
+MAX_TOKEN_LENGTH = 64
+
+
+def add_fulltext_index(apps, schema_editor):
+    """MySQL: FULLTEXT index with the ngram parser; other databases: build the token table."""
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute(
+            f"ALTER TABLE monitor_feed ADD FULLTEXT INDEX {FULLTEXT_INDEX_NAME} "
+            "(content, source_keyword) WITH PARSER ngram"
+        )
+        return
+
+    import jieba
+
+    MonitorFeed = apps.get_model("media_platform", "MonitorFeed")
+    MonitorFeedToken = apps.get_model("media_platform", "MonitorFeedToken")
+    last_id = 0
+    while True:
+        feeds = list(
+            MonitorFeed.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", "content", "source_keyword")[:CHUNK_SIZE]
+        )
+        if not feeds:
+            break
+        last_id = feeds[-1][0]
+        rows = []
+        for feed_id, content, source_keyword in feeds:
+            # Frozen copy of api.feed_search.tokenize at the time of this migration
+            seen = set()
+            for token in jieba.cut_for_search(f"{content or ''} {source_keyword or ''}"):
+                token = token.strip().lower()[:MAX_TOKEN_LENGTH]
+                if len(token) < MIN_TOKEN_LENGTH or token in seen or not any(ch.isalnum() for ch in token):
+                    continue
+                seen.add(token)
+                rows.append(MonitorFeedToken(token=token, feed_id=feed_id))
+        MonitorFeedToken.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute(f"ALTER TABLE monitor_feed DROP INDEX {FULLTEXT_INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("media_platform", "0009_monitorfeed_interactions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonitorFeedToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "token",
+                    models.CharField(max_length=64, verbose_name="Search token"),
+                ),
+                (
+                    "feed",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_tokens",
+                        to="media_platform.monitorfeed",
+                        verbose_name="Monitor feed",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Monitor Feed Token",
+                "verbose_name_plural": "Monitor Feed Tokens",
+                "db_table": "monitor_feed_token",
+                "unique_together": {("token", "feed")},
+            },
+        ),
+        migrations.RunPython(add_fulltext_index, drop_fulltext_index),
+    ]
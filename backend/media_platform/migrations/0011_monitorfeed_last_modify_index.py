@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-18 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("media_platform", "0010_monitorfeed_search"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="monitorfeed",
+            index=models.Index(
+                fields=["last_modify_ts", "id"], name="monitor_fee_last_mo_edd422_idx"
+            ),
+        ),
+    ]
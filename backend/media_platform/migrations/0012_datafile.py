@@ -0,0 +1,72 @@
+# Generated by Django 5.0.14 on 2026-10-18 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("media_platform", "0011_monitorfeed_last_modify_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DataFile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "path",
+                    models.CharField(
+                        max_length=512,
+                        unique=True,
+                        verbose_name="Path relative to DATA_DIR",
+                    ),
+                ),
+                (
+                    "platform",
+                    models.CharField(
+                        blank=True, max_length=20, null=True, verbose_name="Platform code"
+                    ),
+                ),
+                (
+                    "file_type",
+                    models.CharField(max_length=16, verbose_name="File format"),
+                ),
+                (
+                    "size",
+                    models.BigIntegerField(default=0, verbose_name="File size in bytes"),
+                ),
+                (
+                    "mtime",
+                    models.FloatField(default=0, verbose_name="File modification time"),
+                ),
+                (
+                    "record_count",
+                    models.IntegerField(blank=True, null=True, verbose_name="Record count"),
+                ),
+                (
+                    "scanned_at",
+                    models.BigIntegerField(default=0, verbose_name="Catalog update timestamp"),
+                ),
+            ],
+            options={
+                "verbose_name": "Data File",
+                "verbose_name_plural": "Data Files",
+                "db_table": "data_file",
+                "indexes": [
+                    models.Index(fields=["-mtime"], name="data_file_mtime_idx"),
+                    models.Index(
+                        fields=["platform", "-mtime"], name="data_file_platform_mtime_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
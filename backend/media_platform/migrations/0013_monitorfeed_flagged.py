@@ -0,0 +1,40 @@
+# Generated by Django 5.0.14 on 2026-10-18 21:10
+
+from django.db import migrations, models
+
+
+def populate_flagged(apps, schema_editor):
+    """flagged = is_sensitive OR sentiment = 'sensitive' for existing rows."""
+    MonitorFeed = apps.get_model("media_platform", "MonitorFeed")
+    MonitorFeed.objects.filter(
+        models.Q(is_sensitive=True) | models.Q(sentiment="sensitive")
+    ).update(flagged=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("media_platform", "0012_datafile"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="monitorfeed",
+            name="flagged",
+            field=models.BooleanField(default=False, db_default=False, verbose_name="Flagged as sensitive"),
+        ),
+        migrations.RunPython(populate_flagged, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="monitorfeed",
+            index=models.Index(
+                fields=["flagged", "platform", "-created_at"],
+                name="monitor_fee_flagged_784207_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="monitorfeed",
+            index=models.Index(
+                fields=["flagged", "-created_at"], name="monitor_fee_flagged_671aa1_idx"
+            ),
+        ),
+    ]
@@ -23,10 +23,82 @@ class BaseModel(models.Model):
         abstract = True
 
 
+class PlatformContentQuerySet(models.QuerySet):
+    """
+    Queryset of a platform content table with a select_related-style join to monitor_feed
+
+    Platform tables reference monitor_feed only by (platform, content_id), so a real
+    foreign-key join is not possible. ``with_monitor_feed()`` instead loads the matching
+    MonitorFeed rows for each fetched page with a single ``content_id__in`` query and
+    attaches them as ``obj.monitor_feed`` (None when there is no feed row)::
+
+        XhsNote.objects.with_monitor_feed("sentiment", "is_sensitive").order_by("-time")[:20]
+
+    The join runs when the queryset is evaluated; ``iterator()`` and ``values()`` skip it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._monitor_feed_fields = None
+
+    def with_monitor_feed(self, *fields):
+        """Attach MonitorFeed rows, optionally deferring all but ``fields``"""
+        clone = self._chain()
+        clone._monitor_feed_fields = tuple(fields)
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._monitor_feed_fields = self._monitor_feed_fields
+        return clone
+
+    def _fetch_all(self):
+        needs_join = self._result_cache is None
+        super()._fetch_all()
+        if (
+            needs_join
+            and self._monitor_feed_fields is not None
+            and issubclass(self._iterable_class, models.query.ModelIterable)
+        ):
+            attach_monitor_feed(self.model, self._result_cache, self._monitor_feed_fields)
+
+
+def attach_monitor_feed(model, objs, fields=()) -> None:
+    """Set ``obj.monitor_feed`` on platform content rows using one monitor_feed query"""
+    from api.interactions import PLATFORM_CONTENT_MODELS
+
+    feed_source = next(
+        (
+            (platform, id_field)
+            for platform, (model_name, id_field) in PLATFORM_CONTENT_MODELS.items()
+            if model_name == model.__name__
+        ),
+        None,
+    )
+    if feed_source is None:
+        raise TypeError(f"{model.__name__} is not a platform content model")
+    platform, id_field = feed_source
+
+    content_ids = {
+        str(value) for value in (getattr(obj, id_field, None) for obj in objs) if value not in (None, "")
+    }
+    feeds = {}
+    if content_ids:
+        queryset = MonitorFeed.objects.filter(platform=platform, content_id__in=content_ids)
+        if fields:
+            queryset = queryset.only("content_id", *fields)
+        for feed in queryset:
+            feeds.setdefault(feed.content_id, feed)
+    for obj in objs:
+        obj.monitor_feed = feeds.get(str(getattr(obj, id_field, None)))
+
+
 # ============== Bilibili Models ==============
 
 class BilibiliVideo(BaseModel):
     """Bilibili video model"""
+    objects = PlatformContentQuerySet.as_manager()
+
     video_id = models.BigIntegerField(unique=True, db_index=True, verbose_name="Video ID")
     video_url = models.TextField(verbose_name="Video URL")
     user_id = models.BigIntegerField(db_index=True, null=True, blank=True)
@@ -148,6 +220,8 @@ class BilibiliUpDynamic(BaseModel):
 
 class DouyinAweme(BaseModel):
     """Douyin aweme (video) model"""
+    objects = PlatformContentQuerySet.as_manager()
+
     user_id = models.CharField(max_length=255, null=True, blank=True)
     sec_uid = models.CharField(max_length=255, null=True, blank=True)
     short_user_id = models.CharField(max_length=255, null=True, blank=True)
@@ -242,6 +316,8 @@ class DyCreator(BaseModel):
 
 class KuaishouVideo(BaseModel):
     """Kuaishou video model"""
+    objects = PlatformContentQuerySet.as_manager()
+
     user_id = models.CharField(max_length=64, null=True, blank=True)
     nickname = models.TextField(null=True, blank=True)
     avatar = models.TextField(null=True, blank=True)
@@ -301,6 +377,8 @@ class KuaishouVideoComment(BaseModel):
 
 class WeiboNote(BaseModel):
     """Weibo note model"""
+    objects = PlatformContentQuerySet.as_manager()
+
     user_id = models.CharField(max_length=255, null=True, blank=True)
     nickname = models.TextField(null=True, blank=True)
     avatar = models.TextField(null=True, blank=True)
@@ -403,6 +481,8 @@ class XhsCreator(BaseModel):
 
 class XhsNote(BaseModel):
     """Xiaohongshu note model"""
+    objects = PlatformContentQuerySet.as_manager()
+
     user_id = models.CharField(max_length=255, null=True, blank=True)
     nickname = models.TextField(null=True, blank=True)
     avatar = models.TextField(null=True, blank=True)
@@ -471,6 +551,8 @@ class XhsNoteComment(BaseModel):
 
 class TiebaNote(BaseModel):
     """Tieba note model"""
+    objects = PlatformContentQuerySet.as_manager()
+
     note_id = models.CharField(max_length=644, db_index=True, verbose_name="Note ID")
     title = models.TextField(null=True, blank=True)
     desc = models.TextField(null=True, blank=True)
@@ -585,6 +667,16 @@ class MonitorFeed(BaseModel):
         db_index=True,
         verbose_name="Is sensitive content"
     )
+    # 敏感标记（is_sensitive 或 sentiment == "sensitive"），由写入路径维护，
+    # 敏感列表只按这一列过滤，可以走 (flagged, platform, created_at) 索引；db_default 同互动数据
+    flagged = models.BooleanField(default=False, db_default=False, verbose_name="Flagged as sensitive")
+    # 互动数据，由同步层从平台内容表换算写入；db_default 使不写这几列的原生 INSERT
+    # （如 sync_all_data.py）在 MySQL 严格模式下仍可执行
+    liked_count = models.BigIntegerField(default=0, db_default=0, verbose_name="Like count")
+    comment_count = models.BigIntegerField(default=0, db_default=0, verbose_name="Comment count")
+    share_count = models.BigIntegerField(default=0, db_default=0, verbose_name="Share count")
+    collected_count = models.BigIntegerField(default=0, db_default=0, verbose_name="Collected count")
+    ip_location = models.CharField(max_length=255, null=True, blank=True, verbose_name="IP location")
 
     class Meta:
         db_table = 'monitor_feed'
@@ -595,6 +687,64 @@ class MonitorFeed(BaseModel):
             models.Index(fields=['-created_at']),
             models.Index(fields=['platform', '-created_at']),
             models.Index(fields=['sentiment', '-created_at']),
+            models.Index(fields=['last_modify_ts', 'id']),
+            models.Index(fields=['flagged', 'platform', '-created_at']),
+            models.Index(fields=['flagged', '-created_at']),
+        ]
+
+
+class MonitorFeedToken(models.Model):
+    """jieba inverted index of monitor_feed content, used for keyword search on non-MySQL databases"""
+    token = models.CharField(max_length=64, verbose_name="Search token")
+    feed = models.ForeignKey(
+        MonitorFeed,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name="search_tokens",
+        verbose_name="Monitor feed",
+    )
+
+    class Meta:
+        db_table = 'monitor_feed_token'
+        verbose_name = "Monitor Feed Token"
+        verbose_name_plural = "Monitor Feed Tokens"
+        unique_together = [['token', 'feed']]
+
+
+class MonitorFeedRollup(models.Model):
+    """Daily sentiment rollup of monitor_feed, maintained incrementally by the sync layer"""
+    platform = models.CharField(max_length=20, verbose_name="Platform code")
+    day = models.DateField(verbose_name="Publish day (local time)")
+    sentiment = models.CharField(max_length=20, verbose_name="Sentiment type")
+    is_sensitive = models.BooleanField(default=False, verbose_name="Is sensitive content")
+    feed_count = models.BigIntegerField(default=0, verbose_name="Feed rows")
+    scored_count = models.BigIntegerField(default=0, verbose_name="Rows with sentiment score")
+    score_sum = models.FloatField(default=0, verbose_name="Sum of sentiment scores")
+
+    class Meta:
+        db_table = 'monitor_feed_rollup'
+        verbose_name = "Monitor Feed Rollup"
+        verbose_name_plural = "Monitor Feed Rollups"
+        unique_together = [['platform', 'day', 'sentiment', 'is_sensitive']]
+
+
+class DataFile(models.Model):
+    """Catalog of crawler output files under DATA_DIR, used instead of scanning and parsing the directory"""
+    path = models.CharField(max_length=512, unique=True, verbose_name="Path relative to DATA_DIR")
+    platform = models.CharField(max_length=20, null=True, blank=True, verbose_name="Platform code")
+    file_type = models.CharField(max_length=16, verbose_name="File format")
+    size = models.BigIntegerField(default=0, verbose_name="File size in bytes")
+    mtime = models.FloatField(default=0, verbose_name="File modification time")
+    record_count = models.IntegerField(null=True, blank=True, verbose_name="Record count")
+    scanned_at = models.BigIntegerField(default=0, verbose_name="Catalog update timestamp")
+
+    class Meta:
+        db_table = 'data_file'
+        verbose_name = "Data File"
+        verbose_name_plural = "Data Files"
+        indexes = [
+            models.Index(fields=['-mtime'], name='data_file_mtime_idx'),
+            models.Index(fields=['platform', '-mtime'], name='data_file_platform_mtime_idx'),
         ]
 
 
@@ -602,6 +752,8 @@ class MonitorFeed(BaseModel):
 
 class ZhihuContent(BaseModel):
     """Zhihu content model"""
+    objects = PlatformContentQuerySet.as_manager()
+
     content_id = models.CharField(max_length=64, db_index=True, verbose_name="Content ID")
     content_type = models.TextField(null=True, blank=True)
     content_text = models.TextField(null=True, blank=True)
@@ -1,3 +1,85 @@
+from django.db import connection
 from django.test import TestCase
 
-# Create your tests here.
+from media_platform.models import DouyinAweme, MonitorFeed, XhsNote
+
+
+def raw_insert_feed(content_id, **columns):
+    """模拟同步脚本的原生 INSERT：只写入给出的列，其余列使用数据库默认值"""
+    values = {
+        "platform": "xhs", "platform_name": "小红书", "content_id": content_id, "content": "内容",
+        "author": "", "url": "", "created_at": 1700000000, "source_keyword": "", "add_ts": 0,
+        "last_modify_ts": 0, "sentiment": "neutral", "sentiment_labels": "{}", "is_sensitive": False,
+        **columns,
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO monitor_feed ({', '.join(values)}) VALUES ({', '.join(['%s'] * len(values))})",
+            list(values.values()),
+        )
+    return MonitorFeed.objects.get(content_id=content_id)
+
+
+class MonitorFeedDefaultsTests(TestCase):
+    """原生 INSERT 不写入的派生列由数据库默认值补齐"""
+
+    def test_interaction_counts_default_to_zero(self):
+        feed = raw_insert_feed("raw-1", flagged=False)
+        self.assertEqual(
+            (feed.liked_count, feed.comment_count, feed.share_count, feed.collected_count),
+            (0, 0, 0, 0),
+        )
+
+    def test_flagged_defaults_to_false(self):
+        feed = raw_insert_feed("raw-2")
+        self.assertFalse(feed.flagged)
+        self.assertFalse(MonitorFeed.objects.filter(flagged=True).exists())
+
+
+class WithMonitorFeedTests(TestCase):
+    """平台内容表按 (platform, content_id) 附带 monitor_feed 记录"""
+
+    def setUp(self):
+        for i in range(5):
+            XhsNote.objects.create(note_id=f"n{i}", title=f"note {i}", time=1700000000 + i)
+            if i % 2 == 0:
+                MonitorFeed.objects.create(platform="xhs", platform_name="小红书", content_id=f"n{i}",
+                                           content="内容", created_at=1700000000, sentiment="negative",
+                                           is_sensitive=i == 4)
+        # 其他平台相同 content_id 的记录不会被匹配
+        MonitorFeed.objects.create(platform="dy", platform_name="抖音", content_id="n1", content="内容",
+                                   created_at=1700000000)
+
+    def test_one_query_per_page(self):
+        with self.assertNumQueries(2):
+            notes = list(XhsNote.objects.with_monitor_feed().order_by("time")[:4])
+        self.assertEqual([note.monitor_feed is not None for note in notes], [True, False, True, False])
+        self.assertEqual(notes[0].monitor_feed.sentiment, "negative")
+
+    def test_only_requested_fields(self):
+        notes = list(XhsNote.objects.with_monitor_feed("sentiment", "is_sensitive").order_by("time"))
+        feed = notes[4].monitor_feed
+        self.assertTrue(feed.is_sensitive)
+        self.assertEqual(feed.get_deferred_fields() & {"sentiment", "is_sensitive", "content_id"}, set())
+        self.assertIn("content", feed.get_deferred_fields())
+
+    def test_numeric_content_ids(self):
+        DouyinAweme.objects.create(aweme_id=7001, title="video")
+        MonitorFeed.objects.create(platform="dy", platform_name="抖音", content_id="7001", content="内容",
+                                   created_at=1700000000)
+        aweme = DouyinAweme.objects.with_monitor_feed().get()
+        self.assertEqual(aweme.monitor_feed.content_id, "7001")
+
+    def test_not_joined_without_with_monitor_feed_or_for_values(self):
+        with self.assertNumQueries(1):
+            notes = list(XhsNote.objects.all())
+        self.assertFalse(hasattr(notes[0], "monitor_feed"))
+        with self.assertNumQueries(1):
+            list(XhsNote.objects.with_monitor_feed().values("note_id"))
+
+    def test_evaluated_queryset_is_not_joined_again(self):
+        queryset = XhsNote.objects.with_monitor_feed()
+        list(queryset)
+        with self.assertNumQueries(0):
+            list(queryset)
+            len(queryset)
@@ -37,6 +37,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # QUERY_PROFILING 关闭时不加载（MiddlewareNotUsed）
+    "api.profiling.QueryProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -64,6 +66,7 @@ TEMPLATES = [{
 }]
 
 WSGI_APPLICATION = "mediacrawler_config.wsgi.application"
+ASGI_APPLICATION = "mediacrawler_config.asgi.application"
 
 # Database - MySQL (from .env)
 import pymysql
@@ -114,10 +117,78 @@ MEDIA_ROOT = BASE_DIR / "media"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Cache - Redis (from .env), falls back to local memory when REDIS_HOST is not set
+REDIS_HOST = os.environ.get('REDIS_HOST', '')
+REDIS_PORT = os.environ.get('REDIS_PORT', '6379')
+REDIS_DB = os.environ.get('REDIS_DB', '0')
+REDIS_PASSWORD = os.environ.get('REDIS_PASSWORD', '')
+
+if REDIS_HOST:
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}",
+            "KEY_PREFIX": "mediacrawler",
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                "PASSWORD": REDIS_PASSWORD or None,
+                "SOCKET_CONNECT_TIMEOUT": 2,
+                "SOCKET_TIMEOUT": 2,
+                # Redis 不可用时视为缓存未命中，接口直接查库
+                "IGNORE_EXCEPTIONS": True,
+            },
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "mediacrawler",
+        }
+    }
+
+# 监控接口响应缓存时长（秒）。本地内存缓存无法感知爬虫进程的写入，默认只缓存 15 秒
+API_CACHE_TIMEOUT = int(os.environ.get('API_CACHE_TIMEOUT', '300' if REDIS_HOST else '15'))
+
+# 列表总数统计：不超过该行数时精确计数，超过时使用数据库优化器估算（total_is_estimate=true）
+COUNT_EXACT_THRESHOLD = int(os.environ.get('COUNT_EXACT_THRESHOLD', '10000'))
+# 总数按查询条件 + 数据版本号缓存的时长（秒）
+COUNT_CACHE_TIMEOUT = int(os.environ.get('COUNT_CACHE_TIMEOUT', '300' if REDIS_HOST else '60'))
+
+# 情绪分数后台回填间隔（秒），0 表示不在 Web 进程内启动回填线程（改用 manage.py backfill_sentiment）
+SENTIMENT_BACKFILL_INTERVAL = int(os.environ.get('SENTIMENT_BACKFILL_INTERVAL', '0'))
+
+# /api/monitor/stream 增量查询 monitor_feed 的间隔（秒）
+MONITOR_STREAM_POLL_INTERVAL = float(os.environ.get('MONITOR_STREAM_POLL_INTERVAL', '2'))
+
+# AI 分析结果缓存时长（秒）。缓存键包含 monitor_feed 数据水位，数据变化后自动重新分析
+AI_RESULT_CACHE_TIMEOUT = int(os.environ.get('AI_RESULT_CACHE_TIMEOUT', '1800'))
+# AI 分析任务的最长执行时间（秒），超时的未完成任务不再参与去重并标记为失败
+AI_JOB_TIMEOUT = int(os.environ.get('AI_JOB_TIMEOUT', '300'))
+
+# 智谱 AI 客户端（api/llm_client.py）。ZHIPU_API_URL 可指向本地模拟服务（manage.py run_llm_stub）
+ZHIPU_API_URL = os.environ.get('ZHIPU_API_URL', 'https://open.bigmodel.cn/api/paas/v4/chat/completions')
+LLM_TIMEOUT = float(os.environ.get('LLM_TIMEOUT', '90'))
+# 每个进程同时在途的请求数、令牌桶限流（次/秒）和突发容量
+LLM_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', '4'))
+LLM_RATE_LIMIT = float(os.environ.get('LLM_RATE_LIMIT', '2'))
+LLM_RATE_BURST = float(os.environ.get('LLM_RATE_BURST', '4'))
+LLM_MAX_RETRIES = int(os.environ.get('LLM_MAX_RETRIES', '2'))
+# 连续失败多少次后熔断，以及熔断持续时间（秒）
+LLM_BREAKER_FAILURES = int(os.environ.get('LLM_BREAKER_FAILURES', '5'))
+LLM_BREAKER_COOLDOWN = float(os.environ.get('LLM_BREAKER_COOLDOWN', '30'))
+
+# 按请求统计数据库查询（api/profiling.py），开启后响应带 Server-Timing 头
+QUERY_PROFILING = os.environ.get('QUERY_PROFILING', 'false').lower() in ('1', 'true', 'yes')
+# 总耗时（毫秒）或查询数超过阈值的请求写入慢请求日志，用 manage.py summarize_slow_requests 汇总
+QUERY_PROFILING_SLOW_MS = float(os.environ.get('QUERY_PROFILING_SLOW_MS', '500'))
+QUERY_PROFILING_MAX_QUERIES = int(os.environ.get('QUERY_PROFILING_MAX_QUERIES', '50'))
+QUERY_PROFILING_LOG = Path(os.environ.get('QUERY_PROFILING_LOG', BASE_DIR / "logs" / "slow_requests.jsonl"))
+
 # REST Framework
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.AllowAny"],
-    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+    "DEFAULT_RENDERER_CLASSES": ["api.renderers.ORJSONRenderer"],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 100,
     "DEFAULT_FILTER_BACKENDS": [
@@ -137,6 +208,12 @@ CORS_ALLOW_ALL_ORIGINS = DEBUG
 
 # Data Directory
 DATA_DIR = Path(os.environ.get('DATA_DIR', BASE_DIR.parent / "data"))
+# 数据文件目录（data_file 表）按文件大小/修改时间增量刷新的最短间隔（秒）
+DATA_CATALOG_REFRESH_INTERVAL = int(os.environ.get('DATA_CATALOG_REFRESH_INTERVAL', 30))
+
+# 爬虫运行日志（每次运行一个 JSONL 文件）的目录和保留的运行数
+CRAWLER_LOG_DIR = Path(os.environ.get('CRAWLER_LOG_DIR', BASE_DIR / "logs" / "crawler"))
+CRAWLER_LOG_KEEP_RUNS = int(os.environ.get('CRAWLER_LOG_KEEP_RUNS', '50'))
 
 # Crawler Config
 CRAWLER_CONFIG = {
@@ -165,6 +242,10 @@ LOGGING = {
             "format": "{levelname} {asctime} {module} {message}",
             "style": "{",
         },
+        "message": {
+            "format": "{message}",
+            "style": "{",
+        },
     },
     "handlers": {
         "console": {
@@ -178,6 +259,14 @@ LOGGING = {
             "backupCount": 5,
             "formatter": "verbose",
         },
+        "slow_requests": {
+            "class": "logging.handlers.RotatingFileHandler",
+            "filename": QUERY_PROFILING_LOG,
+            "maxBytes": 1024 * 1024 * 10,
+            "backupCount": 5,
+            "formatter": "message",
+            "delay": True,
+        },
     },
     "root": {
         "handlers": ["console", "file"],
@@ -194,6 +283,12 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        # 慢请求日志，每行一个 JSON 对象
+        "api.profiling": {
+            "handlers": ["slow_requests"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
 
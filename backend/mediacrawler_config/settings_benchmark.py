@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Settings for the API benchmark (manage.py run_api_benchmark)
+
+Same as settings.py, but uses a dedicated SQLite file and the local memory cache, so the
+benchmark never touches the production MySQL or Redis. The api / media_platform
+migrations are disabled (0005 contains MySQL-only SQL); tables are created from the
+models with ``migrate --run-syncdb``.
+
+    python manage.py run_api_benchmark --settings=mediacrawler_config.settings_benchmark --rows 1000000
+"""
+
+from .settings import *  # noqa: F401,F403
+
+BENCHMARK_DIR = Path(os.environ.get('BENCHMARK_DIR', BASE_DIR / "benchmark"))
+BENCHMARK_DIR.mkdir(parents=True, exist_ok=True)
+
+DEBUG = False
+ALLOWED_HOSTS = ["testserver", "localhost", "127.0.0.1"]
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BENCHMARK_DIR / "benchmark.sqlite3",
+        "OPTIONS": {"timeout": 30},
+    }
+}
+MIGRATION_MODULES = {
+    "api": None,
+    "media_platform": None,
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "mediacrawler-benchmark",
+    }
+}
+API_CACHE_TIMEOUT = 15
+COUNT_CACHE_TIMEOUT = 60
+
+DATA_DIR = BENCHMARK_DIR / "data"
+DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+SENTIMENT_BACKFILL_INTERVAL = 0
+QUERY_PROFILING = False
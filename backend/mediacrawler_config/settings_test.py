@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Settings for the test suite (manage.py test)
+
+Same as settings.py, but uses an in-memory SQLite database and the local memory cache, so
+tests never touch the production MySQL or Redis. The api / media_platform migrations are
+disabled (0005 contains MySQL-only SQL); test tables are created from the models.
+
+    python manage.py test api media_platform --settings=mediacrawler_config.settings_test
+"""
+
+from .settings import *  # noqa: F401,F403
+
+DEBUG = False
+ALLOWED_HOSTS = ["testserver", "localhost", "127.0.0.1"]
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    }
+}
+MIGRATION_MODULES = {
+    "api": None,
+    "media_platform": None,
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "mediacrawler-test",
+    }
+}
+API_CACHE_TIMEOUT = 15
+COUNT_CACHE_TIMEOUT = 60
+
+SENTIMENT_BACKFILL_INTERVAL = 0
+QUERY_PROFILING = False
@@ -27,7 +27,10 @@ from api.views import (
     get_sensitive_feed,
     get_all_feed,
     get_platform_sentiment_stats,
+    monitor_stream,
+    export_data,
     CrawlerView,
+    crawler_log_stream,
     # Cookie Management
     list_cookies,
     get_cookie,
@@ -39,6 +42,8 @@ from api.views import (
     # AI Analysis
     ai_keyword_analysis,
     ai_analysis,
+    submit_ai_job,
+    get_ai_job,
 )
 
 urlpatterns = [
@@ -52,6 +57,7 @@ urlpatterns = [
     path("api/config/options", get_config_options, name="get_config_options"),
 
     # API: Crawler Control
+    path("api/crawler/logs/stream", crawler_log_stream, name="crawler_log_stream"),
     path("api/crawler/<str:action>", CrawlerView.as_view(), name="crawler_action"),
 
     # API: Data Management
@@ -59,10 +65,12 @@ urlpatterns = [
     path("api/data/stats", get_data_stats, name="get_data_stats"),
     path("api/data/files/<path:file_path>", get_file_content, name="get_file_content"),
     path("api/data/download/<path:file_path>", download_file, name="download_file"),
+    path("api/data/export", export_data, name="export_data"),
     path("api/monitor/feed", get_monitor_feed, name="get_monitor_feed"),
     path("api/monitor/feed/sensitive", get_sensitive_feed, name="get_sensitive_feed"),
     path("api/monitor/feed/all", get_all_feed, name="get_all_feed"),
     path("api/monitor/platform-sentiment-stats", get_platform_sentiment_stats, name="get_platform_sentiment_stats"),
+    path("api/monitor/stream", monitor_stream, name="monitor_stream"),
 
     # API: Cookie Management
     path("api/cookies", list_cookies, name="list_cookies"),
@@ -76,6 +84,8 @@ urlpatterns = [
     # API: AI Analysis
     path("api/ai/keyword-analysis", ai_keyword_analysis, name="ai_keyword_analysis"),
     path("api/ai/analysis", ai_analysis, name="ai_analysis"),
+    path("api/ai/jobs", submit_ai_job, name="submit_ai_job"),
+    path("api/ai/jobs/<int:job_id>", get_ai_job, name="get_ai_job"),
 
     # Root endpoint
     path(
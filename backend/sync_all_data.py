@@ -9,7 +9,7 @@ import sys
 import os
 from dotenv import load_dotenv
 
-from api.sentiment_service import analyze_sentiment
+from api.sentiment_service import analyze_many, sentiment_pool
 
 env_path = os.path.join(os.path.dirname(__file__), '.env')
 if os.path.exists(env_path):
@@ -20,10 +20,30 @@ DB_USER = os.environ.get('DB_USER', 'lxr')
 DB_PASSWORD = os.environ.get('DB_PASSWORD', 'lxr123123')
 DB_HOST = os.environ.get('DB_HOST', '39.105.122.26')
 DB_PORT = int(os.environ.get('DB_PORT', '3306'))
+# 情绪打分进程数，默认使用全部 CPU
+SENTIMENT_WORKERS = int(os.environ.get('SENTIMENT_WORKERS', str(os.cpu_count() or 1)))
 
 platform_names = {"xhs": "小红书", "dy": "抖音", "ks": "快手", "bili": "B站", "wb": "微博", "tieba": "贴吧", "zhihu": "知乎"}
 
+def refresh_derived_data(synced_platforms):
+    """
+    脚本直接写入 monitor_feed，不经过同步层的增量维护：
+    重建这些平台的情绪汇总表，并递增数据版本号使接口响应缓存失效
+    """
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mediacrawler_config.settings')
+    django.setup()
+    from api.feed_cache import bump_data_version
+    from api.rollup import rebuild_rollup
+
+    for platform in synced_platforms:
+        rows = rebuild_rollup(platform)
+        print(f"[OK] Rebuilt rollup for {platform_names[platform]}: {rows} rows")
+    bump_data_version(*synced_platforms)
+
+
 def sync_all():
+    pool = sentiment_pool(SENTIMENT_WORKERS) if SENTIMENT_WORKERS > 1 else None
     try:
         connection = pymysql.connect(
             host=DB_HOST,
@@ -37,6 +57,7 @@ def sync_all():
 
         print(f"=== Syncing ALL data to monitor_feed ===\n")
 
+        synced_platforms = []
         # Clear and sync all platforms
         platforms = [
             ('xhs', 'xhs_note', 'note_id', 'time', 'nickname', 'note_url', ['title', 'desc']),
@@ -66,15 +87,18 @@ def sync_all():
             rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
 
             now_ms = int(time.time() * 1000)
-            payload = []
+            contents = []
             for row in rows:
                 content_parts = []
                 for field in content_fields:
                     value = row.get(field)
                     if value is not None and str(value).strip():
                         content_parts.append(str(value))
-                content = " ".join(content_parts).strip() or "暂无内容"
+                contents.append(" ".join(content_parts).strip() or "暂无内容")
+            sentiment_results = analyze_many(contents, executor=pool)
 
+            payload = []
+            for row, content, sentiment_result in zip(rows, contents, sentiment_results):
                 raw_created_at = row.get("created_at")
                 created_at = 0
                 if raw_created_at is not None:
@@ -82,7 +106,6 @@ def sync_all():
                     if raw_str.isdigit():
                         created_at = int(raw_str)
 
-                sentiment_result = analyze_sentiment(content)
                 sentiment = sentiment_result.get("sentiment", "neutral")
                 sentiment_score = sentiment_result.get("score", 0)
                 sentiment_labels = sentiment_result.get("labels") or {}
@@ -103,6 +126,7 @@ def sync_all():
                     sentiment_score,
                     json.dumps(sentiment_labels, ensure_ascii=False),
                     1 if is_sensitive else 0,
+                    1 if is_sensitive else 0,
                 ))
 
             if not payload:
@@ -125,9 +149,10 @@ def sync_all():
                     sentiment,
                     sentiment_score,
                     sentiment_labels,
-                    is_sensitive
+                    is_sensitive,
+                    flagged
                 )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 ON DUPLICATE KEY UPDATE
                     content = VALUES(content),
                     author = VALUES(author),
@@ -138,13 +163,17 @@ def sync_all():
                     sentiment = VALUES(sentiment),
                     sentiment_score = VALUES(sentiment_score),
                     sentiment_labels = VALUES(sentiment_labels),
-                    is_sensitive = VALUES(is_sensitive)
+                    is_sensitive = VALUES(is_sensitive),
+                    flagged = VALUES(flagged)
                 """,
                 payload,
             )
             print(f"[OK] {platform_names[platform]:8s}: {cursor.rowcount:6d} records")
+            synced_platforms.append(platform)
 
         connection.commit()
+        if synced_platforms:
+            refresh_derived_data(synced_platforms)
 
         cursor.execute("SELECT COUNT(*) FROM monitor_feed")
         total = cursor.fetchone()[0]
@@ -157,6 +186,9 @@ def sync_all():
         print(f"[ERROR] {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
 if __name__ == "__main__":
     sync_all()